@@ -8,7 +8,6 @@ Bu script sistemi hızlı test etmek için kullanılır.
 import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 import os
@@ -23,44 +22,36 @@ from pattern.choch_detector import CHoCHDetector
 from data_feed.mt5 import MT5Feed
 from region.box_region import BoxRegionManager
 
-def generate_sample_data():
-    """Sample forex data üret"""
-    print("📊 Generating sample data...")
-    
-    np.random.seed(42)
-    bars = 200
-    
-    # Trending data with some CHoCH patterns
-    prices = []
+def generate_sample_data(bars: int = 200, seed: int = 42, start=None, freq: str = 'h',
+                         verbose: bool = True):
+    """Sample forex data üret - aynı seed ile aynı seri (benchmark'lar da kullanır)"""
+    if verbose:
+        print("📊 Generating sample data...")
+    
+    # Eski np.random.seed akışı - varsayılan 200 barlık seri döngülü sürümle aynı kalır
+    rng = np.random.RandomState(seed)
     base_price = 1.0800
     
-    for i in range(bars):
-        # Add some trending behavior
-        if i < 50:
-            drift = 0.0002  # Uptrend
-        elif i < 100:
-            drift = -0.0001  # Downtrend
-        elif i < 150:
-            drift = 0.0003  # Strong uptrend
-        else:
-            drift = -0.0002  # Correction
-        
-        base_price += drift + np.random.normal(0, 0.0005)
-        prices.append(base_price)
+    # Trending data with some CHoCH patterns - 200 barlık döngü:
+    # yükseliş, düşüş, güçlü yükseliş, düzeltme. Daha uzun serilerde döngü
+    # tekrarlanır (döngü başına net +0.01); son fazın eğimi sonsuza uzatılsaydı
+    # milyonlarca barlık benchmark serileri sıfırın altına inerdi.
+    phase = (np.arange(bars) % 200) // 50
+    drift = np.array([0.0002, -0.0001, 0.0003, -0.0002])[phase]
+    prices = base_price + np.cumsum(drift + rng.normal(0, 0.0005, bars))
     
     # Create OHLCV data
-    time_index = pd.date_range(
-        start=datetime.now() - timedelta(hours=bars), 
-        periods=bars, 
-        freq='H'
-    )
+    if start is None:
+        time_index = pd.date_range(end=pd.Timestamp.now().floor(freq), periods=bars, freq=freq)
+    else:
+        time_index = pd.date_range(start=start, periods=bars, freq=freq)
     
     df = pd.DataFrame({
         'open': prices,
-        'high': [p + np.random.uniform(0, 0.0008) for p in prices],
-        'low': [p - np.random.uniform(0, 0.0008) for p in prices],
+        'high': prices + rng.uniform(0, 0.0008, bars),
+        'low': prices - rng.uniform(0, 0.0008, bars),
         'close': prices,
-        'volume': np.random.randint(100, 1000, bars)
+        'volume': rng.randint(100, 1000, bars)
     }, index=time_index)
     
     return df
@@ -150,7 +141,7 @@ async def demo_region_management():
     
     for symbol, price in test_prices:
         tick_data = {"bid": price - 0.0001, "ask": price + 0.0001}
-        await manager.check_regions(symbol, tick_data)
+        await manager.notify(symbol, manager.check_regions(symbol, tick_data))
     
     print(f"\n📊 Region Statistics:")
     stats = manager.get_statistics()
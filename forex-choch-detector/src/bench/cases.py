@@ -0,0 +1,205 @@
+"""
+Sıcak yol benchmark senaryoları - veri demo.generate_sample_data ile seed'li üretilir
+"""
+import asyncio
+import importlib.util
+import json
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from bench.runner import BenchCase
+from core.config import PatternConfig
+from data_feed.oanda import OandaFeed
+from pattern.choch_detector import CHoCHDetector
+from pattern.matrix import MatrixSwingEngine
+from pattern.outcomes import outcome_arrays
+from pattern.swing_engine import SwingEngine
+from region.box_region import BoxRegionManager
+
+SYMBOL = "EUR/USD"
+SEED = 42
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+
+# Hafif komutlar (--help, stats, add-region...) için CLI import hedefi
+IMPORT_TARGET_MS = 150
+HEAVY_MODULES = ("pandas", "numpy", "aiohttp", "core.orchestrator", "data_feed.oanda", "notifier.telegram")
+
+_loop = None
+
+def _run(coroutine) -> Any:
+    """Ölçümler boyunca tek event loop - her çağrıda loop kurmak sonucu bozar"""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coroutine)
+
+@lru_cache(maxsize=4)
+def sample_bars(bars: int, freq: str = "min") -> pd.DataFrame:
+    """demo.generate_sample_data'dan sabit başlangıçlı, seed'li M1 barlar"""
+    spec = importlib.util.spec_from_file_location("choch_demo", PROJECT_ROOT / "demo.py")
+    demo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(demo)
+    return demo.generate_sample_data(bars=bars, seed=SEED, start="2020-01-01", freq=freq, verbose=False)
+
+def _ticks_after(bars: pd.DataFrame, count: int) -> List[Dict[str, Any]]:
+    """Son barın ardından saniyede bir tick - dakikada bir yeni bar açılır"""
+    rng = np.random.default_rng(SEED)
+    mids = bars["close"].iloc[-1] + np.cumsum(rng.normal(0, 0.00002, count))
+    times = bars.index[-1] + pd.to_timedelta(np.arange(1, count + 1), unit="s")
+    return [{"bid": mid - 0.00005, "ask": mid + 0.00005, "timestamp": ts, "volume": 1}
+            for mid, ts in zip(mids, times)]
+
+def setup_update_ohlcv(ticks: int) -> Tuple[Callable[[], Any], int]:
+    detector = CHoCHDetector(PatternConfig())
+    history = sample_bars(detector.max_bars)
+    tick_list = _ticks_after(history, ticks)
+    
+    def feed():
+        detector.symbol_data[SYMBOL] = history.copy()
+        for tick in tick_list:
+            detector._update_ohlcv_from_tick(SYMBOL, tick)
+    
+    return feed, ticks
+
+def setup_process_tick(ticks: int) -> Tuple[Callable[[], Any], int]:
+    """Isıtılmış detector'da tick başına bar güncellemesi ve swing/CHoCH analizi"""
+    history = sample_bars(1_000)
+    tick_list = _ticks_after(history, ticks)
+    
+    def feed():
+        detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+        detector.load_history(SYMBOL, history)
+        for tick in tick_list:
+            detector.process_tick(SYMBOL, tick)
+    
+    return feed, ticks
+
+def setup_process_candles(bars: int) -> Tuple[Callable[[], Any], int]:
+    df = sample_bars(bars)
+    config = PatternConfig()
+    
+    def process():
+        SwingEngine(config.swing_depth, config.tolerance, config.min_swing_size).process_candles(df)
+    
+    return process, bars
+
+def setup_check_regions(regions: int, checks: int = 1000) -> Tuple[Callable[[], Any], int]:
+    manager = BoxRegionManager()
+    rng = np.random.default_rng(SEED)
+    lowers = rng.uniform(1.0, 1.2, regions)
+    for i, lower in enumerate(lowers):
+        manager.add_region(SYMBOL, f"bench-{i}", lower + 0.0005, lower)
+    mids = rng.uniform(1.0, 1.2, checks)
+    ticks = [{"bid": mid - 0.00005, "ask": mid + 0.00005} for mid in mids]
+    
+    def check():
+        for tick in ticks:
+            manager.check_regions(SYMBOL, tick)
+    
+    return check, checks
+
+def setup_oanda_parse(lines: int) -> Tuple[Callable[[], Any], int]:
+    feed = OandaFeed(api_key="bench", account_id="bench")
+    rng = np.random.default_rng(SEED)
+    raw = []
+    for i, mid in enumerate(1.08 + rng.normal(0, 0.001, lines)):
+        if i % 10 == 9:
+            message = {"type": "HEARTBEAT", "time": "2024-01-01T00:00:00.000000000Z"}
+        else:
+            message = {
+                "type": "PRICE", "instrument": "EUR_USD", "time": "2024-01-01T00:00:00.000000000Z",
+                "bids": [{"price": f"{mid - 0.00005:.5f}", "liquidity": 1000000}],
+                "asks": [{"price": f"{mid + 0.00005:.5f}", "liquidity": 1000000}],
+                "closeoutBid": f"{mid - 0.0001:.5f}", "closeoutAsk": f"{mid + 0.0001:.5f}",
+                "status": "tradeable", "tradeable": True
+            }
+        raw.append(json.dumps(message).encode("utf-8") + b"\n")
+    
+    async def parse():
+        for line in raw:
+            await feed._handle_line(line)
+    
+    return lambda: _run(parse()), lines
+
+def measure_import(module: str = "cli.main") -> Tuple[float, List[str]]:
+    """Temiz interpreter'da import süresi (sn, açılış hariç) ve yüklenen ağır modüller"""
+    code = (
+        f"import sys, time; sys.path.insert(0, {str(SRC_ROOT)!r}); started = time.perf_counter(); "
+        f"import {module}; elapsed = time.perf_counter() - started; "
+        f"print(elapsed, *[m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    elapsed, *heavy = output.split()
+    return float(elapsed), heavy
+
+def setup_cli_import(imports: int) -> Tuple[Callable[[], Any], int]:
+    def run():
+        for _ in range(imports):
+            measure_import()
+    
+    return run, imports
+
+def setup_backtest(bars: int) -> Tuple[Callable[[], Any], int]:
+    df = sample_bars(bars)
+    detector = CHoCHDetector(PatternConfig())
+    return lambda: detector.backtest(SYMBOL, df), bars
+
+def setup_outcomes(events: int) -> Tuple[Callable[[], Any], int]:
+    """100k barlık seri üzerinde rastgele yön ve invalidation seviyeli event'ler"""
+    bars = sample_bars(100_000)
+    high, low, close = (bars[column].to_numpy() for column in ("high", "low", "close"))
+    rng = np.random.default_rng(SEED)
+    index = np.sort(rng.integers(0, len(bars), events))
+    direction = np.where(rng.random(events) < 0.5, 1.0, -1.0)
+    level = close[index] - direction * 0.0005
+    return lambda: outcome_arrays(index, direction, level, high, low, close), events
+
+def setup_matrix_close(symbols: int, bars: int = 60) -> Tuple[Callable[[], Any], int]:
+    """Sembol başına farklı dilimlerden barlar - çağrı başına ``bars`` ortak kapanış"""
+    source = sample_bars(10_000)
+    rng = np.random.default_rng(SEED)
+    offsets = rng.integers(0, len(source) - bars, symbols)
+    highs = np.stack([source["high"].to_numpy()[offset:offset + bars] for offset in offsets])
+    lows = np.stack([source["low"].to_numpy()[offset:offset + bars] for offset in offsets])
+    config = PatternConfig()
+    matrix = MatrixSwingEngine(config.swing_depth, min_bars=config.swing_depth * 4, capacity=symbols)
+    for row in range(symbols):
+        matrix.add_symbol(f"SYM{row}", config.tolerance)
+    
+    def run():
+        for column in range(bars):
+            for row in range(symbols):
+                matrix.update(row, highs[row, column], lows[row, column])
+            matrix.close_bar()
+    
+    return run, symbols * bars
+
+CASES: Dict[str, BenchCase] = {case.name: case for case in (
+    BenchCase("update_ohlcv_from_tick", setup_update_ohlcv, sizes=(1_000,), test_size=200,
+              description="Tick'ten M1 bar güncellemesi (1000 barlık buffer)"),
+    BenchCase("process_tick", setup_process_tick, sizes=(2_000,), test_size=200,
+              description="Tick başına senkron detector yolu: bar güncellemesi, swing ve CHoCH analizi"),
+    BenchCase("process_candles", setup_process_candles, sizes=(1_000, 10_000),
+              full_sizes=(1_000, 10_000, 100_000), test_size=500,
+              description="SwingEngine'in tam geçişi (runtime.kernel_backend: kuruluysa Numba)"),
+    BenchCase("check_regions", setup_check_regions, sizes=(10, 100, 1_000, 10_000), test_size=100,
+              description="Tick başına region taraması (boyut: region sayısı, çağrı başına 1000 tick)"),
+    BenchCase("oanda_parse", setup_oanda_parse, sizes=(10_000,), test_size=1_000,
+              description="OANDA stream satırı çözme ve tick üretimi"),
+    BenchCase("cli_import", setup_cli_import, sizes=(5,), test_size=1,
+              description=f"Yeni process'te CLI import'u (interpreter açılışı dahil, import hedefi < {IMPORT_TARGET_MS} ms)"),
+    BenchCase("backtest", setup_backtest, sizes=(10_000,),
+              full_sizes=(10_000, 100_000, 1_000_000, 10_000_000), test_size=2_000,
+              description="Bar serisi üzerinde backtest"),
+    BenchCase("evaluate_outcomes", setup_outcomes, sizes=(100_000,), full_sizes=(100_000, 1_000_000),
+              test_size=1_000, description="Event başına ileri getiri, MFE/MAE ve bozulma süresi (5/15/60 bar)"),
+    BenchCase("matrix_bar_close", setup_matrix_close, sizes=(200,), full_sizes=(200, 1_000), test_size=20,
+              description="Matris motorunda tick güncellemesi ve ortak bar kapanışı (boyut: sembol sayısı, 60 bar)")
+)}
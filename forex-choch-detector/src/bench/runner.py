@@ -0,0 +1,167 @@
+"""
+Benchmark çalıştırıcı - zamanlama, makine bilgisi, JSON sonuçları ve baseline karşılaştırması
+"""
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RESULTS_VERSION = 1
+
+@dataclass
+class BenchCase:
+    """
+    Tek bir ölçüm senaryosu.
+    
+    ``setup(size)`` zamanlanacak callable'ı ve bir çağrının kaç işlem
+    yaptığını döner; hazırlık süresi ölçüme girmez.
+    """
+    name: str
+    setup: Callable[[int], Tuple[Callable[[], Any], int]]
+    sizes: Tuple[int, ...]
+    full_sizes: Tuple[int, ...] = ()
+    test_size: Optional[int] = None  # pytest-benchmark'ta kullanılan küçük boyut
+    description: str = ""
+    
+    def sizes_for(self, profile: str) -> Tuple[int, ...]:
+        return self.full_sizes if profile == "full" and self.full_sizes else self.sizes
+
+@dataclass
+class BenchResult:
+    case: str
+    size: int
+    ops: int = 0
+    repeat: int = 0
+    min_s: float = 0.0
+    median_s: float = 0.0
+    mean_s: float = 0.0
+    ns_per_op: float = 0.0
+    skipped: Optional[str] = None
+
+def quiet_logging() -> None:
+    """Ölçüm sırasında bilgi logları süreye ve çıktıya karışmasın"""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+def machine_info() -> Dict[str, Any]:
+    """Sonuçların karşılaştırılabilirliği için ortam bilgisi"""
+    import numpy
+    import pandas
+    
+    info = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+    }
+    try:
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).parent
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        info["commit"] = None
+    return info
+
+def time_callable(fn: Callable[[], Any], min_time: float = 0.2, min_repeat: int = 3,
+                  max_repeat: int = 50) -> List[float]:
+    """En az ``min_repeat`` kez ve toplam ``min_time`` saniye dolana kadar çalıştır"""
+    times: List[float] = []
+    while len(times) < max_repeat and (len(times) < min_repeat or sum(times) < min_time):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return times
+
+def run_case(case: BenchCase, sizes: Sequence[int], max_seconds: float = 30.0,
+             min_time: float = 0.2) -> List[BenchResult]:
+    """
+    Boyutları küçükten büyüğe ölçer.
+    
+    Bir sonraki boyutun süresi önceki ölçümden doğrusal tahmin edilir; tek
+    çağrı ``max_seconds``'ı aşacaksa o ve daha büyük boyutlar atlanır.
+    """
+    results: List[BenchResult] = []
+    previous: Optional[Tuple[int, float]] = None
+    for size in sorted(sizes):
+        if previous is not None and previous[1] * size / previous[0] > max_seconds:
+            results.append(BenchResult(case.name, size, skipped=f"tahmini süre > {max_seconds:g}s"))
+            continue
+        
+        fn, ops = case.setup(size)
+        started = time.perf_counter()
+        fn()  # ısınma
+        warm = time.perf_counter() - started
+        # Tek çağrısı uzun süren boyutlarda ısınma turu tek ölçüm sayılır
+        times = [warm] if warm > max_seconds / 3 else time_callable(fn, min_time)
+        
+        median = statistics.median(times)
+        results.append(BenchResult(
+            case=case.name, size=size, ops=ops, repeat=len(times),
+            min_s=min(times), median_s=median, mean_s=statistics.fmean(times),
+            ns_per_op=median / max(ops, 1) * 1e9
+        ))
+        previous = (size, median)
+    return results
+
+def run_suite(cases: Sequence[BenchCase], profile: str = "quick", max_seconds: float = 30.0,
+              min_time: float = 0.2) -> Dict[str, Any]:
+    results: List[BenchResult] = []
+    for case in cases:
+        results.extend(run_case(case, case.sizes_for(profile), max_seconds, min_time))
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "profile": profile,
+        "machine": machine_info(),
+        "results": [asdict(result) for result in results]
+    }
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    (case, boyut) başına en iyi süreleri karşılaştır.
+    
+    En iyi süre (min) gürültüye medyandan daha az duyarlıdır; oran
+    ``1 + threshold``'u aşarsa regresyon sayılır.
+    """
+    measured = [r for r in current["results"] if not r.get("skipped")]
+    base = {(r["case"], r["size"]): r for r in baseline["results"] if not r.get("skipped")}
+    rows = []
+    for result in measured:
+        previous = base.get((result["case"], result["size"]))
+        row = {"case": result["case"], "size": result["size"], "current_s": result["min_s"],
+               "baseline_s": None, "ratio": None, "status": "new"}
+        if previous is not None and previous["min_s"] > 0:
+            ratio = result["min_s"] / previous["min_s"]
+            row.update(baseline_s=previous["min_s"], ratio=ratio)
+            if ratio > 1 + threshold:
+                row["status"] = "regression"
+            elif ratio < 1 - threshold:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
@@ -1,40 +1,106 @@
 """
 Ana CLI arayüzü
+
+Komutlar ağır modülleri (pandas, orkestratör, feed ve notifier'lar) yalnızca
+kendileri kullanırken import eder; ``--help`` ve hafif komutlar hızlı açılır.
 """
-import asyncio
+import json
 import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-import pandas as pd
-import structlog
-
-# Import fix
-from core.config import Config
-from core.orchestrator import TradingOrchestrator
-from pattern.choch_detector import CHoCHDetector
-from region.box_region import BoxRegionManager
+from rich.table import Table
 
 app = typer.Typer(help="🚀 Forex CHoCH Detection System")
 console = Console()
 
+PROFILE_HELP = "Profil modu: cprofile | sampling (collapsed stack çıktısı)"
+
+def _metrics_config(config_file: str):
+    """Config dosyası yoksa varsayılan metrik ayarları"""
+    from core.config import Config, MetricsConfig
+    return Config.from_file(config_file).metrics if Path(config_file).exists() else MetricsConfig()
+
+def _profile_session(mode: Optional[str], output: str, slow_callback_ms: float):
+    """--profile verilmişse ProfileSession, yoksa boş context"""
+    if mode is None:
+        return nullcontext()
+    from core.profiling import PROFILE_MODES, ProfileSession
+    if mode not in PROFILE_MODES:
+        raise typer.BadParameter(f"{mode} ({' | '.join(PROFILE_MODES)})", param_hint="--profile")
+    return ProfileSession(mode, output, slow_callback_threshold=slow_callback_ms / 1000)
+
+def _print_profile(session) -> None:
+    """Bileşen bazında CPU payı ve event loop'u bloklayan callback'ler"""
+    if isinstance(session, nullcontext):
+        return
+    table = Table(title=f"CPU dağılımı ({session.mode})")
+    table.add_column("Bileşen")
+    table.add_column("Pay", justify="right")
+    for component, share in session.components().items():
+        table.add_row(component, f"{share:.1%}")
+    console.print(table)
+    
+    if session.monitor and session.monitor.slow:
+        slow = Table(title=f"Yavaş callback'ler (>= {session.monitor.threshold * 1000:g} ms)")
+        slow.add_column("Callback")
+        slow.add_column("Adet", justify="right")
+        slow.add_column("En kötü (ms)", justify="right")
+        for row in session.monitor.summary():
+            slow.add_row(row["callback"], str(row["count"]), f"{row['worst_ms']:.1f}")
+        console.print(slow)
+    for path in session.files:
+        console.print(f"[green]Profil yazıldı: {path}[/green]")
+
 @app.command()
 def run(
     config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Detaylı log çıktısı")
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Detaylı log çıktısı"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Shard worker process sayısı (0 = tek process)"),
+    use_uvloop: bool = typer.Option(False, "--uvloop", help="Kuruluysa uvloop event loop'unu kullan"),
+    analysis: Optional[str] = typer.Option(None, "--analysis", help="Bar kapanışı analizi: inline | thread | process"),
+    swing_engine: Optional[str] = typer.Option(None, "--swing-engine", help="Swing motoru: per_symbol | matrix"),
+    profile: Optional[str] = typer.Option(None, "--profile", help=PROFILE_HELP),
+    profile_output: str = typer.Option("profile-run", "--profile-output", help="Profil dosyalarının ön eki"),
+    slow_callback_ms: float = typer.Option(100.0, "--slow-callback-ms", help="Bu süreyi aşan event loop callback'leri loglanır")
 ):
     """Ana trading sistemini çalıştır"""
+    import asyncio
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.panel import Panel
+    from core.config import Config
+    
     console.print(Panel.fit("🚀 Forex CHoCH Detection System Starting...", style="bold green"))
     
     try:
         config = Config.from_file(config_file)
         if verbose:
             config.log_level = "DEBUG"
+        if workers is not None:
+            config.sharding.workers = workers
+        if use_uvloop:
+            config.runtime.uvloop = True
+        if analysis is not None:
+            config.runtime.analysis_executor = analysis
+        if swing_engine is not None:
+            config.runtime.swing_engine = swing_engine
+        if config.runtime.uvloop and profile is not None:
+            # Yavaş callback izleme asyncio Handle._run'ı sarar; uvloop handle'ları onu çağırmaz
+            console.print("[yellow]--profile ile uvloop kapatıldı - standart asyncio loop kullanılıyor[/yellow]")
+            config.runtime.uvloop = False
+        if config.runtime.uvloop:
+            from core.offload import install_uvloop
+            install_uvloop()
         
-        orchestrator = TradingOrchestrator(config)
+        if config.sharding.workers > 0:
+            from core.sharding import ShardedOrchestrator
+            orchestrator = ShardedOrchestrator(config, config_path=config_file)
+        else:
+            from core.orchestrator import TradingOrchestrator
+            orchestrator = TradingOrchestrator(config, config_path=config_file)
         
         with Progress(
             SpinnerColumn(),
@@ -42,10 +108,18 @@ def run(
             console=console
         ) as progress:
             task = progress.add_task("Sistem başlatılıyor...", total=None)
-            asyncio.run(orchestrator.run())
+            # Shard worker'ları ayrı process'te çalışır - profil ana process'i kapsar
+            session = _profile_session(profile, profile_output, slow_callback_ms)
+            try:
+                with session:
+                    asyncio.run(orchestrator.run())
+            finally:
+                _print_profile(session)
             
     except KeyboardInterrupt:
         console.print("\n[yellow]Sistem durduruluyor...[/yellow]")
+    except typer.BadParameter:
+        raise
     except Exception as e:
         console.print(f"[red]Hata: {str(e)}[/red]")
         raise typer.Exit(1)
@@ -54,9 +128,35 @@ def run(
 def backtest(
     symbol: str = typer.Argument(..., help="Test edilecek sembol"),
     data_file: str = typer.Argument(..., help="OHLCV CSV dosyası"),
-    config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası")
+    config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası"),
+    profile: Optional[str] = typer.Option(None, "--profile", help=PROFILE_HELP),
+    profile_output: str = typer.Option("profile-backtest", "--profile-output", help="Profil dosyalarının ön eki"),
+    output: Optional[str] = typer.Option(None, "--output", "-o",
+                                         help="Event, swing ve bar başına yapı durumunun yazılacağı dizin"),
+    output_format: str = typer.Option("parquet", "--format", help="Çıktı biçimi: parquet, arrow, npz"),
+    row_group: int = typer.Option(65536, "--row-group", help="Row group başına satır sayısı"),
+    evaluate: bool = typer.Option(False, "--evaluate", help="Event'lerin ileri getiri, MFE/MAE ve bozulma süresini ölç"),
+    horizons: str = typer.Option("5,15,60", "--horizons", help="Değerlendirme ufukları (bar, virgülle ayrılmış)")
 ):
     """Geçmiş veri üzerinde backtest yap"""
+    import pandas as pd
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from core.config import Config
+    from pattern.choch_detector import CHoCHDetector
+    
+    try:
+        horizon_bars = [int(h) for h in horizons.split(",") if h.strip()]
+    except ValueError:
+        raise typer.BadParameter(f"Geçersiz ufuk listesi: {horizons}", param_hint="--horizons")
+    
+    writer = None
+    if output:
+        from core.export import create_writer
+        try:
+            writer = create_writer(output_format, output, row_group)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--format")
+    
     console.print(f"[blue]Backtest başlatılıyor: {symbol}[/blue]")
     
     try:
@@ -67,7 +167,9 @@ def backtest(
             raise typer.Exit(1)
         
         df = pd.read_csv(data_file)
-        detector = CHoCHDetector(config.pattern)
+        if "timestamp" in df.columns:
+            df = df.set_index(pd.DatetimeIndex(df.pop("timestamp")))
+        detector = CHoCHDetector(config.pattern_for(symbol))
         
         with Progress(
             SpinnerColumn(),
@@ -75,14 +177,158 @@ def backtest(
             console=console
         ) as progress:
             task = progress.add_task("Backtest çalışıyor...", total=None)
-            results = detector.backtest(symbol, df)
+            session = _profile_session(profile, profile_output, slow_callback_ms=0)
+            # Writer varsa event'ler row group'larla akar - sonuçlar parti parti değerlendirilir
+            batches = []
             
-        console.print(f"[green]Backtest tamamlandı: {len(results)} pattern bulundu[/green]")
+            def _on_events(events) -> None:
+                batches.append(_evaluate_backtest(events, df, detector.config, horizon_bars, writer)
+                               if evaluate else len(events))
+            
+            with session:
+                results = detector.backtest(symbol, df, writer=writer, on_events=_on_events)
+            if writer is None or not batches:
+                _on_events(results)
+            if writer is not None:
+                writer.close()
+            outcomes = pd.concat(batches, ignore_index=True) if evaluate else None
+            found = len(outcomes) if evaluate else sum(batches)
+            
+        console.print(f"[green]Backtest tamamlandı: {found} pattern bulundu[/green]")
+        if outcomes is not None:
+            _print_outcomes(outcomes)
+        if writer is not None:
+            for table, path in writer.files().items():
+                console.print(f"[dim]{table}: {writer.rows[table]} satır, "
+                              f"{writer.row_groups[table]} row group -> {path}[/dim]")
+        _print_profile(session)
         
+    except typer.BadParameter:
+        raise
     except Exception as e:
         console.print(f"[red]Backtest hatası: {str(e)}[/red]")
         raise typer.Exit(1)
 
+def _int_list(value: str, option: str) -> List[int]:
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise typer.BadParameter(f"Geçersiz liste: {value}", param_hint=option)
+
+def _float_list(value: str, option: str) -> List[float]:
+    try:
+        return [float(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise typer.BadParameter(f"Geçersiz liste: {value}", param_hint=option)
+
+@app.command("walk-forward")
+def walk_forward_command(
+    symbol: str = typer.Argument(..., help="Test edilecek sembol"),
+    data_file: str = typer.Argument(..., help="OHLCV CSV dosyası"),
+    config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası"),
+    train: int = typer.Option(5000, "--train", help="Train penceresi (bar)"),
+    test: int = typer.Option(1000, "--test", help="Test penceresi (bar)"),
+    step: Optional[int] = typer.Option(None, "--step", help="Pencere kayması (varsayılan: test uzunluğu)"),
+    depths: Optional[str] = typer.Option(None, "--depths", help="Denenecek swing_depth'ler (virgülle)"),
+    tolerances: Optional[str] = typer.Option(None, "--tolerances", help="Denenecek tolerance'lar (virgülle)"),
+    horizons: str = typer.Option("5,15,60", "--horizons", help="Değerlendirme ufukları (bar)"),
+    objective: Optional[int] = typer.Option(None, "--objective", help="Seçim skorunun ufku (varsayılan: en kısa)"),
+    min_events: int = typer.Option(5, "--min-events", help="Seçilebilmek için train'de gereken event sayısı"),
+    executor: str = typer.Option("process", "--executor", help="Pencere havuzu: inline, thread, process"),
+    workers: int = typer.Option(2, "--workers", "-w", help="Paralel pencere sayısı"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Pencere sonuçlarının yazılacağı CSV")
+):
+    """Kayan train/test pencerelerinde parametre seç ve ölç"""
+    import itertools
+    import pandas as pd
+    from core.config import Config, PatternConfig
+    from pattern.walkforward import walk_forward
+    
+    horizon_bars = _int_list(horizons, "--horizons")
+    if not Path(data_file).exists():
+        console.print(f"[red]Veri dosyası bulunamadı: {data_file}[/red]")
+        raise typer.Exit(1)
+    base = Config.from_file(config_file).pattern_for(symbol) if Path(config_file).exists() else PatternConfig()
+    grid = itertools.product(_int_list(depths, "--depths") if depths else [base.swing_depth],
+                             _float_list(tolerances, "--tolerances") if tolerances else [base.tolerance])
+    configs = [base.model_copy(update={"swing_depth": depth, "tolerance": tolerance}) for depth, tolerance in grid]
+    
+    df = pd.read_csv(data_file)
+    if "timestamp" in df.columns:
+        df = df.set_index(pd.DatetimeIndex(df.pop("timestamp")))
+    console.print(f"[blue]Walk-forward: {symbol}, {len(df)} bar, {len(configs)} parametre seti[/blue]")
+    try:
+        result = walk_forward(df, configs, train, test, step=step, horizons=horizon_bars,
+                              objective_horizon=objective, min_events=min_events,
+                              executor=executor, workers=workers)
+    except ValueError as e:
+        console.print(f"[red]Walk-forward hatası: {e}[/red]")
+        raise typer.Exit(1)
+    
+    horizon = objective or min(horizon_bars)
+    table = Table(title=f"Walk-forward ({symbol})")
+    for column in ("Pencere", "Test dönemi", "Seçilen", "Train skoru", "Test event",
+                   f"Test getiri ({horizon})", f"İsabet ({horizon})"):
+        table.add_column(column, justify="left" if column in ("Test dönemi", "Seçilen") else "right")
+    for number, row in result.windows.iterrows():
+        selected = isinstance(row["selected"], str)
+        table.add_row(
+            str(number),
+            f"{row['test_from']} → {row['test_to']}",
+            row["selected"] if selected else "[yellow]yok[/yellow]",
+            f"{row['train_score'] * 1e4:.1f} bp" if selected else "-",
+            str(int(row["test_events"])) if selected else "0",
+            f"{row[f'test_mean_return_{horizon}'] * 1e4:.1f} bp" if selected else "-",
+            f"{row[f'test_hit_rate_{horizon}']:.0%}" if selected else "-"
+        )
+    console.print(table)
+    if f"test_mean_return_{horizon}" in result.windows:
+        weights = result.windows["test_events"].fillna(0)
+        returns = result.windows[f"test_mean_return_{horizon}"].fillna(0)
+        if weights.sum() > 0:
+            console.print(f"Test dönemleri toplamı: {int(weights.sum())} event, "
+                          f"ortalama getiri {(returns * weights).sum() / weights.sum() * 1e4:.1f} bp")
+    if output:
+        result.windows.to_csv(output)
+        result.scores.to_csv(Path(output).with_suffix(".scores.csv"), index=False)
+        console.print(f"[dim]Pencere sonuçları: {output}[/dim]")
+
+def _evaluate_backtest(results, df, pattern_config, horizons: List[int], writer):
+    """Backtest event'lerinin sonuçları - writer varsa outcomes tablosu olarak da yazılır"""
+    from pattern.outcomes import config_label, evaluate_events
+    
+    outcomes = evaluate_events(results, df, horizons).assign(config=config_label(pattern_config))
+    if writer is not None:
+        columns = ["symbol", "config", "bar_index", "direction"] + \
+            [f"return_{h}" for h in sorted(set(horizons))] + ["mfe", "mae", "bars_to_invalidation"]
+        writer.write("outcomes", {name: outcomes[name].to_numpy() for name in columns})
+    return outcomes
+
+def _print_outcomes(outcomes) -> None:
+    from pattern.outcomes import summarize_outcomes
+    
+    if outcomes.empty:
+        console.print("[yellow]Değerlendirilecek event yok[/yellow]")
+        return
+    summary = summarize_outcomes(outcomes, by=["config", "symbol"])
+    table = Table(title="Pattern Sonuçları")
+    table.add_column("Config / Sembol", style="cyan")
+    for column in summary.columns:
+        table.add_column(column, justify="right")
+    for (config_name, symbol), row in summary.iterrows():
+        cells = []
+        for column, value in row.items():
+            if column == "events":
+                cells.append(str(int(value)))
+            elif column.startswith(("mean_return", "mean_mfe", "mean_mae")):
+                cells.append(f"{value * 1e4:.1f} bp")
+            elif column.startswith(("hit_rate", "invalidation_rate")):
+                cells.append(f"{value:.0%}")
+            else:
+                cells.append(f"{value:.0f}")
+        table.add_row(f"{config_name} / {symbol}", *cells)
+    console.print(table)
+
 @app.command("add-region")
 def add_region(
     symbol: str = typer.Argument(..., help="Sembol"),
@@ -91,6 +337,8 @@ def add_region(
     lower: float = typer.Argument(..., help="Alt sınır")
 ):
     """Yeni box region ekle"""
+    from region.box_region import BoxRegionManager
+    
     manager = BoxRegionManager()
     region_id = manager.add_region(symbol=symbol, name=name, upper_bound=upper, lower_bound=lower)
     console.print(f"[green]Region eklendi: {region_id}[/green]")
@@ -101,7 +349,16 @@ def test_feed(
     symbol: str = typer.Option("EUR/USD", help="Test edilecek sembol")
 ):
     """Data feed bağlantısını test et"""
+    import asyncio
+    from core.plugins import FEEDS, PluginError
+    
     console.print(f"[blue]Data feed test ediliyor: {broker}[/blue]")
+    try:
+        feed_class = FEEDS.load(broker)
+    except PluginError as e:
+        console.print(f"[red]Test hatası: {e}[/red]")
+        raise typer.Exit(1)
+    console.print(f"[dim]Feed: {feed_class.__module__}.{feed_class.__name__}[/dim]")
     
     async def _test_feed():
         try:
@@ -111,5 +368,161 @@ def test_feed(
     
     asyncio.run(_test_feed())
 
+@app.command()
+def stats(
+    config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası"),
+    url: Optional[str] = typer.Option(None, "--url", help="Metrik endpoint'i (varsayılan: config'teki metrics ayarı)"),
+    interval: float = typer.Option(1.0, "--interval", "-i", help="Tick hızı için iki okuma arası süre (sn)")
+):
+    """Çalışan sistemin metriklerini göster"""
+    import urllib.request
+    from core.metrics import parse_prometheus_text, summarize_scrapes
+    
+    if url is None:
+        metrics_config = _metrics_config(config_file)
+        url = f"http://{metrics_config.host}:{metrics_config.port}/metrics"
+    
+    def scrape():
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return parse_prometheus_text(response.read().decode("utf-8"))
+    
+    try:
+        before = scrape()
+        started = time.monotonic()
+        time.sleep(interval)
+        after = scrape()
+    except OSError as e:
+        console.print(f"[red]Metrik endpoint'ine ulaşılamadı ({url}): {e}[/red]")
+        raise typer.Exit(1)
+    summary = summarize_scrapes(before, after, time.monotonic() - started)
+    
+    ticks = Table(title="Tick hızı")
+    ticks.add_column("Sembol")
+    ticks.add_column("tick/s", justify="right")
+    for symbol, rate in summary["ticks_per_second"].items():
+        ticks.add_row(symbol, f"{rate:,.1f}")
+    console.print(ticks)
+    
+    stages = Table(title=f"Aşama latency'leri (son {interval:g} sn)")
+    stages.add_column("Aşama")
+    stages.add_column("Adet", justify="right")
+    stages.add_column("p50 (µs)", justify="right")
+    stages.add_column("p99 (µs)", justify="right")
+    for stage, values in summary["stages"].items():
+        stages.add_row(stage, f"{values['count']:,.0f}", f"{values['p50'] * 1e6:,.1f}", f"{values['p99'] * 1e6:,.1f}")
+    console.print(stages)
+    
+    health = Table(title="Kuyruklar ve bağlantı")
+    health.add_column("Metrik")
+    health.add_column("Değer", justify="right")
+    for queue, depth in summary["queues"].items():
+        health.add_row(f"kuyruk: {queue}", f"{depth:,.0f}")
+    for feed, count in summary["reconnects"].items():
+        health.add_row(f"reconnect: {feed}", f"{count:,.0f}")
+    for reason, count in summary["dropped"].items():
+        health.add_row(f"düşen tick: {reason}", f"{count:,.0f}")
+    if summary["analysis_saturated"]:
+        health.add_row("analiz havuzu doygunluğu", f"{summary['analysis_saturated']:,.0f}")
+    console.print(health)
+
+@app.command()
+def bench(
+    cases: Optional[List[str]] = typer.Option(None, "--case", "-k", help="Yalnızca bu senaryolar (tekrarlanabilir)"),
+    full: bool = typer.Option(False, "--full", help="Büyük boyutları da ölç (backtest 1e7 bara kadar)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Sonuçların yazılacağı JSON dosyası"),
+    compare: Optional[str] = typer.Option(None, "--compare", help="Karşılaştırılacak baseline JSON dosyası"),
+    threshold: float = typer.Option(0.10, "--threshold", help="Regresyon eşiği (0.10 = %10 yavaşlama)"),
+    max_seconds: float = typer.Option(30.0, "--max-seconds", help="Tek çağrı süre sınırı - aşacak boyutlar atlanır")
+):
+    """Sıcak yol benchmark'larını çalıştır"""
+    from bench.cases import CASES
+    from bench.runner import compare_results, load_results, quiet_logging, run_suite, save_results
+    
+    unknown = [name for name in cases or [] if name not in CASES]
+    if unknown:
+        console.print(f"[red]Bilinmeyen senaryo: {', '.join(unknown)} (mevcut: {', '.join(CASES)})[/red]")
+        raise typer.Exit(1)
+    
+    quiet_logging()
+    selected = [CASES[name] for name in cases] if cases else list(CASES.values())
+    with console.status("Benchmark'lar çalışıyor..."):
+        report = run_suite(selected, profile="full" if full else "quick", max_seconds=max_seconds)
+    if output:
+        save_results(report, output)
+        console.print(f"[green]Sonuçlar yazıldı: {output}[/green]")
+    
+    comparison = {}
+    if compare:
+        comparison = {(row["case"], row["size"]): row
+                      for row in compare_results(report, load_results(compare), threshold)}
+    
+    table = Table(title=f"Benchmark ({report['machine']['processor']}, Python {report['machine']['python']})")
+    table.add_column("Senaryo")
+    table.add_column("Boyut", justify="right")
+    table.add_column("Tekrar", justify="right")
+    table.add_column("Medyan (ms)", justify="right")
+    table.add_column("ns/işlem", justify="right")
+    if compare:
+        table.add_column("Baseline oranı", justify="right")
+    
+    styles = {"regression": "red", "improved": "green", "ok": "white", "new": "dim"}
+    for result in report["results"]:
+        if result["skipped"]:
+            table.add_row(result["case"], f"{result['size']:,}", "-", f"[dim]atlandı: {result['skipped']}[/dim]", "-")
+            continue
+        row = [result["case"], f"{result['size']:,}", str(result["repeat"]),
+               f"{result['median_s'] * 1000:,.2f}", f"{result['ns_per_op']:,.0f}"]
+        if compare:
+            diff = comparison[(result["case"], result["size"])]
+            ratio = f"{diff['ratio']:.2f}x" if diff["ratio"] is not None else "-"
+            row.append(f"[{styles[diff['status']]}]{ratio} {diff['status']}[/{styles[diff['status']]}]")
+        table.add_row(*row)
+    console.print(table)
+    
+    regressions = [row for row in comparison.values() if row["status"] == "regression"]
+    if regressions:
+        console.print(f"[red]{len(regressions)} regresyon (eşik %{threshold * 100:g})[/red]")
+        raise typer.Exit(1)
+
+@app.command("latency-report")
+def latency_report(
+    config_file: str = typer.Option("config.yaml", "--config", "-c", help="Konfigürasyon dosyası"),
+    url: Optional[str] = typer.Option(None, "--url", help="Latency endpoint'i (varsayılan: config'teki metrics ayarı)"),
+    symbol: Optional[str] = typer.Option(None, "--symbol", "-s", help="Yalnızca bu sembol"),
+    as_json: bool = typer.Option(False, "--json", help="Ham JSON çıktısı")
+):
+    """Tick'ten bildirime aşama latency'lerini göster (p50/p99/p999)"""
+    import urllib.request
+    
+    if url is None:
+        metrics_config = _metrics_config(config_file)
+        url = f"http://{metrics_config.host}:{metrics_config.port}/latency"
+    
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            report = json.loads(response.read().decode("utf-8"))
+    except OSError as e:
+        console.print(f"[red]Latency endpoint'ine ulaşılamadı ({url}): {e}[/red]")
+        raise typer.Exit(1)
+    
+    if symbol:
+        report = {stage: {s: row for s, row in rows.items() if s == symbol} for stage, rows in report.items()}
+    if as_json:
+        console.print_json(json.dumps(report))
+        return
+    
+    table = Table(title="Ingest'ten itibaren latency (µs)")
+    table.add_column("Aşama")
+    table.add_column("Sembol")
+    table.add_column("Örnek", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("p999", justify="right")
+    for stage, rows in report.items():
+        for row_symbol, row in rows.items():
+            table.add_row(stage, "tümü" if row_symbol == "*" else row_symbol, f"{row['count']:,}",
+                          f"{row['p50']:,.1f}", f"{row['p99']:,.1f}", f"{row['p999']:,.1f}")
+    console.print(table)
+
 if __name__ == "__main__":
     app()
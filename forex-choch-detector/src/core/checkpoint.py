@@ -0,0 +1,210 @@
+"""
+Detector durumunun periyodik checkpoint'i ve başlangıçta sıcak geri yüklenmesi
+"""
+import asyncio
+import json
+import struct
+from typing import Dict, Any, List, Optional, Set
+import numpy as np
+import pandas as pd
+import structlog
+
+from core.state_store import StateStore
+from pattern.choch_detector import CHoCHDetector, TrendDirection
+from pattern.swing_engine import SwingPoint, SwingType
+
+logger = structlog.get_logger(__name__)
+
+# Format: header | JSON meta | bar kayıtları | swing kayıtları
+MAGIC = b"CHK2"
+HEADER = struct.Struct("<4sIII")  # magic, meta_len, n_bars, n_swings
+
+BAR_DTYPE = np.dtype([
+    ("time_ns", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8")
+])
+
+SWING_DTYPE = np.dtype([
+    ("index", "<i8"),
+    ("price", "<f8"),
+    ("time_ns", "<i8"),
+    ("kind", "u1"),  # 0 = high, 1 = low
+    ("strength", "<f8")
+])
+
+# CHK1 swing gücünü float32 yazıyordu - o zaman güç sabit 0.5'ti
+SWING_DTYPES = {b"CHK1": np.dtype(SWING_DTYPE.descr[:-1] + [("strength", "<f4")]), MAGIC: SWING_DTYPE}
+
+_SWING_KINDS = {SwingType.HIGH: 0, SwingType.LOW: 1}
+
+def _encode_swings(swings: List[SwingPoint]) -> np.ndarray:
+    records = np.empty(len(swings), dtype=SWING_DTYPE)
+    for i, swing in enumerate(swings):
+        records[i] = (swing.index, swing.price, pd.Timestamp(swing.timestamp).value,
+                      _SWING_KINDS[swing.swing_type], swing.strength)
+    return records
+
+def _decode_swing(record) -> SwingPoint:
+    index, price, time_ns, kind, strength = record
+    return SwingPoint(
+        index=int(index),
+        price=float(price),
+        timestamp=pd.Timestamp(int(time_ns)).isoformat(),
+        swing_type=SwingType.HIGH if kind == 0 else SwingType.LOW,
+        strength=float(strength)
+    )
+
+def encode_symbol_state(symbol: str, detector_state: Optional[Dict[str, Any]],
+                        regions: List[Dict[str, Any]]) -> bytes:
+    """Sembol durumunu kompakt binary blob'a çevir"""
+    meta: Dict[str, Any] = {"symbol": symbol, "regions": regions}
+    bars = np.empty(0, dtype=BAR_DTYPE)
+    swings = np.empty(0, dtype=SWING_DTYPE)
+    
+    if detector_state is not None:
+        df = detector_state["bars"]
+        bars = np.empty(len(df), dtype=BAR_DTYPE)
+        bars["time_ns"] = df.index.values.astype("datetime64[ns]").astype(np.int64)
+        for column in ("open", "high", "low", "close", "volume"):
+            bars[column] = df[column].to_numpy(dtype=np.float64)
+        
+        swings = _encode_swings(detector_state["swing_highs"] + detector_state["swing_lows"])
+        meta["trend"] = detector_state["trend"].value
+        meta["last_processed_index"] = detector_state["last_processed_index"]
+        meta["last_break"] = detector_state.get("last_break")
+        meta["n_swing_highs"] = len(detector_state["swing_highs"])
+    
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    return b"".join((
+        HEADER.pack(MAGIC, len(meta_bytes), len(bars), len(swings)),
+        meta_bytes,
+        bars.tobytes(),
+        swings.tobytes()
+    ))
+
+def decode_symbol_state(blob: bytes) -> Dict[str, Any]:
+    """encode_symbol_state çıktısını çöz - detector durumu yoksa 'detector' None olur"""
+    magic, meta_len, n_bars, n_swings = HEADER.unpack_from(blob)
+    swing_dtype = SWING_DTYPES.get(magic)
+    if swing_dtype is None:
+        raise ValueError("Geçersiz checkpoint formatı")
+    
+    offset = HEADER.size
+    meta = json.loads(blob[offset:offset + meta_len])
+    offset += meta_len
+    bars = np.frombuffer(blob, dtype=BAR_DTYPE, count=n_bars, offset=offset)
+    offset += n_bars * BAR_DTYPE.itemsize
+    swings = np.frombuffer(blob, dtype=swing_dtype, count=n_swings, offset=offset)
+    
+    detector_state = None
+    if "trend" in meta:
+        df = pd.DataFrame(
+            {column: bars[column] for column in ("open", "high", "low", "close", "volume")},
+            index=pd.DatetimeIndex(bars["time_ns"].astype("datetime64[ns]"))
+        )
+        swing_points = [_decode_swing(record) for record in swings.tolist()]
+        n_highs = meta["n_swing_highs"]
+        detector_state = {
+            "bars": df,
+            "swing_highs": swing_points[:n_highs],
+            "swing_lows": swing_points[n_highs:],
+            "last_processed_index": meta["last_processed_index"],
+            "trend": TrendDirection(meta["trend"]),
+            "last_break": meta.get("last_break")
+        }
+    
+    return {"symbol": meta["symbol"], "detector": detector_state, "regions": meta["regions"]}
+
+class CheckpointManager:
+    """
+    Detector ve region manager durumunu belirli aralıklarla depoya yazar.
+    
+    Yalnızca son checkpoint'ten beri değişen (dirty) semboller encode edilip
+    tek bir ``save_many`` çağrısıyla gönderilir.
+    """
+    
+    def __init__(self, store: StateStore, detector: CHoCHDetector, region_manager,
+                 interval: float = 5.0):
+        self.store = store
+        self.detector = detector
+        self.region_manager = region_manager
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.checkpoints_written = 0
+    
+    def _encode_symbol(self, symbol: str) -> bytes:
+        return encode_symbol_state(
+            symbol,
+            self.detector.export_state(symbol),
+            self.region_manager.export_state(symbol)
+        )
+    
+    async def checkpoint(self) -> int:
+        """Dirty sembolleri yaz - yazılan sembol sayısını döndür"""
+        dirty: Set[str] = self.detector.dirty_symbols | self.region_manager.dirty_symbols
+        if not dirty:
+            return 0
+        
+        # Yazım sırasında gelen tick'ler bir sonraki tura kalsın diye önce temizle
+        self.detector.dirty_symbols.difference_update(dirty)
+        self.region_manager.dirty_symbols.difference_update(dirty)
+        
+        items = {symbol: self._encode_symbol(symbol) for symbol in dirty}
+        try:
+            await self.store.save_many(items)
+        except Exception:
+            self.detector.dirty_symbols.update(dirty)
+            self.region_manager.dirty_symbols.update(dirty)
+            raise
+        
+        self.checkpoints_written += len(items)
+        return len(items)
+    
+    async def restore(self) -> Set[str]:
+        """Depodaki tüm sembolleri geri yükle - detector durumu geri yüklenen semboller döner"""
+        blobs = await self.store.load_all()
+        restored: Set[str] = set()
+        
+        for symbol, blob in blobs.items():
+            try:
+                state = decode_symbol_state(blob)
+            except Exception as e:
+                logger.warning("Checkpoint okunamadı", symbol=symbol, error=str(e))
+                continue
+            
+            if state["detector"] is not None:
+                self.detector.restore_state(symbol, state["detector"])
+                restored.add(symbol)
+            self.region_manager.restore_state(symbol, state["regions"])
+        
+        logger.info("Checkpoint geri yüklendi", symbols=len(restored))
+        return restored
+    
+    async def run(self) -> None:
+        """Periyodik checkpoint döngüsü"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                logger.error("Checkpoint yazılamadı", error=str(e))
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Döngüyü durdur ve son durumu yaz"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
+        await self.store.close()
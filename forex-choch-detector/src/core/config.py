@@ -2,11 +2,14 @@
 Yapılandırma yöneticisi - pydantic ile type-safe config handling
 """
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 from pydantic import BaseModel, Field, validator
 import yaml
 from pathlib import Path
 
+# Pattern timeframe'i (OANDA granularity adları) -> pandas bar frekansı
+TIMEFRAME_FREQS = {"M1": "1min", "M5": "5min", "M15": "15min", "M30": "30min", "H1": "1h", "H4": "4h", "D": "1D"}
+
 class BrokerConfig(BaseModel):
     """Broker bağlantı konfigürasyonu"""
     type: str = Field(..., description="Broker türü: oanda, mt5, websocket")
@@ -14,6 +17,13 @@ class BrokerConfig(BaseModel):
     account_id: Optional[str] = None
     environment: str = "practice"  # practice veya live
     symbols: List[str] = Field(default_factory=list)
+    url: Optional[str] = None  # websocket feed adresi
+    field_map: Dict[str, str] = Field(default_factory=dict)  # quote alan eşlemesi
+    batch_key: Optional[str] = "quotes"
+    heartbeat_interval: int = Field(default=30, ge=1)
+    backfill_bars: int = Field(default=500, ge=0)  # başlangıçta çekilecek geçmiş bar sayısı (M1)
+    backfill_concurrency: int = Field(default=4, ge=1)
+    candle_cache_dir: Optional[str] = "data/cache"
     
 class TelegramConfig(BaseModel):
     """Telegram bot konfigürasyonu"""
@@ -30,22 +40,110 @@ class NotificationConfig(BaseModel):
     smtp_port: int = 587
     smtp_user: Optional[str] = None
     smtp_password: Optional[str] = None
+    smtp_starttls: bool = True
+    smtp_pool_size: int = Field(default=2, ge=1)
+    email_from: Optional[str] = None  # varsayılan: smtp_user
+    email_to: List[str] = Field(default_factory=list)  # varsayılan: smtp_user
+    email_digest_interval: float = Field(default=0.0, ge=0)  # > 0 ise aralık başına tek email
+    email_digest_max: int = Field(default=500, ge=1)  # SMTP düşükken bekleyen digest sınırı - en eskiler düşer
+    queue_size: int = Field(default=1000, ge=1)  # kanal başına bekleyen uyarı sınırı
+    coalesce_window: float = Field(default=2.0, ge=0)  # bu süre içinde gelenler tek digest olur
+    send_timeout: float = Field(default=10.0, gt=0)
+    channel_timeouts: Dict[str, float] = Field(default_factory=dict)  # ör. {"telegram": 5}
+    breaker_failures: int = Field(default=5, ge=1)
+    breaker_reset: float = Field(default=30.0, gt=0)
+    dedup_ttl: float = Field(default=300.0, ge=0)  # 0 = tekrar bastırma kapalı
+    dedup_max_size: int = Field(default=10000, ge=1)
+    dedup_price_bucket_bps: float = Field(default=5.0, gt=0)  # fiyat kovası genişliği (baz puan)
+    plugins: List[str] = Field(default_factory=list)  # entry point ile kurulan ek notifier adları
 
 class PatternConfig(BaseModel):
     """Pattern detection ayarları"""
     swing_depth: int = Field(default=5, ge=3, le=20)
     tolerance: float = Field(default=0.001, ge=0.0001, le=0.01)
     min_swing_size: float = Field(default=0.0005, ge=0.0001)
+    # Tick'lerin toplandığı bar; geçmiş veri bu granularity'de çekilir ve alert dedup anahtarına girer
+    timeframe: Literal["M1", "M5", "M15", "M30", "H1", "H4", "D"] = "M1"
+    # Güven/güç skorlarındaki ATR ve ortalama hacim penceresi (bar)
+    stats_window: int = Field(default=14, ge=2, le=500)
+    # Bu skorun altındaki event'ler geçmişe yazılır ama callback'lere iletilmez
+    min_confidence: float = Field(default=0.0, ge=0.0, le=1.0)
     
+class ShardingConfig(BaseModel):
+    """Çok process'li sembol sharding ayarları"""
+    workers: int = Field(default=0, ge=0)  # 0 = tek process
+    ring_capacity: int = Field(default=65536, ge=1024)
+    virtual_nodes: int = Field(default=64, ge=1)
+
+class CheckpointConfig(BaseModel):
+    """Detector durum checkpoint ayarları"""
+    enabled: bool = False
+    backend: Literal["file", "redis"] = "file"  # redis backend'i redis_url'i kullanır
+    path: str = "data/state"
+    interval: float = Field(default=5.0, gt=0)
+
+class EventBusConfig(BaseModel):
+    """Pattern/region event'lerinin Redis Streams'e yayını"""
+    enabled: bool = False
+    backend: Literal["redis", "memory"] = "redis"  # redis backend'i redis_url'i kullanır
+    stream_prefix: str = "choch"
+    flush_interval_ms: float = Field(default=5.0, gt=0)
+    max_batch: int = Field(default=500, ge=1)
+    maxlen: int = Field(default=100000, ge=1)  # stream başına yaklaşık üst sınır
+
+class MetricsConfig(BaseModel):
+    """Prometheus metrik endpoint'i"""
+    enabled: bool = True
+    host: str = "127.0.0.1"
+    port: int = Field(default=9108, ge=0, le=65535)
+    latency_sample_every: int = Field(default=8, ge=1)  # aşama süreleri her N tick'te bir ölçülür
+
+class TracingConfig(BaseModel):
+    """Tick'ten bildirime uçtan uca latency izleme"""
+    enabled: bool = True
+    sample_every: int = Field(default=16, ge=1)  # tick başına aşamalar her N tick'te bir izlenir
+    max_samples: int = Field(default=10000, ge=100)  # aşama/sembol başına tutulan son örnek
+
+class RuntimeConfig(BaseModel):
+    """Event loop ve bar kapanışı analizinin çalıştığı yer"""
+    uvloop: bool = False  # kuruluysa uvloop event loop'u, değilse standart asyncio
+    analysis_executor: Literal["inline", "thread", "process"] = "inline"  # inline = her tick'te loop üzerinde
+    analysis_workers: int = Field(default=2, ge=1)
+    # matrix = aynı swing_depth'li semboller ortak bar kapanışında tek vektörel geçişte analiz edilir
+    swing_engine: Literal["per_symbol", "matrix"] = "per_symbol"
+    # Swing/yapı kernel'leri: auto = kuruluysa Numba, değilse NumPy/Python
+    kernel_backend: Literal["auto", "numba", "python"] = "auto"
+
+class ReloadConfig(BaseModel):
+    """Çalışırken config değişikliklerini uygulama (dosya izleme veya SIGHUP)"""
+    watch: bool = True  # config dosyasının değişikliği poll edilir
+    interval: float = Field(default=2.0, gt=0)
+
 class Config(BaseModel):
     """Ana konfigürasyon sınıfı"""
     broker: BrokerConfig
     notifications: NotificationConfig
     pattern: PatternConfig
+    # Sembole özel pattern parametreleri - verilen alanlar pattern'in üzerine yazılır
+    pattern_overrides: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    sharding: ShardingConfig = Field(default_factory=ShardingConfig)
+    checkpoint: CheckpointConfig = Field(default_factory=CheckpointConfig)
+    event_bus: EventBusConfig = Field(default_factory=EventBusConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    runtime: RuntimeConfig = Field(default_factory=RuntimeConfig)
+    reload: ReloadConfig = Field(default_factory=ReloadConfig)
     log_level: str = "INFO"
     redis_url: str = "redis://localhost:6379"
     database_url: Optional[str] = None
     
+    def pattern_for(self, symbol: str) -> PatternConfig:
+        """Sembolün geçerli pattern parametreleri"""
+        override = self.pattern_overrides.get(symbol)
+        if not override:
+            return self.pattern
+        return PatternConfig(**{**self.pattern.model_dump(), **override})
+    
     @classmethod
     def from_file(cls, config_path: str = "config.yaml") -> "Config":
         """YAML dosyasından config yükle"""
@@ -0,0 +1,287 @@
+"""
+Pattern ve region event'leri için Redis Streams event bus'ı - batch'li, pipeline'lı yayın
+"""
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Any
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Stream kaydı: (id, alanlar)
+StreamEntry = Tuple[str, Dict[str, str]]
+
+class StreamBackend(ABC):
+    """Append-only stream ve consumer group işlemleri"""
+    
+    @abstractmethod
+    async def append_many(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        """(stream, alanlar) kayıtlarını sırayla ekle"""
+        pass
+    
+    @abstractmethod
+    async def create_group(self, stream: str, group: str, start_id: str = "0") -> None:
+        """Consumer group oluştur - zaten varsa sessizce geç"""
+        pass
+    
+    @abstractmethod
+    async def read_group(self, stream: str, group: str, consumer: str,
+                         count: int = 100, block_ms: int = 1000) -> List[StreamEntry]:
+        """Grubun henüz teslim edilmemiş kayıtlarını oku"""
+        pass
+    
+    @abstractmethod
+    async def ack(self, stream: str, group: str, *entry_ids: str) -> None:
+        """İşlenen kayıtları onayla"""
+        pass
+    
+    async def close(self) -> None:
+        pass
+
+class RedisStreamBackend(StreamBackend):
+    """Redis Streams - tüm batch tek bir pipeline round-trip'inde yazılır"""
+    
+    def __init__(self, url: str = "redis://localhost:6379", maxlen: Optional[int] = 100000, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as e:
+                raise ImportError("Redis event bus için 'redis' paketi gerekli") from e
+            client = aioredis.from_url(url)
+        self.client = client
+        self.maxlen = maxlen
+    
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+    
+    async def append_many(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for stream, fields in entries:
+                pipe.xadd(stream, fields, maxlen=self.maxlen, approximate=True)
+            await pipe.execute()
+    
+    async def create_group(self, stream: str, group: str, start_id: str = "0") -> None:
+        try:
+            await self.client.xgroup_create(stream, group, id=start_id, mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+    
+    async def read_group(self, stream: str, group: str, consumer: str,
+                         count: int = 100, block_ms: int = 1000) -> List[StreamEntry]:
+        response = await self.client.xreadgroup(group, consumer, {stream: ">"}, count=count, block=block_ms)
+        entries: List[StreamEntry] = []
+        for _, records in response or []:
+            for entry_id, fields in records:
+                entries.append((self._decode(entry_id),
+                                {self._decode(k): self._decode(v) for k, v in fields.items()}))
+        return entries
+    
+    async def ack(self, stream: str, group: str, *entry_ids: str) -> None:
+        if entry_ids:
+            await self.client.xack(stream, group, *entry_ids)
+    
+    async def close(self) -> None:
+        await self.client.aclose()
+
+class InMemoryStreamBackend(StreamBackend):
+    """Process içi stream - test ve Redis'siz kurulumlar için"""
+    
+    def __init__(self, maxlen: Optional[int] = 100000):
+        self.maxlen = maxlen
+        self.streams: Dict[str, deque] = {}
+        # stream -> grup -> [son teslim edilen sıra no, bekleyen id'ler]
+        self.groups: Dict[str, Dict[str, list]] = {}
+        self._sequence = 0
+        self._condition = asyncio.Condition()
+    
+    def _stream(self, stream: str) -> deque:
+        if stream not in self.streams:
+            self.streams[stream] = deque(maxlen=self.maxlen)
+        return self.streams[stream]
+    
+    async def append_many(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        async with self._condition:
+            for stream, fields in entries:
+                self._sequence += 1
+                self._stream(stream).append((self._sequence, dict(fields)))
+            self._condition.notify_all()
+    
+    async def create_group(self, stream: str, group: str, start_id: str = "0") -> None:
+        groups = self.groups.setdefault(stream, {})
+        if group not in groups:
+            last = self._sequence if start_id == "$" else 0
+            groups[group] = [last, set()]
+            self._stream(stream)
+    
+    def _take(self, stream: str, group: str, count: int) -> List[StreamEntry]:
+        state = self.groups[stream][group]
+        entries = [(seq, fields) for seq, fields in self._stream(stream) if seq > state[0]][:count]
+        if entries:
+            state[0] = entries[-1][0]
+            state[1].update(f"{seq}-0" for seq, _ in entries)
+        return [(f"{seq}-0", fields) for seq, fields in entries]
+    
+    def _has_new(self, stream: str, group: str) -> bool:
+        entries = self._stream(stream)
+        return bool(entries) and entries[-1][0] > self.groups[stream][group][0]
+    
+    async def read_group(self, stream: str, group: str, consumer: str,
+                         count: int = 100, block_ms: int = 1000) -> List[StreamEntry]:
+        async with self._condition:
+            entries = self._take(stream, group, count)
+            if entries or not block_ms:
+                return entries
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._has_new(stream, group)),
+                    timeout=block_ms / 1000
+                )
+            except asyncio.TimeoutError:
+                return []
+            return self._take(stream, group, count)
+    
+    async def ack(self, stream: str, group: str, *entry_ids: str) -> None:
+        self.groups[stream][group][1].difference_update(entry_ids)
+
+class EventPublisher:
+    """
+    Detector callback'lerinden gelen event'leri tamponlayıp arka planda yayınlar.
+    
+    ``publish`` yalnızca tampona ekler ve hiç beklemez; flush döngüsü her
+    ``flush_interval`` saniyede (veya tampon ``max_batch``'e ulaşınca) tüm
+    bekleyen kayıtları tek pipeline ile gönderir. Backend erişilemezse tampon
+    ``max_buffer`` ile sınırlıdır ve en eski kayıtlar düşürülür.
+    """
+    
+    def __init__(self, backend: StreamBackend, stream_prefix: str = "choch",
+                 flush_interval: float = 0.005, max_batch: int = 500, max_buffer: int = 100000):
+        self.backend = backend
+        self.stream_prefix = stream_prefix
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._buffer: deque = deque(maxlen=max_buffer)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        
+        self.published = 0
+        self.dropped = 0
+        self.flushes = 0
+    
+    def stream_name(self, category: str) -> str:
+        return f"{self.stream_prefix}:{category}"
+    
+    def publish(self, category: str, event_type: str, symbol: str, data: Dict[str, Any]) -> None:
+        """Event'i tampona ekle - detection döngüsünü bloklamaz"""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((self.stream_name(category), {
+            "type": event_type,
+            "symbol": symbol,
+            "data": json.dumps(data, default=str)
+        }))
+        if len(self._buffer) >= self.max_batch:
+            self._wakeup.set()
+    
+    def publish_pattern(self, pattern: str, symbol: str, data: Dict[str, Any]) -> None:
+        self.publish("patterns", pattern, symbol, data)
+    
+    def publish_region(self, event_type: str, symbol: str, data: Dict[str, Any]) -> None:
+        self.publish("regions", event_type, symbol, data)
+    
+    async def flush(self) -> int:
+        """Tampondaki kayıtları max_batch'lik pipeline'larla gönder"""
+        sent = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.max_batch, len(self._buffer)))]
+            try:
+                await self.backend.append_many(batch)
+            except Exception:
+                # Sıra korunsun diye geri koy - bir sonraki flush'ta tekrar denenir.
+                # Bu sırada tampon dolduysa extendleft en yeni kayıtları sondan atar.
+                overflow = len(self._buffer) + len(batch) - self._buffer.maxlen
+                if overflow > 0:
+                    self.dropped += overflow
+                    logger.warning("Event bus tamponu taştı - en yeni kayıtlar düşürüldü",
+                                   dropped=overflow, total_dropped=self.dropped)
+                self._buffer.extendleft(reversed(batch))
+                raise
+            sent += len(batch)
+            self.flushes += 1
+        self.published += sent
+        return sent
+    
+    async def run(self) -> None:
+        """Periyodik flush döngüsü"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Event bus flush hatası", error=str(e), pending=len(self._buffer))
+                await asyncio.sleep(min(1.0, self.flush_interval * 100))
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Döngüyü durdur, kalanları gönder ve backend'i kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        finally:
+            await self.backend.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "pending": len(self._buffer),
+            "dropped": self.dropped,
+            "flushes": self.flushes
+        }
+
+class EventConsumer:
+    """Consumer group üyesi - her kayıt grup içinde tek bir consumer'a teslim edilir"""
+    
+    def __init__(self, backend: StreamBackend, stream: str, group: str, consumer: str):
+        self.backend = backend
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer
+    
+    async def setup(self, start_id: str = "0") -> None:
+        await self.backend.create_group(self.stream, self.group, start_id)
+    
+    async def read(self, count: int = 100, block_ms: int = 1000) -> List[Tuple[str, Dict[str, Any]]]:
+        """Kayıtları oku ve 'data' alanını çöz"""
+        entries = await self.backend.read_group(self.stream, self.group, self.consumer, count, block_ms)
+        return [
+            (entry_id, {**fields, "data": json.loads(fields.get("data", "{}"))})
+            for entry_id, fields in entries
+        ]
+    
+    async def ack(self, *entry_ids: str) -> None:
+        await self.backend.ack(self.stream, self.group, *entry_ids)
+
+def create_stream_backend(backend: str, redis_url: Optional[str] = None,
+                          maxlen: Optional[int] = 100000) -> StreamBackend:
+    """Config'e göre stream backend'i oluştur"""
+    if backend == "redis":
+        return RedisStreamBackend(redis_url or "redis://localhost:6379", maxlen=maxlen)
+    if backend == "memory":
+        return InMemoryStreamBackend(maxlen=maxlen)
+    raise ValueError(f"Desteklenmeyen event bus backend'i: {backend}")
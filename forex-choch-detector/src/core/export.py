@@ -0,0 +1,214 @@
+"""
+Backtest sonuçlarının sütunlu, akış halinde yazımı - Parquet, Arrow IPC veya sıkıştırılmış NPZ
+
+Her tablo (events, swings, structure, outcomes) çıktı dizininde ayrı bir dosyadır. Satırlar
+tabloda ``row_group_size`` kadar birikince tek row group olarak diske yazılır;
+çok yıllık, çok sembollü çıktılar belleğe sığmak zorunda değildir.
+"""
+import re
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RESULT_TABLES = ("events", "swings", "structure", "outcomes")
+EXPORT_FORMATS = ("parquet", "arrow", "npz")
+
+class ResultWriter(ABC):
+    """Tablo başına sütun tamponu; dolunca alt sınıfın row group yazımına verilir"""
+    
+    format = ""
+    suffix = ""
+    
+    def __init__(self, path: str, row_group_size: int = 65536):
+        if row_group_size < 1:
+            raise ValueError("row_group_size en az 1 olmalı")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self._buffers: Dict[str, Dict[str, List[np.ndarray]]] = {}
+        self._buffered: Dict[str, int] = {}
+        self.rows: Dict[str, int] = {}
+        self.row_groups: Dict[str, int] = {}
+        self.closed = False
+    
+    def file_for(self, table: str) -> Path:
+        return self.path / f"{table}{self.suffix}"
+    
+    def write(self, table: str, columns: Dict[str, Sequence]) -> None:
+        """Eşit uzunlukta sütunları tabloya ekle - tampon dolunca row group yazılır"""
+        if table not in RESULT_TABLES:
+            raise ValueError(f"Bilinmeyen sonuç tablosu: {table}")
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"{table} sütunlarının uzunlukları farklı: {sorted(lengths)}")
+        count = lengths.pop() if lengths else 0
+        if count == 0:
+            return
+        
+        buffer = self._buffers.setdefault(table, {name: [] for name in arrays})
+        if set(buffer) != set(arrays):
+            raise ValueError(f"{table} sütunları önceki yazımla uyuşmuyor")
+        for name, values in arrays.items():
+            buffer[name].append(values)
+        self._buffered[table] = self._buffered.get(table, 0) + count
+        while self._buffered[table] >= self.row_group_size:
+            self._flush(table, self.row_group_size)
+    
+    def _flush(self, table: str, limit: Optional[int] = None) -> None:
+        buffer = self._buffers.get(table)
+        if not buffer or not self._buffered.get(table):
+            return
+        columns = {name: np.concatenate(chunks) for name, chunks in buffer.items()}
+        total = self._buffered[table]
+        size = min(limit or total, total)
+        self._write_group(table, {name: values[:size] for name, values in columns.items()})
+        self._buffers[table] = {name: [values[size:]] for name, values in columns.items()}
+        self._buffered[table] = total - size
+        self.rows[table] = self.rows.get(table, 0) + size
+        self.row_groups[table] = self.row_groups.get(table, 0) + 1
+    
+    @abstractmethod
+    def _write_group(self, table: str, columns: Dict[str, np.ndarray]) -> None:
+        """Tek row group'u tablonun dosyasına yaz"""
+        pass
+    
+    def _close_files(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        """Kalan satırları yaz ve dosyaları kapat"""
+        if self.closed:
+            return
+        for table in list(self._buffers):
+            self._flush(table)
+        self._close_files()
+        self.closed = True
+        logger.info("Backtest çıktısı yazıldı", path=str(self.path), format=self.format, rows=self.rows)
+    
+    def files(self) -> Dict[str, Path]:
+        return {table: self.file_for(table) for table in self.rows}
+    
+    def __enter__(self) -> "ResultWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class ArrowResultWriter(ResultWriter):
+    """Parquet (row group başına bir grup) veya Arrow IPC dosyası (row group başına bir record batch)"""
+    
+    def __init__(self, path: str, row_group_size: int = 65536, format: str = "parquet",
+                 compression: str = "zstd"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ValueError("Parquet/Arrow çıktısı için pyarrow gerekli (pip install pyarrow) "
+                             "- ya da --format npz kullanın") from e
+        super().__init__(path, row_group_size)
+        self.format = format
+        self.suffix = ".parquet" if format == "parquet" else ".arrow"
+        self.compression = compression
+        self._writers: Dict[str, object] = {}
+        self._sinks: Dict[str, object] = {}
+    
+    def _write_group(self, table: str, columns: Dict[str, np.ndarray]) -> None:
+        import pyarrow as pa
+        
+        batch = pa.table({name: pa.array(values) for name, values in columns.items()})
+        writer = self._writers.get(table)
+        if writer is None:
+            writer = self._open(table, batch.schema)
+        if self.format == "parquet":
+            writer.write_table(batch, row_group_size=len(batch))
+        else:
+            writer.write_table(batch, max_chunksize=len(batch))
+    
+    def _open(self, table: str, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if self.format == "parquet":
+            writer = pq.ParquetWriter(self.file_for(table), schema, compression=self.compression)
+        else:
+            sink = pa.OSFile(str(self.file_for(table)), "wb")
+            self._sinks[table] = sink
+            writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression=self.compression))
+        self._writers[table] = writer
+        return writer
+    
+    def _close_files(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        for sink in self._sinks.values():
+            sink.close()
+
+class NpzResultWriter(ResultWriter):
+    """
+    Sıkıştırılmış NPZ - her row group her sütun için ayrı bir ``sütun.NNNNN`` dizisi.
+    
+    ``np.load`` ile açılır; ``read_results`` grupları sütun başına birleştirir.
+    Metin sütunları sabit genişlikli unicode dizilerdir, pickle gerekmez.
+    """
+    
+    format = "npz"
+    suffix = ".npz"
+    
+    def __init__(self, path: str, row_group_size: int = 65536):
+        super().__init__(path, row_group_size)
+        self._archives: Dict[str, zipfile.ZipFile] = {}
+    
+    def _write_group(self, table: str, columns: Dict[str, np.ndarray]) -> None:
+        archive = self._archives.get(table)
+        if archive is None:
+            archive = zipfile.ZipFile(self.file_for(table), "w", compression=zipfile.ZIP_DEFLATED)
+            self._archives[table] = archive
+        group = self.row_groups.get(table, 0)
+        for name, values in columns.items():
+            if values.dtype == object:
+                values = values.astype(str)
+            with archive.open(f"{name}.{group:05d}.npy", "w", force_zip64=True) as entry:
+                np.lib.format.write_array(entry, values, allow_pickle=False)
+    
+    def _close_files(self) -> None:
+        for archive in self._archives.values():
+            archive.close()
+
+def create_writer(format: str, path: str, row_group_size: int = 65536) -> ResultWriter:
+    """Çıktı biçimine göre yazıcı - pyarrow yoksa Parquet/Arrow ValueError verir"""
+    if format in ("parquet", "arrow"):
+        return ArrowResultWriter(path, row_group_size, format=format)
+    if format == "npz":
+        return NpzResultWriter(path, row_group_size)
+    raise ValueError(f"Desteklenmeyen çıktı biçimi: {format} (mevcut: {', '.join(EXPORT_FORMATS)})")
+
+_NPZ_KEY = re.compile(r"^(?P<column>.+)\.(?P<group>\d{5})$")
+
+def read_results(path: str, table: str) -> pd.DataFrame:
+    """Dizindeki tabloyu biçimi ne olursa olsun DataFrame olarak oku"""
+    directory = Path(path)
+    if (directory / f"{table}.parquet").exists():
+        return pd.read_parquet(directory / f"{table}.parquet")
+    if (directory / f"{table}.arrow").exists():
+        import pyarrow as pa
+        
+        with pa.memory_map(str(directory / f"{table}.arrow")) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    if (directory / f"{table}.npz").exists():
+        with np.load(directory / f"{table}.npz", allow_pickle=False) as data:
+            groups: Dict[str, List] = {}
+            for key in data.files:
+                match = _NPZ_KEY.match(key)
+                groups.setdefault(match["column"], []).append((match["group"], key))
+            return pd.DataFrame({
+                column: np.concatenate([data[key] for _, key in sorted(keys)])
+                for column, keys in groups.items()
+            })
+    raise FileNotFoundError(f"Sonuç tablosu bulunamadı: {directory / table}")
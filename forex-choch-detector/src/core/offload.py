@@ -0,0 +1,148 @@
+"""
+Event loop dışına analiz aktarımı - opsiyonel uvloop ve sembol başına sıralı thread/process havuzu
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing as mp
+from typing import Any, Awaitable, Callable, Dict, Optional
+import structlog
+
+from core import metrics
+
+logger = structlog.get_logger(__name__)
+
+ANALYSIS_WAIT = metrics.STAGE_LATENCY.labels("analysis_wait")
+ANALYSIS_RUN = metrics.STAGE_LATENCY.labels("analysis")
+ANALYSIS_SATURATED = metrics.registry.counter(
+    "choch_analysis_pool_saturated_total", "Tüm worker'lar doluyken kuyruğa giren analiz işi"
+)
+
+def install_uvloop() -> bool:
+    """uvloop kuruluysa event loop policy'sini değiştir - asyncio.run'dan önce çağrılmalı"""
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop kurulu değil, standart asyncio loop kullanılıyor")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop event loop'u etkin", version=uvloop.__version__)
+    return True
+
+def _timed_call(fn: Callable, args: tuple) -> tuple:
+    """Worker tarafında başlama zamanıyla çalıştır - CLOCK_MONOTONIC process'ler arası ortaktır"""
+    started = time.monotonic()
+    return started, fn(*args)
+
+class AnalysisPool:
+    """
+    CPU ağırlıklı analiz işlerini thread veya process havuzunda çalıştırır.
+    
+    Aynı sembolün işleri sırayla çalışır ve sonuçları loop üzerinde gönderim
+    sırasıyla uygulanır; farklı semboller paralel ilerler. Tüm worker'lar
+    doluyken gelen iş doygunluk olarak sayılır ve loglanır.
+    """
+    
+    def __init__(self, mode: str = "thread", workers: int = 2, warn_interval: float = 30.0):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Geçersiz analiz executor'ı: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.warn_interval = warn_interval
+        self.executor: Executor = (
+            ThreadPoolExecutor(workers, thread_name_prefix="choch-analysis") if mode == "thread"
+            else ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"))
+        )
+        self._tails: Dict[str, asyncio.Task] = {}
+        self.pending = 0  # gönderilmiş, henüz bitmemiş işler
+        self.in_flight = 0  # executor'a verilmiş işler
+        self.completed = 0
+        self.failed = 0
+        self.saturated = 0
+        self._last_warning = 0.0
+    
+    def submit(self, symbol: str, job: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """``job``'ı sembolün önceki işi bittikten sonra çalıştır"""
+        previous = self._tails.get(symbol)
+        self.pending += 1
+        task = asyncio.get_running_loop().create_task(self._chain(previous, job))
+        self._tails[symbol] = task
+        
+        def _release(done: asyncio.Task) -> None:
+            self.pending -= 1
+            if self._tails.get(symbol) is done:
+                del self._tails[symbol]
+        
+        task.add_done_callback(_release)
+        return task
+    
+    async def _chain(self, previous: Optional[asyncio.Task], job: Callable[[], Awaitable[Any]]) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await job()
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error("Analiz işi başarısız", error=str(e))
+    
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """``fn(*args)``'ı havuzda çalıştır; process modunda argümanlar ve sonuç pickle'lanır"""
+        if self.in_flight >= self.workers:
+            self._report_saturation()
+        self.in_flight += 1
+        submitted = time.monotonic()
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed_call, fn, args
+            )
+        finally:
+            self.in_flight -= 1
+        finished = time.monotonic()
+        ANALYSIS_WAIT.observe(max(started - submitted, 0.0))
+        ANALYSIS_RUN.observe(finished - started)
+        return result
+    
+    def _report_saturation(self) -> None:
+        self.saturated += 1
+        ANALYSIS_SATURATED.inc()
+        now = time.monotonic()
+        if now - self._last_warning >= self.warn_interval:
+            self._last_warning = now
+            logger.warning("Analiz havuzu doygun", mode=self.mode, workers=self.workers,
+                           in_flight=self.in_flight, pending=self.pending, saturated_total=self.saturated)
+    
+    async def drain(self, symbol: Optional[str] = None) -> None:
+        """Sembolün (verilmezse tüm sembollerin) bekleyen işlerini bitir"""
+        if symbol is None:
+            tasks = list(self._tails.values())
+        else:
+            tasks = [self._tails[symbol]] if symbol in self._tails else []
+        if tasks:
+            await asyncio.wait(tasks)
+    
+    def queue_depths(self) -> Dict[tuple, float]:
+        """QUEUE_DEPTH collector'ı: çalışan ve worker bekleyen işler"""
+        running = min(self.in_flight, self.workers)
+        return {("analysis_running",): running, ("analysis_waiting",): self.pending - running}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "saturated": self.saturated
+        }
+    
+    async def shutdown(self) -> None:
+        await self.drain()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def create_analysis_pool(mode: str, workers: int) -> Optional[AnalysisPool]:
+    """inline için None - analiz her tick'te loop üzerinde çalışmaya devam eder"""
+    if mode == "inline":
+        return None
+    return AnalysisPool(mode, workers)
@@ -1,43 +1,157 @@
-python"""
+"""
 Ana orkestratör - tüm servisleri koordine eden merkezi sınıf
 """
 import asyncio
+import random
 import signal
 import logging
+import time
 from typing import Dict, List, Optional, Set
 from contextlib import asynccontextmanager
+import pandas as pd
 import structlog
 
 # Relative import'ları absolute yap
 from data_feed.base import DataFeedBase
-from data_feed.oanda import OandaFeed
-from data_feed.mt5 import MT5Feed
-from data_feed.websocket import WebSocketFeed
+from data_feed.candle_cache import CandleCache
+from core.checkpoint import CheckpointManager
+from core.state_store import create_state_store
+from core.event_bus import EventPublisher, EventConsumer, create_stream_backend
+from core import metrics
+from core.metrics import MetricsServer
+from core.tracing import tracer
+from core.plugins import FEEDS, NOTIFIERS, PluginError
+from core.offload import AnalysisPool, create_analysis_pool
+from core.reload import ConfigDiff, ConfigWatcher, diff_configs, effective_config
 from pattern.choch_detector import CHoCHDetector
+from pattern import kernels
+from pattern.matrix import MatrixSwingEngine
 from region.box_region import BoxRegionManager
-from notifier.telegram import TelegramNotifier
-from notifier.desktop import DesktopNotifier
-from notifier.email import EmailNotifier
-from core.config import Config
+from notifier.dispatcher import NotificationDispatcher
+from notifier.dedup import AlertDeduplicator
+from core.config import Config, TIMEFRAME_FREQS
 
 logger = structlog.get_logger(__name__)
 
+def enabled_notifiers(config: Config) -> List[str]:
+    """Config'te açık olan notifier eklentilerinin adları"""
+    settings = config.notifications
+    names = []
+    if settings.telegram and settings.telegram.enabled:
+        names.append("telegram")
+    if settings.desktop_enabled:
+        names.append("desktop")
+    if settings.email_enabled:
+        names.append("email")
+    names.extend(name for name in settings.plugins if name not in names)
+    return names
+
+async def create_notifiers(config: Config) -> List:
+    """
+    Config'e göre notifier'ları oluştur ve başlat.
+    
+    Modülü import edilemeyen notifier (ör. eksik opsiyonel bağımlılık) loglanıp
+    atlanır; diğer kanallar çalışmaya devam eder.
+    """
+    notifiers = []
+    for name in enabled_notifiers(config):
+        try:
+            notifier_class = NOTIFIERS.load(name)
+        except PluginError as e:
+            logger.error("Notifier atlandı", notifier=name, error=str(e))
+            continue
+        notifier = notifier_class.from_config(config.notifications)
+        await notifier.initialize()
+        notifiers.append(notifier)
+    return notifiers
+
+def create_deduplicator(config: Config) -> Optional[AlertDeduplicator]:
+    settings = config.notifications
+    if settings.dedup_ttl <= 0:
+        return None
+    return AlertDeduplicator(
+        ttl=settings.dedup_ttl,
+        max_size=settings.dedup_max_size,
+        price_bucket_bps=settings.dedup_price_bucket_bps
+    )
+
+def dispatcher_settings(config: Config) -> Dict:
+    """Dispatcher'ın kanal ayarları - oluşturma ve yeniden yapılandırmada ortak"""
+    settings = config.notifications
+    return {
+        "queue_size": settings.queue_size,
+        "coalesce_window": settings.coalesce_window,
+        "timeout": settings.send_timeout,
+        "channel_timeouts": settings.channel_timeouts,
+        "failure_threshold": settings.breaker_failures,
+        "reset_timeout": settings.breaker_reset
+    }
+
+def create_dispatcher(config: Config, notifiers: List) -> NotificationDispatcher:
+    """Notifier'lar için kanal başına kuyruklu dispatcher oluştur"""
+    return NotificationDispatcher(notifiers, deduplicator=create_deduplicator(config), **dispatcher_settings(config))
+
+def create_event_publisher(config: Config) -> EventPublisher:
+    """Config'e göre event bus publisher'ı oluştur"""
+    bus_config = config.event_bus
+    backend = create_stream_backend(bus_config.backend, redis_url=config.redis_url, maxlen=bus_config.maxlen)
+    return EventPublisher(
+        backend,
+        stream_prefix=bus_config.stream_prefix,
+        flush_interval=bus_config.flush_interval_ms / 1000,
+        max_batch=bus_config.max_batch
+    )
+
+def create_matrix_engine(config: Config) -> MatrixSwingEngine:
+    """Varsayılan swing_depth'li semboller için matris motoru - farklı depth override'ları kendi motorunda kalır"""
+    return MatrixSwingEngine(config.pattern.swing_depth, min_bars=config.pattern.swing_depth * 4,
+                             capacity=max(len(config.broker.symbols), 8))
+
+def format_pattern_message(pattern: str, symbol: str, data: Dict) -> str:
+    """Pattern event'i için bildirim metni"""
+    header = "🔄 CHoCH Detected" if pattern == "choch" else "💥 BOS Detected"
+    message = f"{header}: {symbol}\n"
+    message += f"Direction: {data['direction']}\n"
+    message += f"Price: {data['price']}\n"
+    message += f"Time: {data['timestamp']}"
+    return message
+
+def format_region_message(symbol: str, hit_data: Dict) -> str:
+    """Region isabeti için bildirim metni"""
+    return f"📦 Region Hit: {symbol}\nRegion: {hit_data['region_name']}\nPrice: {hit_data['price']}"
+
 class TradingOrchestrator:
     """Ana orkestratör sınıfı - tüm bileşenleri yönetir"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, config_path: Optional[str] = None):
         self.config = config
+        # Verilirse dosya değişikliği ve SIGHUP config'i yeniden yükler
+        self.config_path = config_path
+        self.config_watcher: Optional[ConfigWatcher] = None
         self.running = False
         self.shutdown_event = asyncio.Event()
         
         # Bileşenler
         self.data_feed: Optional[DataFeedBase] = None
         self.pattern_detector = CHoCHDetector(config.pattern)
+        for symbol in config.pattern_overrides:
+            if config.pattern_for(symbol) != config.pattern:
+                self.pattern_detector.symbol_configs[symbol] = config.pattern_for(symbol)
         self.region_manager = BoxRegionManager()
         self.notifiers: List = []
+        self.dispatcher: Optional[NotificationDispatcher] = None
         
         # Aktif semboller
         self.active_symbols: Set[str] = set()
+        self.reconnect_task: Optional[asyncio.Task] = None
+        self.checkpoint_manager: Optional[CheckpointManager] = None
+        self.event_publisher: Optional[EventPublisher] = None
+        self.command_task: Optional[asyncio.Task] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.analysis_pool: Optional[AnalysisPool] = None
+        self.region_sampler = metrics.LatencySampler(config.metrics.latency_sample_every)
+        self.pattern_detector.latency_sampler.every = self.region_sampler.every
+        tracer.configure(config.tracing.enabled, config.tracing.sample_every, config.tracing.max_samples)
         
         # Sinyal handlers
         self._setup_signal_handlers()
@@ -62,57 +176,50 @@ class TradingOrchestrator:
         # Notifier'ları başlat
         await self._setup_notifiers()
         
+        self.analysis_pool = create_analysis_pool(self.config.runtime.analysis_executor,
+                                                  self.config.runtime.analysis_workers)
+        self.pattern_detector.analysis_pool = self.analysis_pool
+        self.pattern_detector.kernel_backend = self.config.runtime.kernel_backend
+        # Derleme (veya diskteki önbellekten yükleme) ilk bar kapanışından önce yapılır
+        if kernels.warm_up(self.config.runtime.kernel_backend):
+            logger.info("Numba kernel'leri hazır")
+        if self.config.runtime.swing_engine == "matrix":
+            self.pattern_detector.matrix = create_matrix_engine(self.config)
+        
         # Pattern detector event handler'larını bağla
         self.pattern_detector.on_choch = self._on_choch_detected
         self.pattern_detector.on_bos = self._on_bos_detected
+        self.region_manager.on_region_hit = self._on_region_hit
         
         # Data feed event handler'larını bağla
         self.data_feed.on_tick = self._on_tick_received
         self.data_feed.on_error = self._on_feed_error
         
+        if self.config.checkpoint.enabled:
+            store = create_state_store(
+                self.config.checkpoint.backend,
+                path=self.config.checkpoint.path,
+                redis_url=self.config.redis_url
+            )
+            self.checkpoint_manager = CheckpointManager(
+                store, self.pattern_detector, self.region_manager,
+                interval=self.config.checkpoint.interval
+            )
+        
+        if self.config.event_bus.enabled:
+            self.event_publisher = create_event_publisher(self.config)
+        
         logger.info("Sistem başarıyla başlatıldı")
     
     def _create_data_feed(self) -> DataFeedBase:
-        """Broker tipine göre data feed oluştur"""
-        broker_type = self.config.broker.type.lower()
-        
-        if broker_type == "oanda":
-            return OandaFeed(
-                api_key=self.config.broker.api_key,
-                account_id=self.config.broker.account_id,
-                environment=self.config.broker.environment
-            )
-        elif broker_type == "mt5":
-            return MT5Feed()
-        elif broker_type == "websocket":
-            return WebSocketFeed()
-        else:
-            raise ValueError(f"Desteklenmeyen broker türü: {broker_type}")
+        """Broker tipine göre data feed oluştur - yalnızca seçilen feed modülü import edilir"""
+        return FEEDS.load(self.config.broker.type).from_config(self.config.broker)
     
     async def _setup_notifiers(self) -> None:
         """Bildirim servislerini başlat"""
-        if self.config.notifications.telegram and self.config.notifications.telegram.enabled:
-            telegram_notifier = TelegramNotifier(
-                bot_token=self.config.notifications.telegram.bot_token,
-                chat_id=self.config.notifications.telegram.chat_id
-            )
-            await telegram_notifier.initialize()
-            self.notifiers.append(telegram_notifier)
-        
-        if self.config.notifications.desktop_enabled:
-            desktop_notifier = DesktopNotifier()
-            await desktop_notifier.initialize()
-            self.notifiers.append(desktop_notifier)
-        
-        if self.config.notifications.email_enabled:
-            email_notifier = EmailNotifier(
-                smtp_host=self.config.notifications.smtp_host,
-                smtp_port=self.config.notifications.smtp_port,
-                smtp_user=self.config.notifications.smtp_user,
-                smtp_password=self.config.notifications.smtp_password
-            )
-            await email_notifier.initialize()
-            self.notifiers.append(email_notifier)
+        self.notifiers.extend(await create_notifiers(self.config))
+        self.dispatcher = create_dispatcher(self.config, self.notifiers)
+        self.dispatcher.start()
     
     async def run(self) -> None:
         """Ana çalışma döngüsü"""
@@ -123,6 +230,25 @@ class TradingOrchestrator:
         logger.info("Trading sistemi çalışmaya başladı")
         
         try:
+            await self._start_metrics()
+            await self.data_feed.connect()
+            
+            # Checkpoint'ten dönen semboller backfill yerine yalnızca aradaki boşluğu çeker
+            restored: Set[str] = set()
+            if self.checkpoint_manager:
+                restored = await self.checkpoint_manager.restore()
+            
+            # Canlı tick'lerden önce detector buffer'larını geçmiş veriyle ısıt
+            await self._warm_up_detector([s for s in self.config.broker.symbols if s not in restored])
+            await self._replay_gap(sorted(restored & set(self.config.broker.symbols)))
+            
+            if self.checkpoint_manager:
+                self.checkpoint_manager.start()
+            if self.event_publisher:
+                self.event_publisher.start()
+                self.command_task = asyncio.create_task(self._consume_region_commands())
+            self._start_config_reload()
+            
             # Sembolleri subscribe et
             for symbol in self.config.broker.symbols:
                 await self.data_feed.subscribe(symbol)
@@ -137,62 +263,264 @@ class TradingOrchestrator:
         finally:
             await self.cleanup()
     
+    async def _start_metrics(self) -> None:
+        """Kuyruk derinliği collector'larını kaydet ve /metrics endpoint'ini aç"""
+        metrics.QUEUE_DEPTH.set_collector("notifications", lambda: {
+            (f"notify_{worker.name}",): worker.queue.qsize()
+            for worker in (self.dispatcher.workers if self.dispatcher else [])
+        })
+        metrics.QUEUE_DEPTH.set_collector("event_bus", lambda: {
+            ("event_bus",): len(self.event_publisher._buffer)
+        } if self.event_publisher else {})
+        metrics.QUEUE_DEPTH.set_collector("analysis_pool", lambda: (
+            self.analysis_pool.queue_depths() if self.analysis_pool else {}
+        ))
+        
+        if self.config.metrics.enabled:
+            self.metrics_server = MetricsServer(metrics.registry, self.config.metrics.host,
+                                                self.config.metrics.port, tracer=tracer)
+            try:
+                await self.metrics_server.start()
+            except OSError as e:
+                # Metrik portu doluysa sistem yine de çalışsın
+                logger.warning("Metrik sunucusu açılamadı", port=self.config.metrics.port, error=str(e))
+                self.metrics_server = None
+    
+    def _start_config_reload(self) -> None:
+        """Config dosyası izleyicisini ve SIGHUP handler'ını kur"""
+        if not self.config_path:
+            return
+        self.config_watcher = ConfigWatcher(self.config_path, self.reload_config, self.config.reload.interval)
+        if self.config.reload.watch:
+            self.config_watcher.start()
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, lambda: asyncio.create_task(self.config_watcher.reload())
+            )
+        except (AttributeError, NotImplementedError, RuntimeError):
+            # Windows'ta SIGHUP yok - yalnızca dosya izleme
+            pass
+    
+    async def reload_config(self, new_config: Config) -> ConfigDiff:
+        """
+        Yeni config'i çalışan sisteme farkıyla uygula.
+        
+        Yalnızca eklenen/çıkarılan semboller subscribe/unsubscribe edilir ve
+        parametresi değişen semboller buffer'daki barlardan yeniden kurulur;
+        diğer sembollerin durumu sıcak kalır. Bildirim ayarları kuyruktaki
+        uyarılar korunarak değiştirilir.
+        """
+        diff = diff_configs(self.config, new_config)
+        if diff.empty:
+            logger.info("Config değişmedi")
+            return diff
+        if diff.restart_required:
+            logger.warning("Bu bölümler yeniden başlatınca uygulanır", sections=diff.restart_required)
+        new_config = effective_config(self.config, new_config, diff)
+        
+        for symbol in diff.removed_symbols:
+            if symbol in self.active_symbols and self.data_feed:
+                await self.data_feed.unsubscribe(symbol)
+            self.active_symbols.discard(symbol)
+            await self.pattern_detector.drop_symbol(symbol)
+        
+        self.pattern_detector.config = new_config.pattern
+        matrix = self.pattern_detector.matrix
+        if matrix is not None and matrix.swing_depth != new_config.pattern.swing_depth:
+            # Satırlar yeni matriste ilk tick'te sembol durumundan ısıtılır
+            self.pattern_detector.matrix = create_matrix_engine(new_config)
+        for symbol in diff.rebuilt_symbols:
+            await self.pattern_detector.reconfigure_symbol(symbol, new_config.pattern_for(symbol))
+        # Buffer'ı olmayan semboller motorlarını yeni parametrelerle ilk kullanımda kurar
+        self.pattern_detector.symbol_configs = {
+            symbol: new_config.pattern_for(symbol) for symbol in new_config.pattern_overrides
+            if new_config.pattern_for(symbol) != new_config.pattern
+        }
+        
+        if diff.notifications_changed:
+            await self._reconfigure_notifiers(new_config)
+        
+        self.config = new_config
+        if diff.added_symbols:
+            if self.running:
+                await self._warm_up_detector(diff.added_symbols)
+            for symbol in diff.added_symbols:
+                if self.running and self.data_feed:
+                    await self.data_feed.subscribe(symbol)
+                    self.active_symbols.add(symbol)
+        
+        logger.info("Config yeniden yüklendi", added=diff.added_symbols, removed=diff.removed_symbols,
+                    rebuilt=diff.rebuilt_symbols, notifications=diff.notifications_changed)
+        return diff
+    
+    async def _reconfigure_notifiers(self, new_config: Config) -> None:
+        """Notifier'ları yeni ayarlarla kur ve kanal kuyruklarını koruyarak yerlerine koy"""
+        notifiers = await create_notifiers(new_config)
+        deduplicator = self.dispatcher.deduplicator if self.dispatcher else None
+        old, new = self.config.notifications, new_config.notifications
+        if (old.dedup_ttl, old.dedup_max_size, old.dedup_price_bucket_bps) != \
+                (new.dedup_ttl, new.dedup_max_size, new.dedup_price_bucket_bps):
+            deduplicator = create_deduplicator(new_config)
+        
+        if self.dispatcher is None:
+            self.dispatcher = create_dispatcher(new_config, notifiers)
+            self.dispatcher.start()
+            retired = list(self.notifiers)
+        else:
+            retired = await self.dispatcher.reconfigure(notifiers, deduplicator=deduplicator,
+                                                        **dispatcher_settings(new_config))
+        self.notifiers = notifiers
+        for notifier in retired:
+            try:
+                await notifier.cleanup()
+            except Exception as e:
+                logger.error("Eski notifier kapatılamadı", notifier=getattr(notifier, "name", None), error=str(e))
+    
+    async def _warm_up_detector(self, symbols: Optional[List[str]] = None) -> None:
+        """Backfill destekleyen feed'lerden geçmiş barları çekip detector'a yükle"""
+        bars = self.config.broker.backfill_bars
+        if symbols is None:
+            symbols = self.config.broker.symbols
+        if bars <= 0 or not symbols or not hasattr(self.data_feed, "backfill"):
+            return
+        
+        cache = CandleCache(self.config.broker.candle_cache_dir) if self.config.broker.candle_cache_dir else None
+        # Override'lı semboller farklı timeframe'de olabilir - her granularity ayrı çekilir
+        by_timeframe: Dict[str, List[str]] = {}
+        for symbol in symbols:
+            by_timeframe.setdefault(self.config.pattern_for(symbol).timeframe, []).append(symbol)
+        
+        loaded = 0
+        for timeframe, group in by_timeframe.items():
+            history = await self.data_feed.backfill(
+                group,
+                bars=bars,
+                granularity=timeframe,
+                cache=cache,
+                max_concurrency=self.config.broker.backfill_concurrency
+            )
+        
+            for symbol, df in history.items():
+                if not df.empty:
+                    self.pattern_detector.load_history(symbol, df)
+            loaded += len(history)
+        
+        logger.info("Detector ısıtma tamamlandı", symbols=loaded)
+    
     async def _on_tick_received(self, symbol: str, tick_data: Dict) -> None:
-        """Yeni tick verisi geldiğinde çağrılır"""
+        """
+        Yeni tick verisi geldiğinde çağrılır.
+        
+        Detector ve region kontrolü senkron çalışır; yalnızca ürettikleri
+        event'ler için callback'ler beklenir.
+        """
         try:
             # Pattern detection
-            await self.pattern_detector.process_tick(symbol, tick_data)
+            events = self.pattern_detector.process_tick(symbol, tick_data)
+            if events:
+                await self.pattern_detector.notify(events)
             
             # Region kontrolü
-            await self.region_manager.check_regions(symbol, tick_data)
+            if self.region_sampler.hit():
+                started = time.perf_counter_ns()
+                hits = self.region_manager.check_regions(symbol, tick_data)
+                metrics.REGION_CHECK.observe_ns(time.perf_counter_ns() - started)
+            else:
+                hits = self.region_manager.check_regions(symbol, tick_data)
+            if hits:
+                await self.region_manager.notify(symbol, hits)
+            if tick_data.get("trace"):
+                tracer.record("region_check", symbol, tick_data.get("ingest_ns"))
             
         except Exception as e:
+            metrics.DROPPED_TICKS.inc("error")
             logger.error("Tick işleme hatası", symbol=symbol, error=str(e))
     
     async def _on_choch_detected(self, symbol: str, choch_data: Dict) -> None:
         """CHoCH tespit edildiğinde çağrılır"""
-        message = f"🔄 CHoCH Detected: {symbol}\n"
-        message += f"Direction: {choch_data['direction']}\n"
-        message += f"Price: {choch_data['price']}\n"
-        message += f"Time: {choch_data['timestamp']}"
+        if self.event_publisher:
+            self.event_publisher.publish_pattern("choch", symbol, choch_data)
+        
+        message = format_pattern_message("choch", symbol, choch_data)
         
-        await self._send_notification(message, alert_type="choch")
+        await self._send_notification(message, alert_type="choch", dedup=(
+            symbol, "choch", choch_data.get("direction"), choch_data.get("timeframe"), choch_data.get("price")
+        ), trace=(symbol, choch_data.get("ingest_ns")))
         
         logger.info("CHoCH tespit edildi", symbol=symbol, data=choch_data)
     
     async def _on_bos_detected(self, symbol: str, bos_data: Dict) -> None:
         """BOS tespit edildiğinde çağrılır"""
-        message = f"💥 BOS Detected: {symbol}\n"
-        message += f"Direction: {bos_data['direction']}\n"
-        message += f"Price: {bos_data['price']}\n"
-        message += f"Time: {bos_data['timestamp']}"
+        if self.event_publisher:
+            self.event_publisher.publish_pattern("bos", symbol, bos_data)
         
-        await self._send_notification(message, alert_type="bos")
+        message = format_pattern_message("bos", symbol, bos_data)
+        
+        await self._send_notification(message, alert_type="bos", dedup=(
+            symbol, "bos", bos_data.get("direction"), bos_data.get("timeframe"), bos_data.get("price")
+        ), trace=(symbol, bos_data.get("ingest_ns")))
         
         logger.info("BOS tespit edildi", symbol=symbol, data=bos_data)
     
+    async def _on_region_hit(self, symbol: str, hit_data: Dict) -> None:
+        """Fiyat bir region'a girdiğinde çağrılır"""
+        if self.event_publisher:
+            self.event_publisher.publish_region("region_hit", symbol, hit_data)
+        
+        # Region içinde kalan her tick yeniden hit üretir - region başına tek uyarı
+        message = format_region_message(symbol, hit_data)
+        await self._send_notification(message, alert_type="region", dedup=(
+            symbol, "region_hit", hit_data["region_id"], None, None
+        ))
+    
+    async def _consume_region_commands(self) -> None:
+        """Webhook servisinin yayınladığı region oluşturma/silme komutlarını uygula"""
+        consumer = EventConsumer(self.event_publisher.backend, self.event_publisher.stream_name("commands"),
+                                 "orchestrator", "main")
+        await consumer.setup()
+        while True:
+            try:
+                entries = await consumer.read(count=100, block_ms=1000)
+                for _, fields in entries:
+                    self._apply_region_command(fields["type"], fields["symbol"], fields["data"])
+                if entries:
+                    await consumer.ack(*(entry_id for entry_id, _ in entries))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Region komutu işlenemedi", error=str(e))
+                await asyncio.sleep(1.0)
+    
+    def _apply_region_command(self, command: str, symbol: str, data: Dict) -> None:
+        self.region_manager.apply_command(command, symbol, data)
+    
     async def _on_feed_error(self, error: Exception) -> None:
         """Data feed hatası durumunda çağrılır"""
         logger.error("Data feed hatası", error=str(error))
-        await self._reconnect_feed()
+        # Hata feed'in kendi stream task'ından gelir - reconnect ayrı task'ta yürümeli
+        if self.reconnect_task is None or self.reconnect_task.done():
+            self.reconnect_task = asyncio.create_task(self._reconnect_feed())
     
-    async def _reconnect_feed(self) -> None:
-        """Data feed yeniden bağlantı"""
-        max_retries = 5
-        base_delay = 1.0
-        
+    async def _reconnect_feed(self, max_retries: int = 5, base_delay: float = 1.0,
+                              max_delay: float = 30.0) -> None:
+        """Data feed yeniden bağlantı - jitter'lı backoff, ardından kaçırılan barların replay'i"""
         for attempt in range(max_retries):
             try:
-                await asyncio.sleep(base_delay * (2 ** attempt))
+                # Equal jitter: çok sayıda instance aynı anda broker'a yüklenmesin
+                cap = min(max_delay, base_delay * (2 ** attempt))
+                await asyncio.sleep(cap / 2 + random.uniform(0, cap / 2))
+                
+                await self.data_feed.reconnect()
                 
-                await self.data_feed.disconnect()
-                await self.data_feed.connect()
+                # Canlı tick'ler başlamadan önce kesinti penceresini sırayla işle
+                await self._replay_gap()
                 
                 # Sembolleri yeniden subscribe et
                 for symbol in self.active_symbols:
                     await self.data_feed.subscribe(symbol)
                 
-                logger.info("Data feed yeniden bağlandı")
+                metrics.RECONNECTS.inc(self.config.broker.type.lower())
+                logger.info("Data feed yeniden bağlandı", attempt=attempt + 1)
                 return
                 
             except Exception as e:
@@ -201,14 +529,39 @@ class TradingOrchestrator:
         logger.error("Yeniden bağlanma başarısız - sistem durduruluyor")
         await self.shutdown()
     
-    async def _send_notification(self, message: str, alert_type: str = "info") -> None:
-        """Tüm notifier'lara bildirim gönder"""
-        tasks = []
-        for notifier in self.notifiers:
-            tasks.append(notifier.send_notification(message, alert_type))
+    async def _replay_gap(self, symbols: Optional[List[str]] = None) -> None:
+        """Kesinti süresince kaçırılan mumları çekip detector'dan sırayla geçir"""
+        if not hasattr(self.data_feed, "fetch_candles"):
+            return
+        
+        for symbol in (symbols if symbols is not None else sorted(self.active_symbols)):
+            last_bar_time = self.pattern_detector.last_bar_time(symbol)
+            if last_bar_time is None:
+                continue
+            
+            # Son bar tick'lerden kısmen oluşmuştu - tamamlanmış haliyle değiştirilir
+            timeframe = self.config.pattern_for(symbol).timeframe
+            gap = await self.data_feed.fetch_candles(
+                symbol, granularity=timeframe, from_time=last_bar_time - pd.Timedelta(TIMEFRAME_FREQS[timeframe])
+            )
+            if not gap.empty:
+                await self.pattern_detector.replay_bars(symbol, gap)
+                logger.info("Kesinti barları replay edildi", symbol=symbol, bars=len(gap))
+    
+    async def _send_notification(self, message: str, alert_type: str = "info",
+                                 dedup: Optional[tuple] = None, trace: Optional[tuple] = None) -> None:
+        """Bildirimi kanal kuyruklarına bırak - gönderim dispatcher worker'larında yapılır
+        
+        ``dedup`` (sembol, pattern, yön, timeframe, fiyat) verilirse tekrarlar fan-out'tan önce bastırılır.
+        ``trace`` (sembol, ingest_ns) kuyruğa ve gönderime kadar latency izlemesine taşınır.
+        """
+        if not self.dispatcher:
+            return
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        dedup_key = None
+        if dedup is not None:
+            dedup_key = self.dispatcher.make_key(*dedup)
+        self.dispatcher.dispatch(message, alert_type, dedup_key, trace)
     
     async def shutdown(self) -> None:
         """Sistemi kapat"""
@@ -218,11 +571,41 @@ class TradingOrchestrator:
     
     async def cleanup(self) -> None:
         """Temizlik işlemleri"""
+        if self.config_watcher:
+            await self.config_watcher.stop()
+        
         if self.data_feed:
             await self.data_feed.disconnect()
         
+        # Bekleyen analizler bitsin - son checkpoint ve uyarılar onları içersin
+        if self.analysis_pool:
+            await self.analysis_pool.shutdown()
+        
+        if self.checkpoint_manager:
+            try:
+                await self.checkpoint_manager.stop()
+            except Exception as e:
+                logger.error("Son checkpoint yazılamadı", error=str(e))
+        
+        if self.command_task:
+            self.command_task.cancel()
+            await asyncio.gather(self.command_task, return_exceptions=True)
+        
+        if self.event_publisher:
+            try:
+                await self.event_publisher.stop()
+            except Exception as e:
+                logger.error("Event bus kapatılamadı", error=str(e))
+        
+        # Kuyruktaki uyarılar notifier'lar kapanmadan gönderilsin
+        if self.dispatcher:
+            await self.dispatcher.stop()
+        
         for notifier in self.notifiers:
             if hasattr(notifier, 'cleanup'):
                 await notifier.cleanup()
         
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        
         logger.info("Sistem temizlendi")
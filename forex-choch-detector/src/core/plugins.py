@@ -0,0 +1,83 @@
+"""
+Eklenti kayıt defteri - broker.type ve notifier adlarını tembel import edilen sınıflara eşler
+
+Dahili eklentiler "modül:sınıf" yolu olarak kayıtlıdır; modül ancak eklenti ilk
+kullanıldığında import edilir. Bilinmeyen adlar kurulu paketlerin entry point'lerinde
+aranır (``forex_choch.feeds`` / ``forex_choch.notifiers`` grupları).
+"""
+import importlib
+from importlib import metadata
+from typing import Any, Dict, List, Union
+
+class PluginError(ValueError):
+    """Eklenti bulunamadı veya modülü import edilemedi"""
+
+class PluginRegistry:
+    """Ad -> "modül:nesne" yolu; yüklenen nesneler cache'lenir"""
+    
+    def __init__(self, kind: str, group: str, builtins: Dict[str, str]):
+        self.kind = kind
+        self.group = group
+        self._targets: Dict[str, Union[str, Any]] = dict(builtins)
+        self._loaded: Dict[str, Any] = {}
+        self._discovered = False
+    
+    def register(self, name: str, target: Union[str, Any]) -> None:
+        """Eklenti ekle - ``target`` "modül:nesne" yolu veya nesnenin kendisi"""
+        self._targets[name.lower()] = target
+        self._loaded.pop(name.lower(), None)
+    
+    def _discover(self) -> None:
+        """Entry point'leri bir kez tara - dahili adları ezmez"""
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in metadata.entry_points(group=self.group):
+            self._targets.setdefault(entry_point.name.lower(), entry_point.value)
+    
+    def names(self) -> List[str]:
+        self._discover()
+        return sorted(self._targets)
+    
+    def load(self, name: str) -> Any:
+        """Eklenti nesnesini import et - eksik bağımlılık PluginError olarak yükselir"""
+        key = name.lower()
+        if key in self._loaded:
+            return self._loaded[key]
+        if key not in self._targets:
+            self._discover()
+        target = self._targets.get(key)
+        if target is None:
+            raise PluginError(f"Desteklenmeyen {self.kind} türü: {name} (mevcut: {', '.join(self.names())})")
+        
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            try:
+                loaded = importlib.import_module(module_name)
+            except ImportError as e:
+                raise PluginError(f"{self.kind} eklentisi yüklenemedi: {name} ({e})") from e
+            for part in filter(None, attribute.split(".")):
+                loaded = getattr(loaded, part)
+        else:
+            loaded = target
+        self._loaded[key] = loaded
+        return loaded
+    
+    def available(self, name: str) -> bool:
+        try:
+            self.load(name)
+        except PluginError:
+            return False
+        return True
+
+FEEDS = PluginRegistry("broker", "forex_choch.feeds", {
+    "oanda": "data_feed.oanda:OandaFeed",
+    "mt5": "data_feed.mt5:MT5Feed",
+    "websocket": "data_feed.websocket:WebSocketFeed",
+})
+
+NOTIFIERS = PluginRegistry("notifier", "forex_choch.notifiers", {
+    "telegram": "notifier.telegram:TelegramNotifier",
+    "desktop": "notifier.desktop:DesktopNotifier",
+    "email": "notifier.email:EmailNotifier",
+})
@@ -0,0 +1,303 @@
+"""
+Profil modu - cProfile veya örneklemeli profil, bileşen bazında CPU dağılımı ve
+event loop'u bloklayan callback tespiti. Çıktı flamegraph için collapsed stack formatıdır.
+"""
+import asyncio
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+# Örnekleyici bu fonksiyonlarda bulduğu ana thread'i boşta sayar
+_IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait"), ("queues.py", "get")}
+
+Frame = Tuple[str, int, str]  # (dosya, satır, fonksiyon)
+
+def uvloop_active() -> bool:
+    """Geçerli event loop policy'si uvloop'un mu"""
+    return type(asyncio.get_event_loop_policy()).__module__.startswith("uvloop")
+
+def _component(filename: str) -> Optional[str]:
+    """src altındaki dosyanın üst paketi (pattern, data_feed, ...) - dışarıdaysa None"""
+    try:
+        relative = Path(filename).resolve().relative_to(SRC_ROOT)
+    except (ValueError, OSError):
+        return None
+    return relative.parts[0] if len(relative.parts) > 1 else relative.stem
+
+def _label(frame: Frame) -> str:
+    filename, _, name = frame
+    component = _component(filename)
+    path = Path(filename)
+    module = f"{component}/{path.stem}" if component and component != path.stem else path.stem
+    return f"{module}:{name}"
+
+def attribute_stack(stack: Tuple[Frame, ...]) -> str:
+    """
+    Örneği bileşene ata: yapraktan köke ilk src frame'inin paketi.
+    
+    pandas/numpy içinde geçen süre onu çağıran bileşene yazılır; ana thread
+    select'te bekliyorsa örnek 'idle' sayılır.
+    """
+    if stack:
+        leaf_file, _, leaf_name = stack[-1]
+        if (Path(leaf_file).name, leaf_name) in _IDLE_FRAMES:
+            return "idle"
+    for filename, _, _ in reversed(stack):
+        component = _component(filename)
+        if component:
+            return component
+    return "other"
+
+class SamplingProfiler:
+    """
+    Hedef thread'in stack'ini ``interval`` saniyede bir okuyan profil.
+    
+    Yorumlayıcıya hook kurmadığından ölçülen kodu yavaşlatmaz; maliyet
+    örnekleyici thread'in her örnekte GIL'i kısa süre almasıdır.
+    """
+    
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="choch-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+    
+    def stacks(self) -> Dict[Tuple[Frame, ...], float]:
+        return dict(self.samples)
+
+class DeterministicProfiler:
+    """cProfile sarmalayıcısı - collapsed çıktı çağıran;çağrılan çiftlerinden oluşur"""
+    
+    def __init__(self):
+        self.profile = cProfile.Profile()
+    
+    def start(self) -> None:
+        self.profile.enable()
+    
+    def stop(self) -> None:
+        self.profile.disable()
+    
+    def stacks(self) -> Dict[Tuple[Frame, ...], float]:
+        """Fonksiyon başına öz süre (µs), çağırana göre bölünmüş iki seviyeli stack'ler"""
+        stats = pstats.Stats(self.profile).stats
+        stacks: Dict[Tuple[Frame, ...], float] = {}
+        for func, (_, _, tottime, _, callers) in stats.items():
+            if not callers:
+                stacks[(func,)] = stacks.get((func,), 0.0) + tottime * 1e6
+                continue
+            for caller, caller_stats in callers.items():
+                key = (caller, func)
+                stacks[key] = stacks.get(key, 0.0) + caller_stats[2] * 1e6
+        return stacks
+    
+    def component_times(self) -> Counter:
+        """
+        Öz süreleri (µs) bileşenlere dağıt.
+        
+        src dışındaki fonksiyonun (pandas, numpy...) süresi çağıranlar zincirinde
+        yukarı çıkılarak ilk src frame'inin bileşenine, her çağıranın kümülatif
+        süre payı oranında yazılır. Zincirde src frame'i yoksa 'other' sayılır.
+        """
+        stats = pstats.Stats(self.profile).stats
+        owners: Dict[Frame, Dict[str, float]] = {}
+        resolving = set()
+        
+        def owner_shares(func: Frame) -> Dict[str, float]:
+            if func in owners:
+                return owners[func]
+            component = _component(func[0])
+            if component:
+                owners[func] = {component: 1.0}
+                return owners[func]
+            resolving.add(func)
+            # Özyinelemeli çağrılar (zincirde zaten çözülen çağıranlar) atlanır
+            callers = {caller: caller_stats[3] for caller, caller_stats in
+                       (stats[func][4] if func in stats else {}).items() if caller not in resolving}
+            total = sum(callers.values())
+            shares: Counter = Counter()
+            for caller, cumulative in callers.items():
+                if total > 0:
+                    for name, share in owner_shares(caller).items():
+                        shares[name] += share * cumulative / total
+            unowned = 1.0 - sum(shares.values())
+            if unowned > 1e-9:
+                shares["other"] += unowned
+            resolving.discard(func)
+            owners[func] = shares
+            return shares
+        
+        totals: Counter = Counter()
+        for stack, weight in self.stacks().items():
+            func = stack[-1]
+            if (Path(func[0]).name, func[2]) in _IDLE_FRAMES:
+                totals["idle"] += weight
+                continue
+            # (çağıran, fonksiyon) çiftinde süre zaten çağırana göre bölünmüş
+            owner = func if len(stack) == 1 or _component(func[0]) else stack[0]
+            for name, share in owner_shares(owner).items():
+                totals[name] += weight * share
+        return totals
+    
+    def dump_stats(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+class SlowCallbackMonitor:
+    """
+    Event loop callback'lerini süreler; ``threshold`` saniyeyi aşanı hangi
+    coroutine'in çalıştırdığıyla loglar.
+    
+    asyncio debug modunun aksine yalnızca Handle._run'ı sarar, coroutine
+    oluşturma izleme maliyeti yoktur. uvloop handle'ları Handle._run'ı
+    çağırmaz - uvloop açıkken hiçbir callback görülmez.
+    """
+    
+    def __init__(self, threshold: float = 0.1):
+        self.threshold = threshold
+        self.slow: Counter = Counter()
+        self.worst: Dict[str, float] = {}
+        self._original = None
+    
+    @staticmethod
+    def describe(handle: asyncio.Handle) -> str:
+        callback = handle._callback
+        task = getattr(callback, "__self__", None)
+        if isinstance(task, asyncio.Task):
+            coroutine = task.get_coro()
+            return getattr(coroutine, "__qualname__", repr(coroutine))
+        return getattr(callback, "__qualname__", repr(callback))
+    
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        if uvloop_active():
+            logger.warning("uvloop etkin - yavaş callback izleme çalışmaz, standart asyncio loop kullanın")
+        original = asyncio.events.Handle._run
+        monitor = self
+        
+        def timed_run(handle):
+            started = time.perf_counter()
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.perf_counter() - started
+                if elapsed >= monitor.threshold:
+                    monitor._record(handle, elapsed)
+        
+        self._original = original
+        asyncio.events.Handle._run = timed_run
+    
+    def uninstall(self) -> None:
+        if self._original is not None:
+            asyncio.events.Handle._run = self._original
+            self._original = None
+    
+    def _record(self, handle: asyncio.Handle, elapsed: float) -> None:
+        name = self.describe(handle)
+        self.slow[name] += 1
+        self.worst[name] = max(self.worst.get(name, 0.0), elapsed)
+        logger.warning("Event loop bloklandı", callback=name, duration_ms=round(elapsed * 1000, 1),
+                       threshold_ms=round(self.threshold * 1000, 1))
+    
+    def summary(self) -> List[Dict[str, float]]:
+        return [{"callback": name, "count": count, "worst_ms": self.worst[name] * 1000}
+                for name, count in self.slow.most_common()]
+
+class ProfileSession:
+    """
+    ``run`` ve ``backtest`` komutlarının profil oturumu.
+    
+    ``with ProfileSession(...)`` bloğu profillenir; çıkışta collapsed stack
+    dosyası (cProfile'da ek olarak .pstats) yazılır.
+    """
+    
+    def __init__(self, mode: str = "sampling", output: str = "profile", interval: float = 0.005,
+                 slow_callback_threshold: Optional[float] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Geçersiz profil modu: {mode} ({' | '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.output = output
+        self.profiler = SamplingProfiler(interval) if mode == "sampling" else DeterministicProfiler()
+        self.monitor = SlowCallbackMonitor(slow_callback_threshold) if slow_callback_threshold else None
+        self.files: List[str] = []
+    
+    def __enter__(self) -> "ProfileSession":
+        if self.monitor:
+            self.monitor.install()
+        self.profiler.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.stop()
+        if self.monitor:
+            self.monitor.uninstall()
+        self.files = self.write()
+    
+    def collapsed(self) -> Dict[str, float]:
+        """'kök;...;yaprak' -> ağırlık (örnek sayısı veya µs)"""
+        lines: Dict[str, float] = {}
+        for stack, weight in self.profiler.stacks().items():
+            key = ";".join(_label(frame) for frame in stack)
+            lines[key] = lines.get(key, 0.0) + weight
+        return lines
+    
+    def components(self) -> Dict[str, float]:
+        """Bileşen başına CPU payı (boşta geçen süre hariç, toplam 1.0)"""
+        if isinstance(self.profiler, DeterministicProfiler):
+            totals = self.profiler.component_times()
+        else:
+            totals = Counter()
+            for stack, weight in self.profiler.stacks().items():
+                totals[attribute_stack(stack)] += weight
+        totals.pop("idle", None)
+        busy = sum(totals.values())
+        return {name: weight / busy for name, weight in totals.most_common()} if busy else {}
+    
+    def write(self) -> List[str]:
+        path = Path(f"{self.output}.collapsed")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(self.collapsed().items()):
+                if weight >= 1:
+                    f.write(f"{stack} {int(round(weight))}\n")
+        files = [str(path)]
+        if isinstance(self.profiler, DeterministicProfiler):
+            stats_path = f"{self.output}.pstats"
+            self.profiler.dump_stats(stats_path)
+            files.append(stats_path)
+        return files
@@ -0,0 +1,108 @@
+"""
+Config yeniden yükleme - eski/yeni Config farkı ve dosya izleyici
+"""
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Tuple
+import structlog
+
+from core.config import Config
+
+logger = structlog.get_logger(__name__)
+
+# Çalışırken uygulanabilen bölümler - diğerleri yeniden başlatma gerektirir
+HOT_SECTIONS = {"broker", "pattern", "pattern_overrides", "notifications", "reload", "log_level"}
+# broker içinde yalnızca sembol listesi canlı değişir
+HOT_BROKER_FIELDS = {"symbols"}
+
+@dataclass
+class ConfigDiff:
+    """İki Config arasındaki, orkestratörün uygulayacağı fark"""
+    added_symbols: List[str] = field(default_factory=list)
+    removed_symbols: List[str] = field(default_factory=list)
+    rebuilt_symbols: List[str] = field(default_factory=list)  # pattern parametresi değişen semboller
+    pattern_changed: bool = False  # genel PatternConfig değişti
+    notifications_changed: bool = False
+    restart_required: List[str] = field(default_factory=list)  # uygulanmayan bölümler
+    
+    @property
+    def empty(self) -> bool:
+        return not (self.added_symbols or self.removed_symbols or self.rebuilt_symbols or self.pattern_changed
+                    or self.notifications_changed or self.restart_required)
+
+def diff_configs(old: Config, new: Config) -> ConfigDiff:
+    """Sembol, detector parametresi ve bildirim farklarını çıkar"""
+    old_symbols, new_symbols = old.broker.symbols, new.broker.symbols
+    kept = [symbol for symbol in new_symbols if symbol in old_symbols]
+    diff = ConfigDiff(
+        added_symbols=[symbol for symbol in new_symbols if symbol not in old_symbols],
+        removed_symbols=[symbol for symbol in old_symbols if symbol not in new_symbols],
+        rebuilt_symbols=[symbol for symbol in kept if old.pattern_for(symbol) != new.pattern_for(symbol)],
+        pattern_changed=old.pattern != new.pattern,
+        notifications_changed=old.notifications != new.notifications
+    )
+    
+    if old.broker.model_dump(exclude=HOT_BROKER_FIELDS) != new.broker.model_dump(exclude=HOT_BROKER_FIELDS):
+        diff.restart_required.append("broker")
+    for name in type(new).model_fields:
+        if name not in HOT_SECTIONS and getattr(old, name) != getattr(new, name):
+            diff.restart_required.append(name)
+    return diff
+
+def effective_config(old: Config, new: Config, diff: ConfigDiff) -> Config:
+    """Yeni config - yeniden başlatma gerektiren bölümler eski değerleriyle kalır"""
+    kept = {name: getattr(old, name) for name in diff.restart_required if name != "broker"}
+    if "broker" in diff.restart_required:
+        kept["broker"] = old.broker.model_copy(update={"symbols": list(new.broker.symbols)})
+    return new.model_copy(update=kept)
+
+class ConfigWatcher:
+    """
+    Config dosyasını mtime/boyut ile poll eder; değişince yeni Config'i
+    ``on_change``'e verir. Okunamayan veya geçersiz dosya loglanır, çalışan
+    config korunur.
+    """
+    
+    def __init__(self, path: str, on_change: Callable[[Config], Awaitable[object]], interval: float = 2.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = self._stat()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    async def reload(self) -> None:
+        """Dosyayı oku ve uygula - SIGHUP ve izleyici bu yolu kullanır"""
+        async with self._lock:
+            self._signature = self._stat()
+            try:
+                config = Config.from_file(self.path)
+            except Exception as e:
+                logger.error("Config yeniden yüklenemedi, mevcut config korunuyor", path=self.path, error=str(e))
+                return
+            await self.on_change(config)
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            signature = self._stat()
+            if signature is not None and signature != self._signature:
+                await self.reload()
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="config-watcher")
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
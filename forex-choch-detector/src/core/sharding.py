@@ -0,0 +1,351 @@
+"""
+Çok process'li sembol sharding - feed process'i tick'leri shard başına paylaşımlı
+bellek ring'lerine yazar, her worker kendi sembol alt kümesinin detector'ını çalıştırır
+"""
+import asyncio
+import bisect
+import hashlib
+import multiprocessing as mp
+import queue
+from typing import Dict, List, Iterable, Any, Optional
+import pandas as pd
+import structlog
+
+from core.config import Config, PatternConfig
+from core.orchestrator import (TradingOrchestrator, create_notifiers, create_dispatcher, create_event_publisher,
+                               format_pattern_message, format_region_message)
+from core.reload import ConfigDiff, diff_configs
+from core.shm_ring import ShmTickRing
+from core import metrics
+from pattern.choch_detector import CHoCHDetector
+from region.box_region import BoxRegionManager
+
+logger = structlog.get_logger(__name__)
+
+class ConsistentHashRing:
+    """
+    Sanal node'lu consistent hashing halkası.
+    
+    Bir worker eklendiğinde yalnızca yaklaşık 1/N sembol yer değiştirir.
+    """
+    
+    def __init__(self, nodes: Iterable[int] = (), virtual_nodes: int = 64):
+        self.virtual_nodes = virtual_nodes
+        self._keys: List[int] = []
+        self._owners: Dict[int, int] = {}
+        for node in nodes:
+            self.add_node(node)
+    
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+    
+    def add_node(self, node: int) -> None:
+        """Halkaya node ekle"""
+        for i in range(self.virtual_nodes):
+            key = self._hash(f"{node}#{i}")
+            self._owners[key] = node
+            bisect.insort(self._keys, key)
+    
+    def remove_node(self, node: int) -> None:
+        """Node'u halkadan çıkar"""
+        self._keys = [k for k in self._keys if self._owners[k] != node]
+        self._owners = {k: n for k, n in self._owners.items() if n != node}
+    
+    def get_node(self, key: str) -> int:
+        """Anahtarın sahibi olan node"""
+        if not self._keys:
+            raise ValueError("Hash halkasında node yok")
+        i = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._owners[self._keys[i]]
+    
+    def assign(self, keys: Iterable[str]) -> Dict[int, List[str]]:
+        """Anahtarları node'lara göre grupla"""
+        assignment: Dict[int, List[str]] = {}
+        for key in keys:
+            assignment.setdefault(self.get_node(key), []).append(key)
+        return assignment
+
+def run_shard_worker(shard_id: int, ring_name: str, capacity: int, symbol_table: List[str],
+                     pattern_config: PatternConfig, symbol_configs: Dict[str, PatternConfig], event_queue,
+                     stop_event, command_queue, regions: Dict[str, List[Dict[str, Any]]],
+                     kernel_backend: str = "auto") -> None:
+    """Worker process girişi"""
+    asyncio.run(_shard_worker_loop(shard_id, ring_name, capacity, symbol_table, pattern_config, symbol_configs,
+                                   event_queue, stop_event, command_queue, regions, kernel_backend))
+
+def _apply_region_commands(region_manager: BoxRegionManager, command_queue) -> None:
+    """Orkestratörden gelen region komutlarını beklemeden uygula"""
+    while True:
+        try:
+            command, symbol, data = command_queue.get_nowait()
+        except queue.Empty:
+            return
+        region_manager.apply_command(command, symbol, data)
+
+async def _shard_worker_loop(shard_id: int, ring_name: str, capacity: int, symbol_table: List[str],
+                             pattern_config: PatternConfig, symbol_configs: Dict[str, PatternConfig], event_queue,
+                             stop_event, command_queue, regions: Dict[str, List[Dict[str, Any]]],
+                             kernel_backend: str = "auto") -> None:
+    """Ring'den tick oku, shard'ın detector/region manager'ından geçir, event'leri kuyruğa yaz
+    
+    ``symbol_configs`` shard'ın sembollerinin ``pattern_overrides``'tan gelen
+    parametreleridir (tek process'teki ``detector.symbol_configs`` gibi). ``regions`` shard'ın sembollerinin başlangıç region'larıdır (``export_state``
+    çıktısı); sonraki ekleme/silmeler ``command_queue`` üzerinden gelir.
+    """
+    ring = ShmTickRing.attach(ring_name, capacity)
+    detector = CHoCHDetector(pattern_config)
+    detector.kernel_backend = kernel_backend
+    detector.symbol_configs.update(symbol_configs)
+    region_manager = BoxRegionManager()
+    for symbol, symbol_regions in regions.items():
+        region_manager.restore_state(symbol, symbol_regions)
+    
+    def _forward(kind: str):
+        async def _callback(symbol: str, data: Dict[str, Any]) -> None:
+            event_queue.put((kind, symbol, data))
+        return _callback
+    
+    detector.on_choch = _forward("choch")
+    detector.on_bos = _forward("bos")
+    region_manager.on_region_hit = _forward("region_hit")
+    
+    logger.info("Shard worker başladı", shard=shard_id, regions=sum(len(r) for r in regions.values()))
+    processed = 0
+    try:
+        while True:
+            _apply_region_commands(region_manager, command_queue)
+            batch = ring.read_batch(1024)
+            if len(batch) == 0:
+                if stop_event.is_set():
+                    break
+                await asyncio.sleep(0.001)
+                continue
+            
+            for symbol_id, bid, ask, volume, timestamp_ns in batch.tolist():
+                symbol = symbol_table[symbol_id]
+                tick_data = {
+                    "symbol": symbol,
+                    "bid": bid,
+                    "ask": ask,
+                    "volume": volume,
+                    "timestamp": timestamp_ns
+                }
+                events = detector.process_tick(symbol, tick_data)
+                if events:
+                    await detector.notify(events)
+                hits = region_manager.check_regions(symbol, tick_data)
+                if hits:
+                    await region_manager.notify(symbol, hits)
+            processed += len(batch)
+    finally:
+        ring.close()
+        logger.info("Shard worker durdu", shard=shard_id, ticks=processed)
+
+def run_notifier_process(config: Config, event_queue) -> None:
+    """Notifier process girişi - tüm shard'ların event'leri tek noktadan gönderilir"""
+    asyncio.run(_notifier_loop(config, event_queue))
+
+async def _notifier_loop(config: Config, event_queue) -> None:
+    """Kuyruktan event al, event bus'a yayınla ve notifier'lara dağıt - None sentinel'i döngüyü bitirir"""
+    notifiers = await create_notifiers(config)
+    dispatcher = create_dispatcher(config, notifiers)
+    dispatcher.start()
+    # Tek process'teki gibi worker event'leri de stream'lere yazılır
+    publisher = create_event_publisher(config) if config.event_bus.enabled else None
+    if publisher:
+        publisher.start()
+    loop = asyncio.get_running_loop()
+    
+    try:
+        while True:
+            item = await loop.run_in_executor(None, event_queue.get)
+            if item is None:
+                break
+            
+            kind, symbol, data = item
+            if publisher:
+                if kind == "region_hit":
+                    publisher.publish_region(kind, symbol, data)
+                else:
+                    publisher.publish_pattern(kind, symbol, data)
+            if kind == "region_hit":
+                # Orkestratördeki gibi region başına tek uyarı
+                dedup_key = dispatcher.make_key(symbol, kind, data["region_id"], None, None)
+                dispatcher.dispatch(format_region_message(symbol, data), "region", dedup_key)
+            else:
+                dedup_key = dispatcher.make_key(symbol, kind, data.get("direction"), data.get("timeframe"),
+                                               data.get("price"))
+                dispatcher.dispatch(format_pattern_message(kind, symbol, data), kind, dedup_key)
+            logger.info("Pattern event bildirildi", kind=kind, symbol=symbol)
+    finally:
+        await dispatcher.stop()
+        for notifier in notifiers:
+            await notifier.cleanup()
+        if publisher:
+            try:
+                await publisher.stop()
+            except Exception as e:
+                logger.error("Event bus kapatılamadı", error=str(e))
+
+class ShardedOrchestrator(TradingOrchestrator):
+    """
+    Feed'i bu process'te çalıştıran, pattern analizini N worker process'e dağıtan orkestratör.
+    
+    Semboller consistent hashing ile shard'lara atanır; her shard'ın kendi
+    paylaşımlı bellek ring'i vardır. Pattern event'leri tek bir notifier
+    process'ine ``multiprocessing.Queue`` üzerinden gelir; bildirimler ve event bus
+    yayını oradan yapılır. Region'ların asıl
+    kopyası bu process'tedir; her worker başlangıçta kendi sembollerinin
+    region'larını alır, sonraki ekleme/silmeler shard'ın komut kuyruğuna iletilir.
+    """
+    
+    def __init__(self, config: Config, workers: Optional[int] = None, config_path: Optional[str] = None):
+        super().__init__(config, config_path)
+        self.worker_count = workers or config.sharding.workers
+        if self.worker_count < 1:
+            raise ValueError("Sharded mod en az bir worker gerektirir")
+        
+        self.symbol_table: List[str] = list(config.broker.symbols)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbol_table)}
+        self.hash_ring = ConsistentHashRing(range(self.worker_count), config.sharding.virtual_nodes)
+        self.shard_of = {symbol: self.hash_ring.get_node(symbol) for symbol in self.symbol_table}
+        
+        self.mp_context = mp.get_context("spawn")
+        self.rings: Dict[int, ShmTickRing] = {}
+        self.workers: List = []
+        self.command_queues: Dict[int, Any] = {}
+        self.notifier_process = None
+        self.event_queue = None
+        self.stop_event = None
+    
+    async def initialize(self) -> None:
+        """Feed'i oluştur ve worker/notifier process'lerini başlat"""
+        logger.info("Sharded sistem başlatılıyor...", workers=self.worker_count)
+        
+        self.data_feed = self._create_data_feed()
+        if self.config.event_bus.enabled:
+            # Webhook'un region komutları bus üzerinden gelir ve shard'lara dağıtılır
+            self.event_publisher = create_event_publisher(self.config)
+        self._start_processes()
+        
+        self.data_feed.on_tick = self._on_tick_received
+        self.data_feed.on_error = self._on_feed_error
+        
+        logger.info("Shard ataması", shards={s: sorted(v) for s, v in self.hash_ring.assign(self.symbol_table).items()})
+    
+    def _start_processes(self) -> None:
+        """Shard ring'lerini oluştur ve process'leri spawn et"""
+        ctx = self.mp_context
+        self.event_queue = ctx.Queue()
+        self.stop_event = ctx.Event()
+        
+        assignment = self.hash_ring.assign(self.region_manager.regions)
+        symbols = self.hash_ring.assign(self.symbol_table)
+        for shard_id in range(self.worker_count):
+            ring = ShmTickRing(capacity=self.config.sharding.ring_capacity)
+            self.rings[shard_id] = ring
+            self.command_queues[shard_id] = ctx.Queue()
+            regions = {symbol: self.region_manager.export_state(symbol) for symbol in assignment.get(shard_id, [])}
+            process = ctx.Process(
+                target=run_shard_worker,
+                args=(shard_id, ring.name, ring.capacity, self.symbol_table, self.config.pattern,
+                      self.symbol_configs(symbols.get(shard_id, [])), self.event_queue, self.stop_event,
+                      self.command_queues[shard_id], regions, self.config.runtime.kernel_backend),
+                name=f"choch-shard-{shard_id}",
+                daemon=True
+            )
+            process.start()
+            self.workers.append(process)
+        
+        metrics.QUEUE_DEPTH.set_collector("shard_rings", lambda: {
+            (f"shard_ring_{shard_id}",): len(ring) for shard_id, ring in self.rings.items()
+        })
+        
+        self.notifier_process = ctx.Process(
+            target=run_notifier_process,
+            args=(self.config, self.event_queue),
+            name="choch-notifier",
+            daemon=True
+        )
+        self.notifier_process.start()
+    
+    def symbol_configs(self, symbols: Iterable[str]) -> Dict[str, PatternConfig]:
+        """Sembollerin global config'ten farklı pattern parametreleri - shard worker'ının detector'ına verilir"""
+        configs = {symbol: self.config.pattern_for(symbol) for symbol in symbols}
+        return {symbol: config for symbol, config in configs.items() if config != self.config.pattern}
+    
+    async def _warm_up_detector(self, symbols: Optional[List[str]] = None) -> None:
+        """Detector'lar worker'larda yaşar - ısınma canlı tick'lerle olur"""
+        logger.info("Sharded modda geçmiş veri ısıtması atlandı")
+    
+    def _apply_region_command(self, command: str, symbol: str, data: Dict) -> None:
+        """Region'ı yerel kopyaya uygula ve sembolün shard'ına ilet"""
+        super()._apply_region_command(command, symbol, data)
+        shard_id = self.shard_of.get(symbol)
+        if shard_id is None:
+            logger.warning("Region komutu shard'ı olmayan sembol için", symbol=symbol, command=command)
+            return
+        if shard_id in self.command_queues:
+            self.command_queues[shard_id].put((command, symbol, data))
+    
+    async def _on_tick_received(self, symbol: str, tick_data: Dict) -> None:
+        """Tick'i sembolün shard ring'ine yaz"""
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return
+        
+        timestamp = pd.Timestamp(tick_data["timestamp"])
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        
+        ring = self.rings[self.shard_of[symbol]]
+        if not ring.write(symbol_id, tick_data["bid"], tick_data["ask"],
+                          float(tick_data.get("volume", 1)), timestamp.value):
+            metrics.DROPPED_TICKS.inc("ring_full")
+            if ring.dropped % 1000 == 1:
+                logger.warning("Shard ring dolu - tick düşürüldü", symbol=symbol, dropped=ring.dropped)
+    
+    async def reload_config(self, new_config: Config) -> ConfigDiff:
+        """Shard tablosu ve worker process'lerin durumu canlı değişmez - farkı yalnızca raporla"""
+        diff = diff_configs(self.config, new_config)
+        if not diff.empty:
+            logger.warning("Sharded modda config yeniden yükleme desteklenmiyor, yeniden başlatın",
+                           added=diff.added_symbols, removed=diff.removed_symbols, rebuilt=diff.rebuilt_symbols)
+        return diff
+    
+    async def cleanup(self) -> None:
+        """Feed'i kapat, worker'ların ring'i boşaltmasını bekle, process'leri durdur"""
+        if self.config_watcher:
+            await self.config_watcher.stop()
+        if self.data_feed:
+            await self.data_feed.disconnect()
+        
+        if self.command_task:
+            self.command_task.cancel()
+            await asyncio.gather(self.command_task, return_exceptions=True)
+        if self.event_publisher:
+            try:
+                await self.event_publisher.stop()
+            except Exception as e:
+                logger.error("Event bus kapatılamadı", error=str(e))
+        
+        loop = asyncio.get_running_loop()
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for process in self.workers:
+            await loop.run_in_executor(None, process.join, 10)
+        
+        if self.event_queue is not None:
+            self.event_queue.put(None)
+        if self.notifier_process is not None:
+            await loop.run_in_executor(None, self.notifier_process.join, 10)
+        
+        for ring in self.rings.values():
+            ring.close()
+        self.rings.clear()
+        
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        
+        logger.info("Sharded sistem temizlendi")
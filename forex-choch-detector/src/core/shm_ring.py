@@ -0,0 +1,87 @@
+"""
+Paylaşımlı bellek üzerinde tek üretici / tek tüketici tick ring buffer'ı
+"""
+from multiprocessing import shared_memory
+from typing import Optional
+import numpy as np
+
+# Sabit boyutlu tick kaydı - sembol string yerine sembol tablosundaki index taşınır
+TICK_DTYPE = np.dtype([
+    ("symbol_id", "<i4"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("volume", "<f8"),
+    ("timestamp_ns", "<i8")
+])
+
+# Header: [head (yazılan kayıt sayısı), tail (okunan kayıt sayısı)] - cache line'a hizalı
+HEADER_SIZE = 64
+
+class ShmTickRing:
+    """
+    ``multiprocessing.shared_memory`` üzerinde SPSC ring buffer.
+    
+    Yazıcı kaydı yazdıktan sonra ``head``'i, okuyucu kayıtları kopyaladıktan
+    sonra ``tail``'i ilerletir; iki sayaç da yalnızca tek bir taraf tarafından
+    yazıldığı için kilit gerekmez. Buffer doluysa yeni tick düşürülür.
+    """
+    
+    def __init__(self, capacity: int = 65536, name: Optional[str] = None, create: bool = True):
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * TICK_DTYPE.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.shm.name
+        self._owner = create
+        
+        self._header = np.ndarray((2,), dtype=np.uint64, buffer=self.shm.buf[:16])
+        self._records = np.ndarray((capacity,), dtype=TICK_DTYPE, buffer=self.shm.buf[HEADER_SIZE:size])
+        if create:
+            self._header[:] = 0
+        
+        self.dropped = 0
+    
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "ShmTickRing":
+        """Başka bir process'in oluşturduğu ring'e bağlan"""
+        return cls(capacity=capacity, name=name, create=False)
+    
+    def __len__(self) -> int:
+        return int(self._header[0] - self._header[1])
+    
+    def write(self, symbol_id: int, bid: float, ask: float, volume: float, timestamp_ns: int) -> bool:
+        """Tek tick yaz - buffer doluysa False döner ve tick düşürülür"""
+        head = int(self._header[0])
+        if head - int(self._header[1]) >= self.capacity:
+            self.dropped += 1
+            return False
+        
+        self._records[head % self.capacity] = (symbol_id, bid, ask, volume, timestamp_ns)
+        self._header[0] = head + 1
+        return True
+    
+    def read_batch(self, max_records: int = 1024) -> np.ndarray:
+        """Bekleyen kayıtlardan en fazla max_records tanesini kopyalayıp tüket"""
+        tail = int(self._header[1])
+        available = int(self._header[0]) - tail
+        if available <= 0:
+            return self._records[:0].copy()
+        
+        n = min(available, max_records)
+        start = tail % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            batch = self._records[start:end].copy()
+        else:
+            batch = np.concatenate((self._records[start:], self._records[:end - self.capacity]))
+        
+        self._header[1] = tail + n
+        return batch
+    
+    def close(self) -> None:
+        """Bu process'teki eşlemeyi kapat; oluşturan taraf belleği de serbest bırakır"""
+        # numpy view'ları bırakılmadan shm kapatılamaz
+        del self._header
+        del self._records
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
@@ -0,0 +1,102 @@
+"""
+Detector checkpoint'leri için takılabilir durum deposu - Redis ve lokal dosya backend'leri
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote, unquote
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+class StateStore(ABC):
+    """Sembol başına bir binary blob saklayan depo arayüzü"""
+    
+    @abstractmethod
+    async def save_many(self, items: Dict[str, bytes]) -> None:
+        """Verilen sembollerin blob'larını yaz"""
+        pass
+    
+    @abstractmethod
+    async def load_all(self) -> Dict[str, bytes]:
+        """Tüm sembollerin blob'larını oku"""
+        pass
+    
+    async def close(self) -> None:
+        """Kaynakları serbest bırak"""
+        pass
+
+class FileStateStore(StateStore):
+    """Sembol başına bir dosya - yazımlar atomik (tmp + rename)"""
+    
+    suffix = ".ckpt"
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+    
+    def _path(self, symbol: str) -> Path:
+        return self.directory / f"{quote(symbol, safe='')}{self.suffix}"
+    
+    def _write(self, items: Dict[str, bytes]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for symbol, blob in items.items():
+            path = self._path(symbol)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+    
+    def _read(self) -> Dict[str, bytes]:
+        if not self.directory.exists():
+            return {}
+        return {
+            unquote(path.name[:-len(self.suffix)]): path.read_bytes()
+            for path in self.directory.glob(f"*{self.suffix}")
+        }
+    
+    async def save_many(self, items: Dict[str, bytes]) -> None:
+        if items:
+            await asyncio.to_thread(self._write, items)
+    
+    async def load_all(self) -> Dict[str, bytes]:
+        return await asyncio.to_thread(self._read)
+
+class RedisStateStore(StateStore):
+    """Tüm semboller tek bir Redis hash'inde - yazımlar tek pipeline'da gider"""
+    
+    def __init__(self, url: str = "redis://localhost:6379", key: str = "choch:state", client=None):
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as e:
+                raise ImportError("Redis state store için 'redis' paketi gerekli") from e
+            client = aioredis.from_url(url)
+        self.client = client
+        self.key = key
+    
+    async def save_many(self, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(self.key, mapping=items)
+            await pipe.execute()
+    
+    async def load_all(self) -> Dict[str, bytes]:
+        raw = await self.client.hgetall(self.key)
+        return {
+            (field.decode("utf-8") if isinstance(field, bytes) else field): value
+            for field, value in raw.items()
+        }
+    
+    async def close(self) -> None:
+        await self.client.aclose()
+
+def create_state_store(backend: str, path: Optional[str] = None, redis_url: Optional[str] = None) -> StateStore:
+    """Config'e göre depo oluştur"""
+    if backend == "redis":
+        return RedisStateStore(redis_url or "redis://localhost:6379")
+    if backend == "file":
+        return FileStateStore(path or "data/state")
+    raise ValueError(f"Desteklenmeyen state store: {backend}")
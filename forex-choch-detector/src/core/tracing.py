@@ -0,0 +1,83 @@
+"""
+Tick'ten bildirime uçtan uca latency izleme
+
+Feed ``_emit_tick``'te her tick'e monotonic ns ``ingest_ns`` damgası basar. Tick
+bar güncellemesinden, pattern event'ine ve bildirim kuyruğundan notifier'a kadar
+taşınır; her el değiştirmede ingest'ten geçen süre aşama ve sembol başına
+kaydedilir.
+"""
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import numpy as np
+import structlog
+
+from core.metrics import LatencySampler
+
+logger = structlog.get_logger(__name__)
+
+# Boru hattı sırasıyla aşamalar - değerler ingest'ten itibaren kümülatif
+STAGES = ("bar_update", "region_check", "pattern", "notify_enqueued", "notify_sent")
+
+QUANTILES = (("p50", 50.0), ("p99", 99.0), ("p999", 99.9))
+
+class LatencyTracer:
+    """
+    (aşama, sembol) başına son ``max_samples`` süreyi tutar.
+    
+    Tick başına aşamalar (bar_update, region_check) yalnızca örneklenen
+    tick'lerde kaydedilir; pattern ve bildirim aşamaları seyrek olduğundan
+    her zaman kaydedilir.
+    """
+    
+    def __init__(self, enabled: bool = True, sample_every: int = 16, max_samples: int = 10000):
+        self.samples: Dict[Tuple[str, str], Deque[int]] = {}
+        self.configure(enabled, sample_every, max_samples)
+    
+    def configure(self, enabled: bool = True, sample_every: int = 16, max_samples: int = 10000) -> None:
+        self.enabled = enabled
+        self.sampler = LatencySampler(sample_every)
+        self.max_samples = max_samples
+        self.samples = {key: deque(values, maxlen=max_samples) for key, values in self.samples.items()}
+    
+    def sample(self) -> bool:
+        """Bu tick'in aşamaları izlenecek mi"""
+        return self.enabled and self.sampler.hit()
+    
+    def record(self, stage: str, symbol: str, ingest_ns: Optional[int], now_ns: Optional[int] = None) -> None:
+        if not self.enabled or ingest_ns is None:
+            return
+        elapsed = (time.monotonic_ns() if now_ns is None else now_ns) - ingest_ns
+        key = (stage, symbol)
+        samples = self.samples.get(key)
+        if samples is None:
+            samples = self.samples[key] = deque(maxlen=self.max_samples)
+        samples.append(elapsed)
+    
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{aşama: {sembol | "*": {count, p50, p99, p999}}} - süreler µs"""
+        grouped: Dict[str, Dict[str, np.ndarray]] = {}
+        for (stage, symbol), values in list(self.samples.items()):
+            if values:
+                grouped.setdefault(stage, {})[symbol] = np.fromiter(values, dtype=np.int64, count=len(values))
+        
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        report: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for stage in sorted(grouped, key=lambda s: (order.get(s, len(order)), s)):
+            by_symbol = grouped[stage]
+            rows = {symbol: _summarize(values) for symbol, values in sorted(by_symbol.items())}
+            rows["*"] = _summarize(np.concatenate(list(by_symbol.values())))
+            report[stage] = rows
+        return report
+    
+    def reset(self) -> None:
+        self.samples.clear()
+
+def _summarize(values: np.ndarray) -> Dict[str, float]:
+    percentiles = np.percentile(values, [q for _, q in QUANTILES]) / 1000.0
+    summary: Dict[str, Any] = {"count": int(values.size)}
+    summary.update({name: float(value) for (name, _), value in zip(QUANTILES, percentiles)})
+    return summary
+
+# Process genelindeki tracer - orkestratör config'e göre ayarlar
+tracer = LatencyTracer()
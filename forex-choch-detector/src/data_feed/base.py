@@ -4,8 +4,11 @@ Data feed için temel sınıf - Strategy pattern implementasyonu
 from abc import ABC, abstractmethod
 from typing import Dict, Callable, Optional, Any
 import asyncio
+import time
 import structlog
 
+from core import tracing
+
 logger = structlog.get_logger(__name__)
 
 class DataFeedBase(ABC):
@@ -27,6 +30,11 @@ class DataFeedBase(ABC):
         self.last_heartbeat = None
         self.heartbeat_task: Optional[asyncio.Task] = None
     
+    @classmethod
+    def from_config(cls, broker) -> "DataFeedBase":
+        """config.broker'dan feed oluştur - eklenti registry'si bu yolu kullanır"""
+        return cls()
+    
     @abstractmethod
     async def connect(self) -> None:
         """Broker'a bağlan"""
@@ -37,6 +45,11 @@ class DataFeedBase(ABC):
         """Bağlantıyı kapat"""
         pass
     
+    async def reconnect(self) -> None:
+        """Bağlantıyı yeniden kur - alt sınıflar kaynakları koruyarak override edebilir"""
+        await self.disconnect()
+        await self.connect()
+    
     @abstractmethod
     async def subscribe(self, symbol: str) -> None:
         """Sembole subscribe ol"""
@@ -48,7 +61,11 @@ class DataFeedBase(ABC):
         pass
     
     async def _emit_tick(self, symbol: str, tick_data: Dict[str, Any]) -> None:
-        """Tick event'ini emit et"""
+        """Tick event'ini emit et - tick'e latency izleme için ingest damgası basılır"""
+        if "ingest_ns" not in tick_data:
+            tick_data["ingest_ns"] = time.monotonic_ns()
+        if tracing.tracer.sample():
+            tick_data["trace"] = True
         if self.on_tick:
             try:
                 await self.on_tick(symbol, tick_data)
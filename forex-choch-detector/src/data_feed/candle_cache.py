@@ -0,0 +1,45 @@
+"""
+Lokal mum (candle) cache'i - restart sonrası yalnızca eksik kuyruğun çekilmesi için
+"""
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+class CandleCache:
+    """Sembol/granularity başına bir CSV dosyasında OHLCV saklar"""
+    
+    def __init__(self, directory: str, max_bars: int = 20000):
+        self.directory = Path(directory)
+        self.max_bars = max_bars
+    
+    def _path(self, symbol: str, granularity: str) -> Path:
+        return self.directory / f"{symbol.replace('/', '_')}_{granularity}.csv"
+    
+    def load(self, symbol: str, granularity: str) -> Optional[pd.DataFrame]:
+        """Cache'lenmiş mumları yükle, yoksa None"""
+        path = self._path(symbol, granularity)
+        if not path.exists():
+            return None
+        try:
+            return pd.read_csv(path, index_col=0, parse_dates=True)
+        except Exception as e:
+            logger.warning("Candle cache okunamadı", path=str(path), error=str(e))
+            return None
+    
+    def save(self, symbol: str, granularity: str, df: pd.DataFrame) -> None:
+        """Mumları cache'e yaz - yalnızca son max_bars bar saklanır"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        df.tail(self.max_bars).to_csv(self._path(symbol, granularity))
+    
+    @staticmethod
+    def merge(cached: Optional[pd.DataFrame], fresh: pd.DataFrame) -> pd.DataFrame:
+        """Cache ile yeni mumları birleştir - çakışan barlarda yeni veri kazanır"""
+        if cached is None or cached.empty:
+            return fresh
+        if fresh.empty:
+            return cached
+        merged = pd.concat([cached, fresh])
+        return merged[~merged.index.duplicated(keep="last")].sort_index()
@@ -2,33 +2,54 @@
 MetaTrader 5 bridge implementasyonu
 """
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
 import structlog
 from datetime import datetime
 
 from data_feed.base import DataFeedBase
+from data_feed.mt5_bridge import TerminalBridge, create_default_bridge
 
 logger = structlog.get_logger(__name__)
 
 class MT5Feed(DataFeedBase):
-    """MetaTrader 5 bridge implementasyonu"""
-    
-    def __init__(self, login: Optional[int] = None, password: Optional[str] = None, server: Optional[str] = None):
+    """
+    MetaTrader 5 bridge implementasyonu
+
+    Tüm semboller tek bir toplu çağrıyla poll edilir; polling aralığı piyasa
+    aktifken ``min_interval``'a doğru daralır, quote'lar durağanken
+    ``max_interval``'a doğru genişler.
+    """
+
+    def __init__(self, login: Optional[int] = None, password: Optional[str] = None, server: Optional[str] = None,
+                 bridge: Optional[TerminalBridge] = None, min_interval: float = 0.02,
+                 max_interval: float = 1.0, backoff_factor: float = 1.5, change_threshold: float = 0.00001):
         super().__init__()
         self.login = login
         self.password = password
         self.server = server
+        self.bridge = bridge or create_default_bridge()
         self.polling_task: Optional[asyncio.Task] = None
         self.polling_interval = 0.1
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.change_threshold = change_threshold
         self.last_ticks: Dict[str, Dict] = {}
-    
+
+        # Sembol sırasına hizalı son quote'lar - değişim tek vektörel karşılaştırmayla bulunur
+        self._symbols: Tuple[str, ...] = ()
+        self._last_bid = np.empty(0)
+        self._last_ask = np.empty(0)
+
     async def connect(self) -> None:
         """MT5'e bağlan"""
         logger.info("MT5'e bağlanılıyor...")
+        await self._call_bridge(self.bridge.connect, self.login, self.password, self.server)
         self.connected = True
         await self._start_heartbeat()
         logger.info("MT5 bağlantısı başarılı")
-    
+
     async def disconnect(self) -> None:
         """MT5 bağlantısını kapat"""
         logger.info("MT5 bağlantısı kapatılıyor...")
@@ -36,51 +57,98 @@ class MT5Feed(DataFeedBase):
         await self._stop_heartbeat()
         if self.polling_task:
             self.polling_task.cancel()
+            self.polling_task = None
+        await self._call_bridge(self.bridge.shutdown)
         logger.info("MT5 bağlantısı kapatıldı")
-    
+
     async def subscribe(self, symbol: str) -> None:
         """Sembole subscribe ol"""
         self.subscribed_symbols.add(symbol)
+        self._rebuild_symbol_index()
         if not self.polling_task:
             self.polling_task = asyncio.create_task(self._polling_loop())
         logger.info("Sembole subscribe olundu", symbol=symbol)
-    
+
     async def unsubscribe(self, symbol: str) -> None:
         """Sembol subscription'ını iptal et"""
         self.subscribed_symbols.discard(symbol)
+        self.last_ticks.pop(symbol, None)
+        self._rebuild_symbol_index()
         if not self.subscribed_symbols and self.polling_task:
             self.polling_task.cancel()
+            self.polling_task = None
         logger.info("Sembol subscription iptal edildi", symbol=symbol)
-    
+
+    def _rebuild_symbol_index(self) -> None:
+        """Sembol sırasını ve son quote array'lerini yeniden kur"""
+        previous = dict(zip(self._symbols, zip(self._last_bid, self._last_ask)))
+        self._symbols = tuple(sorted(self.subscribed_symbols))
+        self._last_bid = np.array([previous.get(s, (np.nan, np.nan))[0] for s in self._symbols], dtype=float)
+        self._last_ask = np.array([previous.get(s, (np.nan, np.nan))[1] for s in self._symbols], dtype=float)
+
+    async def _call_bridge(self, func, *args):
+        """Bloklayan bridge çağrılarını executor'da çalıştır"""
+        if self.bridge.blocking:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+        return func(*args)
+
     async def _polling_loop(self) -> None:
         """Tick polling döngüsü"""
         while self.connected and self.subscribed_symbols:
             try:
-                await self._poll_ticks()
+                changed = await self._poll_ticks()
+                self._adapt_interval(changed)
                 await asyncio.sleep(self.polling_interval)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.warning("Tick polling hatası", error=str(e))
                 await asyncio.sleep(1)
-    
-    async def _poll_ticks(self) -> None:
-        """Tick verilerini poll et (simulated)"""
-        import random
-        
-        for symbol in self.subscribed_symbols.copy():
-            base_price = 1.0800 if symbol == "EUR/USD" else 1.2500
-            bid = base_price + random.uniform(-0.001, 0.001)
-            ask = bid + 0.0001
-            
+
+    def _adapt_interval(self, changed: int) -> None:
+        """Aktivite varsa aralığı daralt, yoksa geri çekil"""
+        if changed:
+            self.polling_interval = max(self.min_interval, self.polling_interval / 2)
+        else:
+            self.polling_interval = min(self.max_interval, self.polling_interval * self.backoff_factor)
+
+    async def _poll_ticks(self) -> int:
+        """Tüm sembolleri tek çağrıda poll et, değişenleri emit et ve sayısını döndür"""
+        symbols = self._symbols
+        if not symbols:
+            return 0
+
+        snapshot = await self._call_bridge(self.bridge.fetch_quotes, symbols)
+        if symbols is not self._symbols:
+            # Poll sırasında subscription değişti - bir sonraki turda tekrar dene
+            return 0
+
+        bid, ask = snapshot.bid, snapshot.ask
+        threshold = self.change_threshold
+        # NaN (ilk quote) karşılaştırmaları False döner, ~(<=) ile değişmiş sayılır
+        changed_mask = ~((np.abs(bid - self._last_bid) <= threshold) & (np.abs(ask - self._last_ask) <= threshold))
+        changed_mask &= ~(np.isnan(bid) | np.isnan(ask))
+        changed = np.flatnonzero(changed_mask)
+        if changed.size == 0:
+            return 0
+
+        self._last_bid[changed] = bid[changed]
+        self._last_ask[changed] = ask[changed]
+
+        for i in changed.tolist():
+            symbol = symbols[i]
+            b = float(bid[i])
+            a = float(ask[i])
+            ts = snapshot.time[i]
             tick_data = {
                 "symbol": symbol,
-                "bid": bid,
-                "ask": ask,
-                "spread": ask - bid,
-                "timestamp": datetime.now().isoformat(),
-                "volume": random.randint(1, 10)
+                "bid": b,
+                "ask": a,
+                "spread": a - b,
+                "timestamp": (datetime.fromtimestamp(ts) if ts else datetime.now()).isoformat(),
+                "volume": float(snapshot.volume[i])
             }
-            
-            last_tick = self.last_ticks.get(symbol)
-            if not last_tick or abs(last_tick["bid"] - bid) > 0.00001:
-                await self._emit_tick(symbol, tick_data)
-                self.last_ticks[symbol] = tick_data
+            self.last_ticks[symbol] = tick_data
+            await self._emit_tick(symbol, tick_data)
+
+        return int(changed.size)
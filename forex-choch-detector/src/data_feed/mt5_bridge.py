@@ -0,0 +1,134 @@
+"""
+MetaTrader 5 terminal bridge'leri - tüm semboller için toplu quote çekimi
+"""
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+@dataclass
+class QuoteSnapshot:
+    """Tek bir toplu çağrının sonucu - sembol sırasına göre hizalı array'ler"""
+    bid: np.ndarray
+    ask: np.ndarray
+    volume: np.ndarray
+    time: np.ndarray
+
+class TerminalBridge(ABC):
+    """MT5Feed'in terminal ile konuştuğu arayüz"""
+
+    # True ise fetch_quotes event loop dışında (executor'da) çağrılır
+    blocking: bool = False
+
+    @abstractmethod
+    def connect(self, login: Optional[int], password: Optional[str], server: Optional[str]) -> None:
+        """Terminale bağlan"""
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """Terminal bağlantısını kapat"""
+        pass
+
+    @abstractmethod
+    def fetch_quotes(self, symbols: Sequence[str]) -> QuoteSnapshot:
+        """Verilen sembollerin son quote'larını tek çağrıda al"""
+        pass
+
+class MetaTrader5Bridge(TerminalBridge):
+    """Resmi MetaTrader5 Python paketi üzerinden bridge"""
+
+    blocking = True
+
+    def __init__(self):
+        import MetaTrader5
+        self.mt5 = MetaTrader5
+
+    @staticmethod
+    def to_terminal_symbol(symbol: str) -> str:
+        """EUR/USD -> EURUSD"""
+        return symbol.replace("/", "")
+
+    def connect(self, login: Optional[int], password: Optional[str], server: Optional[str]) -> None:
+        kwargs = {}
+        if login is not None:
+            kwargs = {"login": login, "password": password, "server": server}
+        if not self.mt5.initialize(**kwargs):
+            raise ConnectionError(f"MT5 initialize başarısız: {self.mt5.last_error()}")
+
+    def shutdown(self) -> None:
+        self.mt5.shutdown()
+
+    def fetch_quotes(self, symbols: Sequence[str]) -> QuoteSnapshot:
+        names = [self.to_terminal_symbol(s) for s in symbols]
+        infos = self.mt5.symbols_get(group=",".join(names)) or ()
+        by_name = {info.name: info for info in infos}
+
+        n = len(names)
+        bid = np.full(n, np.nan)
+        ask = np.full(n, np.nan)
+        volume = np.zeros(n)
+        ts = np.zeros(n)
+        for i, name in enumerate(names):
+            info = by_name.get(name)
+            if info is not None:
+                bid[i] = info.bid
+                ask[i] = info.ask
+                volume[i] = info.volume
+                ts[i] = info.time
+        return QuoteSnapshot(bid=bid, ask=ask, volume=volume, time=ts)
+
+class StubBridge(TerminalBridge):
+    """
+    Terminal olmadan çalışan lokal bridge.
+
+    ``volatility`` sıfırdan büyükse her çağrıda random walk uygular, sıfırsa
+    quote'lar yalnızca ``set_quote`` ile değişir (testler için).
+    """
+
+    def __init__(self, quotes: Optional[Dict[str, Tuple[float, float]]] = None,
+                 volatility: float = 0.0, seed: Optional[int] = None):
+        self.quotes: Dict[str, Tuple[float, float]] = dict(quotes or {})
+        self.volatility = volatility
+        self.rng = random.Random(seed)
+        self.fetch_count = 0
+
+    def connect(self, login: Optional[int], password: Optional[str], server: Optional[str]) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+    def set_quote(self, symbol: str, bid: float, ask: float) -> None:
+        self.quotes[symbol] = (bid, ask)
+
+    def fetch_quotes(self, symbols: Sequence[str]) -> QuoteSnapshot:
+        self.fetch_count += 1
+        n = len(symbols)
+        bid = np.empty(n)
+        ask = np.empty(n)
+        for i, symbol in enumerate(symbols):
+            if symbol not in self.quotes:
+                base_price = 1.0800 if symbol == "EUR/USD" else 1.2500
+                self.quotes[symbol] = (base_price, base_price + 0.0001)
+            b, a = self.quotes[symbol]
+            if self.volatility:
+                step = self.rng.uniform(-self.volatility, self.volatility)
+                b, a = b + step, a + step
+                self.quotes[symbol] = (b, a)
+            bid[i] = b
+            ask[i] = a
+        return QuoteSnapshot(bid=bid, ask=ask, volume=np.ones(n), time=np.full(n, time.time()))
+
+def create_default_bridge() -> TerminalBridge:
+    """MetaTrader5 paketi varsa gerçek bridge'i, yoksa simüle eden stub'ı döndür"""
+    try:
+        return MetaTrader5Bridge()
+    except ImportError:
+        logger.warning("MetaTrader5 paketi bulunamadı - simüle quote'lar kullanılacak")
+        return StubBridge(volatility=0.0005)
@@ -3,25 +3,44 @@ OANDA v20 API streaming data feed implementasyonu
 """
 import asyncio
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Iterable
 import aiohttp
+import pandas as pd
 import structlog
-from datetime import datetime
+from datetime import datetime, timezone
 
 from data_feed.base import DataFeedBase
+from data_feed.candle_cache import CandleCache
 
 logger = structlog.get_logger(__name__)
 
+# OANDA granularity -> bar süresi
+GRANULARITY_DELTAS = {
+    "M1": pd.Timedelta(minutes=1),
+    "M5": pd.Timedelta(minutes=5),
+    "M15": pd.Timedelta(minutes=15),
+    "M30": pd.Timedelta(minutes=30),
+    "H1": pd.Timedelta(hours=1),
+    "H4": pd.Timedelta(hours=4),
+    "D": pd.Timedelta(days=1)
+}
+
+# Tek candles isteğinde dönebilecek maksimum mum sayısı
+MAX_CANDLES_PER_REQUEST = 5000
+
 class OandaFeed(DataFeedBase):
     """
     OANDA v20 streaming API implementasyonu
     """
     
-    def __init__(self, api_key: str, account_id: str, environment: str = "practice"):
+    def __init__(self, api_key: str, account_id: str, environment: str = "practice",
+                 max_retries: int = 3, retry_base_delay: float = 0.5):
         super().__init__()
         self.api_key = api_key
         self.account_id = account_id
         self.environment = environment
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
         
         # API endpoints
         base_url = "https://api-fxpractice.oanda.com" if environment == "practice" else "https://api-fxtrade.oanda.com"
@@ -40,6 +59,10 @@ class OandaFeed(DataFeedBase):
             "Accept-Datetime-Format": "RFC3339"
         }
     
+    @classmethod
+    def from_config(cls, broker) -> "OandaFeed":
+        return cls(api_key=broker.api_key, account_id=broker.account_id, environment=broker.environment)
+    
     async def connect(self) -> None:
         """OANDA API'ye bağlan"""
         try:
@@ -72,21 +95,39 @@ class OandaFeed(DataFeedBase):
         await self._stop_heartbeat()
         
         # Stream'i kapat
-        if self.stream_task:
-            self.stream_task.cancel()
-            try:
-                await self.stream_task
-            except asyncio.CancelledError:
-                pass
-        
-        if self.stream_response:
-            self.stream_response.close()
+        await self._stop_streaming()
         
         if self.session:
             await self.session.close()
+            self.session = None
         
         logger.info("OANDA bağlantısı kapatıldı")
     
+    async def reconnect(self) -> None:
+        """
+        Stream'i yeniden kur - ClientSession ve connection pool korunur.
+        
+        Subscription'lar korunur; stream bir sonraki subscribe çağrısında
+        tüm sembollerle yeniden başlar.
+        """
+        logger.info("OANDA stream'i yeniden kuruluyor...")
+        
+        self.connected = False
+        await self._stop_heartbeat()
+        await self._stop_streaming()
+        
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers=self.headers
+            )
+        
+        await self._validate_account()
+        self.connected = True
+        await self._start_heartbeat()
+        
+        logger.info("OANDA stream'i yeniden kuruldu")
+    
     async def subscribe(self, symbol: str) -> None:
         """Sembole subscribe ol"""
         if not self.connected:
@@ -94,8 +135,13 @@ class OandaFeed(DataFeedBase):
         
         # OANDA formatına çevir (EUR/USD -> EUR_USD)
         oanda_symbol = symbol.replace("/", "_")
+        is_new = oanda_symbol not in self.subscribed_symbols
         self.subscribed_symbols.add(oanda_symbol)
         
+        # Stream instrument listesi başlangıçta sabitlenir - yeni sembolde yeniden başlat
+        if is_new and self.stream_task:
+            await self._stop_streaming()
+        
         # Streaming başlat
         await self._start_streaming()
         
@@ -106,9 +152,10 @@ class OandaFeed(DataFeedBase):
         oanda_symbol = symbol.replace("/", "_")
         self.subscribed_symbols.discard(oanda_symbol)
         
-        # Eğer hiç symbol kalmadıysa streaming'i durdur
-        if not self.subscribed_symbols and self.stream_task:
-            self.stream_task.cancel()
+        # Eğer hiç symbol kalmadıysa streaming'i durdur, kalanlar varsa onlarla yeniden başlat
+        if self.stream_task:
+            await self._stop_streaming()
+            await self._start_streaming()
         
         logger.info("Sembol subscription iptal edildi", symbol=symbol)
     
@@ -134,6 +181,20 @@ class OandaFeed(DataFeedBase):
         
         self.stream_task = asyncio.create_task(self._stream_prices())
     
+    async def _stop_streaming(self) -> None:
+        """Aktif price stream'ini durdur"""
+        task, self.stream_task = self.stream_task, None
+        if task and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        
+        if self.stream_response:
+            self.stream_response.close()
+            self.stream_response = None
+    
     async def _stream_prices(self) -> None:
         """Price stream döngüsü"""
         instruments = ",".join(self.subscribed_symbols)
@@ -156,13 +217,7 @@ class OandaFeed(DataFeedBase):
                         break
                     
                     try:
-                        line = line.decode('utf-8').strip()
-                        if not line:
-                            continue
-                        
-                        data = json.loads(line)
-                        await self._process_stream_data(data)
-                        
+                        await self._handle_line(line)
                     except json.JSONDecodeError:
                         continue
                     except Exception as e:
@@ -172,6 +227,12 @@ class OandaFeed(DataFeedBase):
             logger.error("Price streaming hatası", error=str(e))
             await self._emit_error(e)
     
+    async def _handle_line(self, raw: bytes) -> None:
+        """Stream'in tek satırını çöz ve işle"""
+        line = raw.decode('utf-8').strip()
+        if line:
+            await self._process_stream_data(json.loads(line))
+    
     async def _process_stream_data(self, data: Dict[str, Any]) -> None:
         """Stream verisini işle"""
         msg_type = data.get("type")
@@ -194,20 +255,169 @@ class OandaFeed(DataFeedBase):
         best_bid = float(bids[0].get("price", 0))
         best_ask = float(asks[0].get("price", 0))
         
-        # Tick verisi oluştur
+        # Tick verisi oluştur - zaman damgası broker'ın UTC saatidir, mumlarla aynı eksende
         tick_data = {
             "symbol": instrument.replace("_", "/"),
             "bid": best_bid,
             "ask": best_ask,
             "spread": best_ask - best_bid,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": data.get("time") or datetime.now(timezone.utc).isoformat(),
             "raw_data": data
         }
         
-        await self._emit_tick(instrument, tick_data)
+        await self._emit_tick(tick_data["symbol"], tick_data)
     
     async def _process_heartbeat(self, data: Dict[str, Any]) -> None:
         """Heartbeat mesajını işle"""
         import time
         self.last_heartbeat = time.time()
         logger.debug("OANDA heartbeat alındı", time=data.get("time"))
+
+    async def fetch_candles(self, symbol: str, granularity: str = "M1", count: Optional[int] = None,
+                            from_time: Optional[pd.Timestamp] = None,
+                            to_time: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Tamamlanmış mumları çek - istek limiti aşılırsa sayfalanır.
+        
+        ``from_time`` verilirse o andan (hariç) ileriye doğru, verilmezse
+        ``to_time``'dan (varsayılan şimdi) geriye doğru ``count`` mum çekilir.
+        Index naive UTC'dir.
+        """
+        if self.session is None:
+            raise RuntimeError("Bağlantı kurulmamış")
+        
+        instrument = symbol.replace("/", "_")
+        url = f"{self.rest_url}/instruments/{instrument}/candles"
+        pages: List[pd.DataFrame] = []
+        
+        if from_time is not None:
+            cursor = pd.Timestamp(from_time)
+            remaining = count
+            while True:
+                page_size = MAX_CANDLES_PER_REQUEST if remaining is None else min(remaining, MAX_CANDLES_PER_REQUEST)
+                params = {
+                    "price": "M",
+                    "granularity": granularity,
+                    "from": self._format_time(cursor),
+                    "count": page_size,
+                    "includeFirst": "false"
+                }
+                data = await self._get_json(url, params)
+                raw = data.get("candles", [])
+                page = self._candles_to_frame(raw)
+                if to_time is not None:
+                    page = page[page.index <= pd.Timestamp(to_time)]
+                if not page.empty:
+                    pages.append(page)
+                    cursor = page.index[-1]
+                if remaining is not None:
+                    remaining -= len(page)
+                # Son sayfa: limit dolmadı, hedef zamana ulaşıldı ya da istenen sayı tamamlandı
+                if (len(raw) < page_size or page.empty or (remaining is not None and remaining <= 0)
+                        or (to_time is not None and cursor >= pd.Timestamp(to_time))):
+                    break
+        else:
+            remaining = count or MAX_CANDLES_PER_REQUEST
+            cursor = pd.Timestamp(to_time) if to_time is not None else None
+            while remaining > 0:
+                page_size = min(remaining, MAX_CANDLES_PER_REQUEST)
+                params = {"price": "M", "granularity": granularity, "count": page_size}
+                if cursor is not None:
+                    params["to"] = self._format_time(cursor)
+                data = await self._get_json(url, params)
+                raw = data.get("candles", [])
+                page = self._candles_to_frame(raw)
+                if page.empty:
+                    break
+                pages.insert(0, page)
+                remaining -= len(page)
+                cursor = page.index[0]
+                if len(raw) < page_size:
+                    break
+        
+        if not pages:
+            return self._candles_to_frame([])
+        df = pd.concat(pages)
+        return df[~df.index.duplicated(keep="last")].sort_index()
+    
+    async def backfill(self, symbols: Iterable[str], bars: int, granularity: str = "M1",
+                       cache: Optional[CandleCache] = None, max_concurrency: int = 4) -> Dict[str, pd.DataFrame]:
+        """
+        Tüm semboller için son ``bars`` mumu eşzamanlı çek.
+        
+        Cache varsa yalnızca son cache'lenmiş bardan sonraki eksik kuyruk istenir.
+        Başarısız semboller loglanır ve sonuçtan çıkarılır.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        bar_delta = GRANULARITY_DELTAS.get(granularity, pd.Timedelta(minutes=1))
+        
+        async def _backfill_symbol(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                cached = cache.load(symbol, granularity) if cache else None
+                now = pd.Timestamp.now(tz="UTC").tz_convert(None)
+                if cached is not None and len(cached) >= bars and now - cached.index[-1] < bar_delta * bars:
+                    fresh = await self.fetch_candles(symbol, granularity, from_time=cached.index[-1])
+                else:
+                    cached = None
+                    fresh = await self.fetch_candles(symbol, granularity, count=bars)
+                
+                merged = CandleCache.merge(cached, fresh)
+                if cache:
+                    cache.save(symbol, granularity, merged)
+                logger.info("Geçmiş veri yüklendi", symbol=symbol, bars=len(merged),
+                            fetched=len(fresh), cached=0 if cached is None else len(cached))
+                return merged.tail(bars)
+        
+        symbols = list(symbols)
+        results = await asyncio.gather(*(_backfill_symbol(s) for s in symbols), return_exceptions=True)
+        
+        history = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error("Geçmiş veri yüklenemedi", symbol=symbol, error=str(result))
+            else:
+                history[symbol] = result
+        return history
+    
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET isteği - 429/5xx ve ağ hatalarında exponential backoff ile tekrar dener"""
+        last_error: Optional[Exception] = None
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    last_error = Exception(f"İstek başarısız: {response.status}")
+                    if response.status != 429 and response.status < 500:
+                        raise last_error
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_base_delay * (2 ** attempt))
+        
+        raise last_error
+    
+    @staticmethod
+    def _format_time(ts: pd.Timestamp) -> str:
+        """Naive UTC timestamp -> RFC3339"""
+        ts = pd.Timestamp(ts)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert(None)
+        return ts.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    
+    @staticmethod
+    def _candles_to_frame(candles: List[Dict[str, Any]]) -> pd.DataFrame:
+        """OANDA candle listesini OHLCV DataFrame'e çevir - tamamlanmamış mum atlanır"""
+        complete = [c for c in candles if c.get("complete", True) and "mid" in c]
+        index = pd.DatetimeIndex(
+            pd.to_datetime([c["time"] for c in complete], utc=True)
+        ).tz_convert(None)
+        return pd.DataFrame({
+            "open": [float(c["mid"]["o"]) for c in complete],
+            "high": [float(c["mid"]["h"]) for c in complete],
+            "low": [float(c["mid"]["l"]) for c in complete],
+            "close": [float(c["mid"]["c"]) for c in complete],
+            "volume": [int(c.get("volume", 0)) for c in complete]
+        }, index=index)
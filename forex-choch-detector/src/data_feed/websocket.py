@@ -0,0 +1,256 @@
+"""
+Genel amaçlı WebSocket push data feed implementasyonu
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterable
+import aiohttp
+import structlog
+
+from data_feed.base import DataFeedBase
+from core import metrics
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_FIELD_MAP = {
+    "symbol": "symbol",
+    "bid": "bid",
+    "ask": "ask",
+    "timestamp": "timestamp",
+    "volume": "volume"
+}
+
+class WebSocketFeed(DataFeedBase):
+    """
+    JSON quote yayınlayan herhangi bir WebSocket sunucusu için push feed.
+
+    Bir frame tek bir quote (dict), quote listesi ya da ``batch_key`` altında
+    quote listesi taşıyan bir dict olabilir. Alan isimleri ``field_map`` ile
+    sunucu formatına eşlenir.
+    """
+
+    def __init__(self, url: str, field_map: Optional[Dict[str, str]] = None,
+                 batch_key: Optional[str] = "quotes", heartbeat_interval: int = 30,
+                 max_reconnect_attempts: int = 10, reconnect_base_delay: float = 0.5,
+                 reconnect_max_delay: float = 30.0):
+        super().__init__()
+        self.url = url
+        self.field_map = {**DEFAULT_FIELD_MAP, **(field_map or {})}
+        self.batch_key = batch_key
+        self.heartbeat_interval = heartbeat_interval
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+
+        # Session ve socket
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.reader_task: Optional[asyncio.Task] = None
+
+        # İstatistikler
+        self.frames_received = 0
+        self.quotes_received = 0
+        self.reconnect_count = 0
+    
+    @classmethod
+    def from_config(cls, broker) -> "WebSocketFeed":
+        if not broker.url:
+            raise ValueError("websocket broker için broker.url gerekli")
+        return cls(url=broker.url, field_map=broker.field_map, batch_key=broker.batch_key,
+                   heartbeat_interval=broker.heartbeat_interval)
+
+    async def connect(self) -> None:
+        """WebSocket sunucusuna bağlan"""
+        try:
+            logger.info("WebSocket sunucusuna bağlanılıyor...", url=self.url)
+
+            self.session = aiohttp.ClientSession()
+            await self._open_socket()
+
+            self.connected = True
+            await self._start_heartbeat()
+            self.reader_task = asyncio.create_task(self._reader_loop())
+
+            logger.info("WebSocket bağlantısı başarılı")
+
+        except Exception as e:
+            logger.error("WebSocket bağlantı hatası", error=str(e))
+            await self.disconnect()
+            raise
+
+    async def disconnect(self) -> None:
+        """WebSocket bağlantısını kapat"""
+        logger.info("WebSocket bağlantısı kapatılıyor...")
+
+        self.connected = False
+        await self._stop_heartbeat()
+
+        if self.reader_task:
+            self.reader_task.cancel()
+            try:
+                await self.reader_task
+            except asyncio.CancelledError:
+                pass
+            self.reader_task = None
+
+        if self.ws and not self.ws.closed:
+            await self.ws.close()
+        self.ws = None
+
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+        logger.info("WebSocket bağlantısı kapatıldı")
+
+    async def subscribe(self, symbol: str) -> None:
+        """Sembole subscribe ol"""
+        if not self.connected:
+            raise RuntimeError("Bağlantı kurulmamış")
+
+        self.subscribed_symbols.add(symbol)
+        await self._send_control("subscribe", [symbol])
+        logger.info("Sembole subscribe olundu", symbol=symbol)
+
+    async def unsubscribe(self, symbol: str) -> None:
+        """Sembol subscription'ını iptal et"""
+        self.subscribed_symbols.discard(symbol)
+        await self._send_control("unsubscribe", [symbol])
+        logger.info("Sembol subscription iptal edildi", symbol=symbol)
+
+    async def _open_socket(self) -> None:
+        """Socket'i aç - ping/pong heartbeat aiohttp tarafından yürütülür"""
+        self.ws = await self.session.ws_connect(
+            self.url,
+            heartbeat=self.heartbeat_interval,
+            autoping=True
+        )
+
+    async def _send_control(self, action: str, symbols: List[str]) -> None:
+        """Subscribe/unsubscribe kontrol mesajı gönder"""
+        if self.ws is None or self.ws.closed or not symbols:
+            return
+        await self.ws.send_json({"action": action, "symbols": symbols})
+
+    async def _reader_loop(self) -> None:
+        """Frame okuma döngüsü - kopmada yeniden bağlanır ve resubscribe eder"""
+        attempt = 0
+        while self.connected:
+            try:
+                await self._read_frames()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("WebSocket okuma hatası", error=str(e))
+
+            if not self.connected:
+                break
+
+            # Yeniden bağlanma
+            while self.connected:
+                if attempt >= self.max_reconnect_attempts:
+                    self.connected = False
+                    await self._emit_error(ConnectionError("WebSocket yeniden bağlantı başarısız"))
+                    return
+                delay = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+                attempt += 1
+                await asyncio.sleep(delay)
+                try:
+                    # Eski socket açık kalmasın - yenisi üzerine yazılır
+                    if self.ws is not None and not self.ws.closed:
+                        await self.ws.close()
+                    await self._open_socket()
+                    await self._send_control("subscribe", sorted(self.subscribed_symbols))
+                    self.reconnect_count += 1
+                    metrics.RECONNECTS.inc("websocket")
+                    logger.info("WebSocket yeniden bağlandı", attempt=attempt)
+                    break
+                except Exception as e:
+                    logger.warning(f"Yeniden bağlanma denemesi {attempt} başarısız", error=str(e))
+
+    async def _read_frames(self) -> None:
+        """Socket kapanana kadar frame'leri oku"""
+        async for msg in self.ws:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                self.last_heartbeat = time.time()
+                await self._process_frame(msg.data)
+            elif msg.type == aiohttp.WSMsgType.BINARY:
+                self.last_heartbeat = time.time()
+                await self._process_frame(msg.data.decode('utf-8'))
+            elif msg.type == aiohttp.WSMsgType.ERROR:
+                raise ConnectionError(f"WebSocket hatası: {self.ws.exception()}")
+
+        if self.connected:
+            raise ConnectionError("WebSocket bağlantısı sunucu tarafından kapatıldı")
+
+    async def _process_frame(self, raw: str) -> None:
+        """Frame'i decode et ve içindeki her quote için tick emit et"""
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+
+        self.frames_received += 1
+        for tick_data in self._decode_quotes(payload):
+            self.quotes_received += 1
+            await self._emit_tick(tick_data["symbol"], tick_data)
+
+    def _decode_quotes(self, payload: Any) -> List[Dict[str, Any]]:
+        """Tekil ya da batch frame'i normalize tick listesine çevir"""
+        if isinstance(payload, list):
+            quotes: Iterable = payload
+        elif isinstance(payload, dict) and self.batch_key and isinstance(payload.get(self.batch_key), list):
+            quotes = payload[self.batch_key]
+        elif isinstance(payload, dict):
+            quotes = (payload,)
+        else:
+            return []
+
+        fm = self.field_map
+        symbol_key, bid_key, ask_key = fm["symbol"], fm["bid"], fm["ask"]
+        ts_key, volume_key = fm["timestamp"], fm["volume"]
+        now = None
+        ticks = []
+
+        for quote in quotes:
+            if not isinstance(quote, dict):
+                continue
+            symbol = quote.get(symbol_key)
+            bid = quote.get(bid_key)
+            ask = quote.get(ask_key)
+            if symbol is None or bid is None or ask is None:
+                continue
+            if self.subscribed_symbols and symbol not in self.subscribed_symbols:
+                continue
+
+            try:
+                bid = float(bid)
+                ask = float(ask)
+            except (TypeError, ValueError):
+                # Bozuk quote atlanır - okuma döngüsü bunu kopma sanıp yeniden bağlanmasın
+                logger.warning("Geçersiz quote atlandı", symbol=symbol, bid=bid, ask=ask)
+                continue
+            timestamp = quote.get(ts_key)
+            if timestamp is None:
+                if now is None:
+                    now = datetime.now().isoformat()
+                timestamp = now
+
+            ticks.append({
+                "symbol": symbol,
+                "bid": bid,
+                "ask": ask,
+                "spread": ask - bid,
+                "timestamp": timestamp,
+                "volume": quote.get(volume_key, 1)
+            })
+
+        return ticks
+
+    async def _send_heartbeat(self) -> None:
+        """Uygulama seviyesinde heartbeat - socket ping'i aiohttp yönetir"""
+        if self.last_heartbeat is None:
+            self.last_heartbeat = time.time()
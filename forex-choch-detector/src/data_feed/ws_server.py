@@ -0,0 +1,199 @@
+"""
+Lokal WebSocket quote/echo sunucusu - WebSocketFeed testleri ve offline throughput ölçümü için
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from aiohttp import web, WSMsgType
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+class QuoteServer:
+    """
+    Subscribe olunan semboller için batch halinde sentetik quote yayınlayan sunucu.
+
+    Protokol WebSocketFeed ile aynıdır: ``{"action": "subscribe", "symbols": [...]}``
+    ile abone olunur, quote'lar ``{"quotes": [...]}`` frame'leri olarak gelir.
+    ``{"action": "echo", ...}`` mesajları olduğu gibi geri gönderilir.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, batch_size: int = 50,
+                 interval: float = 0.01, base_prices: Optional[Dict[str, float]] = None):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.interval = interval
+        self.base_prices = dict(base_prices or {})
+
+        self.app = web.Application()
+        self.app.router.add_get("/ws", self._handle_ws)
+        self.runner: Optional[web.AppRunner] = None
+        self.clients: Dict[web.WebSocketResponse, Set[str]] = {}
+        self.stream_task: Optional[asyncio.Task] = None
+        self.frames_sent = 0
+        self.quotes_sent = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    async def start(self, stream: bool = True) -> None:
+        """Sunucuyu başlat - port 0 ise boş bir port seçilir"""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self.runner.addresses[0][1]
+        if stream:
+            self.stream_task = asyncio.create_task(self._stream_loop())
+        logger.info("Quote sunucusu başlatıldı", url=self.url)
+
+    async def stop(self) -> None:
+        """Sunucuyu durdur"""
+        if self.stream_task:
+            self.stream_task.cancel()
+            try:
+                await self.stream_task
+            except asyncio.CancelledError:
+                pass
+            self.stream_task = None
+        for ws in list(self.clients):
+            await ws.close()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def drop_clients(self) -> None:
+        """Tüm client bağlantılarını kopar - reconnect testleri için"""
+        for ws in list(self.clients):
+            await ws.close()
+
+    async def publish(self, quotes: List[Dict[str, Any]]) -> None:
+        """Verilen quote'ları tek bir batch frame olarak abonelere gönder"""
+        for ws, symbols in list(self.clients.items()):
+            batch = [q for q in quotes if q.get("symbol") in symbols]
+            if batch and not ws.closed:
+                await ws.send_str(json.dumps({"quotes": batch}))
+                self.frames_sent += 1
+                self.quotes_sent += len(batch)
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """Client bağlantısını yönet"""
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        self.clients[ws] = set()
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+
+                action = data.get("action")
+                if action == "subscribe":
+                    self.clients[ws].update(data.get("symbols", []))
+                elif action == "unsubscribe":
+                    self.clients[ws].difference_update(data.get("symbols", []))
+                elif action == "echo":
+                    await ws.send_str(msg.data)
+        finally:
+            self.clients.pop(ws, None)
+
+        return ws
+
+    def _next_quotes(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Random walk ile bir batch sentetik quote üret"""
+        timestamp = datetime.now().isoformat()
+        quotes = []
+        for i in range(self.batch_size):
+            symbol = symbols[i % len(symbols)]
+            price = self.base_prices.get(symbol, 1.0800) + random.uniform(-0.0002, 0.0002)
+            self.base_prices[symbol] = price
+            quotes.append({
+                "symbol": symbol,
+                "bid": round(price, 5),
+                "ask": round(price + 0.0001, 5),
+                "timestamp": timestamp,
+                "volume": 1
+            })
+        return quotes
+
+    async def _stream_loop(self) -> None:
+        """Abonelere periyodik olarak batch quote gönder"""
+        while True:
+            symbols = sorted(set().union(*self.clients.values())) if self.clients else []
+            if symbols:
+                await self.publish(self._next_quotes(symbols))
+            await asyncio.sleep(self.interval)
+
+async def run_throughput_benchmark(symbols: List[str], duration: float = 5.0,
+                                   batch_size: int = 50, interval: float = 0.0) -> Dict[str, Any]:
+    """Lokal sunucu + WebSocketFeed ile uçtan uca decode throughput'unu ölç"""
+    from data_feed.websocket import WebSocketFeed
+
+    server = QuoteServer(batch_size=batch_size, interval=interval)
+    await server.start()
+
+    feed = WebSocketFeed(url=server.url)
+    received = 0
+
+    async def on_tick(symbol, tick_data):
+        nonlocal received
+        received += 1
+
+    feed.on_tick = on_tick
+    await feed.connect()
+    for symbol in symbols:
+        await feed.subscribe(symbol)
+
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - start
+
+    await feed.disconnect()
+    await server.stop()
+
+    return {
+        "ticks": received,
+        "frames": feed.frames_received,
+        "elapsed": elapsed,
+        "ticks_per_sec": received / elapsed if elapsed else 0.0
+    }
+
+def main() -> None:
+    """Komut satırı girişi: sunucuyu çalıştır ya da throughput ölç"""
+    parser = argparse.ArgumentParser(description="Lokal WebSocket quote sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--bench", action="store_true", help="Throughput benchmark çalıştır")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--symbols", default="EUR/USD,GBP/USD,USD/JPY")
+    args = parser.parse_args()
+
+    if args.bench:
+        result = asyncio.run(run_throughput_benchmark(
+            args.symbols.split(","), args.duration, args.batch_size, args.interval
+        ))
+        print(json.dumps(result, indent=2))
+        return
+
+    async def _serve():
+        server = QuoteServer(args.host, args.port, args.batch_size, args.interval)
+        await server.start()
+        await asyncio.Event().wait()
+
+    asyncio.run(_serve())
+
+if __name__ == "__main__":
+    main()
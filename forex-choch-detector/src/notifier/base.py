@@ -7,10 +7,20 @@ from typing import Dict, Any
 class NotifierBase(ABC):
     """Tüm bildirim servisleri için temel sınıf"""
     
+    # Kanal adı - dispatcher istatistikleri ve kanal bazlı ayarlar için
+    name = "notifier"
+    
     def __init__(self):
         self.initialized = False
         self.sent_count = 0
         self.failed_count = 0
+        # Dispatcher'ın tekrar cache'i tarafından bu kanala hiç iletilmeyen uyarılar
+        self.suppressed_count = 0
+    
+    @classmethod
+    def from_config(cls, settings) -> "NotifierBase":
+        """config.notifications'tan notifier oluştur - eklenti registry'si bu yolu kullanır"""
+        return cls()
     
     @abstractmethod
     async def initialize(self) -> None:
@@ -31,5 +41,6 @@ class NotifierBase(ABC):
         return {
             "initialized": self.initialized,
             "sent_count": self.sent_count,
-            "failed_count": self.failed_count
+            "failed_count": self.failed_count,
+            "suppressed_count": self.suppressed_count
         }
@@ -0,0 +1,66 @@
+"""
+Bildirim öncesi tekrar bastırma - TTL'li ve boyutu LRU ile sınırlı cache
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class AlertDeduplicator:
+    """
+    (sembol, pattern, yön, timeframe, fiyat kovası) anahtarıyla ``ttl`` saniye
+    içinde tekrar eden uyarıları bastırır.
+    
+    Süre ilk gönderimden itibaren sayılır; bastırılan tekrarlar süreyi uzatmaz,
+    böylece uzun süren dalgalanmada uyarı her ``ttl``'de en fazla bir kez gider.
+    Fiyat kovaları logaritmiktir (``price_bucket_bps`` genişliğinde), böylece
+    EUR/USD ile USD/JPY aynı ayarla çalışır.
+    """
+    
+    def __init__(self, ttl: float = 300.0, max_size: int = 10000, price_bucket_bps: float = 5.0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._log_step = math.log1p(price_bucket_bps / 10000)
+        self._expiry: "OrderedDict[Hashable, float]" = OrderedDict()
+        
+        self.allowed = 0
+        self.suppressed = 0
+        self.evicted = 0
+    
+    def price_bucket(self, price: float) -> int:
+        if price <= 0:
+            return 0
+        return int(math.floor(math.log(price) / self._log_step))
+    
+    def make_key(self, symbol: str, pattern: str, direction: Optional[str], timeframe: str,
+                 price: Optional[float]) -> Tuple:
+        bucket = self.price_bucket(price) if price is not None else None
+        return (symbol, pattern, direction, timeframe, bucket)
+    
+    def allow(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """Anahtar ttl içinde görülmediyse True döner ve kaydeder"""
+        now = time.monotonic() if now is None else now
+        expires_at = self._expiry.get(key)
+        if expires_at is not None and expires_at > now:
+            self._expiry.move_to_end(key)
+            self.suppressed += 1
+            return False
+        
+        self._expiry[key] = now + self.ttl
+        self._expiry.move_to_end(key)
+        while len(self._expiry) > self.max_size:
+            self._expiry.popitem(last=False)
+            self.evicted += 1
+        self.allowed += 1
+        return True
+    
+    def __len__(self) -> int:
+        return len(self._expiry)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "allowed": self.allowed,
+            "suppressed": self.suppressed,
+            "evicted": self.evicted,
+            "size": len(self._expiry)
+        }
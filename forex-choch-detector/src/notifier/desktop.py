@@ -10,6 +10,8 @@ logger = structlog.get_logger(__name__)
 class DesktopNotifier(NotifierBase):
     """Desktop bildirim sınıfı"""
     
+    name = "desktop"
+    
     def __init__(self):
         super().__init__()
         self.platform = sys.platform
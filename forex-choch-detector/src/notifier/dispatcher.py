@@ -0,0 +1,292 @@
+"""
+Bloklamayan bildirim dağıtıcısı - kanal başına kuyruk, digest birleştirme ve circuit breaker
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Any, Tuple
+import structlog
+
+from notifier.base import NotifierBase
+from notifier.dedup import AlertDeduplicator
+from core import metrics
+from core.tracing import tracer
+
+logger = structlog.get_logger(__name__)
+
+class CircuitBreaker:
+    """
+    Art arda ``failure_threshold`` hatadan sonra kanalı ``reset_timeout`` saniye
+    kapatır; süre dolunca tek bir deneme gönderimine (half-open) izin verir.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+    
+    def allow(self) -> bool:
+        """Gönderim denenebilir mi"""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        return self.state != self.OPEN
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = self.CLOSED
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit breaker açıldı", failures=self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+class ChannelWorker:
+    """Tek bir notifier'ın kuyruğunu arka planda boşaltan worker"""
+    
+    def __init__(self, notifier: NotifierBase, queue_size: int = 1000, coalesce_window: float = 2.0,
+                 timeout: float = 10.0, breaker: Optional[CircuitBreaker] = None, max_digest: int = 20):
+        self.notifier = notifier
+        self.name = getattr(notifier, "name", type(notifier).__name__)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.coalesce_window = coalesce_window
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.max_digest = max_digest
+        self._task: Optional[asyncio.Task] = None
+        # Gönderim sürerken notifier değiştirilmesin
+        self._sending = asyncio.Lock()
+        
+        self.enqueued = 0
+        self.dropped = 0
+        self.short_circuited = 0
+        self.digests_sent = 0
+        self.timeouts = 0
+    
+    def offer(self, message: str, alert_type: str, trace: Optional[Tuple[str, int]] = None) -> None:
+        """Kuyruğa ekle - doluysa en eski uyarı düşürülür"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+        self.queue.put_nowait((message, alert_type, trace))
+        self.enqueued += 1
+    
+    async def _collect(self) -> List[Tuple[str, str, Optional[Tuple[str, int]]]]:
+        """İlk uyarıdan sonra pencere boyunca gelenleri topla"""
+        batch = [await self.queue.get()]
+        if self.coalesce_window > 0:
+            deadline = time.monotonic() + self.coalesce_window
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+    
+    def _build_digest(self, batch: List[Tuple[str, str, Optional[Tuple[str, int]]]]) -> Tuple[str, str]:
+        """Birden fazla uyarıyı tek mesajda birleştir"""
+        if len(batch) == 1:
+            return batch[0][:2]
+        
+        alert_types = {alert_type for _, alert_type, _ in batch}
+        alert_type = alert_types.pop() if len(alert_types) == 1 else "digest"
+        shown = batch[-self.max_digest:]
+        parts = [f"📋 {len(batch)} alerts"]
+        if len(batch) > len(shown):
+            parts.append(f"(+{len(batch) - len(shown)} earlier alerts omitted)")
+        parts.extend(message for message, _, _ in shown)
+        return "\n\n".join(parts), alert_type
+    
+    async def _deliver(self, batch: List[Tuple[str, str, Optional[Tuple[str, int]]]]) -> None:
+        if not self.breaker.allow():
+            self.short_circuited += len(batch)
+            return
+        
+        message, alert_type = self._build_digest(batch)
+        started = time.perf_counter_ns()
+        try:
+            success = await asyncio.wait_for(
+                self.notifier.send_notification(message, alert_type), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            success = False
+            logger.warning("Bildirim zaman aşımı", channel=self.name, timeout=self.timeout)
+        except Exception as e:
+            success = False
+            logger.error("Bildirim kanalı hatası", channel=self.name, error=str(e))
+        metrics.NOTIFICATION.observe_ns(time.perf_counter_ns() - started)
+        
+        if success:
+            self.breaker.record_success()
+            if len(batch) > 1:
+                self.digests_sent += 1
+            sent_ns = time.monotonic_ns()
+            for _, _, trace in batch:
+                if trace is not None:
+                    tracer.record("notify_sent", trace[0], trace[1], sent_ns)
+        else:
+            self.breaker.record_failure()
+    
+    async def run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                async with self._sending:
+                    await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    async def swap_notifier(self, notifier: NotifierBase) -> NotifierBase:
+        """Kuyruğu koruyarak notifier'ı değiştir - süren gönderim bitince; eski notifier döner"""
+        async with self._sending:
+            previous, self.notifier = self.notifier, notifier
+        return previous
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name=f"notifier-{self.name}")
+    
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Kuyruktaki uyarıları göndermeyi bekle, sonra worker'ı durdur"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Bildirim kuyruğu boşaltılamadı", channel=self.name, pending=self.queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "short_circuited": self.short_circuited,
+            "digests_sent": self.digests_sent,
+            "timeouts": self.timeouts,
+            "breaker": self.breaker.state
+        }
+
+class NotificationDispatcher:
+    """
+    Detector callback'lerinin yalnızca kuyruğa yazdığı bildirim dağıtıcısı.
+    
+    Her notifier kendi sınırlı kuyruğunu kendi task'ında boşaltır; yavaş veya
+    çökmüş bir kanal ne tick işlemeyi ne de diğer kanalları bekletir.
+    """
+    
+    def __init__(self, notifiers: List[NotifierBase], queue_size: int = 1000,
+                 coalesce_window: float = 2.0, timeout: float = 10.0,
+                 channel_timeouts: Optional[Dict[str, float]] = None,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 deduplicator: Optional[AlertDeduplicator] = None):
+        channel_timeouts = channel_timeouts or {}
+        self.deduplicator = deduplicator
+        self.workers: List[ChannelWorker] = []
+        for notifier in notifiers:
+            name = getattr(notifier, "name", type(notifier).__name__)
+            self.workers.append(ChannelWorker(
+                notifier,
+                queue_size=queue_size,
+                coalesce_window=coalesce_window,
+                timeout=channel_timeouts.get(name, timeout),
+                breaker=CircuitBreaker(failure_threshold, reset_timeout)
+            ))
+    
+    def dispatch(self, message: str, alert_type: str = "info", dedup_key: Optional[Tuple] = None,
+                 trace: Optional[Tuple[str, int]] = None) -> bool:
+        """Uyarıyı tüm kanalların kuyruğuna ekle - hiç beklemez; tekrar ise False döner
+        
+        ``trace`` (sembol, ingest_ns) verilirse kuyruğa giriş ve gönderim süreleri izlenir.
+        """
+        if dedup_key is not None and self.deduplicator is not None:
+            if not self.deduplicator.allow(dedup_key):
+                for worker in self.workers:
+                    worker.notifier.suppressed_count += 1
+                return False
+        
+        if trace is not None and trace[1] is None:
+            trace = None
+        if trace is not None:
+            tracer.record("notify_enqueued", trace[0], trace[1])
+        for worker in self.workers:
+            worker.offer(message, alert_type, trace)
+        return True
+    
+    async def reconfigure(self, notifiers: List[NotifierBase], queue_size: int = 1000,
+                          coalesce_window: float = 2.0, timeout: float = 10.0,
+                          channel_timeouts: Optional[Dict[str, float]] = None,
+                          failure_threshold: int = 5, reset_timeout: float = 30.0,
+                          deduplicator: Optional[AlertDeduplicator] = None) -> List[NotifierBase]:
+        """
+        Kanal ayarlarını bekleyen uyarıları düşürmeden değiştir.
+        
+        Aynı adlı kanalın worker'ı ve kuyruğu korunur, yalnızca notifier nesnesi
+        ve zamanlama ayarları değişir. Kaldırılan kanallar kuyruklarını boşaltıp
+        durur, yeni kanallar başlatılır. ``queue_size`` yalnızca yeni kanallara
+        uygulanır. Kapatılması gereken eski notifier'lar döner.
+        """
+        channel_timeouts = channel_timeouts or {}
+        current = {worker.name: worker for worker in self.workers}
+        started = any(worker._task is not None for worker in self.workers)
+        retired: List[NotifierBase] = []
+        workers: List[ChannelWorker] = []
+        for notifier in notifiers:
+            name = getattr(notifier, "name", type(notifier).__name__)
+            worker = current.pop(name, None)
+            if worker is None:
+                worker = ChannelWorker(notifier, queue_size=queue_size,
+                                       breaker=CircuitBreaker(failure_threshold, reset_timeout))
+                if started:
+                    worker.start()
+            else:
+                retired.append(await worker.swap_notifier(notifier))
+                worker.breaker.failure_threshold = failure_threshold
+                worker.breaker.reset_timeout = reset_timeout
+            worker.coalesce_window = coalesce_window
+            worker.timeout = channel_timeouts.get(name, timeout)
+            workers.append(worker)
+        
+        # Yeni uyarılar artık yalnızca kalan kanallara gider; kaldırılanlar kuyruğunu bitirir
+        self.workers = workers
+        self.deduplicator = deduplicator
+        for worker in current.values():
+            await worker.stop()
+            retired.append(worker.notifier)
+        logger.info("Bildirim kanalları yeniden yapılandırıldı", channels=[w.name for w in workers],
+                    removed=sorted(current))
+        return retired
+    
+    def make_key(self, symbol: str, pattern: str, direction: Optional[str] = None,
+                 timeframe: str = "M1", price: Optional[float] = None) -> Optional[Tuple]:
+        """Tekrar anahtarı - cache kapalıysa None"""
+        if self.deduplicator is None:
+            return None
+        return self.deduplicator.make_key(symbol, pattern, direction, timeframe, price)
+    
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+    
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        await asyncio.gather(*(worker.stop(drain_timeout) for worker in self.workers))
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {worker.name: worker.get_stats() for worker in self.workers}
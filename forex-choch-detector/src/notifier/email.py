@@ -1,37 +1,231 @@
 """
 Email bildirim servisi
 """
+import asyncio
+import smtplib
+import ssl
+import time
+from collections import deque
+from email.message import EmailMessage
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
 import structlog
 from notifier.base import NotifierBase
 
 logger = structlog.get_logger(__name__)
 
 class EmailNotifier(NotifierBase):
-    """Email bildirim sınıfı"""
+    """
+    Email bildirim sınıfı.
     
-    def __init__(self, smtp_host: str, smtp_port: int, smtp_user: str, smtp_password: str):
+    Kimliği doğrulanmış SMTP bağlantıları küçük bir havuzda açık tutulur ve
+    ilk ihtiyaçta (veya sunucu bağlantıyı kapattığında) yeniden kurulur.
+    smtplib bloklayıcı olduğu için tüm SMTP I/O'su thread'de yapılır.
+    ``digest_interval`` > 0 ise uyarılar biriktirilip aralık başına tek email gider;
+    gönderilemeyen digest bir sonraki denemeye kadar kuyrukta kalır. Kuyruk
+    ``max_digest`` uyarıyla sınırlıdır; SMTP uzun süre düşük kalırsa en eski
+    uyarılar düşürülür ve ``dropped_digest``'te sayılır.
+    """
+    
+    name = "email"
+    
+    def __init__(self, smtp_host: str, smtp_port: int, smtp_user: Optional[str], smtp_password: Optional[str],
+                 sender: Optional[str] = None, recipients: Optional[List[str]] = None,
+                 use_starttls: bool = True, pool_size: int = 2, digest_interval: float = 0.0,
+                 max_digest: int = 500, timeout: float = 10.0):
         super().__init__()
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
+        self.sender = sender or smtp_user
+        self.recipients = recipients or ([smtp_user] if smtp_user else [])
+        self.use_starttls = use_starttls
+        self.pool_size = pool_size
+        self.digest_interval = digest_interval
+        self.timeout = timeout
+        
+        # Havuz slotları: None = henüz bağlanmamış / düşmüş bağlantı
+        self._pool: Optional[asyncio.Queue] = None
+        self._pending: Deque[Tuple[str, str, datetime]] = deque(maxlen=max_digest)
+        self.dropped_digest = 0
+        self._digest_task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+        # Son digest gönderiminin sonucu - digest modunda send_notification bunu döndürür
+        self._digest_ok = True
+        self.connections_opened = 0
+    
+    @classmethod
+    def from_config(cls, settings) -> "EmailNotifier":
+        return cls(
+            smtp_host=settings.smtp_host,
+            smtp_port=settings.smtp_port,
+            smtp_user=settings.smtp_user,
+            smtp_password=settings.smtp_password,
+            sender=settings.email_from,
+            recipients=settings.email_to,
+            use_starttls=settings.smtp_starttls,
+            pool_size=settings.smtp_pool_size,
+            digest_interval=settings.email_digest_interval,
+            max_digest=settings.email_digest_max
+        )
     
     async def initialize(self) -> None:
-        """Email notifier'ı başlat"""
+        """Email notifier'ı başlat - bağlantılar ilk gönderimde açılır"""
+        if not self.smtp_host or not self.sender or not self.recipients:
+            raise ValueError("Email notifier için smtp_host, gönderen ve alıcı gerekli")
+        
+        self._pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._pool.put_nowait(None)
+        
+        if self.digest_interval > 0:
+            self._digest_task = asyncio.create_task(self._digest_loop())
+        
         self.initialized = True
-        logger.info("Email notifier başlatıldı")
+        logger.info("Email notifier başlatıldı", host=self.smtp_host, port=self.smtp_port,
+                    digest_interval=self.digest_interval)
     
-    async def send_notification(self, message: str, alert_type: str = "info", **kwargs) -> bool:
-        """Email bildirimi gönder"""
-        if not self.initialized:
-            return False
-        
+    def _connect(self) -> smtplib.SMTP:
+        """Yeni SMTP bağlantısı aç, STARTTLS ve login yap"""
+        smtp = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.use_starttls:
+            smtp.starttls(context=ssl.create_default_context())
+            smtp.ehlo()
+        if self.smtp_user and self.smtp_password:
+            smtp.login(self.smtp_user, self.smtp_password)
+        self.connections_opened += 1
+        return smtp
+    
+    def _send_blocking(self, smtp: Optional[smtplib.SMTP], message: EmailMessage) -> smtplib.SMTP:
+        """Thread'de çalışır - düşmüş bağlantıyı bir kez yenileyip tekrar dener"""
+        if smtp is None:
+            smtp = self._connect()
         try:
-            subject = f"Forex CHoCH Alert - {alert_type.upper()}"
-            logger.info("Email gönderildi", subject=subject, message=message[:100])
+            smtp.send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._close_quietly(smtp)
+            smtp = self._connect()
+            try:
+                smtp.send_message(message)
+            except Exception:
+                self._close_quietly(smtp)
+                raise
+        return smtp
+    
+    @staticmethod
+    def _close_quietly(smtp: Optional[smtplib.SMTP]) -> None:
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+    
+    def _build_message(self, subject: str, body: str) -> EmailMessage:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content(body)
+        return message
+    
+    async def _deliver(self, subject: str, body: str) -> bool:
+        """Havuzdan bir bağlantı alıp email'i gönder"""
+        message = self._build_message(subject, body)
+        smtp = await self._pool.get()
+        try:
+            smtp = await asyncio.to_thread(self._send_blocking, smtp, message)
             self.sent_count += 1
             return True
         except Exception as e:
+            await asyncio.to_thread(self._close_quietly, smtp)
+            smtp = None
             self.failed_count += 1
             logger.error("Email gönderme hatası", error=str(e))
             return False
+        finally:
+            self._pool.put_nowait(smtp)
+    
+    async def send_notification(self, message: str, alert_type: str = "info", **kwargs) -> bool:
+        """Email bildirimi gönder - digest modunda yalnızca biriktirir"""
+        if not self.initialized:
+            return False
+        
+        if self.digest_interval > 0:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped_digest += 1
+            self._pending.append((message, alert_type, datetime.now()))
+            # Gecikmiş digest burada gönderilir; dispatcher'ın timeout ve breaker'ı SMTP hatasını görür
+            if time.monotonic() - self._last_flush >= self.digest_interval:
+                return await self.flush_digest()
+            return self._digest_ok
+        
+        subject = f"Forex CHoCH Alert - {alert_type.upper()}"
+        success = await self._deliver(subject, message)
+        if success:
+            logger.info("Email gönderildi", subject=subject, message=message[:100])
+        return success
+    
+    async def flush_digest(self) -> bool:
+        """Biriken uyarıları tek email olarak gönder - başarısızsa uyarılar kuyruğa geri konur"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return True
+
+        pending = list(self._pending)
+        self._pending.clear()
+        subject = f"Forex CHoCH Digest - {len(pending)} alerts"
+        body = "\n\n".join(
+            f"[{created.strftime('%H:%M:%S')}] {alert_type.upper()}\n{message}"
+            for message, alert_type, created in pending
+        )
+        success = await self._deliver(subject, body)
+        if success:
+            logger.info("Email digest gönderildi", alerts=len(pending))
+        else:
+            # Gönderim sırasında gelenlerin önüne, sıra korunarak - sığmayan en eskiler düşer
+            pending.extend(self._pending)
+            overflow = len(pending) - self._pending.maxlen
+            if overflow > 0:
+                self.dropped_digest += overflow
+            self._pending.clear()
+            self._pending.extend(pending)
+            logger.warning("Email digest gönderilemedi - uyarılar kuyrukta", alerts=len(self._pending),
+                           dropped=self.dropped_digest)
+        self._digest_ok = success
+        return success
+    
+    async def _digest_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.digest_interval)
+            await self.flush_digest()
+    
+    async def cleanup(self) -> None:
+        """Bekleyen digest'i gönder ve havuzdaki bağlantıları kapat"""
+        if self._digest_task is not None:
+            self._digest_task.cancel()
+            try:
+                await self._digest_task
+            except asyncio.CancelledError:
+                pass
+            self._digest_task = None
+            await self.flush_digest()
+        
+        if self._pool is not None:
+            while not self._pool.empty():
+                await asyncio.to_thread(self._close_quietly, self._pool.get_nowait())
+        self.initialized = False
+    
+    def get_stats(self):
+        stats = super().get_stats()
+        stats.update({
+            "connections_opened": self.connections_opened,
+            "pending_digest": len(self._pending),
+            "dropped_digest": self.dropped_digest
+        })
+        return stats
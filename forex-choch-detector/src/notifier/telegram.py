@@ -14,6 +14,8 @@ logger = structlog.get_logger(__name__)
 class TelegramNotifier(NotifierBase):
     """Telegram bot kullanarak bildirim gönderen sınıf"""
     
+    name = "telegram"
+    
     def __init__(self, bot_token: str, chat_id: str):
         super().__init__()
         self.bot_token = bot_token
@@ -26,12 +28,18 @@ class TelegramNotifier(NotifierBase):
         self.emoji_map = {
             "choch": "🔄",
             "bos": "💥",
+            "region": "📦",
+            "digest": "📋",
             "info": "ℹ️",
             "warning": "⚠️",
             "error": "❌",
             "success": "✅"
         }
     
+    @classmethod
+    def from_config(cls, settings) -> "TelegramNotifier":
+        return cls(bot_token=settings.telegram.bot_token, chat_id=settings.telegram.chat_id)
+    
     async def initialize(self) -> None:
         """Telegram bot'u başlat"""
         try:
@@ -1,16 +1,23 @@
 """
 CHoCH ve BOS tespit motoru
 """
+import math
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Set
 from dataclasses import dataclass
 from enum import Enum
 import structlog
+import time
 from datetime import datetime
 
 # Relative import'ları absolute yap
-from pattern.swing_engine import SwingEngine, SwingPoint, SwingType
-from core.config import PatternConfig
+from pattern.swing_engine import SwingEngine, SwingPoint, SwingType, advance_engine
+from pattern.matrix import NO_BREAK, MatrixSwingEngine, MatrixUpdate
+from pattern.scoring import RollingStats, choch_confidence, leg_strength, price_scale
+from core.config import PatternConfig, TIMEFRAME_FREQS
+from core import metrics
+from core.tracing import tracer
 
 logger = structlog.get_logger(__name__)
 
@@ -20,6 +27,9 @@ class TrendDirection(Enum):
     BEARISH = "bearish"
     SIDEWAYS = "sideways"
 
+# Bar başına yapı durumu çıktısında trend kodu
+TREND_CODES = {"bullish": 1, "bearish": -1, "sideways": 0}
+
 class PatternType(Enum):
     """Pattern türleri"""
     CHOCH = "choch"
@@ -36,41 +46,312 @@ class PatternEvent:
     confidence: float
     swing_points: List[SwingPoint]
     metadata: Dict[str, Any]
+    # Event'i tetikleyen tick'in feed ingest damgası (monotonic ns) - replay/backtest'te None
+    ingest_ns: Optional[int] = None
 
 class CHoCHDetector:
     """CHoCH ve BOS tespit motoru"""
     
+    # Sembol başına bellekte tutulan maksimum bar sayısı
+    max_bars = 1000
+    
     def __init__(self, config: PatternConfig):
         self.config = config
-        self.swing_engine = SwingEngine(
-            swing_depth=config.swing_depth,
-            tolerance=config.tolerance,
-            min_swing_size=config.min_swing_size
-        )
+        # Sembole özel parametreler (config.pattern_overrides) - yoksa self.config
+        self.symbol_configs: Dict[str, PatternConfig] = {}
+        self.swing_engines: Dict[str, SwingEngine] = {}
         self.symbol_data: Dict[str, pd.DataFrame] = {}
+        # Buffer'daki kapanmış barların kayan ATR/hacim istatistikleri - oluşan bar dahil değil
+        self.bar_stats: Dict[str, RollingStats] = {}
         self.current_trends: Dict[str, TrendDirection] = {}
+        # Son CHoCH'u tetikleyen swing'in zamanı - yeni CHoCH ondan sonra oluşan bir swing ister
+        self.last_break: Dict[str, str] = {}
         self.on_choch: Optional[Callable] = None
         self.on_bos: Optional[Callable] = None
         self.on_abort: Optional[Callable] = None
         self.pattern_history: List[PatternEvent] = []
+        # Son checkpoint'ten beri durumu değişen semboller
+        self.dirty_symbols: Set[str] = set()
+        # Aşama süreleri örneklenen tick'lerde ölçülür
+        self.latency_sampler = metrics.LatencySampler()
+        self._timed = False
+        # İşlenmekte olan tick'in ingest damgası - üretilen event'lere taşınır
+        self._ingest_ns: Optional[int] = None
+        # Verilirse analiz her tick yerine bar kapanışında havuzda çalışır (core.offload.AnalysisPool)
+        self.analysis_pool = None
+        # Yeni swing motorlarının kernel backend'i (runtime.kernel_backend)
+        self.kernel_backend = "auto"
+        # Backtest'te event zamanı duvar saati yerine bar zamanıdır
+        self._event_time: Optional[str] = None
+        # Event barına kadarki bar zamanları (swing yaşı için) - None ise buffer'ın tamamı
+        self._event_times: Optional[pd.Index] = None
+        # Verilirse aynı swing_depth'li semboller ortak bar kapanışında matriste analiz edilir
+        self.matrix: Optional[MatrixSwingEngine] = None
+        # Matrisin oluşan sütununun bar zamanı - daha yeni bir bar gelince sütun kapanır
+        self._bar_clock: Optional[pd.Timestamp] = None
+    
+    def config_for(self, symbol: str) -> PatternConfig:
+        return self.symbol_configs.get(symbol, self.config)
+    
+    def _get_swing_engine(self, symbol: str) -> SwingEngine:
+        """Sembolün swing motorunu al - her sembolün kendi swing durumu vardır"""
+        engine = self.swing_engines.get(symbol)
+        if engine is None:
+            config = self.config_for(symbol)
+            engine = SwingEngine(
+                swing_depth=config.swing_depth,
+                tolerance=config.tolerance,
+                min_swing_size=config.min_swing_size,
+                backend=self.kernel_backend
+            )
+            self.swing_engines[symbol] = engine
+        return engine
+    
+    def _reset_bar_stats(self, symbol: str, closed: pd.DataFrame) -> None:
+        """Kayan istatistikleri buffer'ın kapanmış barlarından yeniden kur"""
+        self.bar_stats[symbol] = RollingStats.from_bars(
+            self.config_for(symbol).stats_window,
+            closed['high'].to_numpy(), closed['low'].to_numpy(),
+            closed['close'].to_numpy(), closed['volume'].to_numpy()
+        )
+    
+    def _close_bar(self, symbol: str, df: pd.DataFrame) -> None:
+        """Buffer'ın son barı kapandı - kayan istatistiklere ekle"""
+        stats = self.bar_stats.get(symbol)
+        if stats is None:
+            stats = self.bar_stats[symbol] = RollingStats(self.config_for(symbol).stats_window)
+        stats.push(df['high'].iat[-1], df['low'].iat[-1], df['close'].iat[-1], df['volume'].iat[-1])
+    
+    def _price_scale(self, symbol: str) -> float:
+        stats = self.bar_stats.get(symbol)
+        return price_scale(stats.atr if stats is not None else math.nan, self.config_for(symbol).min_swing_size)
+    
+    def _rate_swings(self, symbol: str, engine: SwingEngine, highs_from: int = 0, lows_from: int = 0) -> None:
+        """Yeni swing'lerin gücünü bacak boyunun kayan ATR'ye oranından hesapla"""
+        scale = self._price_scale(symbol)
+        for swing in engine.swing_highs[highs_from:]:
+            swing.strength = leg_strength(swing, engine.swing_lows, scale)
+        for swing in engine.swing_lows[lows_from:]:
+            swing.strength = leg_strength(swing, engine.swing_highs, scale)
+    
+    def _advance_swings(self, symbol: str, df: pd.DataFrame):
+        """Swing motorunu ilerlet ve yeni swing'leri puanla"""
+        engine = self._get_swing_engine(symbol)
+        highs_from, lows_from = len(engine.swing_highs), len(engine.swing_lows)
+        engine.process_candles(df)
+        self._rate_swings(symbol, engine, highs_from, lows_from)
+        return engine.swing_highs, engine.swing_lows
+    
+    async def reconfigure_symbol(self, symbol: str, config: PatternConfig) -> None:
+        """
+        Sembolün parametrelerini değiştir ve swing/trend durumunu buffer'daki
+        barlardan yeniden kur.
+        
+        Barlar korunur, yeniden kurulum sırasında event emit edilmez; diğer
+        sembollerin durumu etkilenmez.
+        """
+        if self.analysis_pool is not None:
+            await self.analysis_pool.drain(symbol)
+        if config == self.config:
+            self.symbol_configs.pop(symbol, None)
+        else:
+            self.symbol_configs[symbol] = config
+        self.swing_engines.pop(symbol, None)
+        self._discard_matrix_row(symbol)
+        
+        df = self.symbol_data.get(symbol)
+        if df is None or df.empty:
+            return
+        self._reset_bar_stats(symbol, df.iloc[:-1])
+        engine = self._get_swing_engine(symbol)
+        # Havuz modunda oluşan bar analize girmez
+        bars = df.iloc[:-1] if self.analysis_pool is not None else df
+        swing_highs, swing_lows = engine.process_candles(bars)
+        self._rate_swings(symbol, engine)
+        self.current_trends[symbol] = self._infer_trend(swing_highs, swing_lows)
+        self.dirty_symbols.add(symbol)
+        logger.info("Detector yeniden kuruldu", symbol=symbol, bars=len(bars),
+                    swings=len(swing_highs) + len(swing_lows), trend=self.current_trends[symbol].value)
     
-    async def process_tick(self, symbol: str, tick_data: Dict[str, Any]) -> None:
-        """Yeni tick verisini işle"""
+    async def drop_symbol(self, symbol: str) -> None:
+        """Sembolün bar, swing ve trend durumunu bırak"""
+        if self.analysis_pool is not None:
+            await self.analysis_pool.drain(symbol)
+        for state in (self.symbol_data, self.bar_stats, self.swing_engines, self.current_trends, self.symbol_configs,
+                      self.last_break):
+            state.pop(symbol, None)
+        self.dirty_symbols.discard(symbol)
+        self._discard_matrix_row(symbol)
+    
+    def load_history(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Geçmiş barları toplu yükle ve swing/trend durumunu ısıt.
+        
+        Canlı tick'lerden önce çağrılmalıdır; geçmiş üzerinde event emit edilmez.
+        """
+        bars = df[['open', 'high', 'low', 'close', 'volume']].tail(self.max_bars).copy()
+        if bars.index.tz is not None:
+            bars.index = bars.index.tz_convert(None)
+        self.symbol_data[symbol] = bars
+        self.dirty_symbols.add(symbol)
+        self.last_break.pop(symbol, None)
+        self._discard_matrix_row(symbol)
+        # Son bar bir sonraki barın ilk tick'inde kapanır
+        self._reset_bar_stats(symbol, bars.iloc[:-1])
+        
+        engine = self._get_swing_engine(symbol)
+        engine.clear_swings()
+        swing_highs, swing_lows = engine.process_candles(bars)
+        self._rate_swings(symbol, engine)
+        self.current_trends[symbol] = self._infer_trend(swing_highs, swing_lows)
+        
+        logger.info("Detector geçmiş veriyle ısıtıldı", symbol=symbol, bars=len(bars),
+                    swings=len(swing_highs) + len(swing_lows),
+                    trend=self.current_trends[symbol].value)
+    
+    def export_state(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Sembolün checkpoint'lenecek durumu: barlar, swing'ler, trend ve son işlenen bar"""
+        df = self.symbol_data.get(symbol)
+        if df is None:
+            return None
+        engine = self._get_swing_engine(symbol)
+        return {
+            "bars": df,
+            "swing_highs": list(engine.swing_highs),
+            "swing_lows": list(engine.swing_lows),
+            "last_processed_index": engine.last_processed_index,
+            "trend": self.current_trends.get(symbol, TrendDirection.SIDEWAYS),
+            "last_break": self.last_break.get(symbol)
+        }
+    
+    def restore_state(self, symbol: str, state: Dict[str, Any]) -> None:
+        """export_state çıktısından sembol durumunu geri yükle"""
+        self.symbol_data[symbol] = state["bars"]
+        self._reset_bar_stats(symbol, state["bars"].iloc[:-1])
+        engine = self._get_swing_engine(symbol)
+        engine.clear_swings()
+        engine.swing_highs.extend(state["swing_highs"])
+        engine.swing_lows.extend(state["swing_lows"])
+        engine.last_processed_index = state["last_processed_index"]
+        self.current_trends[symbol] = state["trend"]
+        if state.get("last_break"):
+            self.last_break[symbol] = state["last_break"]
+        else:
+            self.last_break.pop(symbol, None)
+        self.dirty_symbols.discard(symbol)
+        self._discard_matrix_row(symbol)
+    
+    def last_bar_time(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Sembolün buffer'daki son bar zamanı"""
+        df = self.symbol_data.get(symbol)
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+    
+    async def replay_bars(self, symbol: str, bars: pd.DataFrame) -> List[PatternEvent]:
+        """
+        Kaçırılan tamamlanmış barları sırayla uygula.
+        
+        Her bar sonrası analiz çalışır, böylece swing/trend yapısı kesinti
+        hiç olmamış gibi ilerler. Buffer'daki son bar aynı zamana sahipse
+        tamamlanmış mumla değiştirilir, daha eski barlar atlanır. Üretilen
+        event'ler callback'lere iletilir ve döndürülür.
+        """
+        bars = bars[['open', 'high', 'low', 'close', 'volume']]
+        if bars.index.tz is not None:
+            bars = bars.tz_convert(None)
+        if self.analysis_pool is not None:
+            # Havuzdaki eski sonuçlar replay'in güncellediği motorun üzerine yazılmasın
+            await self.analysis_pool.drain(symbol)
+        
+        self.dirty_symbols.add(symbol)
+        # Matris satırı bir sonraki tick'te ilerlemiş durumdan yeniden ısıtılır
+        self._discard_matrix_row(symbol)
+        df = self.symbol_data.get(symbol)
+        if self._in_matrix(symbol) and df is not None and len(df) > 1:
+            # Matrisin eklediği swing'ler motorun işlenen index'ini izlemez - motor buffer'dan yeniden kurulur
+            engine = self._get_swing_engine(symbol)
+            engine.clear_swings()
+            engine.process_candles(df.iloc[:-1])
+        events: List[PatternEvent] = []
+        for bar_time, values in zip(bars.index, bars.itertuples(index=False)):
+            df = self.symbol_data.get(symbol)
+            if df is not None and len(df) > 0:
+                if bar_time < df.index[-1]:
+                    continue
+                if bar_time == df.index[-1]:
+                    df.iloc[-1] = list(values)
+                    events.extend(self._analyze_patterns(symbol))
+                    continue
+            
+            new_bar = pd.DataFrame([list(values)], columns=bars.columns, index=[bar_time])
+            if df is not None and not df.empty:
+                self._close_bar(symbol, df)
+            self.symbol_data[symbol] = new_bar if df is None or df.empty else pd.concat([df, new_bar])
+            if len(self.symbol_data[symbol]) > self.max_bars:
+                self.symbol_data[symbol] = self.symbol_data[symbol].tail(self.max_bars)
+            events.extend(self._analyze_patterns(symbol))
+        await self.notify(events)
+        return events
+    
+    @staticmethod
+    def _infer_trend(swing_highs: List[SwingPoint], swing_lows: List[SwingPoint]) -> TrendDirection:
+        """Son iki swing high/low'dan mevcut yapıyı çıkar (HH+HL / LH+LL)"""
+        if len(swing_highs) < 2 or len(swing_lows) < 2:
+            return TrendDirection.SIDEWAYS
+        higher_high = swing_highs[-1].price > swing_highs[-2].price
+        higher_low = swing_lows[-1].price > swing_lows[-2].price
+        if higher_high and higher_low:
+            return TrendDirection.BULLISH
+        if not higher_high and not higher_low:
+            return TrendDirection.BEARISH
+        return TrendDirection.SIDEWAYS
+    
+    def process_tick(self, symbol: str, tick_data: Dict[str, Any]) -> List[PatternEvent]:
+        """
+        Yeni tick verisini işle ve üretilen pattern event'lerini döndür.
+        
+        Callback'ler burada çağrılmaz - event'ler çağıranın ``notify``'ına verilir.
+        Havuz modunda bar kapanışı analizi arka planda çalışır ve kendi event'lerini iletir.
+        """
         try:
-            await self._update_ohlcv_from_tick(symbol, tick_data)
-            await self._analyze_patterns(symbol)
+            metrics.TICKS.inc(symbol)
+            self._ingest_ns = tick_data.get("ingest_ns")
+            self._timed = self.latency_sampler.hit()
+            previous_bar = self.last_bar_time(symbol) if self.analysis_pool is not None else None
+            if self._timed:
+                started = time.perf_counter_ns()
+                self._update_ohlcv_from_tick(symbol, tick_data)
+                metrics.BAR_UPDATE.observe_ns(time.perf_counter_ns() - started)
+            else:
+                self._update_ohlcv_from_tick(symbol, tick_data)
+            if tick_data.get("trace"):
+                tracer.record("bar_update", symbol, self._ingest_ns)
+            if self._in_matrix(symbol):
+                return self._advance_matrix(symbol)
+            if self.analysis_pool is None:
+                return self._analyze_patterns(symbol)
+            if previous_bar is not None and self.last_bar_time(symbol) != previous_bar:
+                self._schedule_analysis(symbol)
+            return []
         except Exception as e:
             logger.error("Tick işleme hatası", symbol=symbol, error=str(e))
+            return []
+        finally:
+            self._ingest_ns = None
     
-    async def _update_ohlcv_from_tick(self, symbol: str, tick_data: Dict[str, Any]) -> None:
+    def _update_ohlcv_from_tick(self, symbol: str, tick_data: Dict[str, Any]) -> None:
         """Tick verisinden OHLCV bar'ı güncelle"""
         if symbol not in self.symbol_data:
             self.symbol_data[symbol] = pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
         
         df = self.symbol_data[symbol]
+        self.dirty_symbols.add(symbol)
         mid_price = (tick_data['bid'] + tick_data['ask']) / 2
-        timestamp = pd.to_datetime(tick_data['timestamp'])
-        bar_time = timestamp.floor('T')
+        timestamp = pd.Timestamp(tick_data['timestamp'])
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        bar_time = timestamp.floor(TIMEFRAME_FREQS[self.config_for(symbol).timeframe])
         
         if len(df) > 0 and df.index[-1] == bar_time:
             df.iloc[-1, df.columns.get_loc('high')] = max(df.iloc[-1]['high'], mid_price)
@@ -78,6 +359,8 @@ class CHoCHDetector:
             df.iloc[-1, df.columns.get_loc('close')] = mid_price
             df.iloc[-1, df.columns.get_loc('volume')] += tick_data.get('volume', 1)
         else:
+            if len(df) > 0:
+                self._close_bar(symbol, df)
             new_bar = pd.DataFrame({
                 'open': [mid_price],
                 'high': [mid_price],
@@ -87,71 +370,381 @@ class CHoCHDetector:
             }, index=[bar_time])
             self.symbol_data[symbol] = pd.concat([df, new_bar])
         
-        if len(self.symbol_data[symbol]) > 1000:
-            self.symbol_data[symbol] = self.symbol_data[symbol].tail(1000)
+        if len(self.symbol_data[symbol]) > self.max_bars:
+            self.symbol_data[symbol] = self.symbol_data[symbol].tail(self.max_bars)
     
-    async def _analyze_patterns(self, symbol: str) -> None:
+    def _analyze_patterns(self, symbol: str) -> List[PatternEvent]:
         """Pattern analizi yap"""
         if symbol not in self.symbol_data:
-            return
+            return []
         
         df = self.symbol_data[symbol]
-        if len(df) < self.config.swing_depth * 4:
+        if len(df) < self.config_for(symbol).swing_depth * 4:
+            return []
+        
+        if not self._timed:
+            swing_highs, swing_lows = self._advance_swings(symbol, df)
+            return self._detect_choch(symbol, swing_highs, swing_lows) + \
+                self._detect_bos(symbol, swing_highs, swing_lows)
+        
+        started = time.perf_counter_ns()
+        swing_highs, swing_lows = self._advance_swings(symbol, df)
+        swings_done = time.perf_counter_ns()
+        metrics.SWING_UPDATE.observe_ns(swings_done - started)
+        events = self._detect_choch(symbol, swing_highs, swing_lows) + \
+            self._detect_bos(symbol, swing_highs, swing_lows)
+        metrics.PATTERN_DETECTION.observe_ns(time.perf_counter_ns() - swings_done)
+        return events
+    
+    def _schedule_analysis(self, symbol: str) -> None:
+        """Kapanan barlara kadar olan analizi havuza gönder - oluşan bar dahil edilmez"""
+        bars = self.symbol_data[symbol].iloc[:-1]
+        if len(bars) < self.config_for(symbol).swing_depth * 4:
             return
+        ingest_ns = self._ingest_ns
+        self.analysis_pool.submit(symbol, lambda: self._apply_offloaded(symbol, bars, ingest_ns))
+    
+    async def _apply_offloaded(self, symbol: str, bars: pd.DataFrame, ingest_ns: Optional[int]) -> None:
+        """Swing'leri havuzda ilerlet, pattern tespitini loop üzerinde yap ve event'leri ilet"""
+        previous = self._get_swing_engine(symbol)
+        engine = await self.analysis_pool.run(advance_engine, previous, bars)
+        self.swing_engines[symbol] = engine
+        self.dirty_symbols.add(symbol)
+        self._rate_swings(symbol, engine, len(previous.swing_highs), len(previous.swing_lows))
+        self._ingest_ns = ingest_ns
+        self._event_times = bars.index
+        try:
+            events = self._detect_choch(symbol, engine.swing_highs, engine.swing_lows) + \
+                self._detect_bos(symbol, engine.swing_highs, engine.swing_lows)
+        finally:
+            self._ingest_ns = None
+            self._event_times = None
+        await self.notify(events)
+    
+    def _in_matrix(self, symbol: str) -> bool:
+        """Sembol matris modunda mı - farklı swing_depth'li semboller kendi motorunda kalır"""
+        return self.matrix is not None and self.config_for(symbol).swing_depth == self.matrix.swing_depth
+    
+    def _discard_matrix_row(self, symbol: str) -> None:
+        if self.matrix is not None and symbol in self.matrix:
+            self.matrix.remove_symbol(symbol)
+    
+    def _advance_matrix(self, symbol: str) -> List[PatternEvent]:
+        """
+        Tick'in barını matrise yaz; bar zamanı saati geçerse önce ortak sütunu kapat.
+        
+        Kapanmış bir dakikaya geç gelen tick'ler buffer'ı günceller, matrisi değil.
+        """
+        df = self.symbol_data[symbol]
+        bar_time = df.index[-1]
+        events: List[PatternEvent] = []
+        if self._bar_clock is not None and bar_time > self._bar_clock:
+            events = self._close_matrix_bar()
+        if self._bar_clock is None or bar_time > self._bar_clock:
+            self._bar_clock = bar_time
+        elif bar_time < self._bar_clock:
+            return events
+        if symbol not in self.matrix:
+            self._seed_matrix_row(symbol)
+        self.matrix.update(self.matrix.rows[symbol], df['high'].iat[-1], df['low'].iat[-1])
+        return events
+    
+    def _seed_matrix_row(self, symbol: str) -> None:
+        """Satırı buffer'daki kapanmış barlar ve sembolün swing/trend/kırılım durumuyla ekle"""
+        closed = self.symbol_data[symbol].iloc[:-1]
+        engine = self._get_swing_engine(symbol)
+        last_break = self.last_break.get(symbol)
+        broken = NO_BREAK
+        
+        def grid_swings(swings: List[SwingPoint]) -> List[tuple]:
+            nonlocal broken
+            result = []
+            for swing in swings[-2:]:
+                # Son kapanmış bar matriste column - 1'dedir
+                position = closed.index.searchsorted(pd.Timestamp(swing.timestamp))
+                index = self.matrix.column - len(closed) + int(position)
+                if last_break is not None and swing.timestamp <= last_break:
+                    broken = max(broken, index)
+                result.append((index, swing.price))
+            return result
+        
+        swing_highs, swing_lows = grid_swings(engine.swing_highs), grid_swings(engine.swing_lows)
+        self.matrix.add_symbol(
+            symbol,
+            self.config_for(symbol).tolerance,
+            highs=closed['high'].to_numpy(),
+            lows=closed['low'].to_numpy(),
+            bars=len(closed),
+            swing_highs=swing_highs,
+            swing_lows=swing_lows,
+            trend=TREND_CODES[self.current_trends.get(symbol, TrendDirection.SIDEWAYS).value],
+            last_break=broken
+        )
+    
+    def _close_matrix_bar(self) -> List[PatternEvent]:
+        """Ortak sütunu kapat ve yalnızca değişen satırların sembollerine dağıt"""
+        if self._timed:
+            started = time.perf_counter_ns()
+            update = self.matrix.close_bar(self._bar_clock)
+            metrics.SWING_UPDATE.observe_ns(time.perf_counter_ns() - started)
+        else:
+            update = self.matrix.close_bar(self._bar_clock)
+        events = []
+        for row in update.changed:
+            event = self._apply_matrix_row(self.matrix.symbols[row], int(row), update)
+            if event is not None:
+                events.append(event)
+        return events
+    
+    def _apply_matrix_row(self, symbol: str, row: int, update: MatrixUpdate) -> Optional[PatternEvent]:
+        """Matris satırının değişikliğini sembolün swing listelerine ve trendine yansıt, CHoCH'u emit et"""
+        engine = self._get_swing_engine(symbol)
+        df = self.symbol_data[symbol]
+        self.dirty_symbols.add(symbol)
+        if update.new_high[row] or update.new_low[row]:
+            position = int(df.index.searchsorted(update.swing_time))
+            engine.last_processed_index = position + 1
+            highs_from, lows_from = len(engine.swing_highs), len(engine.swing_lows)
+            for side, swing_type, swings in (("high", SwingType.HIGH, engine.swing_highs),
+                                             ("low", SwingType.LOW, engine.swing_lows)):
+                if getattr(update, f"new_{side}")[row]:
+                    swings.append(SwingPoint(
+                        index=position,
+                        price=float(getattr(self.matrix, f"{side}_last")[row]),
+                        timestamp=_isoformat(update.swing_time),
+                        swing_type=swing_type
+                    ))
+            self._rate_swings(symbol, engine, highs_from, lows_from)
         
-        swing_highs, swing_lows = self.swing_engine.process_candles(df)
-        await self._detect_choch(symbol, swing_highs, swing_lows)
-        await self._detect_bos(symbol, swing_highs, swing_lows)
+        if not update.trend_changed[row]:
+            return None
+        direction = TrendDirection.BULLISH if self.matrix.trend[row] == 1 else TrendDirection.BEARISH
+        self.current_trends[symbol] = direction
+        if update.direction[row] == 0:
+            return None
+        if direction == TrendDirection.BULLISH:
+            recent, invalidation = engine.swing_highs[-2:], engine.swing_lows[-1].price
+        else:
+            recent, invalidation = engine.swing_lows[-2:], engine.swing_highs[-1].price
+        self.last_break[symbol] = recent[1].timestamp
+        # Kapanan bar, tick'in açtığı yeni barın bir öncesidir
+        self._event_times = df.index[:-1]
+        try:
+            return self._emit_choch(symbol, direction, recent, recent[1].price, invalidation=invalidation)
+        finally:
+            self._event_times = None
     
-    async def _detect_choch(self, symbol: str, swing_highs: List[SwingPoint], swing_lows: List[SwingPoint]) -> None:
+    def _detect_choch(self, symbol: str, swing_highs: List[SwingPoint], swing_lows: List[SwingPoint]) -> List[PatternEvent]:
         """CHoCH tespiti"""
         if len(swing_highs) < 2 or len(swing_lows) < 2:
-            return
+            return []
         
         current_trend = self.current_trends.get(symbol, TrendDirection.SIDEWAYS)
+        last_break = self.last_break.get(symbol)
         
-        if current_trend == TrendDirection.BEARISH:
+        if current_trend == TrendDirection.SIDEWAYS:
+            # Henüz yapı yok - ilk net yapıyı event üretmeden benimse
+            self.current_trends[symbol] = self._infer_trend(swing_highs, swing_lows)
+        elif current_trend == TrendDirection.BEARISH:
             recent_highs = swing_highs[-2:]
-            if len(recent_highs) >= 2 and recent_highs[1].price > recent_highs[0].price:
-                await self._emit_choch(symbol, TrendDirection.BULLISH, recent_highs, recent_highs[1].price)
+            if recent_highs[1].price > recent_highs[0].price and \
+                    (last_break is None or recent_highs[1].timestamp > last_break):
                 self.current_trends[symbol] = TrendDirection.BULLISH
+                self.last_break[symbol] = recent_highs[1].timestamp
+                # Yeni yükseliş yapısı son swing low'un altına kapanışta bozulur
+                return [self._emit_choch(symbol, TrendDirection.BULLISH, recent_highs, recent_highs[1].price,
+                                         invalidation=swing_lows[-1].price)]
         elif current_trend == TrendDirection.BULLISH:
             recent_lows = swing_lows[-2:]
-            if len(recent_lows) >= 2 and recent_lows[1].price < recent_lows[0].price:
-                await self._emit_choch(symbol, TrendDirection.BEARISH, recent_lows, recent_lows[1].price)
+            if recent_lows[1].price < recent_lows[0].price and \
+                    (last_break is None or recent_lows[1].timestamp > last_break):
                 self.current_trends[symbol] = TrendDirection.BEARISH
+                self.last_break[symbol] = recent_lows[1].timestamp
+                return [self._emit_choch(symbol, TrendDirection.BEARISH, recent_lows, recent_lows[1].price,
+                                         invalidation=swing_highs[-1].price)]
+        return []
     
-    async def _detect_bos(self, symbol: str, swing_highs: List[SwingPoint], swing_lows: List[SwingPoint]) -> None:
+    def _detect_bos(self, symbol: str, swing_highs: List[SwingPoint], swing_lows: List[SwingPoint]) -> List[PatternEvent]:
         """BOS tespiti"""
-        pass
+        return []
     
-    async def _emit_choch(self, symbol: str, direction: TrendDirection, swing_points: List[SwingPoint], price: float) -> None:
-        """CHoCH event'ini emit et"""
+    def _emit_choch(self, symbol: str, direction: TrendDirection, swing_points: List[SwingPoint], price: float,
+                    invalidation: Optional[float] = None) -> PatternEvent:
+        """CHoCH event'ini oluştur ve geçmişe ekle - callback'ler ``notify`` ile çağrılır"""
+        inputs = self._score_inputs(symbol, swing_points, price, invalidation)
         event = PatternEvent(
             pattern_type=PatternType.CHOCH,
             symbol=symbol,
             direction=direction,
             price=price,
-            timestamp=datetime.now().isoformat(),
-            confidence=0.8,
+            timestamp=self._event_time or datetime.now().isoformat(),
+            confidence=choch_confidence(**inputs, swing_depth=self.config_for(symbol).swing_depth),
             swing_points=swing_points,
-            metadata={}
+            metadata={"invalidation": invalidation, **inputs},
+            ingest_ns=self._ingest_ns
         )
         self.pattern_history.append(event)
+        tracer.record("pattern", symbol, event.ingest_ns)
+        return event
+        
+    def _score_inputs(self, symbol: str, swing_points: List[SwingPoint], price: float,
+                      invalidation: Optional[float]) -> Dict[str, float]:
+        """
+        Güven skorunun girdileri - kayan istatistiklerden O(1).
         
-        if self.on_choch:
-            await self.on_choch(symbol, {
-                "direction": direction.value,
-                "price": price,
+        Bacak boyu kırılım fiyatı ile bozulma seviyesi, kayma tetikleyici swing ile
+        önceki swing arasıdır (ATR cinsinden); hacim son kapanan barındır. Swing
+        yaşı ``leg_strength`` gibi zaman damgasından sayılır - canlı buffer
+        kırpıldıkça swing index'leri kayar.
+        """
+        scale = self._price_scale(symbol)
+        stats = self.bar_stats.get(symbol)
+        times = self._event_times
+        if times is None:
+            times = self.symbol_data[symbol].index if symbol in self.symbol_data else pd.Index([])
+        if swing_points:
+            swing_bar = int(times.searchsorted(pd.Timestamp(swing_points[-1].timestamp)))
+            swing_age = len(times) - 1 - swing_bar
+        else:
+            swing_age = self.config_for(symbol).swing_depth
+        return {
+            "swing_size": abs(price - invalidation) / scale if invalidation is not None else 0.0,
+            "displacement": abs(swing_points[-1].price - swing_points[0].price) / scale if swing_points else 0.0,
+            "relative_volume": stats.relative_volume if stats is not None else math.nan,
+            "swing_age": swing_age
+        }
+    
+    async def notify(self, events: List[PatternEvent]) -> None:
+        """Senkron çekirdeğin ürettiği event'leri on_choch/on_bos callback'lerine ilet - min_confidence altı atlanır"""
+        for event in events:
+            callback = self.on_choch if event.pattern_type == PatternType.CHOCH else self.on_bos
+            if not callback or event.confidence < self.config_for(event.symbol).min_confidence:
+                continue
+            payload = {
+                "direction": event.direction.value,
+                "price": event.price,
                 "timestamp": event.timestamp,
+                "timeframe": self.config_for(event.symbol).timeframe,
                 "confidence": event.confidence
-            })
+            }
+            if event.ingest_ns is not None:
+                payload["ingest_ns"] = event.ingest_ns
+            await callback(event.symbol, payload)
     
-    def backtest(self, symbol: str, df: pd.DataFrame) -> List[PatternEvent]:
-        """Backtest yap"""
-        logger.info("Backtest başlatılıyor", symbol=symbol)
-        self.symbol_data[symbol] = df.copy()
+    def backtest(self, symbol: str, df: pd.DataFrame, writer=None,
+                 on_events: Optional[Callable[[List[PatternEvent]], None]] = None) -> List[PatternEvent]:
+        """
+        Bar bar backtest yap.
+        
+        Swing'ler tek geçişte bulunur; her swing canlıdaki gibi onaylandığı barda
+        (index + swing_depth) görünür olur ve CHoCH tespiti her bar kapanışında
+        çalışır. ``writer`` (core.export.ResultWriter) verilirse event'ler, swing'ler
+        ve bar başına yapı durumu replay ilerledikçe row group'lar halinde yazılır;
+        yazılan event'ler bellekte tutulmaz, her parti ``on_events``'e verilir ve
+        dönüş listesi boştur. Skorlar canlıdaki gibi event barından önce kapanmış
+        barların kayan istatistikleriyle hesaplanır. Event'ler callback'lere iletilmez.
+        """
+        logger.info("Backtest başlatılıyor", symbol=symbol, bars=len(df))
+        # Girdinin tamamı kopyalanmaz - canlı buffer kadarı tutulur
+        self.symbol_data[symbol] = df.tail(self.max_bars).copy()
         self.current_trends[symbol] = TrendDirection.SIDEWAYS
+        self.last_break.pop(symbol, None)
         self.pattern_history.clear()
-        swing_highs, swing_lows = self.swing_engine.process_candles(df)
+        engine = self._get_swing_engine(symbol)
+        engine.clear_swings()
+        swing_highs, swing_lows = engine.process_candles(df)
+        
+        depth = engine.swing_depth
+        confirmations = sorted(swing_highs + swing_lows, key=lambda swing: swing.index)
+        min_bars = self.config_for(symbol).swing_depth * 4
+        visible_highs: List[SwingPoint] = []
+        visible_lows: List[SwingPoint] = []
+        times = df.index
+        chunk = writer.row_group_size if writer is not None else len(df)
+        trends: List[int] = []
+        last_highs: List[float] = []
+        last_lows: List[float] = []
+        next_swing = flushed_swings = chunk_start = streamed = 0
+        stats = self.bar_stats[symbol] = RollingStats(self.config_for(symbol).stats_window)
+        bars = zip(df['high'].tolist(), df['low'].tolist(), df['close'].tolist(), df['volume'].tolist())
+        
+        try:
+            for i in range(len(df)):
+                while next_swing < len(confirmations) and confirmations[next_swing].index + depth <= i:
+                    swing = confirmations[next_swing]
+                    if swing.swing_type == SwingType.HIGH:
+                        swing.strength = leg_strength(swing, visible_lows, self._price_scale(symbol))
+                        visible_highs.append(swing)
+                    else:
+                        swing.strength = leg_strength(swing, visible_highs, self._price_scale(symbol))
+                        visible_lows.append(swing)
+                    next_swing += 1
+                
+                if i + 1 >= min_bars:
+                    self._event_time = _isoformat(times[i])
+                    self._event_times = times[:i + 1]
+                    for event in self._detect_choch(symbol, visible_highs, visible_lows):
+                        event.metadata["bar_index"] = i
+                stats.push(*next(bars))
+                
+                if writer is None:
+                    continue
+                trends.append(TREND_CODES[self.current_trends[symbol].value])
+                last_highs.append(visible_highs[-1].price if visible_highs else np.nan)
+                last_lows.append(visible_lows[-1].price if visible_lows else np.nan)
+                if len(trends) == chunk or i == len(df) - 1:
+                    end = chunk_start + len(trends)
+                    writer.write("structure", {
+                        "symbol": np.full(len(trends), symbol),
+                        "bar_index": np.arange(chunk_start, end),
+                        "timestamp": times[chunk_start:end].to_numpy(),
+                        "close": df["close"].to_numpy()[chunk_start:end],
+                        "trend": np.asarray(trends, dtype=np.int8),
+                        "swing_high": last_highs,
+                        "swing_low": last_lows
+                    })
+                    _write_swings(writer, symbol, times, confirmations[flushed_swings:next_swing], depth)
+                    _write_events(writer, times, self.pattern_history)
+                    if on_events is not None:
+                        on_events(self.pattern_history.copy())
+                    streamed += len(self.pattern_history)
+                    self.pattern_history.clear()
+                    flushed_swings, chunk_start = next_swing, end
+                    trends, last_highs, last_lows = [], [], []
+        finally:
+            self._event_time = None
+            self._event_times = None
+        
+        logger.info("Backtest tamamlandı", symbol=symbol, patterns=streamed + len(self.pattern_history),
+                    swings=len(confirmations))
         return self.pattern_history.copy()
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def _write_swings(writer, symbol: str, times: pd.Index, swings: List[SwingPoint], depth: int) -> None:
+    indexes = [swing.index for swing in swings]
+    writer.write("swings", {
+        "symbol": [symbol] * len(swings),
+        "index": indexes,
+        "confirmed_index": [index + depth for index in indexes],
+        "timestamp": times[indexes].to_numpy(),
+        "swing_type": [swing.swing_type.value for swing in swings],
+        "price": np.asarray([swing.price for swing in swings], dtype=float),
+        "strength": np.asarray([swing.strength for swing in swings], dtype=float)
+    })
+
+def _write_events(writer, times: pd.Index, events: List[PatternEvent]) -> None:
+    bar_indexes = [event.metadata["bar_index"] for event in events]
+    writer.write("events", {
+        "symbol": [event.symbol for event in events],
+        "bar_index": bar_indexes,
+        "timestamp": times[bar_indexes].to_numpy(),
+        "pattern": [event.pattern_type.value for event in events],
+        "direction": [event.direction.value for event in events],
+        "price": np.asarray([event.price for event in events], dtype=float),
+        "confidence": np.asarray([event.confidence for event in events], dtype=float),
+        "invalidation": np.asarray([event.metadata.get("invalidation", np.nan) for event in events], dtype=float),
+        "swing_from": [event.swing_points[0].index for event in events],
+        "swing_to": [event.swing_points[-1].index for event in events]
+    })
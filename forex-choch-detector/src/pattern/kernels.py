@@ -0,0 +1,200 @@
+"""
+Swing tespiti ve CHoCH yapı geçişi için opsiyonel Numba kernel'leri
+
+Döngüler Numba'nın derleyebildiği alt kümeyle yazılmıştır ve ilk kullanımda
+``njit(cache=True)`` ile derlenir; derleme sonucu diske yazılır, sonraki
+process'ler yalnızca yükler. Numba kurulu değilse swing tespiti NumPy ile
+vektörel, yapı geçişi aynı döngüyle saf Python olarak çalışır - sonuçlar aynıdır.
+Referans uygulamalar ``SwingEngine._check_swing_at_index`` ve
+``CHoCHDetector._detect_choch``'tur.
+"""
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+BACKENDS = ("auto", "numba", "python")
+
+# Önceki swing yokken index - çift swing kontrolüne hiç takılmaz
+NO_SWING = -(2 ** 62)
+
+def swing_loop(high: np.ndarray, low: np.ndarray, start: int, end: int, depth: int, tolerance: float,
+               last_high_index: int, last_high_price: float,
+               last_low_index: int, last_low_price: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    [start, end) aday barlarında swing high ve low index'leri.
+    
+    ``last_*`` motorun listelerindeki son swing'dir; ona ``tolerance``'tan yakın
+    fiyatlı ve ``depth``'ten yakın index'li aday çift sayılır.
+    """
+    n = len(high)
+    high_index = np.empty(max(end - start, 0), dtype=np.int64)
+    low_index = np.empty(max(end - start, 0), dtype=np.int64)
+    highs = lows = 0
+    for i in range(max(start, depth), min(end, n - depth)):
+        current = high[i]
+        swing = True
+        for j in range(i - depth, i + depth + 1):
+            if j != i and high[j] >= current - tolerance:
+                swing = False
+                break
+        if swing and not (abs(current - last_high_price) < tolerance and abs(i - last_high_index) < depth):
+            high_index[highs] = i
+            highs += 1
+            last_high_index, last_high_price = i, current
+        
+        current = low[i]
+        swing = True
+        for j in range(i - depth, i + depth + 1):
+            if j != i and low[j] <= current + tolerance:
+                swing = False
+                break
+        if swing and not (abs(current - last_low_price) < tolerance and abs(i - last_low_index) < depth):
+            low_index[lows] = i
+            lows += 1
+            last_low_index, last_low_price = i, current
+    return high_index[:highs], low_index[:lows]
+
+def swing_vectorized(high: np.ndarray, low: np.ndarray, start: int, end: int, depth: int, tolerance: float,
+                     last_high_index: int, last_high_price: float,
+                     last_low_index: int, last_low_price: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ``swing_loop``'un NumPy karşılığı.
+    
+    Swing koşulu pencere max/min'iyle vektörel, çift kontrolü seyrek adaylar
+    üzerinde sırayla yapılır.
+    """
+    first, last = max(start, depth), min(end, len(high) - depth)
+    if last <= first:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    window = 2 * depth + 1
+    candidates = np.arange(first, last)
+    
+    def detect(values: np.ndarray, sign: float, last_index: int, last_price: float) -> np.ndarray:
+        # Low'lar işaret çevrilerek high gibi aranır
+        windows = np.lib.stride_tricks.sliding_window_view(sign * values[first - depth:last + depth], window)
+        neighbours = np.concatenate([windows[:, :depth], windows[:, depth + 1:]], axis=1).max(axis=1)
+        kept = []
+        for i in candidates[neighbours < windows[:, depth] - tolerance].tolist():
+            if not (abs(values[i] - last_price) < tolerance and abs(i - last_index) < depth):
+                kept.append(i)
+                last_index, last_price = i, values[i]
+        return np.asarray(kept, dtype=np.int64)
+    
+    return (detect(np.asarray(high, dtype=np.float64), 1.0, last_high_index, last_high_price),
+            detect(np.asarray(low, dtype=np.float64), -1.0, last_low_index, last_low_price))
+
+def structure_loop(confirm_bar: np.ndarray, index: np.ndarray, is_high: np.ndarray, price: np.ndarray,
+                   start: int, end: int, min_bars: int, trend: int, last_break: int):
+    """
+    ``pattern.structure.structure_pass``'in döngüsü - event dizileri ve son (trend, last_break).
+    
+    Trend kodları 1 yükseliş, -1 düşüş, 0 yatay. Her event yeni bir tetikleyici
+    swing ister, bu yüzden event sayısı swing sayısını aşmaz.
+    """
+    total = len(index)
+    bar_index = np.empty(total, dtype=np.int64)
+    direction = np.empty(total, dtype=np.int8)
+    event_price = np.empty(total, dtype=np.float64)
+    invalidation = np.empty(total, dtype=np.float64)
+    swing_from = np.empty(total, dtype=np.int64)
+    swing_to = np.empty(total, dtype=np.int64)
+    events = 0
+    bar = max(start, min_bars - 1)
+    cursor = 0
+    # Görünür son iki high ve low'un pozisyonları (-1 = yok)
+    high_prev = high_last = low_prev = low_last = -1
+    
+    while bar < end:
+        while cursor < total and confirm_bar[cursor] <= bar:
+            if is_high[cursor]:
+                high_prev, high_last = high_last, cursor
+            else:
+                low_prev, low_last = low_last, cursor
+            cursor += 1
+        
+        changed = False
+        if high_prev >= 0 and low_prev >= 0:
+            if trend == 0:
+                higher_high = price[high_last] > price[high_prev]
+                higher_low = price[low_last] > price[low_prev]
+                if higher_high and higher_low:
+                    trend, changed = 1, True
+                elif not higher_high and not higher_low:
+                    trend, changed = -1, True
+            elif trend == -1:
+                if price[high_last] > price[high_prev] and index[high_last] > last_break:
+                    trend, last_break, changed = 1, index[high_last], True
+                    bar_index[events], direction[events] = bar, 1
+                    event_price[events], invalidation[events] = price[high_last], price[low_last]
+                    swing_from[events], swing_to[events] = index[high_prev], index[high_last]
+                    events += 1
+            elif price[low_last] < price[low_prev] and index[low_last] > last_break:
+                trend, last_break, changed = -1, index[low_last], True
+                bar_index[events], direction[events] = bar, -1
+                event_price[events], invalidation[events] = price[low_last], price[high_last]
+                swing_from[events], swing_to[events] = index[low_prev], index[low_last]
+                events += 1
+        
+        # Değişmeyen swing'ler ve durumla bir sonraki çağrı aynı sonucu verir
+        if changed:
+            bar += 1
+        elif cursor < total:
+            bar = max(bar + 1, confirm_bar[cursor])
+        else:
+            break
+    
+    return (bar_index[:events], direction[:events], event_price[:events], invalidation[:events],
+            swing_from[:events], swing_to[:events], trend, last_break)
+
+@lru_cache(maxsize=None)
+def compiled() -> Optional[SimpleNamespace]:
+    """Derlenmiş kernel'ler - Numba yoksa None. Import ve derleme ilk çağrıda yapılır."""
+    try:
+        import numba
+    except ImportError:
+        logger.info("Numba kurulu değil, kernel'ler NumPy/Python ile çalışıyor")
+        return None
+    jit = numba.njit(cache=True, nogil=True)
+    return SimpleNamespace(swing_loop=jit(swing_loop), structure_loop=jit(structure_loop))
+
+def _kernels(backend: str) -> Optional[SimpleNamespace]:
+    if backend not in BACKENDS:
+        raise ValueError(f"Geçersiz kernel backend'i: {backend}")
+    if backend == "python":
+        return None
+    kernels = compiled()
+    if kernels is None and backend == "numba":
+        raise ValueError("Numba backend'i için 'numba' paketi gerekli")
+    return kernels
+
+def detect_swings(high: np.ndarray, low: np.ndarray, start: int, end: int, depth: int, tolerance: float,
+                  last_high: Tuple[int, float] = (NO_SWING, np.nan), last_low: Tuple[int, float] = (NO_SWING, np.nan),
+                  backend: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+    """Swing high ve low index'leri - ``last_high``/``last_low`` (index, fiyat) çift kontrolü içindir"""
+    kernels = _kernels(backend)
+    detect = kernels.swing_loop if kernels is not None else swing_vectorized
+    return detect(np.ascontiguousarray(high, dtype=np.float64), np.ascontiguousarray(low, dtype=np.float64),
+                  int(start), int(end), int(depth), float(tolerance),
+                  int(last_high[0]), float(last_high[1]), int(last_low[0]), float(last_low[1]))
+
+def run_structure(confirm_bar: np.ndarray, index: np.ndarray, is_high: np.ndarray, price: np.ndarray,
+                  start: int, end: int, min_bars: int, trend: int, last_break: int, backend: str = "auto"):
+    kernels = _kernels(backend)
+    loop = kernels.structure_loop if kernels is not None else structure_loop
+    return loop(confirm_bar, index, is_high, price, int(start), int(end), int(min_bars), int(trend), int(last_break))
+
+def warm_up(backend: str = "auto") -> bool:
+    """Kernel'leri küçük girdiyle derle/önbellekten yükle - canlıda ilk bar kapanışı beklemesin"""
+    if _kernels(backend) is None:
+        return False
+    bars = np.linspace(1.0, 2.0, 32)
+    detect_swings(bars, bars, 0, len(bars), 3, 0.0001, backend=backend)
+    empty = np.empty(0, dtype=np.int64)
+    run_structure(empty, empty, np.empty(0, dtype=np.bool_), np.empty(0), 0, 1, 0, 0, -1, backend=backend)
+    return True
@@ -0,0 +1,213 @@
+"""
+Semboller arası matris swing motoru - ortak bar kapanışında tek vektörel geçiş
+
+Aynı M1/M5 ızgarasındaki tüm sembollerin high/low'u (sembol x bar) boyutlu bir
+halka dizide tutulur. Her ortak bar kapanışında swing onayı ve CHoCH kırılım
+seviyeleri tüm satırlar için birlikte hesaplanır; çağıran yalnızca değişen
+satırların sembollerine event dağıtır. Kurallar ``SwingEngine`` ve
+``CHoCHDetector._detect_choch`` ile aynıdır; bar sayıları ızgara sütunlarıdır,
+barı olmayan sütunlar pencerede yok sayılır.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pattern.structure import BEARISH, BULLISH, SIDEWAYS
+
+# Kırılım yokken son kırılım index'i - her swing bundan yenidir
+NO_BREAK = np.iinfo(np.int64).min
+
+@dataclass
+class MatrixUpdate:
+    """Bir bar kapanışının sonucu - maskeler satır başınadır"""
+    bar: int  # kapanan ızgara sütunu
+    swing_time: Any  # ``bar - swing_depth`` sütununun close_bar'a verilen zamanı
+    new_high: np.ndarray  # ``bar - swing_depth``'te onaylanan swing high
+    new_low: np.ndarray
+    trend_changed: np.ndarray
+    direction: np.ndarray  # CHoCH event'i: +1 yükseliş, -1 düşüş, 0 yok
+    changed: np.ndarray  # yukarıdakilerden biri olan satırların index'leri
+
+class MatrixSwingEngine:
+    """
+    Ortak swing_depth'li semboller için matris swing ve yapı durumu.
+    
+    Satırın pencere sütunları ``(2 * swing_depth + 1)``'lik halkadır; oluşan bar
+    ``update`` ile yerinde güncellenir, ``close_bar`` onu kapatır ve merkez
+    sütunu aday olarak değerlendirir. Tolerans satır başınadır.
+    """
+    
+    def __init__(self, swing_depth: int, min_bars: int = 0, capacity: int = 64):
+        self.swing_depth = swing_depth
+        self.width = 2 * swing_depth + 1
+        self.min_bars = min_bars
+        self.rows: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        # Kapanmış ızgara sütunu sayısı - oluşan bar ``column % width`` slotundadır
+        self.column = 0
+        self.times: List[Any] = [None] * self.width
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int) -> None:
+        count = len(self.symbols)
+        
+        def grow(name: str, fill, dtype, columns: Optional[int] = None) -> None:
+            shape = (capacity, columns) if columns else (capacity,)
+            array = np.full(shape, fill, dtype=dtype)
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+        
+        grow("high", -np.inf, np.float64, self.width)
+        grow("low", np.inf, np.float64, self.width)
+        grow("tolerance", 0.0, np.float64)
+        grow("bars", 0, np.int64)  # satırın kapanmış bar sayısı
+        grow("columns", 0, np.int64)  # satırın penceresine giren sütun sayısı
+        for side in ("high", "low"):
+            grow(f"{side}_last", np.nan, np.float64)
+            grow(f"{side}_prev", np.nan, np.float64)
+            grow(f"{side}_last_index", -1, np.int64)
+            grow(f"{side}_prev_index", -1, np.int64)
+        grow("trend", SIDEWAYS, np.int8)
+        grow("last_break", NO_BREAK, np.int64)
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def add_symbol(self, symbol: str, tolerance: float, highs: Sequence[float] = (), lows: Sequence[float] = (),
+                   bars: int = 0, swing_highs: Sequence[Tuple[int, float]] = (),
+                   swing_lows: Sequence[Tuple[int, float]] = (), trend: int = SIDEWAYS,
+                   last_break: int = NO_BREAK) -> int:
+        """
+        Satır ekle ve geçmişle ısıt.
+        
+        ``highs``/``lows`` son kapanmış barlardır ve son ızgara sütunlarına sağdan
+        hizalanır; ``swing_highs``/``swing_lows`` (ızgara index'i, fiyat) olarak
+        son swing'lerdir. Index'ler ``column - swing_depth``'ten küçük olmalıdır.
+        """
+        if symbol in self.rows:
+            self.remove_symbol(symbol)
+        row = len(self.symbols)
+        if row == len(self.tolerance):
+            self._allocate(2 * row)
+        self.rows[symbol] = row
+        self.symbols.append(symbol)
+        self._reset_row(row)
+        self.tolerance[row] = tolerance
+        self.bars[row] = bars
+        self.trend[row] = trend
+        self.last_break[row] = last_break
+        
+        history = min(len(highs), self.width - 1)
+        for offset in range(1, history + 1):
+            slot = (self.column - offset) % self.width
+            self.high[row, slot] = highs[-offset]
+            self.low[row, slot] = lows[-offset]
+        self.columns[row] = history
+        for side, swings in (("high", swing_highs), ("low", swing_lows)):
+            for index, price in list(swings)[-2:]:
+                self._push_swing(side, row, index, price)
+        return row
+    
+    def remove_symbol(self, symbol: str) -> None:
+        """Satırı sil - son satır boşalan yere taşınır"""
+        row = self.rows.pop(symbol)
+        last = len(self.symbols) - 1
+        moved = self.symbols.pop()
+        if row != last:
+            self.symbols[row] = moved
+            self.rows[moved] = row
+            for name in self._row_arrays():
+                array = getattr(self, name)
+                array[row] = array[last]
+        self._reset_row(last)
+    
+    def _row_arrays(self) -> List[str]:
+        names = ["high", "low", "tolerance", "bars", "columns", "trend", "last_break"]
+        for side in ("high", "low"):
+            names += [f"{side}_last", f"{side}_prev", f"{side}_last_index", f"{side}_prev_index"]
+        return names
+    
+    def _reset_row(self, row: int) -> None:
+        self.high[row], self.low[row] = -np.inf, np.inf
+        self.bars[row] = self.columns[row] = 0
+        for side in ("high", "low"):
+            getattr(self, f"{side}_last")[row] = getattr(self, f"{side}_prev")[row] = np.nan
+            getattr(self, f"{side}_last_index")[row] = getattr(self, f"{side}_prev_index")[row] = -1
+        self.trend[row] = SIDEWAYS
+        self.last_break[row] = NO_BREAK
+    
+    def _push_swing(self, side: str, rows, index, price) -> None:
+        last, prev = getattr(self, f"{side}_last"), getattr(self, f"{side}_prev")
+        last_index, prev_index = getattr(self, f"{side}_last_index"), getattr(self, f"{side}_prev_index")
+        prev[rows], prev_index[rows] = last[rows], last_index[rows]
+        last[rows], last_index[rows] = price, index
+    
+    def update(self, row: int, high: float, low: float) -> None:
+        """Oluşan barın high/low'unu tick'le genişlet"""
+        slot = self.column % self.width
+        if high > self.high[row, slot]:
+            self.high[row, slot] = high
+        if low < self.low[row, slot]:
+            self.low[row, slot] = low
+    
+    def close_bar(self, time: Any = None) -> MatrixUpdate:
+        """Oluşan sütunu (``time`` zamanlı) tüm satırlar için kapat, swing ve CHoCH kurallarını birlikte uygula"""
+        count = len(self.symbols)
+        depth = self.swing_depth
+        high, low, tolerance = self.high[:count], self.low[:count], self.tolerance[:count]
+        slot = self.column % self.width
+        candidate = (self.column - depth) % self.width
+        self.times[slot] = time
+        
+        self.bars[:count] += np.isfinite(high[:, slot])
+        self.columns[:count] += 1
+        ready = self.columns[:count] >= self.width
+        neighbours = np.ones(self.width, dtype=bool)
+        neighbours[candidate] = False
+        # Barı olmayan sütunlar -inf/+inf'tir: komşu olarak elenmez, aday olarak swing olmaz
+        new_high = ready & (high[:, neighbours].max(axis=1) < high[:, candidate] - tolerance)
+        new_low = ready & (low[:, neighbours].min(axis=1) > low[:, candidate] + tolerance)
+        index = self.column - depth
+        self._push_swing("high", np.flatnonzero(new_high), index, high[new_high, candidate])
+        self._push_swing("low", np.flatnonzero(new_low), index, low[new_low, candidate])
+        
+        direction = np.zeros(count, dtype=np.int8)
+        high_last, high_prev = self.high_last[:count], self.high_prev[:count]
+        low_last, low_prev = self.low_last[:count], self.low_prev[:count]
+        trend, last_break = self.trend[:count], self.last_break[:count]
+        active = (self.bars[:count] >= self.min_bars) & ~np.isnan(high_prev) & ~np.isnan(low_prev)
+        higher_high = high_last > high_prev
+        higher_low = low_last > low_prev
+        sideways = active & (trend == SIDEWAYS)
+        adopt_bullish = sideways & higher_high & higher_low
+        adopt_bearish = sideways & ~higher_high & ~higher_low
+        bullish = active & (trend == BEARISH) & higher_high & (self.high_last_index[:count] > last_break)
+        bearish = active & (trend == BULLISH) & (low_last < low_prev) & (self.low_last_index[:count] > last_break)
+        trend[adopt_bullish | bullish] = BULLISH
+        trend[adopt_bearish | bearish] = BEARISH
+        last_break[bullish] = self.high_last_index[:count][bullish]
+        last_break[bearish] = self.low_last_index[:count][bearish]
+        direction[bullish] = BULLISH
+        direction[bearish] = BEARISH
+        
+        trend_changed = adopt_bullish | adopt_bearish | bullish | bearish
+        update = MatrixUpdate(
+            bar=self.column,
+            swing_time=self.times[candidate],
+            new_high=new_high,
+            new_low=new_low,
+            trend_changed=trend_changed,
+            direction=direction,
+            changed=np.flatnonzero(new_high | new_low | trend_changed)
+        )
+        
+        self.column += 1
+        slot = self.column % self.width
+        self.high[:, slot] = -np.inf
+        self.low[:, slot] = np.inf
+        return update
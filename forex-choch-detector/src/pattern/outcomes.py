@@ -0,0 +1,152 @@
+"""
+Pattern sonuç değerlendirmesi - event'lerden sonra fiyatın ne yaptığı
+
+Tüm event'lerin ileri penceresi (event x bar) tek NumPy indekslemesiyle toplanır;
+ileri getiriler, MFE/MAE ve bozulma süresi aynı geçişte hesaplanır. Milyonlarca
+event bellek sınırı için ``chunk_size``'lık dilimlerle işlenir.
+"""
+from typing import Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from core.config import PatternConfig
+
+DEFAULT_HORIZONS = (5, 15, 60)
+
+def outcome_arrays(bar_index: np.ndarray, direction: np.ndarray, invalidation: np.ndarray,
+                   high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                   horizons: Sequence[int] = DEFAULT_HORIZONS, chunk_size: int = 65536) -> Dict[str, np.ndarray]:
+    """
+    Tek sembolün event'leri için sonuç dizileri.
+    
+    ``direction`` yükseliş için +1, düşüş için -1'dir; getiriler yön işaretlidir ve
+    event barının kapanışına göre orandır. MFE/MAE en uzun ufuk boyunca ölçülür.
+    ``bars_to_invalidation``, detector'daki tanımla aynı: kapanışın invalidation
+    seviyesinin (yükselişte son swing low, düşüşte son swing high) ötesinde olduğu
+    ilk bar; fitil geçişi sayılmaz, pencerede böyle kapanış yoksa NaN.
+    """
+    horizons = sorted(set(int(h) for h in horizons))
+    if not horizons or horizons[0] < 1:
+        raise ValueError("Ufuklar pozitif bar sayıları olmalı")
+    window = horizons[-1]
+    bar_index = np.asarray(bar_index, dtype=np.int64)
+    sign = np.asarray(direction, dtype=np.float64)
+    level = np.asarray(invalidation, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    if len(bar_index) and (bar_index.min() < 0 or bar_index.max() >= n):
+        raise ValueError("Event bar index'i bar dizisinin dışında")
+    
+    # Seri sonundan taşan pencereler max/min'e hiç katılmayan değerlerle doldurulur
+    high_padded = np.concatenate([np.asarray(high, dtype=np.float64), np.full(window, -np.inf)])
+    low_padded = np.concatenate([np.asarray(low, dtype=np.float64), np.full(window, np.inf)])
+    close_padded = np.concatenate([close, np.full(window, np.nan)])
+    steps = np.arange(1, window + 1)
+    
+    count = len(bar_index)
+    result = {f"return_{h}": np.full(count, np.nan) for h in horizons}
+    result.update({name: np.full(count, np.nan) for name in ("mfe", "mae", "bars_to_invalidation")})
+    
+    for start in range(0, count, chunk_size):
+        rows = slice(start, start + chunk_size)
+        index = bar_index[rows]
+        direction_sign = sign[rows]
+        entry = close[index]
+        for h in horizons:
+            result[f"return_{h}"][rows] = direction_sign * (close_padded[index + h] - entry) / entry
+        
+        ahead = index[:, None] + steps
+        highs = high_padded[ahead]
+        lows = low_padded[ahead]
+        best_high = highs.max(axis=1)
+        worst_low = lows.min(axis=1)
+        bullish = direction_sign > 0
+        favourable = np.where(bullish, best_high - entry, entry - worst_low) / entry
+        adverse = np.where(bullish, entry - worst_low, best_high - entry) / entry
+        has_future = index < n - 1
+        result["mfe"][rows] = np.where(has_future, np.maximum(favourable, 0.0), np.nan)
+        result["mae"][rows] = np.where(has_future, np.maximum(adverse, 0.0), np.nan)
+        
+        # NaN seviye ve seri sonu dolgusu hiçbir karşılaştırmayı geçmez - bozulma yok sayılır
+        closes = close_padded[ahead]
+        broken = np.where(bullish[:, None], closes < level[rows, None], closes > level[rows, None])
+        first = broken.argmax(axis=1) + 1
+        result["bars_to_invalidation"][rows] = np.where(broken.any(axis=1), first, np.nan)
+    return result
+
+def events_frame(events: Sequence) -> pd.DataFrame:
+    """Backtest'in PatternEvent listesini export'taki events tablosu biçimine çevir"""
+    if any("bar_index" not in event.metadata for event in events):
+        raise ValueError("Değerlendirme bar index'i olan backtest event'leri gerektirir")
+    return pd.DataFrame({
+        "symbol": [event.symbol for event in events],
+        "bar_index": np.asarray([event.metadata["bar_index"] for event in events], dtype=np.int64),
+        "timestamp": [event.timestamp for event in events],
+        "pattern": [event.pattern_type.value for event in events],
+        "direction": [event.direction.value for event in events],
+        "price": np.asarray([event.price for event in events], dtype=float),
+        "confidence": np.asarray([event.confidence for event in events], dtype=float),
+        "invalidation": np.asarray([event.metadata.get("invalidation", np.nan) for event in events], dtype=float)
+    })
+
+def evaluate_events(events: Union[pd.DataFrame, Sequence], bars: Union[pd.DataFrame, Mapping[str, pd.DataFrame]],
+                    horizons: Sequence[int] = DEFAULT_HORIZONS) -> pd.DataFrame:
+    """
+    Event'lere sonuç sütunlarını ekle.
+    
+    ``events`` export'taki events tablosu veya backtest'in döndürdüğü liste olabilir;
+    ``bars`` tek sembol için DataFrame, çok sembol için sembol -> DataFrame'dir.
+    """
+    frame = events.reset_index(drop=True) if isinstance(events, pd.DataFrame) else events_frame(events)
+    if "invalidation" not in frame:
+        frame = frame.assign(invalidation=np.nan)
+    horizons = sorted(set(int(h) for h in horizons))
+    columns = {name: np.full(len(frame), np.nan)
+               for name in [f"return_{h}" for h in horizons] + ["mfe", "mae", "bars_to_invalidation"]}
+    
+    for symbol, rows in frame.groupby("symbol", sort=False).indices.items():
+        symbol_bars = bars if isinstance(bars, pd.DataFrame) else bars.get(symbol)
+        if symbol_bars is None:
+            raise ValueError(f"Sembolün barları verilmedi: {symbol}")
+        subset = frame.iloc[rows]
+        outcome = outcome_arrays(
+            subset["bar_index"].to_numpy(),
+            np.where(subset["direction"].to_numpy() == "bullish", 1.0, -1.0),
+            subset["invalidation"].to_numpy(dtype=float),
+            symbol_bars["high"].to_numpy(), symbol_bars["low"].to_numpy(), symbol_bars["close"].to_numpy(),
+            horizons
+        )
+        for name, values in outcome.items():
+            columns[name][rows] = values
+    return frame.assign(**columns)
+
+def summarize_outcomes(outcomes: pd.DataFrame, by: Union[str, List[str]] = "symbol") -> pd.DataFrame:
+    """
+    Grup başına özet: event sayısı, ufuk başına ortalama getiri ve isabet oranı,
+    ortalama MFE/MAE, bozulma oranı ve medyan bozulma süresi.
+    
+    Konfigürasyonlar karşılaştırılırken çıktılar ``config`` sütunuyla birleştirilip
+    ``by=["config", "symbol"]`` verilir.
+    """
+    horizons = [name.split("_", 1)[1] for name in outcomes.columns if name.startswith("return_")]
+    scored = outcomes.assign(
+        invalidated=outcomes["bars_to_invalidation"].notna(),
+        **{f"hit_{h}": np.where(outcomes[f"return_{h}"].notna(), outcomes[f"return_{h}"] > 0, np.nan)
+           for h in horizons}
+    )
+    aggregations = {"events": ("bar_index", "size")}
+    for h in horizons:
+        aggregations[f"mean_return_{h}"] = (f"return_{h}", "mean")
+        aggregations[f"hit_rate_{h}"] = (f"hit_{h}", "mean")
+    aggregations.update({
+        "mean_mfe": ("mfe", "mean"),
+        "mean_mae": ("mae", "mean"),
+        "invalidation_rate": ("invalidated", "mean"),
+        "median_bars_to_invalidation": ("bars_to_invalidation", "median")
+    })
+    return scored.groupby(by, sort=True).agg(**aggregations)
+
+def config_label(config: PatternConfig) -> str:
+    """Konfigürasyon karşılaştırmalarında grup anahtarı"""
+    return f"depth={config.swing_depth} tol={config.tolerance:g} min={config.min_swing_size:g}"
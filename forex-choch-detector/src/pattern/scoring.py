@@ -0,0 +1,115 @@
+"""
+Swing gücü ve CHoCH güven skoru - sembol başına kayan bar istatistikleri
+
+``RollingStats`` kapanan her barda O(1) güncellenir: son ``window`` barın true
+range ve hacim toplamları halka dizide tutulur, ATR ve ortalama hacim bu
+toplamlardan okunur. Skorlar event anında bu değerlerden hesaplanır, bar
+buffer'ı yeniden taranmaz. Fiyat farkları ATR'ye bölünür; ATR çok sakin
+piyasada ``min_swing_size``'ın altına inmez.
+"""
+import math
+from typing import Sequence
+
+# Bileşenin 0.5 puan aldığı değerler
+SIZE_REF = 3.0  # CHoCH bacağı (kırılım fiyatı - bozulma seviyesi), ATR cinsinden
+DISPLACEMENT_REF = 0.5  # yeni swing'in önceki swing'i aşma miktarı, ATR cinsinden
+VOLUME_REF = 1.0  # son kapanan barın hacmi / ortalama hacim
+STRENGTH_REF = 2.0  # swing bacağı (karşı taraftaki son swing'e uzaklık), ATR cinsinden
+
+# Güven skorunda bileşen ağırlıkları - toplamı 1
+WEIGHTS = {"swing_size": 0.35, "displacement": 0.25, "relative_volume": 0.2, "swing_age": 0.2}
+
+class RollingStats:
+    """Son ``window`` kapanmış barın ATR'si ve hacim ortalaması"""
+    
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.true_ranges = [0.0] * window
+        self.volumes = [0.0] * window
+        self.count = 0
+        self.true_range_sum = 0.0
+        self.volume_sum = 0.0
+        self.last_close = math.nan
+        self.last_volume = math.nan
+    
+    @classmethod
+    def from_bars(cls, window: int, high: Sequence[float], low: Sequence[float], close: Sequence[float],
+                  volume: Sequence[float]) -> "RollingStats":
+        """Kapanmış barlardan ısıt - yalnızca pencereyi ve önceki kapanışı dolduran son barlar işlenir"""
+        stats = cls(window)
+        start = max(len(high) - window - 1, 0)
+        for values in zip(high[start:], low[start:], close[start:], volume[start:]):
+            stats.push(*values)
+        return stats
+    
+    def push(self, high: float, low: float, close: float, volume: float) -> None:
+        """Kapanan barı ekle, penceredeki en eski barı çıkar"""
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        if math.isnan(self.last_close):
+            true_range = high - low
+        else:
+            true_range = max(high, self.last_close) - min(low, self.last_close)
+        slot = self.count % self.window
+        self.true_range_sum += true_range - self.true_ranges[slot]
+        self.volume_sum += volume - self.volumes[slot]
+        self.true_ranges[slot] = true_range
+        self.volumes[slot] = volume
+        self.count += 1
+        if slot == self.window - 1:
+            # Halka her dolduğunda toplamlar baştan alınır - çıkarma hataları birikmez
+            self.true_range_sum = math.fsum(self.true_ranges)
+            self.volume_sum = math.fsum(self.volumes)
+        self.last_close, self.last_volume = close, volume
+    
+    @property
+    def atr(self) -> float:
+        if not self.count:
+            return math.nan
+        return self.true_range_sum / min(self.count, self.window)
+    
+    @property
+    def relative_volume(self) -> float:
+        """Son kapanan barın hacmi / pencere ortalaması - hacim yoksa NaN"""
+        if not self.count or self.volume_sum <= 0:
+            return math.nan
+        return self.last_volume * min(self.count, self.window) / self.volume_sum
+
+def price_scale(atr: float, min_swing_size: float) -> float:
+    """Fiyat farklarının bölüneceği ölçek"""
+    if math.isnan(atr):
+        return min_swing_size
+    return max(atr, min_swing_size)
+
+def squash(value: float, reference: float) -> float:
+    """[0, inf) değeri [0, 1)'e taşı - ``reference``'ta 0.5"""
+    if not value > 0:
+        return 0.0
+    return value / (value + reference)
+
+def leg_strength(swing, opposite: Sequence, scale: float) -> float:
+    """
+    Swing'in kendinden önceki son karşı swing'e uzaklığına göre gücü - karşı swing yoksa 0.
+    
+    Sıra zaman damgasıyla belirlenir; canlı buffer kırpıldıkça index'ler kayar.
+    """
+    for anchor in reversed(opposite):
+        if anchor.timestamp < swing.timestamp:
+            return squash(abs(swing.price - anchor.price) / scale, STRENGTH_REF)
+    return 0.0
+
+def choch_confidence(swing_size: float, displacement: float, relative_volume: float, swing_age: int,
+                     swing_depth: int) -> float:
+    """
+    CHoCH güven skoru [0, 1).
+    
+    ``swing_size`` ve ``displacement`` ATR cinsindendir. Hacim bilinmiyorsa
+    (NaN) ortalama sayılır. Swing onaylandığı barda (yaşı ``swing_depth``)
+    kırılım tam puan alır, sonra yaşla azalır.
+    """
+    components = {
+        "swing_size": squash(swing_size, SIZE_REF),
+        "displacement": squash(displacement, DISPLACEMENT_REF),
+        "relative_volume": squash(VOLUME_REF if math.isnan(relative_volume) else relative_volume, VOLUME_REF),
+        "swing_age": min(1.0, swing_depth / swing_age) if swing_age > 0 else 1.0
+    }
+    return sum(WEIGHTS[name] * value for name, value in components.items())
@@ -0,0 +1,108 @@
+"""
+Dizi tabanlı CHoCH yapı geçişi - swing dizilerinden bar aralığı için event üretir
+
+``CHoCHDetector.backtest``'in bar başına ``_detect_choch`` çağrılarıyla aynı event'leri
+verir, ama yalnızca durumun değişebileceği barları ziyaret eder: bir swing'in
+onaylandığı barlar ve bir kırılımın hemen ardından gelen bar.
+"""
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from pattern.kernels import detect_swings, run_structure
+from pattern.swing_engine import SwingPoint, SwingType
+
+BULLISH, BEARISH, SIDEWAYS = 1, -1, 0
+
+@dataclass
+class SwingArrays:
+    """Onay barına göre sıralı swing'ler - bir parametre seti için tüm geçmişte bir kez hesaplanır"""
+    confirm_bar: np.ndarray  # swing'in görünür olduğu bar (index + swing_depth)
+    index: np.ndarray
+    is_high: np.ndarray
+    price: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def visible_before(self, bar: int) -> int:
+        """``bar``'dan önce onaylanmış swing sayısı"""
+        return int(np.searchsorted(self.confirm_bar, bar, side="left"))
+
+def swing_arrays(swing_highs: Sequence[SwingPoint], swing_lows: Sequence[SwingPoint], depth: int) -> SwingArrays:
+    swings = sorted(list(swing_highs) + list(swing_lows), key=lambda swing: swing.index)
+    index = np.asarray([swing.index for swing in swings], dtype=np.int64)
+    return SwingArrays(
+        confirm_bar=index + depth,
+        index=index,
+        is_high=np.asarray([swing.swing_type == SwingType.HIGH for swing in swings], dtype=bool),
+        price=np.asarray([swing.price for swing in swings], dtype=np.float64)
+    )
+
+def compute_swings(high: np.ndarray, low: np.ndarray, swing_depth: int, tolerance: float,
+                   min_swing_size: float, backend: str = "auto") -> SwingArrays:
+    """Tüm geçmiş üzerinde tek swing geçişi - SwingEngine.process_candles ile aynı swing'ler"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    high_index, low_index = detect_swings(high, low, 0, len(high), swing_depth, tolerance, backend=backend)
+    index = np.concatenate([high_index, low_index])
+    # Aynı bardaki high, low'dan önce gelir (swing_arrays'in kararlı sıralaması)
+    order = np.argsort(index, kind="stable")
+    is_high = np.concatenate([np.ones(len(high_index), dtype=bool), np.zeros(len(low_index), dtype=bool)])[order]
+    index = index[order]
+    return SwingArrays(
+        confirm_bar=index + swing_depth,
+        index=index,
+        is_high=is_high,
+        price=np.where(is_high, high[index], low[index])
+    )
+
+def infer_trend(swings: SwingArrays, count: int) -> int:
+    """İlk ``count`` swing'in son iki high/low'undan yapı - CHoCHDetector._infer_trend"""
+    highs = np.flatnonzero(swings.is_high[:count])[-2:]
+    lows = np.flatnonzero(~swings.is_high[:count])[-2:]
+    if len(highs) < 2 or len(lows) < 2:
+        return SIDEWAYS
+    higher_high = swings.price[highs[1]] > swings.price[highs[0]]
+    higher_low = swings.price[lows[1]] > swings.price[lows[0]]
+    if higher_high and higher_low:
+        return BULLISH
+    if not higher_high and not higher_low:
+        return BEARISH
+    return SIDEWAYS
+
+def structure_pass(swings: SwingArrays, start: int, end: int, min_bars: int = 0, trend: int = SIDEWAYS,
+                   last_break: int = -1, backend: str = "auto") -> Tuple[Dict[str, np.ndarray], int, int]:
+    """
+    [start, end) barlarında CHoCH event'leri.
+    
+    Başlangıç durumu ``trend`` ve ``last_break`` (son kırılımı tetikleyen swing'in
+    index'i) ile verilir; ``min_bars``'tan kısa geçmişte analiz çalışmaz. Event
+    dizileri ve aralık sonundaki (trend, last_break) döner. Döngü
+    ``pattern.kernels.structure_loop``'tur - Numba kuruluysa derlenmiş çalışır.
+    """
+    bar_index, direction, price, invalidation, swing_from, swing_to, trend, last_break = run_structure(
+        swings.confirm_bar, swings.index, swings.is_high, swings.price, start, end, min_bars, trend, last_break,
+        backend=backend
+    )
+    arrays = {
+        "bar_index": bar_index,
+        "direction": direction,
+        "price": price,
+        "invalidation": invalidation,
+        "swing_from": swing_from,
+        "swing_to": swing_to
+    }
+    return arrays, int(trend), int(last_break)
+
+def warm_pass(swings: SwingArrays, start: int, end: int, min_bars: int = 0) -> Dict[str, np.ndarray]:
+    """
+    ``start``'ta geçmişle ısıtılmış bir detector'ın [start, end) event'leri.
+    
+    Canlıdaki ``load_history`` gibi trend, ``start``'tan önce onaylanmış swing'lerden
+    çıkarılır; önceki kırılım bilinmez.
+    """
+    trend = infer_trend(swings, swings.visible_before(start)) if start > 0 else SIDEWAYS
+    events, _, _ = structure_pass(swings, start, end, min_bars, trend=trend)
+    return events
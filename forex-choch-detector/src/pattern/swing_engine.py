@@ -1,12 +1,16 @@
 """
 Swing yapısı analiz motoru
 """
+import copy
+import numpy as np
 import pandas as pd
 from typing import List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import structlog
 
+from pattern.kernels import NO_SWING, detect_swings
+
 logger = structlog.get_logger(__name__)
 
 class SwingType(Enum):
@@ -21,15 +25,19 @@ class SwingPoint:
     price: float
     timestamp: str
     swing_type: SwingType
+    # Bacak boyunun kayan ATR'ye oranı [0, 1) - detector puanlar, 0 = puanlanmamış
     strength: float = 0.0
 
 class SwingEngine:
     """N-leg swing struktur analiz motoru"""
     
-    def __init__(self, swing_depth: int = 5, tolerance: float = 0.001, min_swing_size: float = 0.0005):
+    def __init__(self, swing_depth: int = 5, tolerance: float = 0.001, min_swing_size: float = 0.0005,
+                 backend: str = "auto"):
         self.swing_depth = swing_depth
         self.tolerance = tolerance
         self.min_swing_size = min_swing_size
+        # Swing tespiti: auto (kuruluysa Numba, değilse NumPy) | numba | python | reference (bar bar iloc döngüsü)
+        self.backend = backend
         self.swing_highs: List[SwingPoint] = []
         self.swing_lows: List[SwingPoint] = []
         self.last_processed_index = -1
@@ -42,14 +50,35 @@ class SwingEngine:
         start_idx = max(0, self.last_processed_index - self.swing_depth)
         end_idx = len(df) - self.swing_depth
         
-        for i in range(start_idx, end_idx):
-            self._check_swing_at_index(df, i)
+        if self.backend == "reference":
+            for i in range(start_idx, end_idx):
+                self._check_swing_at_index(df, i)
+        else:
+            self._detect_swings(df, start_idx, end_idx)
         
         self.last_processed_index = end_idx
         return self.swing_highs, self.swing_lows
     
+    def _detect_swings(self, df: pd.DataFrame, start_idx: int, end_idx: int) -> None:
+        """[start_idx, end_idx) aralığını pattern.kernels ile tara - _check_swing_at_index ile aynı sonuç"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        last_high = (self.swing_highs[-1].index, self.swing_highs[-1].price) if self.swing_highs else (NO_SWING, np.nan)
+        last_low = (self.swing_lows[-1].index, self.swing_lows[-1].price) if self.swing_lows else (NO_SWING, np.nan)
+        high_index, low_index = detect_swings(high, low, start_idx, end_idx, self.swing_depth, self.tolerance,
+                                              last_high, last_low, backend=self.backend)
+        for indexes, prices, swing_type, swings in ((high_index, high, SwingType.HIGH, self.swing_highs),
+                                                    (low_index, low, SwingType.LOW, self.swing_lows)):
+            for index in indexes.tolist():
+                swings.append(SwingPoint(
+                    index=index,
+                    price=float(prices[index]),
+                    timestamp=df.index[index].isoformat() if hasattr(df.index[index], 'isoformat') else str(df.index[index]),
+                    swing_type=swing_type
+                ))
+    
     def _check_swing_at_index(self, df: pd.DataFrame, index: int) -> None:
-        """Belirtilen index'te swing var mı kontrol et"""
+        """Belirtilen index'te swing var mı kontrol et - backend = reference"""
         if index < self.swing_depth or index >= len(df) - self.swing_depth:
             return
         
@@ -58,8 +87,7 @@ class SwingEngine:
                 index=index,
                 price=df.iloc[index]['high'],
                 timestamp=df.index[index].isoformat() if hasattr(df.index[index], 'isoformat') else str(df.index[index]),
-                swing_type=SwingType.HIGH,
-                strength=0.5
+                swing_type=SwingType.HIGH
             )
             if not self._is_duplicate_swing(swing_point, self.swing_highs):
                 self.swing_highs.append(swing_point)
@@ -69,8 +97,7 @@ class SwingEngine:
                 index=index,
                 price=df.iloc[index]['low'],
                 timestamp=df.index[index].isoformat() if hasattr(df.index[index], 'isoformat') else str(df.index[index]),
-                swing_type=SwingType.LOW,
-                strength=0.5
+                swing_type=SwingType.LOW
             )
             if not self._is_duplicate_swing(swing_point, self.swing_lows):
                 self.swing_lows.append(swing_point)
@@ -122,3 +149,16 @@ class SwingEngine:
         self.swing_highs.clear()
         self.swing_lows.clear()
         self.last_processed_index = -1
+
+def advance_engine(engine: SwingEngine, df: pd.DataFrame) -> SwingEngine:
+    """
+    Motorun kopyasını yeni barlarla ilerlet.
+    
+    Analiz havuzunda çalışır; orijinal motora dokunulmaz, loop sonucu tek
+    atamayla değiştirir. Process havuzunda motor ve barlar pickle'lanır.
+    """
+    advanced = copy.copy(engine)
+    advanced.swing_highs = list(engine.swing_highs)
+    advanced.swing_lows = list(engine.swing_lows)
+    advanced.process_candles(df)
+    return advanced
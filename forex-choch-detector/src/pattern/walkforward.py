@@ -0,0 +1,165 @@
+"""
+Walk-forward değerlendirme - kayan train/test pencerelerinde PatternConfig seçimi
+
+Swing'ler her parametre seti için tüm geçmişte bir kez hesaplanır; pencereler bu
+diziyi dilimler ve yalnızca pencere sınırında geçmişle ısıtılır (bkz.
+``pattern.structure.warm_pass``). Train'de en iyi skoru alan parametreler bir
+sonraki test penceresinde ölçülür. Pencereler process veya thread havuzunda
+paralel çalışır.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+import multiprocessing as mp
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from core.config import PatternConfig
+from pattern.outcomes import DEFAULT_HORIZONS, config_label, outcome_arrays
+from pattern.structure import SwingArrays, compute_swings, warm_pass
+
+logger = structlog.get_logger(__name__)
+
+@dataclass
+class Window:
+    """Bar index aralıkları - train [train_start, test_start), test [test_start, test_end)"""
+    number: int
+    train_start: int
+    test_start: int
+    test_end: int
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame  # pencere başına seçilen parametreler ve test metrikleri
+    scores: pd.DataFrame  # pencere x parametre seti train skorları
+
+def make_windows(bars: int, train_bars: int, test_bars: int, step: Optional[int] = None) -> List[Window]:
+    """Kayan pencereler - ``step`` varsayılan olarak test uzunluğudur (örtüşmeyen test dönemleri)"""
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("Train ve test uzunlukları pozitif olmalı")
+    step = step or test_bars
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= bars:
+        windows.append(Window(len(windows), start, start + train_bars, start + train_bars + test_bars))
+        start += step
+    return windows
+
+# Worker başına bir kez kurulan paylaşılan durum - pencere işleri yalnızca Window taşır
+_shared: Dict[str, Any] = {}
+
+def _init_worker(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 series: List[Tuple[str, int, SwingArrays]], settings: Dict[str, Any]) -> None:
+    _shared.update(high=high, low=low, close=close, series=series, settings=settings)
+
+def _score(events: Dict[str, np.ndarray], keep: np.ndarray, horizons: Sequence[int]) -> Dict[str, float]:
+    """Seçilen event'lerin ortalama sonuçları"""
+    outcome = outcome_arrays(events["bar_index"][keep], events["direction"][keep], events["invalidation"][keep],
+                             _shared["high"], _shared["low"], _shared["close"], horizons)
+    metrics = {"events": int(keep.sum())}
+    for h in sorted(horizons):
+        returns = outcome[f"return_{h}"]
+        valid = ~np.isnan(returns)
+        metrics[f"mean_return_{h}"] = float(returns[valid].mean()) if valid.any() else np.nan
+        metrics[f"hit_rate_{h}"] = float((returns[valid] > 0).mean()) if valid.any() else np.nan
+    for name in ("mfe", "mae"):
+        values = outcome[name][~np.isnan(outcome[name])]
+        metrics[f"mean_{name}"] = float(values.mean()) if len(values) else np.nan
+    metrics["invalidation_rate"] = float((~np.isnan(outcome["bars_to_invalidation"])).mean()) \
+        if len(outcome["mfe"]) else np.nan
+    return metrics
+
+def _evaluate_window(window: Window) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Tüm parametre setlerini train'de skorla, en iyisini test'te ölç"""
+    settings = _shared["settings"]
+    horizons = settings["horizons"]
+    objective = f"mean_return_{settings['objective_horizon']}"
+    longest = max(horizons)
+    scores = []
+    best: Optional[Tuple[float, str, int, SwingArrays]] = None
+    
+    for label, min_bars, swings in _shared["series"]:
+        events = warm_pass(swings, window.train_start, window.test_start, min_bars)
+        # Sonucu test dönemine taşan train event'leri seçimi sızdırmasın
+        keep = events["bar_index"] + longest < window.test_start
+        metrics = _score(events, keep, horizons)
+        eligible = metrics["events"] >= settings["min_events"] and not np.isnan(metrics[objective])
+        scores.append({"window": window.number, "config": label, "eligible": eligible, **metrics})
+        if eligible and (best is None or metrics[objective] > best[0]):
+            best = (metrics[objective], label, min_bars, swings)
+    
+    row: Dict[str, Any] = {"window": window.number, "train_start": window.train_start,
+                           "test_start": window.test_start, "test_end": window.test_end}
+    if best is None:
+        row.update(selected=None, train_score=np.nan, test_events=0)
+        return row, scores
+    
+    score, label, min_bars, swings = best
+    events = warm_pass(swings, window.test_start, window.test_end, min_bars)
+    test = _score(events, np.ones(len(events["bar_index"]), dtype=bool), horizons)
+    row.update(selected=label, train_score=score, **{f"test_{name}": value for name, value in test.items()})
+    return row, scores
+
+def _create_executor(executor: str, workers: int, initargs: tuple) -> Optional[Executor]:
+    if executor == "inline" or workers <= 1:
+        return None
+    if executor == "thread":
+        return ThreadPoolExecutor(workers, thread_name_prefix="walk-forward")
+    if executor == "process":
+        return ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_worker, initargs=initargs)
+    raise ValueError(f"Geçersiz walk-forward executor'ı: {executor}")
+
+def walk_forward(df: pd.DataFrame, configs: Sequence[PatternConfig], train_bars: int, test_bars: int,
+                 step: Optional[int] = None, horizons: Sequence[int] = DEFAULT_HORIZONS,
+                 objective_horizon: Optional[int] = None, min_events: int = 5,
+                 executor: str = "process", workers: int = 2) -> WalkForwardResult:
+    """
+    Parametre setlerini kayan pencerelerde seç ve ölç.
+    
+    Skor, train event'lerinin ``objective_horizon`` (varsayılan: en kısa ufuk)
+    bar sonraki ortalama yön işaretli getirisidir; ``min_events``'ten az event'i
+    olan setler seçilmez.
+    """
+    if not configs:
+        raise ValueError("En az bir parametre seti gerekli")
+    horizons = sorted(set(int(h) for h in horizons))
+    objective_horizon = objective_horizon or horizons[0]
+    if objective_horizon not in horizons:
+        horizons = sorted(horizons + [objective_horizon])
+    windows = make_windows(len(df), train_bars, test_bars, step)
+    if not windows:
+        raise ValueError(f"{len(df)} bar, {train_bars}+{test_bars} barlık tek bir pencereye yetmiyor")
+    
+    high, low, close = (df[column].to_numpy(dtype=np.float64) for column in ("high", "low", "close"))
+    series = []
+    for config in configs:
+        swings = compute_swings(high, low, config.swing_depth, config.tolerance, config.min_swing_size)
+        series.append((config_label(config), config.swing_depth * 4, swings))
+        logger.info("Swing serisi hesaplandı", config=series[-1][0], swings=len(swings))
+    settings = {"horizons": horizons, "objective_horizon": objective_horizon, "min_events": min_events}
+    initargs = (high, low, close, series, settings)
+    
+    # Inline ve thread modu bu process'in durumunu kullanır; process worker'ları initializer ile kurulur
+    _init_worker(*initargs)
+    pool = _create_executor(executor, min(workers, len(windows)), initargs)
+    try:
+        if pool is None:
+            results = [_evaluate_window(window) for window in windows]
+        else:
+            results = list(pool.map(_evaluate_window, windows))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    rows = [row for row, _ in results]
+    times = df.index
+    for row in rows:
+        row["test_from"], row["test_to"] = times[row["test_start"]], times[row["test_end"] - 1]
+    windows_frame = pd.DataFrame(rows).set_index("window")
+    scores = pd.DataFrame([score for _, window_scores in results for score in window_scores])
+    logger.info("Walk-forward tamamlandı", windows=len(windows), configs=len(configs),
+                selected=windows_frame["selected"].value_counts().to_dict())
+    return WalkForwardResult(windows=windows_frame, scores=scores)
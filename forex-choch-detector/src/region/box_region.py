@@ -2,8 +2,8 @@
 Box region yönetim sistemi
 """
 import uuid
-from typing import Dict, List, Optional, Callable, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable, Any, Set
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import structlog
 
@@ -44,14 +44,18 @@ class BoxRegionManager:
         self.on_region_hit: Optional[Callable] = None
         self.on_region_break: Optional[Callable] = None
         self.hit_history: List[Dict[str, Any]] = []
+        # Son checkpoint'ten beri region/hit durumu değişen semboller
+        self.dirty_symbols: Set[str] = set()
     
     def add_region(self, symbol: str, name: str, upper_bound: float, lower_bound: float, 
-                   region_type: str = "static", metadata: Optional[Dict[str, Any]] = None) -> str:
+                   region_type: str = "static", metadata: Optional[Dict[str, Any]] = None,
+                   region_id: Optional[str] = None) -> str:
         """Yeni region ekle"""
         if symbol not in self.regions:
             self.regions[symbol] = []
         
         region = BoxRegion(
+            id=region_id or str(uuid.uuid4()),
             symbol=symbol,
             name=name,
             upper_bound=max(upper_bound, lower_bound),
@@ -61,9 +65,37 @@ class BoxRegionManager:
         )
         
         self.regions[symbol].append(region)
+        self.dirty_symbols.add(symbol)
         logger.info("Yeni region eklendi", symbol=symbol, name=name)
         return region.id
     
+    def remove_region(self, symbol: str, region_id: str) -> bool:
+        """Region'ı sil - bulunamazsa False"""
+        regions = self.regions.get(symbol, [])
+        remaining = [r for r in regions if r.id != region_id]
+        if len(remaining) == len(regions):
+            return False
+        
+        self.regions[symbol] = remaining
+        self.dirty_symbols.add(symbol)
+        logger.info("Region silindi", symbol=symbol, region_id=region_id)
+        return True
+    
+    def apply_command(self, command: str, symbol: str, data: Dict[str, Any]) -> None:
+        """Webhook'un region_create/region_delete komutunu uygula"""
+        if command == "region_create":
+            self.add_region(
+                symbol=symbol,
+                name=data["name"],
+                upper_bound=data["upper_bound"],
+                lower_bound=data["lower_bound"],
+                region_type=data.get("region_type", "static"),
+                metadata=data.get("metadata"),
+                region_id=data["id"]
+            )
+        elif command == "region_delete":
+            self.remove_region(symbol, data["id"])
+    
     def get_regions(self, symbol: str, active_only: bool = True) -> List[BoxRegion]:
         """Symbol'ün region'larını al"""
         if symbol not in self.regions:
@@ -74,6 +106,15 @@ class BoxRegionManager:
             regions = [r for r in regions if r.is_active]
         return regions
     
+    def export_state(self, symbol: str) -> List[Dict[str, Any]]:
+        """Sembolün region'larını hit durumlarıyla birlikte dict listesi olarak döndür"""
+        return [asdict(region) for region in self.regions.get(symbol, [])]
+    
+    def restore_state(self, symbol: str, regions: List[Dict[str, Any]]) -> None:
+        """export_state çıktısından region'ları geri yükle"""
+        self.regions[symbol] = [BoxRegion(**data) for data in regions]
+        self.dirty_symbols.discard(symbol)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Tüm istatistikleri al"""
         stats = {}
@@ -85,25 +126,34 @@ class BoxRegionManager:
             }
         return stats
     
-    async def check_regions(self, symbol: str, tick_data: Dict[str, Any]) -> None:
-        """Region kontrolü yap"""
+    def check_regions(self, symbol: str, tick_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Region kontrolü yap ve isabetleri döndür - callback'ler ``notify`` ile çağrılır"""
         if symbol not in self.regions:
-            return
+            return []
         
         if 'bid' in tick_data and 'ask' in tick_data:
             current_price = (tick_data['bid'] + tick_data['ask']) / 2
         else:
-            return
+            return []
         
+        hits = []
         for region in self.get_regions(symbol):
             if region.contains_price(current_price):
                 region.hit_count += 1
                 region.last_hit = datetime.now().isoformat()
+                self.dirty_symbols.add(symbol)
+                hits.append({
+                    "region_id": region.id,
+                    "region_name": region.name,
+                    "price": current_price,
+                    "hit_count": region.hit_count,
+                    "timestamp": region.last_hit
+                })
+        return hits
                 
-                if self.on_region_hit:
-                    await self.on_region_hit(symbol, {
-                        "region_id": region.id,
-                        "region_name": region.name,
-                        "price": current_price,
-                        "hit_count": region.hit_count
-                    })
+    async def notify(self, symbol: str, hits: List[Dict[str, Any]]) -> None:
+        """Region isabetlerini on_region_hit callback'ine ilet"""
+        if not self.on_region_hit:
+            return
+        for hit in hits:
+            await self.on_region_hit(symbol, hit)
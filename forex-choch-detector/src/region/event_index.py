@@ -0,0 +1,103 @@
+"""
+Sembol başına zamana göre sıralı event index'i - bisect ile aralık sorgusu ve cursor sayfalama
+"""
+import bisect
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+
+# Sıralama anahtarı: (zaman ns, ekleme sırası) - aynı zamanlı kayıtlar da tekil kalır
+IndexKey = Tuple[int, int]
+
+def to_ns(value: Any) -> int:
+    """ISO string / datetime / epoch değerini naive UTC ns'ye çevir"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Epoch birimi büyüklükten anlaşılır: saniye, ms, µs veya ns
+        for limit, scale in ((1e11, 1_000_000_000), (1e14, 1_000_000), (1e17, 1_000)):
+            if abs(value) < limit:
+                return int(value * scale)
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp.value
+
+def encode_cursor(key: IndexKey) -> str:
+    return f"{key[0]}-{key[1]}"
+
+def decode_cursor(cursor: str) -> IndexKey:
+    try:
+        ts, seq = cursor.split("-")
+        return int(ts), int(seq)
+    except ValueError:
+        raise ValueError(f"Geçersiz cursor: {cursor}")
+
+class EventIndex:
+    """
+    Her sembol için ``keys`` ve ``records`` paralel listeleri.
+    
+    Event'ler çoğunlukla zaman sırasıyla geldiğinden ekleme tipik olarak
+    sona append'tir; geç gelenler bisect.insort ile yerine konur. Sembol başına
+    ``max_per_symbol`` kaydı aşınca en eskiler toplu olarak kırpılır.
+    """
+    
+    def __init__(self, max_per_symbol: int = 100000):
+        self.max_per_symbol = max_per_symbol
+        self._keys: Dict[str, List[IndexKey]] = {}
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._sequence = itertools.count()
+    
+    def add(self, symbol: str, timestamp: Any, record: Dict[str, Any]) -> IndexKey:
+        keys = self._keys.setdefault(symbol, [])
+        records = self._records.setdefault(symbol, [])
+        key = (to_ns(timestamp), next(self._sequence))
+        
+        if not keys or key > keys[-1]:
+            keys.append(key)
+            records.append(record)
+        else:
+            position = bisect.bisect(keys, key)
+            keys.insert(position, key)
+            records.insert(position, record)
+        
+        # Her eklemede kırpmamak için %25 pay bırak
+        if len(keys) > self.max_per_symbol * 1.25:
+            excess = len(keys) - self.max_per_symbol
+            del keys[:excess]
+            del records[:excess]
+        return key
+    
+    def query(self, symbol: str, start: Any = None, end: Any = None, limit: int = 100,
+              cursor: Optional[str] = None, descending: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """[start, end] aralığındaki kayıtlar ve sonraki sayfanın cursor'ı"""
+        keys = self._keys.get(symbol)
+        if not keys:
+            return [], None
+        
+        lo = bisect.bisect_left(keys, (to_ns(start), -1)) if start is not None else 0
+        hi = bisect.bisect_right(keys, (to_ns(end), float("inf"))) if end is not None else len(keys)
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            if descending:
+                hi = min(hi, bisect.bisect_left(keys, position))
+            else:
+                lo = max(lo, bisect.bisect_right(keys, position))
+        if lo >= hi:
+            return [], None
+        
+        records = self._records[symbol]
+        if descending:
+            page_lo = max(lo, hi - limit)
+            items = records[page_lo:hi][::-1]
+            next_cursor = encode_cursor(keys[page_lo]) if page_lo > lo else None
+        else:
+            page_hi = min(hi, lo + limit)
+            items = records[lo:page_hi]
+            next_cursor = encode_cursor(keys[page_hi - 1]) if page_hi < hi else None
+        return items, next_cursor
+    
+    def symbols(self) -> List[str]:
+        return sorted(self._keys)
+    
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys.values())
@@ -0,0 +1,85 @@
+"""
+Webhook servisinin region kaydı - Redis backend'inde replikalar ve yeniden başlatmalar arasında paylaşılır
+"""
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+from core.event_bus import RedisStreamBackend, StreamBackend
+
+class RegionStore(ABC):
+    """Region id'sine göre region dict'lerini saklayan depo arayüzü"""
+    
+    @abstractmethod
+    async def save_many(self, regions: List[Dict[str, Any]]) -> None:
+        """Region'ları yaz - aynı id'li kayıt üzerine yazılır"""
+        pass
+    
+    @abstractmethod
+    async def delete_many(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Verilen id'leri sil ve gerçekten silinen region'ları döndür"""
+        pass
+    
+    @abstractmethod
+    async def load_all(self) -> List[Dict[str, Any]]:
+        """Tüm region'ları oku"""
+        pass
+    
+    @abstractmethod
+    async def count(self) -> int:
+        """Kayıtlı region sayısı"""
+        pass
+
+class InMemoryRegionStore(RegionStore):
+    """Process içi kayıt - test ve Redis'siz kurulumlar için"""
+    
+    def __init__(self):
+        self.regions: Dict[str, Dict[str, Any]] = {}
+    
+    async def save_many(self, regions: List[Dict[str, Any]]) -> None:
+        for region in regions:
+            self.regions[region["id"]] = region
+    
+    async def delete_many(self, ids: List[str]) -> List[Dict[str, Any]]:
+        deleted = (self.regions.pop(region_id, None) for region_id in ids)
+        return [region for region in deleted if region is not None]
+    
+    async def load_all(self) -> List[Dict[str, Any]]:
+        return list(self.regions.values())
+    
+    async def count(self) -> int:
+        return len(self.regions)
+
+class RedisRegionStore(RegionStore):
+    """Tüm region'lar tek bir Redis hash'inde (id -> JSON)"""
+    
+    def __init__(self, client, key: str = "choch:regions"):
+        self.client = client
+        self.key = key
+    
+    async def save_many(self, regions: List[Dict[str, Any]]) -> None:
+        if regions:
+            await self.client.hset(self.key, mapping={r["id"]: json.dumps(r, default=str) for r in regions})
+    
+    async def delete_many(self, ids: List[str]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        # id başına HGET+HDEL tek MULTI içinde - aynı id'yi silen iki replikadan yalnızca biri döner
+        async with self.client.pipeline(transaction=True) as pipe:
+            for region_id in ids:
+                pipe.hget(self.key, region_id)
+                pipe.hdel(self.key, region_id)
+            results = await pipe.execute()
+        return [json.loads(raw) for raw, removed in zip(results[::2], results[1::2]) if removed]
+    
+    async def load_all(self) -> List[Dict[str, Any]]:
+        return [json.loads(raw) for raw in (await self.client.hgetall(self.key)).values()]
+    
+    async def count(self) -> int:
+        return await self.client.hlen(self.key)
+
+def create_region_store(backend: StreamBackend, key: str) -> RegionStore:
+    """Event bus Redis ise aynı bağlantıyla paylaşılan hash, değilse process içi kayıt"""
+    if isinstance(backend, RedisStreamBackend):
+        return RedisRegionStore(backend.client, key)
+    return InMemoryRegionStore()
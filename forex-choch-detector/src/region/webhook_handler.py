@@ -0,0 +1,287 @@
+"""
+Webhook ve sorgu HTTP servisi - region yönetimi, event sorguları ve TradingView alert'leri
+
+Servis tick döngüsünden ayrı çalışır: pattern event'leri ve region hit'leri
+event bus stream'lerinden okunup bellekteki zaman index'lerine yazılır, region
+komutları ise orkestratörün dinlediği komut stream'ine yayınlanır. Her replika
+kendi consumer group'uyla stream'lerin tamamını indexler; region kaydı event
+bus Redis ise replikalar arasında paylaşılır. ``WEBHOOK_PASSPHRASE`` verilirse
+TradingView alert'leri ve region'ları değiştiren istekler (``X-Webhook-Passphrase``
+header'ı) bu passphrase'i taşımalıdır.
+"""
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+import structlog
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ConfigDict
+
+from core.config import Config
+from core.event_bus import (EventConsumer, EventPublisher, InMemoryStreamBackend,
+                            StreamBackend, create_stream_backend)
+from region.event_index import EventIndex
+from region.region_store import RegionStore, create_region_store
+
+logger = structlog.get_logger(__name__)
+
+# Replika başına "webhook-service:<consumer_name>" - her replika tüm event'leri görür
+CONSUMER_GROUP_PREFIX = "webhook-service"
+
+class WebhookAuthError(Exception):
+    """İsteğin passphrase'i tutmuyor"""
+
+class RegionSpec(BaseModel):
+    """Oluşturulacak region"""
+    symbol: str
+    name: str
+    upper_bound: float
+    lower_bound: float
+    region_type: str = "static"
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class RegionBulkCreate(BaseModel):
+    regions: List[RegionSpec]
+
+class RegionBulkDelete(BaseModel):
+    ids: List[str]
+
+class TradingViewAlert(BaseModel):
+    """TradingView alert gövdesi - bilinmeyen alanlar payload'da korunur"""
+    model_config = ConfigDict(extra="allow")
+    
+    symbol: Optional[str] = None
+    ticker: Optional[str] = None
+    price: Optional[float] = None
+    close: Optional[float] = None
+    time: Optional[str] = None
+    message: Optional[str] = None
+    passphrase: Optional[str] = None
+
+class TradingViewBatch(BaseModel):
+    alerts: List[TradingViewAlert]
+
+def normalize_symbol(symbol: str) -> str:
+    """'EURUSD' / 'OANDA:EURUSD' gibi TradingView ticker'larını 'EUR/USD' biçimine çevir"""
+    symbol = symbol.split(":")[-1].upper()
+    if "/" not in symbol and len(symbol) == 6 and symbol.isalpha():
+        return f"{symbol[:3]}/{symbol[3:]}"
+    return symbol
+
+class WebhookService:
+    """Index'leri, region kaydını ve stream tüketicilerini tutan servis durumu"""
+    
+    def __init__(self, backend: StreamBackend, stream_prefix: str = "choch",
+                 max_per_symbol: int = 100000, passphrase: Optional[str] = None,
+                 consumer_name: Optional[str] = None, region_store: Optional[RegionStore] = None):
+        self.backend = backend
+        self.publisher = EventPublisher(backend, stream_prefix=stream_prefix)
+        self.passphrase = passphrase
+        self.consumer_name = consumer_name or socket.gethostname()
+        self.consumer_group = f"{CONSUMER_GROUP_PREFIX}:{self.consumer_name}"
+        
+        self.pattern_index = EventIndex(max_per_symbol)
+        self.hit_index = EventIndex(max_per_symbol)
+        self.webhook_index = EventIndex(max_per_symbol)
+        self.regions = region_store or create_region_store(backend, f"{stream_prefix}:regions")
+        self._tasks: List[asyncio.Task] = []
+    
+    def ingest(self, category: str, fields: Dict[str, Any]) -> None:
+        """Stream kaydını ilgili index'e ekle"""
+        index = self.pattern_index if category == "patterns" else self.hit_index
+        data = fields["data"]
+        record = {"type": fields.get("type"), "symbol": fields.get("symbol"), **data}
+        index.add(fields.get("symbol", ""), data.get("timestamp") or datetime.now(), record)
+    
+    async def _consume(self, category: str) -> None:
+        consumer = EventConsumer(self.backend, self.publisher.stream_name(category),
+                                 self.consumer_group, self.consumer_name)
+        await consumer.setup()
+        while True:
+            try:
+                entries = await consumer.read(count=500, block_ms=1000)
+                for _, fields in entries:
+                    self.ingest(category, fields)
+                if entries:
+                    await consumer.ack(*(entry_id for entry_id, _ in entries))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event stream okunamadı", stream=category, error=str(e))
+                await asyncio.sleep(1.0)
+    
+    async def start(self) -> None:
+        self.publisher.start()
+        self._tasks = [asyncio.create_task(self._consume(category)) for category in ("patterns", "regions")]
+        logger.info("Webhook servisi başladı", consumer=self.consumer_name, group=self.consumer_group)
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.publisher.stop()
+    
+    async def create_regions(self, specs: List[RegionSpec]) -> List[str]:
+        regions = []
+        for spec in specs:
+            region = spec.model_dump()
+            region["id"] = str(uuid.uuid4())
+            region["upper_bound"], region["lower_bound"] = (
+                max(spec.upper_bound, spec.lower_bound), min(spec.upper_bound, spec.lower_bound)
+            )
+            regions.append(region)
+        # Komutlar kayıt yazıldıktan sonra - orkestratör listede olmayan region'ı almaz
+        await self.regions.save_many(regions)
+        for region in regions:
+            self.publisher.publish("commands", "region_create", region["symbol"], region)
+        return [region["id"] for region in regions]
+    
+    async def delete_regions(self, ids: List[str]) -> List[str]:
+        deleted = await self.regions.delete_many(ids)
+        for region in deleted:
+            self.publisher.publish("commands", "region_delete", region["symbol"], {"id": region["id"]})
+        return [region["id"] for region in deleted]
+    
+    async def list_regions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        regions = await self.regions.load_all()
+        return [r for r in regions if symbol is None or r["symbol"] == symbol]
+    
+    def authorize(self, passphrase: Optional[str]) -> None:
+        """Passphrase tanımlıysa eşleşmeyen isteği reddet"""
+        if self.passphrase and passphrase != self.passphrase:
+            raise WebhookAuthError("Geçersiz passphrase")
+    
+    def accept_alerts(self, alerts: List[TradingViewAlert]) -> int:
+        for alert in alerts:
+            self.authorize(alert.passphrase)
+        
+        accepted = 0
+        for alert in alerts:
+            raw_symbol = alert.symbol or alert.ticker
+            if not raw_symbol:
+                continue
+            symbol = normalize_symbol(raw_symbol)
+            payload = alert.model_dump(exclude={"passphrase"}, exclude_none=True)
+            payload.update({
+                "symbol": symbol,
+                "price": alert.price if alert.price is not None else alert.close,
+                "timestamp": alert.time or datetime.now().isoformat()
+            })
+            self.webhook_index.add(symbol, payload["timestamp"], payload)
+            self.publisher.publish("webhooks", "tradingview", symbol, payload)
+            accepted += 1
+        return accepted
+
+def _service_from_env() -> WebhookService:
+    """CONFIG_PATH'teki config'e göre servis oluştur - config yoksa process içi backend"""
+    config_path = os.getenv("CONFIG_PATH", "config.yaml")
+    if not os.path.exists(config_path):
+        logger.warning("Config bulunamadı - process içi event bus kullanılıyor", path=config_path)
+        return WebhookService(InMemoryStreamBackend(), passphrase=os.getenv("WEBHOOK_PASSPHRASE"))
+    
+    config = Config.from_file(config_path)
+    backend = create_stream_backend(config.event_bus.backend, redis_url=config.redis_url,
+                                    maxlen=config.event_bus.maxlen)
+    return WebhookService(backend, stream_prefix=config.event_bus.stream_prefix,
+                          passphrase=os.getenv("WEBHOOK_PASSPHRASE"))
+
+def create_app(service: Optional[WebhookService] = None) -> FastAPI:
+    """FastAPI uygulaması - servis verilmezse başlangıçta env'den oluşturulur"""
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if getattr(app.state, "service", None) is None:
+            app.state.service = _service_from_env()
+        await app.state.service.start()
+        try:
+            yield
+        finally:
+            await app.state.service.stop()
+    
+    app = FastAPI(title="Forex CHoCH Webhook Service", lifespan=lifespan)
+    app.state.service = service
+    
+    def _service(request: Request) -> WebhookService:
+        return request.app.state.service
+    
+    def _require_passphrase(request: Request,
+                            x_webhook_passphrase: Optional[str] = Header(None)) -> None:
+        try:
+            _service(request).authorize(x_webhook_passphrase)
+        except WebhookAuthError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+    
+    def _page(index: EventIndex, symbol: str, start: Optional[str], end: Optional[str],
+              limit: int, cursor: Optional[str], order: str) -> Dict[str, Any]:
+        try:
+            items, next_cursor = index.query(symbol, start, end, limit, cursor, descending=order == "desc")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"items": items, "next_cursor": next_cursor}
+    
+    @app.get("/health")
+    async def health(request: Request) -> Dict[str, Any]:
+        service = _service(request)
+        return {
+            "status": "ok",
+            "pattern_events": len(service.pattern_index),
+            "region_hits": len(service.hit_index),
+            "regions": await service.regions.count()
+        }
+    
+    @app.post("/regions/bulk", dependencies=[Depends(_require_passphrase)])
+    async def create_regions(request: Request, body: RegionBulkCreate) -> Dict[str, Any]:
+        ids = await _service(request).create_regions(body.regions)
+        return {"created": len(ids), "ids": ids}
+    
+    @app.delete("/regions/bulk", dependencies=[Depends(_require_passphrase)])
+    async def delete_regions(request: Request, body: RegionBulkDelete) -> Dict[str, Any]:
+        deleted = await _service(request).delete_regions(body.ids)
+        return {"deleted": len(deleted), "ids": deleted}
+    
+    @app.get("/regions")
+    async def list_regions(request: Request, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await _service(request).list_regions(symbol)
+    
+    @app.get("/events")
+    async def pattern_events(request: Request, symbol: str, start: Optional[str] = None,
+                             end: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                             cursor: Optional[str] = None,
+                             order: str = Query("asc", pattern="^(asc|desc)$")) -> Dict[str, Any]:
+        return _page(_service(request).pattern_index, symbol, start, end, limit, cursor, order)
+    
+    @app.get("/region-hits")
+    async def region_hits(request: Request, symbol: str, start: Optional[str] = None,
+                          end: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                          cursor: Optional[str] = None,
+                          order: str = Query("asc", pattern="^(asc|desc)$")) -> Dict[str, Any]:
+        return _page(_service(request).hit_index, symbol, start, end, limit, cursor, order)
+    
+    @app.get("/webhooks/tradingview")
+    async def tradingview_alerts(request: Request, symbol: str, start: Optional[str] = None,
+                                 end: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                                 cursor: Optional[str] = None,
+                                 order: str = Query("asc", pattern="^(asc|desc)$")) -> Dict[str, Any]:
+        return _page(_service(request).webhook_index, symbol, start, end, limit, cursor, order)
+    
+    @app.post("/webhooks/tradingview")
+    async def tradingview_webhook(request: Request,
+                                  body: Union[TradingViewBatch, List[TradingViewAlert], TradingViewAlert]) -> Dict[str, Any]:
+        if isinstance(body, TradingViewBatch):
+            alerts = body.alerts
+        elif isinstance(body, list):
+            alerts = body
+        else:
+            alerts = [body]
+        try:
+            return {"accepted": _service(request).accept_alerts(alerts)}
+        except WebhookAuthError as e:
+            raise HTTPException(status_code=401, detail=str(e))
+    
+    return app
+
+app = create_app()
@@ -0,0 +1,105 @@
+"""
+History backfill tests against a local fake OANDA candles endpoint
+"""
+import pytest
+import aiohttp
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import PatternConfig
+from data_feed.oanda import OandaFeed
+from data_feed.candle_cache import CandleCache
+from pattern.choch_detector import CHoCHDetector
+
+END = pd.Timestamp.now(tz="UTC").tz_convert(None).floor("min")
+
+class FakeCandleServer:
+    """Serves M1 candles ending at END, failing the first request with 503"""
+    
+    def __init__(self, total: int = 12000):
+        self.times = pd.date_range(end=END, periods=total, freq="min")
+        self.requests = []
+        self.fail_next = True
+    
+    async def handle(self, request):
+        self.requests.append(dict(request.query))
+        if self.fail_next:
+            self.fail_next = False
+            return web.Response(status=503)
+        
+        query = request.query
+        count = int(query.get("count", 500))
+        if "from" in query:
+            start = pd.Timestamp(query["from"]).tz_convert(None)
+            selected = self.times[self.times > start][:count]
+        else:
+            end = pd.Timestamp(query["to"]).tz_convert(None) if "to" in query else self.times[-1]
+            selected = self.times[self.times < end][-count:] if "to" in query else self.times[-count:]
+        
+        candles = [{
+            "complete": True,
+            "time": t.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "volume": 10,
+            "mid": {"o": "1.1", "h": "1.2", "l": "1.0", "c": "1.1"}
+        } for t in selected]
+        return web.json_response({"candles": candles})
+
+async def _start(server):
+    app = web.Application()
+    app.router.add_get("/v3/instruments/{instrument}/candles", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}/v3"
+
+@pytest.mark.asyncio
+async def test_backfill_paginates_retries_and_uses_cache(tmp_path):
+    """Test pagination, retry on 503 and tail-only fetch from the cache"""
+    server = FakeCandleServer()
+    runner, url = await _start(server)
+    feed = OandaFeed(api_key="x", account_id="y", retry_base_delay=0.01)
+    feed.rest_url = url
+    feed.session = aiohttp.ClientSession()
+    cache = CandleCache(str(tmp_path))
+    
+    try:
+        history = await feed.backfill(["EUR/USD", "GBP/USD"], bars=7000, cache=cache, max_concurrency=2)
+        assert set(history) == {"EUR/USD", "GBP/USD"}
+        assert len(history["EUR/USD"]) == 7000
+        assert history["EUR/USD"].index.is_monotonic_increasing
+        assert history["EUR/USD"].index[-1] == END
+        # 2 sayfa x 2 sembol + 1 başarısız deneme
+        assert len(server.requests) == 5
+        
+        server.requests.clear()
+        history = await feed.backfill(["EUR/USD"], bars=7000, cache=cache)
+        assert len(history["EUR/USD"]) == 7000
+        assert len(server.requests) == 1
+        assert "from" in server.requests[0]
+    finally:
+        await feed.session.close()
+        await runner.cleanup()
+
+def test_load_history_warms_swings_per_symbol():
+    """Test bulk history load seeds swing state without emitting events"""
+    detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+    index = pd.date_range("2024-01-01", periods=300, freq="min")
+    wave = 1.08 + 0.005 * np.sin(np.arange(300) / 2.0) + np.arange(300) * 0.00002
+    df = pd.DataFrame({
+        "open": wave, "high": wave + 0.0002, "low": wave - 0.0002, "close": wave, "volume": 1
+    }, index=index)
+    
+    detector.load_history("EUR/USD", df)
+    
+    assert len(detector.symbol_data["EUR/USD"]) == 300
+    assert detector.swing_engines["EUR/USD"].swing_highs
+    assert "GBP/USD" not in detector.swing_engines
+    assert detector.current_trends["EUR/USD"].value == "bullish"
+    assert detector.pattern_history == []
@@ -9,6 +9,7 @@ import sys
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
+from bench.cases import sample_bars
 from core.config import PatternConfig
 from pattern.choch_detector import CHoCHDetector
 from region.box_region import BoxRegionManager
@@ -67,6 +68,30 @@ async def test_region_hit():
     
     # Price inside region
     tick_data = {"bid": 1.0824, "ask": 1.0826}
-    await manager.check_regions("EUR/USD", tick_data)
+    hits = manager.check_regions("EUR/USD", tick_data)
+    assert [hit["region_name"] for hit in hits] == ["Test Zone"]
+    assert not hit_detected
     
+    await manager.notify("EUR/USD", hits)
     assert hit_detected
+
+@pytest.mark.asyncio
+async def test_process_tick_returns_events_and_notify_fires_callbacks():
+    """Test that the sync tick path returns CHoCH events and only notify() calls on_choch"""
+    bars = sample_bars(400)
+    detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+    alerts = []
+    
+    async def on_choch(symbol, data):
+        alerts.append((symbol, data["direction"], data["price"]))
+    detector.on_choch = on_choch
+    
+    events = []
+    for bar_time, row in bars.iterrows():
+        events += detector.process_tick("EUR/USD", {"bid": row["close"], "ask": row["close"], "volume": 1,
+                                                    "timestamp": bar_time})
+    assert events and events == detector.pattern_history
+    assert not alerts
+    
+    await detector.notify(events)
+    assert alerts == [("EUR/USD", event.direction.value, event.price) for event in events]
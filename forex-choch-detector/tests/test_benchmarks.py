@@ -0,0 +1,49 @@
+"""
+Hot-path benchmarks for pytest-benchmark, plus checks of the bench runner's JSON and comparison
+
+Run only the benchmarks with: pytest tests/test_benchmarks.py --benchmark-only
+"""
+import importlib.util
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import CASES, sample_bars
+from bench.runner import compare_results, load_results, run_suite, save_results
+
+def test_sample_data_is_seeded_and_minute_indexed():
+    """Test that benchmark data is reproducible and built from the demo generator"""
+    first, second = sample_bars(5_000), sample_bars.__wrapped__(5_000)
+    assert first.equals(second)
+    assert first.index.freqstr == "min"
+    assert (first["high"] >= first["low"]).all() and (first["close"] > 0).all()
+
+def test_results_json_and_regression_flags(tmp_path):
+    """Test the results file layout and baseline comparison"""
+    report = run_suite([CASES["check_regions"]], min_time=0.0)
+    path = tmp_path / "bench.json"
+    save_results(report, str(path))
+    baseline = load_results(str(path))
+    
+    assert {"python", "platform", "cpu_count", "numpy", "pandas"} <= set(baseline["machine"])
+    assert [r["size"] for r in baseline["results"]] == [10, 100, 1_000, 10_000]
+    assert all(r["ns_per_op"] > 0 for r in baseline["results"])
+    
+    slower = {**report, "results": [dict(r, min_s=r["min_s"] * 2) for r in report["results"]]}
+    slower["results"].append(dict(report["results"][0], size=99))
+    statuses = {(row["size"], row["status"]) for row in compare_results(slower, baseline, threshold=0.1)}
+    assert statuses == {(10, "regression"), (100, "regression"), (1_000, "regression"),
+                        (10_000, "regression"), (99, "new")}
+    assert {row["status"] for row in compare_results(baseline, baseline)} == {"ok"}
+
+@pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None, reason="pytest-benchmark not installed")
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_hot_path_benchmark(benchmark, name):
+    """Benchmark each hot path at its small test size"""
+    case = CASES[name]
+    fn, ops = case.setup(case.test_size)
+    benchmark.extra_info["ops"] = ops
+    benchmark.pedantic(fn, rounds=3, warmup_rounds=1)
@@ -0,0 +1,127 @@
+"""
+Checkpoint tests: binary encoding, dirty-only writes and warm restore
+"""
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import PatternConfig
+from core.checkpoint import (HEADER, SWING_DTYPE, SWING_DTYPES, CheckpointManager, decode_symbol_state,
+                             encode_symbol_state)
+from core.state_store import FileStateStore, RedisStateStore
+from pattern.choch_detector import CHoCHDetector, TrendDirection
+from region.box_region import BoxRegionManager
+
+def _bars(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, periods)) + 0.002 * np.sin(np.arange(periods) / 2.0)
+    index = pd.date_range("2024-01-01", periods=periods, freq="min")
+    return pd.DataFrame({
+        "open": close, "high": close + 0.0003, "low": close - 0.0003, "close": close,
+        "volume": rng.integers(1, 100, periods).astype(float)
+    }, index=index)
+
+def _components():
+    detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+    region_manager = BoxRegionManager()
+    return detector, region_manager
+
+def test_encode_decode_round_trip():
+    """Test that bars, swings, trend and regions survive encoding"""
+    detector, region_manager = _components()
+    detector.load_history("EUR/USD", _bars(300))
+    region_manager.add_region("EUR/USD", "Support", 1.105, 1.095)
+    region_manager.regions["EUR/USD"][0].hit_count = 3
+    
+    state = detector.export_state("EUR/USD")
+    assert state["swing_highs"]
+    
+    blob = encode_symbol_state("EUR/USD", state, region_manager.export_state("EUR/USD"))
+    decoded = decode_symbol_state(blob)
+    
+    assert decoded["symbol"] == "EUR/USD"
+    pd.testing.assert_frame_equal(decoded["detector"]["bars"], state["bars"], check_freq=False, check_index_type=False)
+    assert decoded["detector"]["swing_highs"] == state["swing_highs"]
+    assert decoded["detector"]["swing_lows"] == state["swing_lows"]
+    assert decoded["detector"]["trend"] == state["trend"]
+    assert decoded["detector"]["last_processed_index"] == state["last_processed_index"]
+    assert decoded["regions"][0]["hit_count"] == 3
+
+def test_legacy_float32_strength_checkpoint_is_read():
+    """Test that CHK1 blobs with float32 swing strength still decode"""
+    detector, _ = _components()
+    detector.load_history("EUR/USD", _bars(300))
+    state = detector.export_state("EUR/USD")
+    blob = encode_symbol_state("EUR/USD", state, [])
+    
+    _, meta_len, n_bars, n_swings = HEADER.unpack_from(blob)
+    swings_offset = len(blob) - n_swings * SWING_DTYPE.itemsize
+    swings = np.frombuffer(blob, dtype=SWING_DTYPE, offset=swings_offset).astype(SWING_DTYPES[b"CHK1"])
+    legacy = HEADER.pack(b"CHK1", meta_len, n_bars, n_swings) + blob[HEADER.size:swings_offset] + swings.tobytes()
+    
+    decoded = decode_symbol_state(legacy)["detector"]
+    assert [swing.price for swing in decoded["swing_highs"]] == [swing.price for swing in state["swing_highs"]]
+    assert [swing.strength for swing in decoded["swing_lows"]] == \
+        pytest.approx([swing.strength for swing in state["swing_lows"]], rel=1e-6)
+
+@pytest.mark.asyncio
+async def test_checkpoint_writes_only_dirty_symbols(tmp_path):
+    """Test that unchanged symbols are not rewritten"""
+    detector, region_manager = _components()
+    manager = CheckpointManager(FileStateStore(str(tmp_path)), detector, region_manager)
+    detector.load_history("EUR/USD", _bars(100))
+    detector.load_history("GBP/USD", _bars(100, seed=1))
+    
+    assert await manager.checkpoint() == 2
+    assert await manager.checkpoint() == 0
+    
+    detector.process_tick("EUR/USD", {"bid": 1.1, "ask": 1.1001, "timestamp": "2024-01-01T01:40:10"})
+    region_manager.add_region("USD/JPY", "Zone", 151.0, 150.0)
+    assert await manager.checkpoint() == 2
+    assert {p.name for p in tmp_path.iterdir()} == {"EUR%2FUSD.ckpt", "GBP%2FUSD.ckpt", "USD%2FJPY.ckpt"}
+
+@pytest.mark.asyncio
+async def test_file_store_restores_100_symbols_quickly(tmp_path):
+    """Test warm restore of 100 symbols within a second"""
+    detector, region_manager = _components()
+    bars = _bars(1000)
+    symbols = [f"SYM{i}/USD" for i in range(100)]
+    for symbol in symbols:
+        detector.load_history(symbol, bars)
+        region_manager.add_region(symbol, "Zone", 1.2, 1.0)
+    await CheckpointManager(FileStateStore(str(tmp_path)), detector, region_manager).checkpoint()
+    
+    fresh_detector, fresh_regions = _components()
+    manager = CheckpointManager(FileStateStore(str(tmp_path)), fresh_detector, fresh_regions)
+    start = time.perf_counter()
+    restored = await manager.restore()
+    elapsed = time.perf_counter() - start
+    
+    assert restored == set(symbols)
+    assert elapsed < 1.0
+    assert len(fresh_detector.symbol_data["SYM7/USD"]) == 1000
+    assert fresh_detector.current_trends["SYM7/USD"] == detector.current_trends["SYM7/USD"]
+    assert len(fresh_regions.get_regions("SYM7/USD")) == 1
+    assert not fresh_detector.dirty_symbols
+
+@pytest.mark.asyncio
+async def test_redis_store_round_trip():
+    """Test the Redis backend against an in-memory server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    store = RedisStateStore(client=fakeredis.FakeAsyncRedis())
+    detector, region_manager = _components()
+    detector.load_history("EUR/USD", _bars(200))
+    await CheckpointManager(store, detector, region_manager).checkpoint()
+    
+    fresh_detector, fresh_regions = _components()
+    restored = await CheckpointManager(store, fresh_detector, fresh_regions).restore()
+    
+    assert restored == {"EUR/USD"}
+    assert fresh_detector.current_trends["EUR/USD"] in TrendDirection
+    assert len(fresh_detector.swing_engines["EUR/USD"].swing_highs) == len(detector.swing_engines["EUR/USD"].swing_highs)
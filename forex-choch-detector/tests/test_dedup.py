@@ -0,0 +1,107 @@
+"""
+Alert deduplication tests: TTL, LRU bound, price buckets and suppressed stats
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from core.config import Config, PatternConfig
+from core.orchestrator import TradingOrchestrator, create_dispatcher
+from notifier.base import NotifierBase
+from notifier.dedup import AlertDeduplicator
+from pattern.choch_detector import CHoCHDetector
+
+class RecordingNotifier(NotifierBase):
+    name = "recording"
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    async def initialize(self):
+        self.initialized = True
+    
+    async def send_notification(self, message, alert_type="info", **kwargs):
+        self.messages.append(message)
+        self.sent_count += 1
+        return True
+
+def test_ttl_counts_from_first_alert():
+    """Test that repeats are suppressed until the TTL of the first alert expires"""
+    dedup = AlertDeduplicator(ttl=10.0)
+    key = dedup.make_key("EUR/USD", "choch", "bullish", "M1", 1.1000)
+    
+    assert dedup.allow(key, now=0.0)
+    assert not dedup.allow(key, now=5.0)
+    assert not dedup.allow(key, now=9.9)
+    assert dedup.allow(key, now=10.0)
+    assert dedup.get_stats()["suppressed"] == 2
+
+def test_price_buckets_scale_with_price():
+    """Test that nearby prices share a bucket for both EUR/USD and USD/JPY"""
+    dedup = AlertDeduplicator(price_bucket_bps=5.0)
+    assert dedup.price_bucket(1.10001) == dedup.price_bucket(1.10003)
+    assert dedup.price_bucket(1.1000) != dedup.price_bucket(1.1011)
+    assert dedup.price_bucket(150.001) == dedup.price_bucket(150.003)
+    assert dedup.price_bucket(150.00) != dedup.price_bucket(150.15)
+
+def test_lru_bound_evicts_least_recent():
+    """Test that the cache never grows past max_size"""
+    dedup = AlertDeduplicator(ttl=100.0, max_size=2)
+    assert dedup.allow("a", now=0)
+    assert dedup.allow("b", now=0)
+    assert not dedup.allow("a", now=1)
+    assert dedup.allow("c", now=1)
+    
+    assert len(dedup) == 2
+    assert dedup.evicted == 1
+    assert not dedup.allow("a", now=2)
+    assert dedup.allow("b", now=2)
+
+@pytest.mark.asyncio
+async def test_orchestrator_suppresses_repeats_before_fan_out():
+    """Test that repeated CHoCH and region hits reach notifiers once"""
+    config = Config(broker={"type": "mt5", "symbols": []}, notifications={"coalesce_window": 0}, pattern={})
+    orchestrator = TradingOrchestrator(config)
+    notifier = RecordingNotifier()
+    orchestrator.dispatcher = create_dispatcher(config, [notifier])
+    orchestrator.dispatcher.start()
+    
+    for price in (1.10000, 1.10002, 1.10001):
+        await orchestrator._on_choch_detected("EUR/USD", {
+            "direction": "bullish", "price": price, "timestamp": "2024-01-01T00:00:00"
+        })
+    await orchestrator._on_choch_detected("EUR/USD", {
+        "direction": "bearish", "price": 1.10000, "timestamp": "2024-01-01T00:01:00"
+    })
+    # Aynı sinyal başka timeframe'deki detector'dan gelirse ayrı uyarıdır
+    await orchestrator._on_choch_detected("EUR/USD", {
+        "direction": "bearish", "price": 1.10000, "timestamp": "2024-01-01T00:01:00", "timeframe": "M5"
+    })
+    for hit in range(5):
+        await orchestrator._on_region_hit("EUR/USD", {
+            "region_id": "r1", "region_name": "Support", "price": 1.1, "hit_count": hit + 1
+        })
+    await orchestrator.dispatcher.stop()
+    
+    assert orchestrator.dispatcher.get_stats()["recording"]["enqueued"] == 4
+    assert "".join(notifier.messages).count("Region Hit") == 1
+    assert notifier.get_stats()["suppressed_count"] == 6
+    assert orchestrator.dispatcher.deduplicator.get_stats()["suppressed"] == 6
+
+def test_detector_bars_follow_pattern_timeframe():
+    """Test that ticks are aggregated into bars of the configured timeframe"""
+    detector = CHoCHDetector(PatternConfig(timeframe="M5"))
+    for minute in range(12):
+        detector.process_tick("EUR/USD", {"bid": 1.1 + minute * 1e-4, "ask": 1.1001 + minute * 1e-4,
+                                          "timestamp": f"2024-01-01T00:{minute:02d}:30"})
+    
+    bars = detector.symbol_data["EUR/USD"]
+    assert list(bars.index) == list(pd.date_range("2024-01-01 00:00", periods=3, freq="5min"))
+    assert bars["open"].iloc[1] == pytest.approx(1.10055)
+    assert bars["close"].iloc[1] == pytest.approx(1.10095)
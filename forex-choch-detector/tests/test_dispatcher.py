@@ -0,0 +1,104 @@
+"""
+Notification dispatcher tests: non-blocking enqueue, digests, timeouts and circuit breaker
+"""
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import Config
+from core.orchestrator import TradingOrchestrator
+from notifier.base import NotifierBase
+from notifier.dispatcher import NotificationDispatcher, ChannelWorker, CircuitBreaker
+
+class RecordingNotifier(NotifierBase):
+    """Records messages, optionally slow or failing"""
+    
+    def __init__(self, name="recording", delay=0.0, succeed=True):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.succeed = succeed
+        self.messages = []
+    
+    async def initialize(self):
+        self.initialized = True
+    
+    async def send_notification(self, message, alert_type="info", **kwargs):
+        self.messages.append((message, alert_type))
+        await asyncio.sleep(self.delay)
+        return self.succeed
+
+@pytest.mark.asyncio
+async def test_detection_callback_does_not_wait_for_slow_channel():
+    """Test that a CHoCH callback returns while the notifier is still sending"""
+    config = Config(broker={"type": "mt5", "symbols": []}, notifications={}, pattern={})
+    orchestrator = TradingOrchestrator(config)
+    slow = RecordingNotifier(delay=1.0)
+    orchestrator.dispatcher = NotificationDispatcher([slow], coalesce_window=0)
+    orchestrator.dispatcher.start()
+    
+    start = time.perf_counter()
+    await orchestrator._on_choch_detected("EUR/USD", {
+        "direction": "bullish", "price": 1.1, "timestamp": "2024-01-01T00:00:00"
+    })
+    assert time.perf_counter() - start < 0.05
+    
+    await orchestrator.dispatcher.stop()
+    assert len(slow.messages) == 1
+
+@pytest.mark.asyncio
+async def test_alerts_within_window_are_coalesced():
+    """Test that a burst of alerts becomes a single digest message"""
+    notifier = RecordingNotifier()
+    dispatcher = NotificationDispatcher([notifier], coalesce_window=0.05)
+    dispatcher.start()
+    
+    for i in range(5):
+        dispatcher.dispatch(f"CHoCH {i}", "choch")
+    await dispatcher.stop()
+    
+    assert len(notifier.messages) == 1
+    message, alert_type = notifier.messages[0]
+    assert message.startswith("📋 5 alerts")
+    assert "CHoCH 4" in message
+    assert alert_type == "choch"
+    assert dispatcher.get_stats()["recording"]["digests_sent"] == 1
+
+@pytest.mark.asyncio
+async def test_hanging_channel_trips_breaker_without_affecting_others():
+    """Test per-channel timeouts and the circuit breaker"""
+    hanging = RecordingNotifier(name="hanging", delay=10.0)
+    healthy = RecordingNotifier(name="healthy")
+    dispatcher = NotificationDispatcher(
+        [hanging, healthy], coalesce_window=0, timeout=5.0,
+        channel_timeouts={"hanging": 0.02}, failure_threshold=2, reset_timeout=60.0
+    )
+    dispatcher.start()
+    
+    for i in range(4):
+        dispatcher.dispatch(f"alert {i}")
+        await asyncio.sleep(0.05)
+    await dispatcher.stop(drain_timeout=1.0)
+    
+    stats = dispatcher.get_stats()
+    assert stats["hanging"]["timeouts"] == 2
+    assert stats["hanging"]["breaker"] == CircuitBreaker.OPEN
+    assert stats["hanging"]["short_circuited"] == 2
+    assert [m for m, _ in healthy.messages] == [f"alert {i}" for i in range(4)]
+
+def test_bounded_queue_drops_oldest():
+    """Test that a full channel queue keeps the newest alerts"""
+    async def scenario():
+        worker = ChannelWorker(RecordingNotifier(), queue_size=3)
+        for i in range(5):
+            worker.offer(f"alert {i}", "info")
+        return worker, [worker.queue.get_nowait()[0] for _ in range(3)]
+    
+    worker, pending = asyncio.run(scenario())
+    assert pending == ["alert 2", "alert 3", "alert 4"]
+    assert worker.dropped == 2
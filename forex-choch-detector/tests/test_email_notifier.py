@@ -0,0 +1,148 @@
+"""
+Email notifier tests against a local SMTP server
+"""
+import asyncio
+import socket
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from notifier.email import EmailNotifier
+
+aiosmtpd = pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+class CollectingHandler:
+    """Keeps every received message and counts sessions"""
+    
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+    
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope.content.decode("utf-8"))
+        return "250 OK"
+
+def _authenticator(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=auth_data.login == b"bot" and auth_data.password == b"secret")
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = CollectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port,
+                            authenticator=_authenticator, auth_require_tls=False)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+@pytest.mark.asyncio
+async def test_alert_storm_reuses_pooled_connections(smtp_server):
+    """Test that many alerts are sent over at most pool_size connections"""
+    handler, port = smtp_server
+    notifier = EmailNotifier("127.0.0.1", port, "bot", "secret", recipients=["desk@example.com"],
+                             use_starttls=False, pool_size=2)
+    await notifier.initialize()
+    
+    results = await asyncio.gather(*(
+        notifier.send_notification(f"CHoCH #{i}", "choch") for i in range(30)
+    ))
+    await notifier.cleanup()
+    
+    assert all(results)
+    assert len(handler.messages) == 30
+    assert notifier.connections_opened <= 2
+    assert "Subject: Forex CHoCH Alert - CHOCH" in handler.messages[0]
+
+@pytest.mark.asyncio
+async def test_dropped_connection_is_reopened(smtp_server):
+    """Test lazy reconnect after the server side closed the connection"""
+    handler, port = smtp_server
+    notifier = EmailNotifier("127.0.0.1", port, "bot", "secret", recipients=["desk@example.com"],
+                             use_starttls=False, pool_size=1)
+    await notifier.initialize()
+    
+    assert await notifier.send_notification("first")
+    smtp = notifier._pool.get_nowait()
+    smtp.close()
+    notifier._pool.put_nowait(smtp)
+    
+    assert await notifier.send_notification("second")
+    await notifier.cleanup()
+    assert len(handler.messages) == 2
+    assert notifier.connections_opened == 2
+
+@pytest.mark.asyncio
+async def test_digest_mode_sends_one_email_per_interval(smtp_server):
+    """Test that alerts in digest mode are batched into a single email"""
+    handler, port = smtp_server
+    notifier = EmailNotifier("127.0.0.1", port, None, None, sender="bot@example.com",
+                             recipients=["desk@example.com"], use_starttls=False, digest_interval=0.1)
+    await notifier.initialize()
+    
+    for i in range(10):
+        await notifier.send_notification(f"BOS #{i}", "bos")
+    await asyncio.sleep(0.3)
+    await notifier.cleanup()
+    
+    assert len(handler.messages) == 1
+    assert "Forex CHoCH Digest - 10 alerts" in handler.messages[0]
+    assert "BOS #9" in handler.messages[0]
+
+@pytest.mark.asyncio
+async def test_failed_digest_is_requeued_and_reported(smtp_server):
+    """Test that a failed digest keeps its alerts and send_notification reports the failure"""
+    handler, port = smtp_server
+    notifier = EmailNotifier("127.0.0.1", port, None, None, sender="bot@example.com",
+                             recipients=["desk@example.com"], use_starttls=False, digest_interval=60)
+    await notifier.initialize()
+    notifier.smtp_port = 1
+    
+    assert await notifier.send_notification("BOS #0", "bos")
+    assert not await notifier.flush_digest()
+    assert not await notifier.send_notification("BOS #1", "bos")
+    assert notifier.get_stats()["pending_digest"] == 2
+    
+    notifier.smtp_port = port
+    notifier._last_flush -= 60
+    assert await notifier.send_notification("BOS #2", "bos")
+    await notifier.cleanup()
+    
+    assert len(handler.messages) == 1
+    assert "Forex CHoCH Digest - 3 alerts" in handler.messages[0]
+    assert handler.messages[0].index("BOS #0") < handler.messages[0].index("BOS #2")
+
+@pytest.mark.asyncio
+async def test_pending_digest_is_capped_while_smtp_is_down(smtp_server):
+    """Test that repeated digest failures keep only the newest alerts and count the dropped ones"""
+    handler, port = smtp_server
+    notifier = EmailNotifier("127.0.0.1", port, None, None, sender="bot@example.com",
+                             recipients=["desk@example.com"], use_starttls=False, digest_interval=60,
+                             max_digest=5)
+    await notifier.initialize()
+    notifier.smtp_port = 1
+    
+    for i in range(4):
+        await notifier.send_notification(f"BOS #{i}", "bos")
+    assert not await notifier.flush_digest()
+    for i in range(4, 8):
+        await notifier.send_notification(f"BOS #{i}", "bos")
+    assert not await notifier.flush_digest()
+    assert notifier.get_stats()["pending_digest"] == 5
+    assert notifier.get_stats()["dropped_digest"] == 3
+    
+    notifier.smtp_port = port
+    assert await notifier.flush_digest()
+    await notifier.cleanup()
+    
+    assert len(handler.messages) == 1
+    assert "Forex CHoCH Digest - 5 alerts" in handler.messages[0]
+    assert "BOS #2" not in handler.messages[0]
+    assert "BOS #3" in handler.messages[0] and "BOS #7" in handler.messages[0]
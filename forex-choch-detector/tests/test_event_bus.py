@@ -0,0 +1,134 @@
+"""
+Event bus tests: batched publishing and consumer group fan-out
+"""
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.event_bus import EventPublisher, EventConsumer, InMemoryStreamBackend, RedisStreamBackend
+
+class CountingBackend(InMemoryStreamBackend):
+    """Counts round-trips to the backend"""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+    
+    async def append_many(self, entries):
+        self.calls.append(len(entries))
+        await super().append_many(entries)
+
+@pytest.mark.asyncio
+async def test_publisher_batches_writes():
+    """Test that a burst is sent in max_batch sized round-trips"""
+    backend = CountingBackend()
+    publisher = EventPublisher(backend, flush_interval=0.005, max_batch=500)
+    publisher.start()
+    
+    for i in range(1200):
+        publisher.publish_pattern("choch", "EUR/USD", {"price": 1.1 + i * 1e-5, "direction": "bullish"})
+    await asyncio.sleep(0.05)
+    await publisher.stop()
+    
+    assert sum(backend.calls) == 1200
+    assert len(backend.calls) <= 4
+    assert publisher.get_stats()["published"] == 1200
+    assert len(backend.streams["choch:patterns"]) == 1200
+
+class FailingBackend(InMemoryStreamBackend):
+    """Fails every write after letting a publisher fill the buffer mid-flight"""
+    
+    def __init__(self, publisher_ref):
+        super().__init__()
+        self.publisher_ref = publisher_ref
+    
+    async def append_many(self, entries):
+        for i in range(3):
+            self.publisher_ref[0].publish_pattern("bos", "EUR/USD", {"price": i})
+        raise ConnectionError("redis down")
+
+@pytest.mark.asyncio
+async def test_failed_flush_counts_entries_evicted_on_requeue():
+    """Test that requeueing a failed batch into a full buffer counts the evicted entries as dropped"""
+    publisher_ref = []
+    publisher = EventPublisher(FailingBackend(publisher_ref), max_batch=4, max_buffer=5)
+    publisher_ref.append(publisher)
+    for i in range(4):
+        publisher.publish_pattern("choch", "EUR/USD", {"price": i})
+    
+    with pytest.raises(ConnectionError):
+        await publisher.flush()
+    
+    assert len(publisher._buffer) == 5
+    assert publisher.dropped == 2
+    assert [entry[1]["type"] for entry in publisher._buffer] == ["choch"] * 4 + ["bos"]
+
+@pytest.mark.asyncio
+async def test_consumer_groups_fan_out_in_memory():
+    """Test that each group sees every event and consumers in a group share them"""
+    backend = InMemoryStreamBackend()
+    publisher = EventPublisher(backend)
+    stream = publisher.stream_name("patterns")
+    
+    audit = EventConsumer(backend, stream, "audit", "a1")
+    worker_1 = EventConsumer(backend, stream, "execution", "w1")
+    worker_2 = EventConsumer(backend, stream, "execution", "w2")
+    for consumer in (audit, worker_1, worker_2):
+        await consumer.setup()
+    
+    for i in range(10):
+        publisher.publish_pattern("bos", "GBP/USD", {"price": i})
+    await publisher.flush()
+    
+    first = await worker_1.read(count=6, block_ms=0)
+    second = await worker_2.read(count=6, block_ms=0)
+    everything = await audit.read(count=100, block_ms=0)
+    
+    assert [e[1]["data"]["price"] for e in first + second] == list(range(10))
+    assert len(everything) == 10
+    assert everything[0][1]["type"] == "bos"
+    assert everything[0][1]["symbol"] == "GBP/USD"
+    
+    await worker_1.ack(*(entry_id for entry_id, _ in first))
+    assert len(backend.groups[stream]["execution"][1]) == 4
+
+@pytest.mark.asyncio
+async def test_blocking_read_wakes_on_publish():
+    """Test that a blocked consumer receives events as soon as they are flushed"""
+    backend = InMemoryStreamBackend()
+    publisher = EventPublisher(backend)
+    consumer = EventConsumer(backend, publisher.stream_name("regions"), "ui", "c1")
+    await consumer.setup()
+    
+    reader = asyncio.create_task(consumer.read(block_ms=1000))
+    await asyncio.sleep(0.01)
+    publisher.publish_region("region_hit", "EUR/USD", {"region_name": "Support"})
+    await publisher.flush()
+    
+    entries = await asyncio.wait_for(reader, timeout=1)
+    assert entries[0][1]["data"]["region_name"] == "Support"
+
+@pytest.mark.asyncio
+async def test_redis_backend_pipelines_and_groups():
+    """Test the Redis Streams backend against an in-memory server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    backend = RedisStreamBackend(client=client, maxlen=1000)
+    publisher = EventPublisher(backend, stream_prefix="test")
+    consumer = EventConsumer(backend, "test:patterns", "execution", "w1")
+    await consumer.setup()
+    await consumer.setup()
+    
+    for i in range(25):
+        publisher.publish_pattern("choch", "USD/JPY", {"price": 150 + i})
+    await publisher.flush()
+    
+    entries = await consumer.read(count=100, block_ms=10)
+    assert len(entries) == 25
+    assert entries[-1][1]["data"]["price"] == 174
+    await consumer.ack(*(entry_id for entry_id, _ in entries))
+    assert (await client.xpending("test:patterns", "execution"))["pending"] == 0
@@ -0,0 +1,90 @@
+"""
+Backtest export tests: bar-by-bar replay, streamed row groups and format round trips
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from core.export import ResultWriter, create_writer, read_results
+from pattern.choch_detector import CHoCHDetector
+
+SYMBOL = "EUR/USD"
+
+@pytest.fixture(scope="module")
+def bars():
+    return sample_bars(1500)
+
+def run_backtest(bars, writer=None, on_events=None):
+    detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+    events = detector.backtest(SYMBOL, bars, writer=writer, on_events=on_events)
+    return detector, events
+
+def test_backtest_streams_row_groups(bars, tmp_path):
+    """Test that events, swings and per-bar state are written in row groups as the replay advances"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    batches = []
+    with create_writer("parquet", tmp_path, row_group_size=400) as writer:
+        detector, streamed = run_backtest(bars, writer, on_events=batches.append)
+    _, events = run_backtest(bars)
+    
+    # Written events are handed to on_events and not kept in memory
+    assert streamed == [] and detector.pattern_history == []
+    assert len(batches) == 4
+    assert [event.price for batch in batches for event in batch] == [event.price for event in events]
+    assert len(detector.symbol_data[SYMBOL]) == detector.max_bars
+    
+    structure = read_results(tmp_path, "structure")
+    assert len(structure) == len(bars)
+    assert pq.ParquetFile(tmp_path / "structure.parquet").metadata.num_row_groups == 4
+    assert (structure["timestamp"].to_numpy() == bars.index.to_numpy()).all()
+    
+    engine = detector.swing_engines[SYMBOL]
+    swings = read_results(tmp_path, "swings").sort_values(["index", "swing_type"])
+    assert len(swings) == len(engine.swing_highs) + len(engine.swing_lows)
+    highs = swings[swings["swing_type"] == "high"]
+    assert highs["price"].tolist() == [swing.price for swing in engine.swing_highs]
+    
+    exported = read_results(tmp_path, "events")
+    assert len(events) > 4
+    assert exported["bar_index"].tolist() == [event.metadata["bar_index"] for event in events]
+    assert exported["direction"].tolist() == [event.direction.value for event in events]
+    # The trend switches at each event bar and every event uses a swing confirmed by then
+    trend = structure.set_index("bar_index")["trend"]
+    for row in exported.itertuples():
+        assert trend[row.bar_index] == (1 if row.direction == "bullish" else -1)
+        assert row.swing_to + detector.config.swing_depth <= row.bar_index
+
+def test_choch_does_not_refire_on_the_same_swings(bars):
+    """Test that consecutive CHoCH events alternate and each is triggered by a newer swing"""
+    _, events = run_backtest(bars)
+    directions = [event.direction for event in events]
+    assert all(a != b for a, b in zip(directions, directions[1:]))
+    triggers = [event.swing_points[-1].timestamp for event in events]
+    assert triggers == sorted(triggers) and len(set(triggers)) == len(triggers)
+
+@pytest.mark.parametrize("format", ["arrow", "npz"])
+def test_formats_round_trip_like_parquet(bars, tmp_path, format):
+    """Test that Arrow IPC and NPZ outputs read back to the same tables"""
+    pytest.importorskip("pyarrow")
+    with create_writer("parquet", tmp_path / "parquet", row_group_size=256) as writer:
+        run_backtest(bars, writer)
+    with create_writer(format, tmp_path / format, row_group_size=256) as writer:
+        run_backtest(bars, writer)
+    assert writer.row_groups["structure"] == int(np.ceil(len(bars) / 256))
+    
+    for table in ("events", "swings", "structure"):
+        expected = read_results(tmp_path / "parquet", table)
+        actual = read_results(tmp_path / format, table)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+def test_result_writer_requires_a_row_group_backend(tmp_path):
+    """Test that the base writer is abstract"""
+    with pytest.raises(TypeError):
+        ResultWriter(tmp_path)
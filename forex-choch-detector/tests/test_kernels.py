@@ -0,0 +1,106 @@
+"""
+Kernel tests: Numba and NumPy/Python backends against the reference swing engine and structure pass on random data
+"""
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import PatternConfig
+from pattern import kernels
+from pattern.choch_detector import CHoCHDetector
+from pattern.structure import compute_swings, structure_pass, swing_arrays
+from pattern.swing_engine import SwingEngine
+
+BACKENDS = ["python"] + (["numba"] if importlib.util.find_spec("numba") else [])
+
+def random_bars(rng, count):
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0003, count))
+    # Rounded prices make equal highs/lows and tolerance edge cases common
+    high = np.round(close + rng.uniform(0, 0.0004, count), 4)
+    low = np.round(close - rng.uniform(0, 0.0004, count), 4)
+    return pd.DataFrame({"high": high, "low": low}, index=pd.date_range("2024-01-01", periods=count, freq="min"))
+
+def random_ohlcv(rng, count):
+    bars = random_bars(rng, count)
+    bars["open"] = bars["close"] = np.round(rng.uniform(bars["low"], bars["high"]), 5)
+    bars["volume"] = rng.integers(100, 1000, count).astype(float)
+    return bars[["open", "high", "low", "close", "volume"]]
+
+def swings_of(engine):
+    return [(s.index, s.price, s.timestamp) for s in engine.swing_highs], \
+        [(s.index, s.price, s.timestamp) for s in engine.swing_lows]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_swing_kernels_match_reference_engine_incrementally(backend):
+    """Test full and incremental passes (with a changing forming bar) against the iloc reference"""
+    rng = np.random.default_rng(11)
+    for _ in range(4):
+        depth = int(rng.integers(3, 8))
+        tolerance = float(rng.choice([0.0, 0.0001, 0.0003]))
+        df = random_bars(rng, 400)
+        engines = {name: SwingEngine(depth, tolerance, backend=name) for name in ("reference", backend)}
+        for end in list(range(depth * 2 + 1, len(df), 17)) + [len(df)]:
+            bars = df.iloc[:end].copy()
+            bars.iloc[-1, 0] += rng.normal(0, 0.0003)  # oluşan bar sonradan değişir
+            for engine in engines.values():
+                engine.process_candles(bars)
+        assert swings_of(engines[backend]) == swings_of(engines["reference"])
+        assert engines[backend].last_processed_index == engines["reference"].last_processed_index
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_compute_swings_matches_swing_arrays(backend):
+    """Test that the array pass orders swings like swing_arrays, including bars that are both high and low"""
+    rng = np.random.default_rng(5)
+    df = random_bars(rng, 3000)
+    df.iloc[1500] = [df["high"].max() + 0.01, df["low"].min() - 0.01]
+    reference = swing_arrays(*SwingEngine(5, 0.0001).process_candles(df), 5)
+    actual = compute_swings(df["high"].to_numpy(), df["low"].to_numpy(), 5, 0.0001, 0.0005, backend=backend)
+    assert actual.is_high[actual.index == 1500].tolist() == [True, False]
+    for field in ("confirm_bar", "index", "is_high", "price"):
+        np.testing.assert_array_equal(getattr(actual, field), getattr(reference, field))
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_array_pass_matches_detector_backtest_on_random_bars(backend):
+    """Test compiled swing and structure passes against the detector's bar-by-bar backtest on random data"""
+    rng = np.random.default_rng(3)
+    found = 0
+    for _ in range(6):
+        config = PatternConfig(swing_depth=int(rng.integers(3, 8)), tolerance=float(rng.choice([0.0001, 0.0003])))
+        bars = random_ohlcv(rng, int(rng.integers(300, 1500)))
+        detector = CHoCHDetector(config)
+        detector.kernel_backend = "reference"
+        events = detector.backtest("EUR/USD", bars)
+        swings = compute_swings(bars["high"].to_numpy(), bars["low"].to_numpy(), config.swing_depth,
+                                config.tolerance, config.min_swing_size, backend=backend)
+        arrays, trend, _ = structure_pass(swings, 0, len(bars), config.swing_depth * 4, backend=backend)
+        
+        found += len(events)
+        assert detector.swing_engines["EUR/USD"].backend == "reference"
+        assert arrays["bar_index"].tolist() == [event.metadata["bar_index"] for event in events]
+        assert arrays["direction"].tolist() == [1 if event.direction.value == "bullish" else -1 for event in events]
+        assert arrays["price"].tolist() == [event.price for event in events]
+        assert arrays["invalidation"].tolist() == [event.metadata["invalidation"] for event in events]
+        if events:
+            assert trend == (1 if detector.current_trends["EUR/USD"].value == "bullish" else -1)
+    assert found > 30
+
+def test_fallback_without_numba(monkeypatch):
+    """Test that a missing numba falls back transparently and only an explicit numba backend fails"""
+    monkeypatch.setitem(sys.modules, "numba", None)
+    kernels.compiled.cache_clear()
+    try:
+        df = random_bars(np.random.default_rng(1), 500)
+        engine = SwingEngine(5, 0.0001)
+        engine.process_candles(df)
+        assert engine.swing_highs and engine.swing_lows
+        assert not kernels.warm_up()
+        with pytest.raises(ValueError):
+            kernels.detect_swings(df["high"].to_numpy(), df["low"].to_numpy(), 0, len(df), 5, 0.0001, backend="numba")
+    finally:
+        kernels.compiled.cache_clear()
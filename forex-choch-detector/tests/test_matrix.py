@@ -0,0 +1,114 @@
+"""
+Matrix swing engine tests: parity with the per-symbol backtest and the detector's shared bar close dispatch
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from pattern.choch_detector import CHoCHDetector
+from pattern.matrix import MatrixSwingEngine
+
+CONFIG = PatternConfig(tolerance=0.0001)
+
+def symbol_bars(count, symbols=3):
+    bars = sample_bars(count * symbols)
+    return {f"SYM{i}": bars.iloc[i * count:(i + 1) * count].set_axis(bars.index[:count])
+            for i in range(symbols)}
+
+def test_matrix_matches_per_symbol_backtest():
+    """Test that one vectorized close per bar emits each row's backtest events, with per-row tolerances"""
+    bars = symbol_bars(2500)
+    tolerances = {"SYM0": 0.0001, "SYM1": 0.0002, "SYM2": 0.0001}
+    matrix = MatrixSwingEngine(CONFIG.swing_depth, min_bars=CONFIG.swing_depth * 4, capacity=2)
+    for symbol, tolerance in tolerances.items():
+        matrix.add_symbol(symbol, tolerance)
+    highs = np.vstack([df["high"].to_numpy() for df in bars.values()])
+    lows = np.vstack([df["low"].to_numpy() for df in bars.values()])
+    
+    events = {symbol: [] for symbol in bars}
+    for column in range(highs.shape[1]):
+        for row in range(len(bars)):
+            matrix.update(row, highs[row, column], lows[row, column])
+        update = matrix.close_bar()
+        assert set(np.flatnonzero(update.direction)) <= set(update.changed)
+        for row in np.flatnonzero(update.direction):
+            bullish = update.direction[row] > 0
+            events[matrix.symbols[row]].append((update.bar, "bullish" if bullish else "bearish",
+                                                matrix.high_last[row] if bullish else matrix.low_last[row],
+                                                matrix.low_last[row] if bullish else matrix.high_last[row]))
+    
+    for symbol, df in bars.items():
+        expected = CHoCHDetector(PatternConfig(tolerance=tolerances[symbol])).backtest(symbol, df)
+        assert len(expected) > 10
+        assert events[symbol] == [(event.metadata["bar_index"], event.direction.value, event.price,
+                                   event.metadata["invalidation"]) for event in expected]
+
+@pytest.mark.asyncio
+async def test_detector_dispatches_matrix_rows_on_shared_bar_close():
+    """Test that ticks for several symbols on one grid produce the backtest's events once each minute closes"""
+    bars = symbol_bars(1200)
+    detector = CHoCHDetector(CONFIG)
+    detector.matrix = MatrixSwingEngine(CONFIG.swing_depth, min_bars=CONFIG.swing_depth * 4)
+    alerts = []
+    
+    async def on_choch(symbol, data):
+        alerts.append((symbol, data["direction"], data["price"]))
+    detector.on_choch = on_choch
+    
+    for minute, bar_time in enumerate(bars["SYM0"].index):
+        for symbol, df in bars.items():
+            row = df.iloc[minute]
+            for second, price in ((0, row["high"]), (20, row["low"]), (40, row["close"])):
+                await detector.notify(detector.process_tick(symbol, {
+                    "bid": price, "ask": price, "volume": 1, "timestamp": bar_time + pd.Timedelta(seconds=second)}))
+    
+    assert len(detector.matrix) == 3
+    for symbol, df in bars.items():
+        # The last minute is still forming
+        reference = CHoCHDetector(CONFIG)
+        expected = reference.backtest(symbol, df.iloc[:-1])
+        actual = [event for event in detector.pattern_history if event.symbol == symbol]
+        assert len(expected) > 5
+        assert [(event.direction, event.price, event.metadata["invalidation"], event.swing_points[1].timestamp)
+                for event in actual] == [(event.direction, event.price, event.metadata["invalidation"],
+                                          event.swing_points[1].timestamp) for event in expected]
+        assert detector.current_trends[symbol] == reference.current_trends[symbol]
+    assert len(alerts) == len(detector.pattern_history)
+
+@pytest.mark.asyncio
+async def test_rows_are_seeded_from_history_and_overrides_keep_their_engine():
+    """Test warm-up seeding, row removal and that a different swing_depth stays on the per-symbol engine"""
+    bars = symbol_bars(600)
+    detector = CHoCHDetector(CONFIG)
+    detector.symbol_configs["SYM2"] = PatternConfig(tolerance=0.0001, swing_depth=7)
+    detector.matrix = MatrixSwingEngine(CONFIG.swing_depth, min_bars=CONFIG.swing_depth * 4)
+    for symbol, df in bars.items():
+        detector.load_history(symbol, df.iloc[:500])
+    
+    for minute in range(500, 600):
+        for symbol, df in bars.items():
+            row = df.iloc[minute]
+            bar_time = df.index[minute]
+            for second, price in ((0, row["high"]), (20, row["low"]), (40, row["close"])):
+                detector.process_tick(symbol, {"bid": price, "ask": price, "volume": 1,
+                                               "timestamp": bar_time + pd.Timedelta(seconds=second)})
+    
+    assert sorted(detector.matrix.rows) == ["SYM0", "SYM1"]
+    assert detector.swing_engines["SYM2"].last_processed_index == 600 - 7
+    row = detector.matrix.rows["SYM1"]
+    engine = detector.swing_engines["SYM1"]
+    assert detector.matrix.high_last[row] == engine.swing_highs[-1].price
+    assert detector.matrix.low_prev[row] == engine.swing_lows[-2].price
+    assert detector.matrix.trend[row] == {"bullish": 1, "bearish": -1, "sideways": 0}[
+        detector.current_trends["SYM1"].value]
+    
+    await detector.drop_symbol("SYM0")
+    assert detector.matrix.symbols == ["SYM1"] and detector.matrix.rows == {"SYM1": 0}
+    assert detector.matrix.high_last[0] == engine.swing_highs[-1].price
@@ -0,0 +1,121 @@
+"""
+Metrics tests: histogram rendering, the /metrics endpoint, scrape summaries and hot-path overhead
+"""
+import asyncio
+import time
+import urllib.request
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core import metrics
+from core.config import PatternConfig
+from core.metrics import (LatencySampler, MetricsRegistry, MetricsServer, parse_prometheus_text,
+                          summarize_scrapes)
+from pattern.choch_detector import CHoCHDetector
+
+def _ticks(count, start="2024-01-01"):
+    start = pd.Timestamp(start)
+    for i in range(count):
+        mid = 1.1 + 0.001 * ((i // 50) % 7)
+        yield {"bid": mid - 0.0001, "ask": mid + 0.0001, "timestamp": start + pd.Timedelta(seconds=2 * i)}
+
+def test_histogram_render_and_quantile():
+    """Test cumulative buckets in the text output and bucket-based quantiles"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "test", ("stage",))
+    child = histogram.labels("bar_update")
+    for _ in range(90):
+        child.observe_ns(2_000)
+    for _ in range(10):
+        child.observe(0.004)
+    registry.counter("ticks_total", "test", ("symbol",)).inc("EUR/USD", amount=1234567)
+    
+    parsed = parse_prometheus_text(registry.render())
+    buckets = parsed["stage_seconds_bucket"]
+    assert buckets['{stage="bar_update",le="2.5e-06"}'] == 90
+    assert buckets['{stage="bar_update",le="+Inf"}'] == 100
+    assert parsed["stage_seconds_count"]['{stage="bar_update"}'] == 100
+    assert parsed["ticks_total"]['{symbol="EUR/USD"}'] == 1234567
+    
+    assert 1e-6 < child.quantile(0.5) <= 2.5e-6
+    assert 2.5e-3 < child.quantile(0.99) <= 5e-3
+
+def test_scrape_summary_rates_and_interval_quantiles():
+    """Test ticks/s and per-interval latency quantiles from two scrapes"""
+    registry = MetricsRegistry()
+    ticks = registry.counter("choch_ticks_total", "test", ("symbol",))
+    stage = registry.histogram("choch_stage_latency_seconds", "test", ("stage",)).labels("swing_update")
+    registry.gauge("choch_queue_depth", "test", ("queue",)).set_collector("q", lambda: {("notify_telegram",): 3})
+    
+    ticks.inc("EUR/USD", amount=100)
+    for _ in range(100):
+        stage.observe(0.5)
+    before = parse_prometheus_text(registry.render())
+    
+    ticks.inc("EUR/USD", amount=500)
+    for _ in range(50):
+        stage.observe(20e-6)
+    after = parse_prometheus_text(registry.render())
+    
+    summary = summarize_scrapes(before, after, elapsed=0.5)
+    assert summary["ticks_per_second"] == {"EUR/USD": 1000.0}
+    # Önceki okumadaki yavaş gözlemler aralığın quantile'ına girmez
+    assert summary["stages"]["swing_update"]["count"] == 50
+    assert 10e-6 < summary["stages"]["swing_update"]["p99"] <= 25e-6
+    assert summary["queues"] == {"notify_telegram": 3}
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_pipeline_metrics():
+    """Test that detector stages show up on the local /metrics endpoint"""
+    detector = CHoCHDetector(PatternConfig())
+    detector.latency_sampler = LatencySampler(every=1)
+    for tick in _ticks(600):
+        detector.process_tick("TEST/METRICS", tick)
+    
+    server = MetricsServer(metrics.registry, port=0)
+    await server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        body = await asyncio.to_thread(lambda: urllib.request.urlopen(url, timeout=5).read().decode())
+    finally:
+        await server.stop()
+    
+    parsed = parse_prometheus_text(body)
+    assert parsed["choch_ticks_total"]['{symbol="TEST/METRICS"}'] >= 600
+    counts = parsed["choch_stage_latency_seconds_count"]
+    for stage in ("bar_update", "swing_update", "pattern_detection"):
+        assert counts[f'{{stage="{stage}"}}'] > 0
+
+def test_instrumentation_overhead_is_below_one_percent():
+    """Test that per-tick metric work stays under 1% of the tick's processing time"""
+    detector = CHoCHDetector(PatternConfig())
+    ticks = list(_ticks(2000))
+    for tick in ticks[:1500]:
+        detector.process_tick("EUR/USD", tick)
+    
+    started = time.perf_counter()
+    for tick in ticks[1500:]:
+        detector.process_tick("EUR/USD", tick)
+    per_tick = (time.perf_counter() - started) / 500
+    
+    # Sıcak yoldaki metrik çağrılarının aynısı: sayaç, detector ve region örneklemesi, aşama ölçümleri
+    detector_sampler, region_sampler = LatencySampler(every=8), LatencySampler(every=8)
+    loops = 20000
+    started = time.perf_counter()
+    for _ in range(loops):
+        metrics.TICKS.inc("EUR/USD")
+        if detector_sampler.hit():
+            for child in (metrics.BAR_UPDATE, metrics.SWING_UPDATE, metrics.PATTERN_DETECTION):
+                begin = time.perf_counter_ns()
+                child.observe_ns(time.perf_counter_ns() - begin)
+        if region_sampler.hit():
+            begin = time.perf_counter_ns()
+            metrics.REGION_CHECK.observe_ns(time.perf_counter_ns() - begin)
+    overhead = (time.perf_counter() - started) / loops
+    
+    assert overhead < per_tick * 0.01
@@ -0,0 +1,46 @@
+"""
+MT5Feed bulk polling tests using the local stub bridge
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data_feed.mt5 import MT5Feed
+from data_feed.mt5_bridge import StubBridge
+
+@pytest.mark.asyncio
+async def test_bulk_poll_emits_only_changed_symbols():
+    """Test that one bulk fetch emits ticks only for changed quotes"""
+    bridge = StubBridge({"EUR/USD": (1.08, 1.0801), "GBP/USD": (1.25, 1.2501)})
+    feed = MT5Feed(bridge=bridge)
+    emitted = []
+
+    async def on_tick(symbol, tick_data):
+        emitted.append(symbol)
+
+    feed.on_tick = on_tick
+    feed.subscribed_symbols.update(["EUR/USD", "GBP/USD"])
+    feed._rebuild_symbol_index()
+
+    assert await feed._poll_ticks() == 2
+    assert await feed._poll_ticks() == 0
+
+    bridge.set_quote("GBP/USD", 1.2510, 1.2511)
+    assert await feed._poll_ticks() == 1
+    assert emitted == ["EUR/USD", "GBP/USD", "GBP/USD"]
+    assert bridge.fetch_count == 3
+
+def test_polling_interval_adapts_to_activity():
+    """Test backoff on static quotes and tightening on activity"""
+    feed = MT5Feed(bridge=StubBridge(), min_interval=0.02, max_interval=1.0)
+
+    for _ in range(20):
+        feed._adapt_interval(0)
+    assert feed.polling_interval == 1.0
+
+    for _ in range(10):
+        feed._adapt_interval(3)
+    assert feed.polling_interval == 0.02
@@ -0,0 +1,104 @@
+"""
+Analysis offload tests: per-symbol ordering, loop responsiveness, saturation and detector parity
+"""
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from core.offload import AnalysisPool, install_uvloop
+from pattern.choch_detector import CHoCHDetector
+from pattern.swing_engine import SwingEngine
+
+SYMBOL = "EUR/USD"
+
+@pytest.mark.asyncio
+async def test_results_apply_in_submission_order_per_symbol():
+    """Test that a symbol's jobs apply in order even when later ones finish faster"""
+    pool = AnalysisPool("thread", workers=3)
+    applied = []
+    
+    def work(duration, tag):
+        time.sleep(duration)
+        return tag
+    
+    def job(symbol, duration, tag):
+        async def run():
+            applied.append((symbol, await pool.run(work, duration, tag)))
+        return run
+    
+    for i, duration in enumerate([0.05, 0.03, 0.01]):
+        pool.submit("A", job("A", duration, i))
+    pool.submit("B", job("B", 0.0, 0))
+    await pool.shutdown()
+    
+    assert [tag for symbol, tag in applied if symbol == "A"] == [0, 1, 2]
+    # B does not wait behind A's chain
+    assert applied.index(("B", 0)) < applied.index(("A", 2))
+    assert pool.get_stats()["completed"] == 4 and pool.pending == 0
+
+@pytest.mark.asyncio
+async def test_loop_stays_responsive_and_saturation_is_reported():
+    """Test that blocking work runs off the loop and jobs beyond the worker count are counted"""
+    pool = AnalysisPool("thread", workers=1)
+    gaps = []
+    
+    async def heartbeat():
+        last = time.monotonic()
+        while pool.pending:
+            await asyncio.sleep(0.005)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+    
+    for symbol in ("A", "B", "C"):
+        pool.submit(symbol, lambda: pool.run(time.sleep, 0.1))
+    await asyncio.sleep(0)
+    assert pool.queue_depths() == {("analysis_running",): 1, ("analysis_waiting",): 2}
+    await heartbeat()
+    await pool.shutdown()
+    
+    assert max(gaps) < 0.05
+    assert pool.saturated == 2
+
+def _feed_bars(bars):
+    """One tick per minute bar, so every tick closes the previous bar"""
+    return [{"bid": close, "ask": close, "timestamp": ts, "volume": 1}
+            for ts, close in zip(bars.index, bars["close"])]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_offloaded_detector_matches_batch_swings(mode):
+    """Test that bar-close analysis in a pool finds the same swings as one pass over the closed bars"""
+    detector = CHoCHDetector(PatternConfig(tolerance=0.0001))
+    detector.analysis_pool = AnalysisPool(mode, workers=2)
+    try:
+        for tick in _feed_bars(sample_bars(300)):
+            detector.process_tick(SYMBOL, tick)
+        await detector.analysis_pool.drain()
+    finally:
+        await detector.analysis_pool.shutdown()
+    
+    config = detector.config
+    reference = SwingEngine(config.swing_depth, config.tolerance, config.min_swing_size)
+    highs, lows = reference.process_candles(detector.symbol_data[SYMBOL].iloc[:-1])
+    engine = detector.swing_engines[SYMBOL]
+    assert [(s.index, s.price) for s in engine.swing_highs] == [(s.index, s.price) for s in highs]
+    assert [(s.index, s.price) for s in engine.swing_lows] == [(s.index, s.price) for s in lows]
+    assert len(highs) > 2 and detector.analysis_pool.get_stats()["completed"] > 200
+
+def test_install_uvloop_sets_policy():
+    """Test that uvloop becomes the loop policy when it is installed"""
+    uvloop = pytest.importorskip("uvloop")
+    previous = asyncio.get_event_loop_policy()
+    try:
+        assert install_uvloop()
+        assert isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy)
+    finally:
+        asyncio.set_event_loop_policy(previous)
@@ -0,0 +1,93 @@
+"""
+Pattern outcome tests: forward returns, excursions and invalidation against a reference loop, plus summaries
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from pattern.choch_detector import CHoCHDetector
+from pattern.outcomes import config_label, evaluate_events, outcome_arrays, summarize_outcomes
+
+def reference_outcomes(index, direction, level, high, low, close, horizons):
+    """Per-event loop the vectorized pass must match"""
+    window = max(horizons)
+    rows = []
+    for i, sign, stop in zip(index, direction, level):
+        entry = close[i]
+        row = {f"return_{h}": sign * (close[i + h] - entry) / entry if i + h < len(close) else np.nan
+               for h in horizons}
+        ahead = slice(i + 1, min(i + window, len(close) - 1) + 1)
+        if i + 1 < len(close):
+            up, down = high[ahead].max() - entry, entry - low[ahead].min()
+            row["mfe"] = max(up if sign > 0 else down, 0.0) / entry
+            row["mae"] = max(down if sign > 0 else up, 0.0) / entry
+        else:
+            row["mfe"] = row["mae"] = np.nan
+        row["bars_to_invalidation"] = np.nan
+        for step in range(1, window + 1):
+            if i + step >= len(close):
+                break
+            if (sign > 0 and close[i + step] < stop) or (sign < 0 and close[i + step] > stop):
+                row["bars_to_invalidation"] = step
+                break
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def test_vectorized_pass_matches_reference_loop():
+    """Test every outcome column against a per-event loop, including events near the end of the series"""
+    rng = np.random.default_rng(7)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0002, 800))
+    high, low = close + rng.uniform(0, 0.0003, 800), close - rng.uniform(0, 0.0003, 800)
+    index = np.concatenate([rng.integers(0, 800, 300), [799, 798, 790]])
+    direction = np.where(rng.random(len(index)) < 0.5, 1.0, -1.0)
+    level = close[index] - direction * rng.uniform(0.0002, 0.002, len(index))
+    level[::10] = np.nan
+    horizons = (3, 10, 25)
+    
+    actual = pd.DataFrame(outcome_arrays(index, direction, level, high, low, close, horizons, chunk_size=64))
+    expected = reference_outcomes(index, direction, level, high, low, close, horizons)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected)
+
+def test_known_bullish_and_bearish_outcomes():
+    """Test hand-computed values on a tiny series"""
+    close = np.array([1.0, 1.1, 1.2, 0.9, 1.0])
+    high, low = close + 0.05, close - 0.05
+    result = outcome_arrays([0, 2, 4], [1.0, -1.0, 1.0], [1.06, 0.95, 0.5], high, low, close, horizons=(1, 2))
+    
+    # Bullish from 1.0: bars 1-2 never trade below 1.05, the high reaches 1.25
+    assert result["return_1"][0] == pytest.approx(0.1) and result["return_2"][0] == pytest.approx(0.2)
+    assert result["mfe"][0] == pytest.approx(0.25) and result["mae"][0] == 0.0
+    # The 1.05 low wicks below 1.06 but no close does, so the structure holds
+    assert np.isnan(result["bars_to_invalidation"][0])
+    # Bearish from 1.2: the low reaches 0.85; the 0.9 close stays below 0.95, the 1.0 close does not
+    assert result["return_1"][1] == pytest.approx(0.25) and result["return_2"][1] == pytest.approx(0.2 / 1.2)
+    assert result["mfe"][1] == pytest.approx(0.35 / 1.2) and result["mae"][1] == 0.0
+    assert result["bars_to_invalidation"][1] == 2
+    # Nothing follows the last bar
+    assert all(np.isnan(result[name][2]) for name in ("return_1", "mfe", "mae", "bars_to_invalidation"))
+
+def test_backtest_events_are_scored_per_symbol_and_config():
+    """Test evaluating backtest events for several symbols and configs and summarizing them"""
+    bars = {"EUR/USD": sample_bars(2000), "GBP/USD": sample_bars(1500)}
+    frames = []
+    for tolerance in (0.0001, 0.0002):
+        config = PatternConfig(tolerance=tolerance)
+        for symbol, df in bars.items():
+            events = CHoCHDetector(config).backtest(symbol, df)
+            frames.append(evaluate_events(events, bars).assign(config=config_label(config)))
+    outcomes = pd.concat(frames, ignore_index=True)
+    
+    assert outcomes["invalidation"].notna().all()
+    summary = summarize_outcomes(outcomes, by=["config", "symbol"])
+    assert len(summary) == 4
+    assert summary["events"].sum() == len(outcomes)
+    assert summary["hit_rate_5"].between(0, 1).all()
+    per_symbol = summarize_outcomes(outcomes)
+    assert list(per_symbol.index) == ["EUR/USD", "GBP/USD"]
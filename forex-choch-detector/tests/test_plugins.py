@@ -0,0 +1,67 @@
+"""
+Plugin registry tests: lazy feed/notifier loading, entry point discovery and CLI import cost
+"""
+import pytest
+from importlib import metadata
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import IMPORT_TARGET_MS, measure_import
+from core import plugins
+from core.config import Config
+from core.orchestrator import TradingOrchestrator, create_notifiers
+from core.plugins import FEEDS, NOTIFIERS, PluginError, PluginRegistry
+
+def _config(**notifications):
+    return Config(broker={"type": "websocket", "url": "ws://127.0.0.1:1/quotes", "symbols": ["EUR/USD"]},
+                  notifications=notifications, pattern={})
+
+def test_feed_is_built_from_broker_config():
+    """Test that broker.type resolves through the registry and from_config applies broker settings"""
+    feed = TradingOrchestrator(_config())._create_data_feed()
+    assert type(feed).__name__ == "WebSocketFeed"
+    assert feed.url == "ws://127.0.0.1:1/quotes"
+    
+    config = _config()
+    config.broker.type = "fix"
+    with pytest.raises(ValueError, match="Desteklenmeyen broker"):
+        TradingOrchestrator(config)._create_data_feed()
+
+@pytest.mark.asyncio
+async def test_missing_notifier_module_is_skipped():
+    """Test that a notifier whose module cannot be imported does not stop the others"""
+    NOTIFIERS.register("broken", "notifier_that_is_not_installed:Notifier")
+    try:
+        with pytest.raises(PluginError, match="yüklenemedi"):
+            NOTIFIERS.load("broken")
+        notifiers = await create_notifiers(_config(desktop_enabled=True, plugins=["broken"]))
+    finally:
+        NOTIFIERS._targets.pop("broken")
+    assert [notifier.name for notifier in notifiers] == ["desktop"]
+
+def test_entry_points_are_discovered_on_demand(monkeypatch):
+    """Test that unknown names are looked up in the entry point group without shadowing built-ins"""
+    calls = []
+    
+    def entry_points(group):
+        calls.append(group)
+        return [metadata.EntryPoint("custom", "notifier.desktop:DesktopNotifier", group),
+                metadata.EntryPoint("oanda", "notifier_that_is_not_installed:Feed", group)]
+    
+    monkeypatch.setattr(plugins.metadata, "entry_points", entry_points)
+    registry = PluginRegistry("broker", "forex_choch.feeds", {"oanda": "data_feed.oanda:OandaFeed"})
+    assert registry.load("oanda").__name__ == "OandaFeed"
+    assert calls == []
+    assert registry.load("custom").__name__ == "DesktopNotifier"
+    assert registry.names() == ["custom", "oanda"]
+    assert calls == ["forex_choch.feeds"]
+
+def test_cli_import_stays_light():
+    """Test that importing the CLI loads no feed, notifier, orchestrator or pandas module"""
+    assert FEEDS.available("websocket")
+    elapsed, heavy = min(measure_import() for _ in range(3))
+    assert heavy == []
+    assert elapsed * 1000 < IMPORT_TARGET_MS
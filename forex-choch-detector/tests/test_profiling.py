@@ -0,0 +1,78 @@
+"""
+Profiling tests: collapsed stack output, per-component attribution and slow callback detection
+"""
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from core.profiling import ProfileSession, SlowCallbackMonitor, attribute_stack
+from pattern.swing_engine import SwingEngine
+
+def _process(bars=3_000):
+    config = PatternConfig()
+    engine = SwingEngine(config.swing_depth, config.tolerance, config.min_swing_size)
+    # The bar-by-bar reference loop keeps the workload long enough to sample
+    engine.backend = "reference"
+    engine.process_candles(sample_bars(bars))
+
+@pytest.mark.parametrize("mode", ["sampling", "cprofile"])
+def test_profile_writes_collapsed_stacks(tmp_path, mode):
+    """Test that both modes write flamegraph-ready stacks and attribute CPU to the pattern package"""
+    sample_bars(3_000)
+    with ProfileSession(mode, str(tmp_path / "prof"), interval=0.001) as session:
+        _process()
+    
+    lines = (tmp_path / "prof.collapsed").read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert stack and int(weight) >= 1
+    assert any("pattern/swing_engine:process_candles" in line for line in lines)
+    assert (tmp_path / "prof.pstats").exists() == (mode == "cprofile")
+    
+    shares = session.components()
+    assert sum(shares.values()) == pytest.approx(1.0)
+    # pandas time inside the engine counts towards the pattern component in both modes
+    assert max(shares, key=shares.get) == "pattern"
+    assert shares["pattern"] > 0.5
+
+def test_attribution_uses_innermost_project_frame():
+    """Test that library frames are charged to the calling component and select() counts as idle"""
+    src = str(Path(__file__).parent.parent / "src")
+    stack = ((f"{src}/core/orchestrator.py", 1, "run"), (f"{src}/region/box_region.py", 1, "check_regions"),
+             ("/usr/lib/python3/site-packages/pandas/frame.py", 1, "__getitem__"))
+    assert attribute_stack(stack) == "region"
+    assert attribute_stack(stack[:1] + (("/usr/lib/python3.11/selectors.py", 1, "select"),)) == "idle"
+    assert attribute_stack((("/usr/lib/python3.11/json/decoder.py", 1, "decode"),)) == "other"
+
+def test_slow_callback_names_blocking_coroutine():
+    """Test that a coroutine blocking the loop past the threshold is recorded by name"""
+    async def blocking_handler():
+        time.sleep(0.03)
+    
+    async def polite_handler():
+        await asyncio.sleep(0)
+    
+    async def main():
+        await asyncio.gather(blocking_handler(), polite_handler())
+    
+    monitor = SlowCallbackMonitor(threshold=0.02)
+    original = asyncio.events.Handle._run
+    monitor.install()
+    try:
+        asyncio.run(main())
+    finally:
+        monitor.uninstall()
+    
+    assert asyncio.events.Handle._run is original
+    names = [row["callback"] for row in monitor.summary()]
+    assert any("blocking_handler" in name for name in names)
+    assert not any("polite_handler" in name for name in names)
+    assert monitor.summary()[0]["worst_ms"] >= 20
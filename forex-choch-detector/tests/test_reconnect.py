@@ -0,0 +1,107 @@
+"""
+Reconnect tests: session reuse and gap replay ordering
+"""
+import pytest
+import aiohttp
+import pandas as pd
+from aiohttp import web
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import Config
+from core.orchestrator import TradingOrchestrator
+from data_feed.base import DataFeedBase
+from data_feed.oanda import OandaFeed
+
+def _bars(start, periods):
+    index = pd.date_range(start, periods=periods, freq="min")
+    return pd.DataFrame({
+        "open": 1.1, "high": 1.2, "low": 1.0, "close": 1.1, "volume": 5
+    }, index=index)
+
+class FakeFeed(DataFeedBase):
+    """Records call order and serves gap candles"""
+    
+    def __init__(self, gap):
+        super().__init__()
+        self.gap = gap
+        self.calls = []
+    
+    async def connect(self):
+        self.calls.append("connect")
+    
+    async def disconnect(self):
+        self.calls.append("disconnect")
+    
+    async def reconnect(self):
+        self.calls.append("reconnect")
+    
+    async def subscribe(self, symbol):
+        self.calls.append(f"subscribe:{symbol}")
+    
+    async def unsubscribe(self, symbol):
+        pass
+    
+    async def fetch_candles(self, symbol, granularity="M1", from_time=None, **kwargs):
+        self.calls.append(f"fetch:{symbol}:{from_time}")
+        return self.gap[self.gap.index > from_time]
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_gap_before_resubscribing():
+    """Test that missed bars are replayed in order before live ticks resume"""
+    config = Config(broker={"type": "mt5", "symbols": ["EUR/USD"]}, notifications={}, pattern={})
+    orchestrator = TradingOrchestrator(config)
+    detector = orchestrator.pattern_detector
+    detector.symbol_data["EUR/USD"] = _bars("2024-01-01 00:00", 10)
+    
+    gap = _bars("2024-01-01 00:09", 6)
+    feed = FakeFeed(gap)
+    orchestrator.data_feed = feed
+    orchestrator.active_symbols.add("EUR/USD")
+    
+    replayed = []
+    original_analyze = detector._analyze_patterns
+    
+    def tracking_analyze(symbol):
+        replayed.append(detector.last_bar_time(symbol))
+        return original_analyze(symbol)
+    
+    detector._analyze_patterns = tracking_analyze
+    await orchestrator._reconnect_feed(base_delay=0.0)
+    
+    assert feed.calls[0] == "reconnect"
+    assert feed.calls[1].startswith("fetch:EUR/USD:2024-01-01 00:08")
+    assert feed.calls[-1] == "subscribe:EUR/USD"
+    assert replayed == list(gap.index)
+    assert len(detector.symbol_data["EUR/USD"]) == 15
+    assert detector.symbol_data["EUR/USD"].index.is_monotonic_increasing
+
+@pytest.mark.asyncio
+async def test_oanda_reconnect_keeps_client_session():
+    """Test that OandaFeed.reconnect keeps the aiohttp session alive"""
+    async def account(request):
+        return web.json_response({"account": {"currency": "USD", "balance": "1"}})
+    
+    app = web.Application()
+    app.router.add_get("/v3/accounts/{account_id}", account)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    
+    feed = OandaFeed(api_key="x", account_id="acc")
+    feed.rest_url = f"http://127.0.0.1:{runner.addresses[0][1]}/v3"
+    session = aiohttp.ClientSession()
+    feed.session = session
+    
+    try:
+        await feed.reconnect()
+        assert feed.connected
+        assert feed.session is session
+        assert not session.closed
+    finally:
+        await feed.disconnect()
+        await runner.cleanup()
@@ -0,0 +1,159 @@
+"""
+Config hot-reload tests: config diffing, symbol reconciliation, per-symbol detector rebuilds and notifier swaps
+"""
+import asyncio
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import Config
+import core.orchestrator as orchestrator_module
+from core.orchestrator import TradingOrchestrator, create_dispatcher
+from core.reload import ConfigWatcher, diff_configs
+from data_feed.base import DataFeedBase
+from notifier.base import NotifierBase
+
+def make_config(symbols=("EUR/USD", "GBP/USD"), **overrides):
+    data = {
+        "broker": {"type": "mt5", "symbols": list(symbols)},
+        "notifications": {"coalesce_window": 0},
+        "pattern": {"tolerance": 0.0001},
+    }
+    data.update(overrides)
+    return Config(**data)
+
+class TickFeed(DataFeedBase):
+    async def connect(self):
+        self.connected = True
+    
+    async def disconnect(self):
+        self.connected = False
+    
+    async def subscribe(self, symbol):
+        self.subscribed_symbols.add(symbol)
+    
+    async def unsubscribe(self, symbol):
+        self.subscribed_symbols.discard(symbol)
+
+class RecordingNotifier(NotifierBase):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.messages = []
+        self.closed = False
+    
+    async def initialize(self):
+        self.initialized = True
+    
+    async def send_notification(self, message, alert_type="info", **kwargs):
+        self.messages.append(message)
+        return True
+    
+    async def cleanup(self):
+        self.closed = True
+
+async def running_orchestrator(config):
+    orchestrator = TradingOrchestrator(config)
+    orchestrator.data_feed = TickFeed()
+    orchestrator.running = True
+    for symbol in config.broker.symbols:
+        await orchestrator.data_feed.subscribe(symbol)
+        orchestrator.active_symbols.add(symbol)
+        orchestrator.pattern_detector.load_history(symbol, sample_bars(300))
+    return orchestrator
+
+def test_diff_reports_symbols_rebuilds_and_restart_sections():
+    """Test that only changed symbols and parameters show up in the diff"""
+    old = make_config()
+    new = make_config(symbols=("EUR/USD", "USD/JPY"),
+                      pattern_overrides={"EUR/USD": {"swing_depth": 7}},
+                      metrics={"port": 9200})
+    diff = diff_configs(old, new)
+    
+    assert diff.added_symbols == ["USD/JPY"]
+    assert diff.removed_symbols == ["GBP/USD"]
+    assert diff.rebuilt_symbols == ["EUR/USD"]
+    assert not diff.pattern_changed and not diff.notifications_changed
+    assert diff.restart_required == ["metrics"]
+    assert diff_configs(old, make_config()).empty
+
+@pytest.mark.asyncio
+async def test_reload_rebuilds_only_changed_symbols():
+    """Test that symbols are (un)subscribed incrementally and untouched detectors stay hot"""
+    orchestrator = await running_orchestrator(make_config())
+    detector = orchestrator.pattern_detector
+    gbp_engine = detector.swing_engines["GBP/USD"]
+    eur_bars = detector.symbol_data["EUR/USD"]
+    
+    diff = await orchestrator.reload_config(make_config(
+        symbols=("EUR/USD", "GBP/USD", "USD/JPY"),
+        pattern_overrides={"EUR/USD": {"swing_depth": 7}}
+    ))
+    
+    assert diff.rebuilt_symbols == ["EUR/USD"]
+    assert orchestrator.data_feed.subscribed_symbols == {"EUR/USD", "GBP/USD", "USD/JPY"}
+    assert detector.swing_engines["GBP/USD"] is gbp_engine
+    assert detector.symbol_data["EUR/USD"] is eur_bars
+    assert detector.swing_engines["EUR/USD"].swing_depth == 7
+    assert detector.config_for("GBP/USD").swing_depth == orchestrator.config.pattern.swing_depth
+    
+    await orchestrator.reload_config(make_config(symbols=("GBP/USD",)))
+    assert orchestrator.data_feed.subscribed_symbols == {"GBP/USD"}
+    assert orchestrator.active_symbols == {"GBP/USD"}
+    assert "EUR/USD" not in detector.symbol_data and not detector.symbol_configs
+    assert detector.swing_engines["GBP/USD"] is gbp_engine
+
+@pytest.mark.asyncio
+async def test_notifier_swap_keeps_queued_alerts(monkeypatch):
+    """Test that alerts queued under the old notifier are delivered after a settings swap"""
+    config = make_config(notifications={"coalesce_window": 0.2})
+    orchestrator = TradingOrchestrator(config)
+    old = RecordingNotifier("desktop")
+    new = RecordingNotifier("desktop")
+    orchestrator.notifiers = [old]
+    orchestrator.dispatcher = create_dispatcher(config, [old])
+    orchestrator.dispatcher.start()
+    # Still inside the old worker's coalesce window when the reload lands
+    orchestrator.dispatcher.dispatch("queued alert")
+    
+    async def fake_create_notifiers(_config):
+        return [new]
+    
+    monkeypatch.setattr(orchestrator_module, "create_notifiers", fake_create_notifiers)
+    diff = await orchestrator.reload_config(make_config(notifications={"coalesce_window": 0.0}))
+    await orchestrator.dispatcher.stop()
+    
+    assert diff.notifications_changed
+    assert old.messages + new.messages == ["queued alert"]
+    assert old.closed and orchestrator.notifiers == [new]
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_on_file_change_and_keeps_config_on_error(tmp_path):
+    """Test that a changed file is applied and an invalid one is logged and ignored"""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(make_config().model_dump()))
+    received = []
+    
+    async def on_change(config):
+        received.append(config)
+    
+    watcher = ConfigWatcher(str(path), on_change, interval=0.01)
+    watcher.start()
+    try:
+        path.write_text(json.dumps(make_config(symbols=("USD/JPY",)).model_dump()))
+        for _ in range(200):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        path.write_text("{not json")
+        await watcher.reload()
+    finally:
+        await watcher.stop()
+    
+    assert len(received) == 1
+    assert received[0].broker.symbols == ["USD/JPY"]
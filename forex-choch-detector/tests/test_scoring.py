@@ -0,0 +1,104 @@
+"""
+Scoring tests: O(1) rolling bar statistics, swing strength and CHoCH confidence, alert filtering by score
+"""
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from pattern.choch_detector import CHoCHDetector
+from pattern.scoring import RollingStats, choch_confidence
+
+CONFIG = PatternConfig(tolerance=0.0001)
+
+def test_rolling_stats_match_full_recomputation():
+    """Test running sums against pandas rolling ATR and mean volume over many ring wraps"""
+    bars = sample_bars(3000)
+    window = 14
+    stats = RollingStats(window)
+    previous_close = bars["close"].shift(1)
+    true_range = np.maximum(bars["high"], previous_close.fillna(bars["high"])) - \
+        np.minimum(bars["low"], previous_close.fillna(bars["low"]))
+    atr = true_range.rolling(window, min_periods=1).mean().to_numpy()
+    mean_volume = bars["volume"].rolling(window, min_periods=1).mean().to_numpy()
+    
+    for i, (high, low, close, volume) in enumerate(bars[["high", "low", "close", "volume"]].itertuples(index=False)):
+        stats.push(high, low, close, volume)
+        assert stats.atr == pytest.approx(atr[i], rel=1e-9)
+        assert stats.relative_volume == pytest.approx(volume / mean_volume[i], rel=1e-9)
+    
+    warm = RollingStats.from_bars(window, *(bars[column].to_numpy() for column in ("high", "low", "close", "volume")))
+    assert warm.atr == pytest.approx(stats.atr, rel=1e-9)
+    assert warm.relative_volume == pytest.approx(stats.relative_volume, rel=1e-9)
+
+def test_confidence_components_are_monotonic():
+    """Test that bigger legs, displacement and volume raise the score and older swings lower it"""
+    base = dict(swing_size=3.0, displacement=0.5, relative_volume=1.0, swing_age=5, swing_depth=5)
+    score = choch_confidence(**base)
+    assert 0.0 < score < 1.0
+    assert choch_confidence(**dict(base, swing_size=6.0)) > score
+    assert choch_confidence(**dict(base, displacement=2.0)) > score
+    assert choch_confidence(**dict(base, relative_volume=3.0)) > score
+    assert choch_confidence(**dict(base, swing_age=20)) < score
+    assert choch_confidence(**dict(base, relative_volume=float("nan"))) == score
+
+@pytest.mark.asyncio
+async def test_backtest_and_live_path_score_events_from_closed_bars():
+    """Test that replaying bars through the live path scores events and swings like the backtest"""
+    bars = sample_bars(1200)
+    expected = CHoCHDetector(CONFIG).backtest("EUR/USD", bars)
+    live = CHoCHDetector(CONFIG)
+    events = await live.replay_bars("EUR/USD", bars)
+    
+    confidences = [event.confidence for event in expected]
+    assert len(set(confidences)) == len(confidences) > 10
+    assert all(0.0 < confidence < 1.0 for confidence in confidences)
+    assert all(0.0 < swing.strength < 1.0 for event in expected for swing in event.swing_points)
+    assert len(events) == len(expected)
+    for reference, event in zip(expected, events):
+        assert event.price == reference.price
+        assert event.confidence == pytest.approx(reference.confidence, rel=1e-9)
+        assert [swing.strength for swing in event.swing_points] == \
+            pytest.approx([swing.strength for swing in reference.swing_points], rel=1e-9)
+        assert {name: event.metadata[name] for name in ("swing_age", "relative_volume")} == \
+            pytest.approx({name: reference.metadata[name] for name in ("swing_age", "relative_volume")})
+
+@pytest.mark.asyncio
+async def test_notify_skips_events_below_min_confidence():
+    """Test that low-score events stay in history but do not reach on_choch"""
+    bars = sample_bars(1200)
+    detector = CHoCHDetector(CONFIG)
+    events = detector.backtest("EUR/USD", bars)
+    threshold = float(np.median([event.confidence for event in events]))
+    detector.symbol_configs["EUR/USD"] = CONFIG.model_copy(update={"min_confidence": threshold})
+    alerts = []
+    
+    async def on_choch(symbol, data):
+        alerts.append(data["confidence"])
+    detector.on_choch = on_choch
+    
+    await detector.notify(events)
+    assert alerts == [event.confidence for event in events if event.confidence >= threshold]
+    assert 0 < len(alerts) < len(events) == len(detector.pattern_history)
+
+@pytest.mark.asyncio
+async def test_swing_age_counts_bars_after_buffer_trim():
+    """Test that swing age is counted from timestamps once the live buffer has been trimmed under the swing"""
+    bars = sample_bars(900)
+    live = CHoCHDetector(CONFIG)
+    live.max_bars = 300
+    await live.replay_bars("EUR/USD", bars)
+    buffer = live.symbol_data["EUR/USD"]
+    engine = live.swing_engines["EUR/USD"]
+    first = buffer.index[0].isoformat()
+    swing = min((swing for swing in engine.swing_highs + engine.swing_lows if swing.timestamp >= first),
+                key=lambda swing: swing.timestamp)
+    
+    inputs = live._score_inputs("EUR/USD", [swing], swing.price, None)
+    assert inputs["swing_age"] == bars.index.get_loc(buffer.index[-1]) - bars.index.get_loc(swing.timestamp)
+    assert inputs["swing_age"] > 200
@@ -0,0 +1,201 @@
+"""
+Sharding tests: shared-memory tick ring and consistent hashing
+"""
+import asyncio
+import queue
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import Config, PatternConfig
+from core.shm_ring import ShmTickRing
+from core import sharding
+from core.event_bus import EventPublisher, InMemoryStreamBackend
+from core.sharding import ConsistentHashRing, ShardedOrchestrator, _notifier_loop, _shard_worker_loop
+from region.box_region import BoxRegionManager
+
+def test_ring_wraps_around_and_drops_when_full():
+    """Test FIFO order across the wrap point and drop-on-full"""
+    ring = ShmTickRing(capacity=4)
+    reader = ShmTickRing.attach(ring.name, 4)
+    try:
+        for i in range(3):
+            assert ring.write(i, 1.0 + i, 1.1 + i, 1.0, i)
+        assert reader.read_batch(2)["symbol_id"].tolist() == [0, 1]
+        
+        for i in range(3, 6):
+            assert ring.write(i, 1.0, 1.1, 1.0, i)
+        assert not ring.write(99, 1.0, 1.1, 1.0, 99)
+        assert ring.dropped == 1
+        
+        batch = reader.read_batch(10)
+        assert batch["symbol_id"].tolist() == [2, 3, 4, 5]
+        assert batch["timestamp_ns"].tolist() == [2, 3, 4, 5]
+        assert len(reader) == 0
+    finally:
+        reader.close()
+        ring.close()
+
+def test_consistent_hashing_moves_few_symbols_when_adding_worker():
+    """Test that adding a worker only reassigns a fraction of symbols"""
+    symbols = [f"SYM{i}/USD" for i in range(400)]
+    hash_ring = ConsistentHashRing(range(4))
+    before = {s: hash_ring.get_node(s) for s in symbols}
+    
+    hash_ring.add_node(4)
+    after = {s: hash_ring.get_node(s) for s in symbols}
+    
+    moved = [s for s in symbols if before[s] != after[s]]
+    assert all(after[s] == 4 for s in moved)
+    assert 0 < len(moved) < len(symbols) * 0.35
+    assert set(hash_ring.assign(symbols)) == {0, 1, 2, 3, 4}
+
+@pytest.mark.asyncio
+async def test_sharded_workers_drain_their_rings():
+    """Test that spawned workers consume ticks routed by shard"""
+    config = Config(
+        broker={"type": "mt5", "symbols": ["EUR/USD", "GBP/USD", "USD/JPY", "AUD/USD"]},
+        notifications={"desktop_enabled": False},
+        pattern={},
+        sharding={"workers": 2, "ring_capacity": 1024}
+    )
+    orchestrator = ShardedOrchestrator(config)
+    orchestrator._start_processes()
+    
+    for i in range(200):
+        for symbol in config.broker.symbols:
+            await orchestrator._on_tick_received(symbol, {
+                "bid": 1.1 + i * 1e-5, "ask": 1.1001 + i * 1e-5,
+                "timestamp": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}"
+            })
+    
+    assert sum(ring.dropped for ring in orchestrator.rings.values()) == 0
+    rings = list(orchestrator.rings.values())
+    await orchestrator.cleanup()
+    
+    assert all(not p.is_alive() for p in orchestrator.workers)
+    assert all(p.exitcode == 0 for p in orchestrator.workers)
+    assert orchestrator.notifier_process.exitcode == 0
+    assert not orchestrator.rings
+    assert len(rings) == 2
+
+@pytest.mark.asyncio
+async def test_shard_worker_forwards_region_hits_and_applies_commands():
+    """Test that a worker starts with its regions, applies later commands and forwards hits"""
+    ring = ShmTickRing(capacity=64)
+    event_queue, command_queue, stop_event = queue.Queue(), queue.Queue(), threading.Event()
+    regions = BoxRegionManager()
+    regions.add_region("EUR/USD", "support", 1.1010, 1.0990, region_id="r1")
+    worker = asyncio.create_task(_shard_worker_loop(
+        0, ring.name, ring.capacity, ["EUR/USD", "GBP/USD"], PatternConfig(), {},
+        event_queue, stop_event, command_queue, {"EUR/USD": regions.export_state("EUR/USD")}
+    ))
+    try:
+        ring.write(0, 1.1000, 1.1000, 1.0, 1)
+        await asyncio.sleep(0.05)
+        command_queue.put(("region_create", "GBP/USD", {"id": "r2", "name": "resistance",
+                                                        "upper_bound": 1.2710, "lower_bound": 1.2690}))
+        command_queue.put(("region_delete", "EUR/USD", {"id": "r1"}))
+        await asyncio.sleep(0.05)
+        ring.write(0, 1.1000, 1.1000, 1.0, 2)
+        ring.write(1, 1.2700, 1.2700, 1.0, 3)
+        await asyncio.sleep(0.05)
+    finally:
+        stop_event.set()
+        await worker
+        ring.close()
+    
+    events = []
+    while not event_queue.empty():
+        events.append(event_queue.get_nowait())
+    assert [(kind, symbol, data["region_id"]) for kind, symbol, data in events] == [
+        ("region_hit", "EUR/USD", "r1"), ("region_hit", "GBP/USD", "r2")
+    ]
+
+def test_region_commands_are_routed_to_the_owning_shard():
+    """Test that webhook region commands update the local copy and reach only the symbol's shard"""
+    config = Config(
+        broker={"type": "mt5", "symbols": ["EUR/USD", "GBP/USD", "USD/JPY", "AUD/USD"]},
+        notifications={"desktop_enabled": False},
+        pattern={},
+        sharding={"workers": 2}
+    )
+    orchestrator = ShardedOrchestrator(config)
+    orchestrator.command_queues = {0: queue.Queue(), 1: queue.Queue()}
+    data = {"id": "r1", "name": "zone", "upper_bound": 1.1, "lower_bound": 1.0}
+    
+    orchestrator._apply_region_command("region_create", "EUR/USD", data)
+    
+    owner = orchestrator.shard_of["EUR/USD"]
+    assert orchestrator.command_queues[owner].get_nowait() == ("region_create", "EUR/USD", data)
+    assert orchestrator.command_queues[1 - owner].empty()
+    assert [r.id for r in orchestrator.region_manager.get_regions("EUR/USD")] == ["r1"]
+
+@pytest.mark.asyncio
+async def test_shard_worker_applies_symbol_pattern_overrides():
+    """Test that a worker uses pattern_overrides for its symbols like the single-process detector"""
+    config = Config(
+        broker={"type": "mt5", "symbols": ["EUR/USD", "GBP/USD"]},
+        notifications={"desktop_enabled": False},
+        pattern={"tolerance": 0.0001},
+        pattern_overrides={"GBP/USD": {"timeframe": "M5", "swing_depth": 3}},
+        sharding={"workers": 2}
+    )
+    orchestrator = ShardedOrchestrator(config)
+    symbol_configs = orchestrator.symbol_configs(config.broker.symbols)
+    assert list(symbol_configs) == ["GBP/USD"]
+    assert symbol_configs["GBP/USD"].timeframe == "M5"
+    
+    bars = sample_bars(3000)
+    ring = ShmTickRing(capacity=8192)
+    event_queue, command_queue, stop_event = queue.Queue(), queue.Queue(), threading.Event()
+    worker = asyncio.create_task(_shard_worker_loop(
+        0, ring.name, ring.capacity, config.broker.symbols, config.pattern, symbol_configs,
+        event_queue, stop_event, command_queue, {}
+    ))
+    try:
+        for timestamp, close in zip(bars.index, bars["close"]):
+            for symbol_id in (0, 1):
+                ring.write(symbol_id, close, close, 1.0, timestamp.value)
+        while len(ring):
+            await asyncio.sleep(0.01)
+    finally:
+        stop_event.set()
+        await worker
+        ring.close()
+    
+    timeframes = {}
+    while not event_queue.empty():
+        kind, symbol, data = event_queue.get_nowait()
+        timeframes.setdefault(symbol, set()).add(data["timeframe"])
+    assert timeframes == {"EUR/USD": {"M1"}, "GBP/USD": {"M5"}}
+
+@pytest.mark.asyncio
+async def test_notifier_process_publishes_worker_events_to_the_bus(monkeypatch):
+    """Test that events queued by shard workers reach the pattern and region streams"""
+    config = Config(
+        broker={"type": "mt5", "symbols": ["EUR/USD"]},
+        notifications={"desktop_enabled": False},
+        pattern={},
+        event_bus={"enabled": True, "backend": "memory"}
+    )
+    backend = InMemoryStreamBackend()
+    monkeypatch.setattr(sharding, "create_event_publisher", lambda config: EventPublisher(backend))
+    event_queue = queue.Queue()
+    pattern = {"direction": "bullish", "price": 1.1, "timestamp": "2024-01-01T00:00:00", "timeframe": "M1"}
+    event_queue.put(("choch", "EUR/USD", pattern))
+    event_queue.put(("bos", "EUR/USD", pattern))
+    event_queue.put(("region_hit", "EUR/USD", {"region_id": "r1", "region_name": "zone", "price": 1.1}))
+    event_queue.put(None)
+    
+    await _notifier_loop(config, event_queue)
+    
+    patterns = backend.streams["choch:patterns"]
+    regions = backend.streams["choch:regions"]
+    assert [fields["type"] for _, fields in patterns] == ["choch", "bos"]
+    assert [(fields["type"], fields["symbol"]) for _, fields in regions] == [("region_hit", "EUR/USD")]
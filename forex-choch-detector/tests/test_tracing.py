@@ -0,0 +1,113 @@
+"""
+Latency tracing tests: ingest stamps carried to the notifier and sampled per-stage quantiles
+"""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.config import Config
+from core.orchestrator import TradingOrchestrator, create_dispatcher
+from core.tracing import LatencyTracer, STAGES, tracer
+from data_feed.base import DataFeedBase
+from notifier.base import NotifierBase
+from pattern.choch_detector import TrendDirection
+
+class TickFeed(DataFeedBase):
+    async def connect(self):
+        self.connected = True
+    
+    async def disconnect(self):
+        self.connected = False
+    
+    async def subscribe(self, symbol):
+        self.subscribed_symbols.add(symbol)
+    
+    async def unsubscribe(self, symbol):
+        self.subscribed_symbols.discard(symbol)
+
+class RecordingNotifier(NotifierBase):
+    name = "recording"
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    async def initialize(self):
+        self.initialized = True
+    
+    async def send_notification(self, message, alert_type="info", **kwargs):
+        self.messages.append(message)
+        return True
+
+def test_sampled_stage_quantiles_per_symbol():
+    """Test sampling and p50/p99/p999 per stage and symbol"""
+    latency_tracer = LatencyTracer(sample_every=4)
+    sampled = 0
+    for i in range(100):
+        if latency_tracer.sample():
+            sampled += 1
+            latency_tracer.record("bar_update", "EUR/USD", ingest_ns=0, now_ns=(i + 1) * 1000)
+    latency_tracer.record("bar_update", "GBP/USD", ingest_ns=0, now_ns=5_000_000)
+    
+    report = latency_tracer.report()
+    assert sampled == 25
+    assert report["bar_update"]["EUR/USD"]["count"] == 25
+    assert 45 <= report["bar_update"]["EUR/USD"]["p50"] <= 55
+    assert report["bar_update"]["EUR/USD"]["p999"] <= 100
+    assert report["bar_update"]["*"]["count"] == 26
+    assert report["bar_update"]["*"]["p999"] > 4000
+    
+    latency_tracer.configure(enabled=False)
+    assert not latency_tracer.sample()
+    latency_tracer.record("pattern", "EUR/USD", ingest_ns=0)
+    assert "pattern" not in latency_tracer.report()
+
+@pytest.mark.asyncio
+async def test_ingest_stamp_is_traced_to_notifier_completion():
+    """Test that a tick's ingest stamp follows the CHoCH event to the sent alert"""
+    config = Config(broker={"type": "mt5", "symbols": ["EUR/USD"]},
+                    notifications={"coalesce_window": 0}, pattern={})
+    orchestrator = TradingOrchestrator(config)
+    tracer.configure(enabled=True, sample_every=1)
+    tracer.reset()
+    
+    feed = TickFeed()
+    feed.on_tick = orchestrator._on_tick_received
+    detector = orchestrator.pattern_detector
+    detector.on_choch = orchestrator._on_choch_detected
+    notifier = RecordingNotifier()
+    orchestrator.dispatcher = create_dispatcher(config, [notifier])
+    orchestrator.dispatcher.start()
+    
+    # Üçüncü bar açıldığında CHoCH üret - event o tick'in damgasını taşımalı
+    original_analyze = detector._analyze_patterns
+    
+    def analyze(symbol):
+        events = original_analyze(symbol)
+        if len(detector.symbol_data[symbol]) == 3 and not detector.pattern_history:
+            events.append(detector._emit_choch(symbol, TrendDirection.BULLISH, [], 1.1))
+        return events
+    
+    detector._analyze_patterns = analyze
+    start = pd.Timestamp("2024-01-01")
+    for i in range(180):
+        await feed._emit_tick("EUR/USD", {"bid": 1.1, "ask": 1.1002,
+                                          "timestamp": start + pd.Timedelta(seconds=i)})
+    await orchestrator.dispatcher.stop()
+    
+    event = detector.pattern_history[0]
+    assert event.ingest_ns is not None
+    assert len(notifier.messages) == 1
+    
+    report = tracer.report()
+    assert list(report) == list(STAGES)
+    assert report["bar_update"]["EUR/USD"]["count"] == 180
+    assert report["pattern"]["EUR/USD"]["count"] == 1
+    assert report["notify_sent"]["*"]["count"] == 1
+    assert report["notify_sent"]["EUR/USD"]["p50"] >= report["notify_enqueued"]["EUR/USD"]["p50"] \
+        >= report["pattern"]["EUR/USD"]["p50"] > 0
+    tracer.configure()
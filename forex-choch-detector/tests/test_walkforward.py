@@ -0,0 +1,79 @@
+"""
+Walk-forward tests: array structure pass parity with the detector, window re-warming and parallel windows
+"""
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from bench.cases import sample_bars
+from core.config import PatternConfig
+from pattern.choch_detector import CHoCHDetector
+from pattern.structure import structure_pass, swing_arrays, warm_pass
+from pattern.walkforward import make_windows, walk_forward
+
+CONFIG = PatternConfig(tolerance=0.0001)
+
+@pytest.fixture(scope="module")
+def bars():
+    return sample_bars(6000)
+
+def detector_swings(detector, symbol="EUR/USD"):
+    engine = detector.swing_engines[symbol]
+    return swing_arrays(engine.swing_highs, engine.swing_lows, engine.swing_depth)
+
+@pytest.mark.parametrize("depth", [3, 5, 8])
+def test_structure_pass_matches_backtest(bars, depth):
+    """Test that the event-driven array pass emits exactly the backtest's events"""
+    config = PatternConfig(tolerance=0.0001, swing_depth=depth)
+    detector = CHoCHDetector(config)
+    events = detector.backtest("EUR/USD", bars)
+    arrays, trend, _ = structure_pass(detector_swings(detector), 0, len(bars), min_bars=depth * 4)
+    
+    assert len(events) > 20
+    assert arrays["bar_index"].tolist() == [event.metadata["bar_index"] for event in events]
+    assert arrays["price"].tolist() == [event.price for event in events]
+    assert arrays["invalidation"].tolist() == [event.metadata["invalidation"] for event in events]
+    assert trend == (1 if detector.current_trends["EUR/USD"].value == "bullish" else -1)
+
+@pytest.mark.asyncio
+async def test_warm_pass_matches_detector_warmed_at_the_boundary(bars):
+    """Test that re-warming at a window start behaves like load_history followed by live bars"""
+    start, end = 400, 1000
+    detector = CHoCHDetector(CONFIG)
+    detector.load_history("EUR/USD", bars.iloc[:start])
+    await detector.replay_bars("EUR/USD", bars.iloc[start:end])
+    
+    reference = CHoCHDetector(CONFIG)
+    reference.backtest("EUR/USD", bars.iloc[:end])
+    events = warm_pass(detector_swings(reference), start, end, min_bars=CONFIG.swing_depth * 4)
+    
+    assert len(detector.pattern_history) > 3
+    assert events["price"].tolist() == [event.price for event in detector.pattern_history]
+    assert events["direction"].tolist() == [1 if event.direction.value == "bullish" else -1
+                                            for event in detector.pattern_history]
+
+def test_windows_roll_by_test_length():
+    """Test window layout with the default and an explicit step"""
+    windows = make_windows(1000, 400, 200)
+    assert [(w.train_start, w.test_start, w.test_end) for w in windows] == [(0, 400, 600), (200, 600, 800),
+                                                                          (400, 800, 1000)]
+    assert len(make_windows(1000, 400, 200, step=100)) == 5
+    assert make_windows(500, 400, 200) == []
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_windows_match_inline(bars, executor):
+    """Test that windows evaluated in a pool select and score exactly like the inline run"""
+    configs = [PatternConfig(tolerance=0.0001, swing_depth=depth) for depth in (3, 5)]
+    inline = walk_forward(bars, configs, 2000, 1000, horizons=(5, 15), executor="inline")
+    pooled = walk_forward(bars, configs, 2000, 1000, horizons=(5, 15), executor=executor, workers=2)
+    
+    pd.testing.assert_frame_equal(pooled.windows, inline.windows)
+    pd.testing.assert_frame_equal(pooled.scores, inline.scores)
+    assert len(inline.windows) == 4
+    assert set(inline.windows["selected"]) <= {"depth=3 tol=0.0001 min=0.0005", "depth=5 tol=0.0001 min=0.0005"}
+    assert len(inline.scores) == 4 * len(configs)
+    assert (inline.windows["test_events"] > 0).all()
@@ -0,0 +1,228 @@
+"""
+Webhook service tests: region bulk endpoints, indexed queries and TradingView alerts
+"""
+import asyncio
+import json
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from core.config import Config
+from core.event_bus import EventPublisher, InMemoryStreamBackend, RedisStreamBackend
+from core.orchestrator import TradingOrchestrator
+from region.event_index import EventIndex
+from region.webhook_handler import RegionSpec, WebhookService, create_app, normalize_symbol
+
+def _client(**kwargs):
+    service = WebhookService(InMemoryStreamBackend(), **kwargs)
+    return service, TestClient(create_app(service))
+
+def test_event_index_range_and_cursor_pagination():
+    """Test time-range queries and cursors in both directions"""
+    index = EventIndex()
+    for minute in (3, 1, 2, 0, 4):
+        index.add("EUR/USD", f"2024-01-01T00:0{minute}:00", {"minute": minute})
+    
+    items, cursor = index.query("EUR/USD", limit=2)
+    assert [i["minute"] for i in items] == [0, 1]
+    items, cursor = index.query("EUR/USD", limit=2, cursor=cursor)
+    assert [i["minute"] for i in items] == [2, 3]
+    items, cursor = index.query("EUR/USD", limit=2, cursor=cursor)
+    assert [i["minute"] for i in items] == [4] and cursor is None
+    
+    items, _ = index.query("EUR/USD", start="2024-01-01T00:01:00", end="2024-01-01T00:03:00")
+    assert [i["minute"] for i in items] == [1, 2, 3]
+    items, cursor = index.query("EUR/USD", limit=3, descending=True)
+    assert [i["minute"] for i in items] == [4, 3, 2]
+    items, _ = index.query("EUR/USD", limit=3, cursor=cursor, descending=True)
+    assert [i["minute"] for i in items] == [1, 0]
+
+def test_bulk_region_endpoints_publish_commands():
+    """Test bulk create/delete and the commands sent to the orchestrator"""
+    service, client = _client()
+    with client:
+        response = client.post("/regions/bulk", json={"regions": [
+            {"symbol": "EUR/USD", "name": "Support", "upper_bound": 1.09, "lower_bound": 1.10},
+            {"symbol": "GBP/USD", "name": "Resistance", "upper_bound": 1.30, "lower_bound": 1.29}
+        ]})
+        ids = response.json()["ids"]
+        assert response.json()["created"] == 2
+        assert [r["name"] for r in client.get("/regions", params={"symbol": "EUR/USD"}).json()] == ["Support"]
+        
+        response = client.request("DELETE", "/regions/bulk", json={"ids": [ids[0], "missing"]})
+        assert response.json() == {"deleted": 1, "ids": [ids[0]]}
+        client.portal.call(service.publisher.flush)
+    
+    commands = [fields for _, fields in service.backend.streams["choch:commands"]]
+    assert [c["type"] for c in commands] == ["region_create", "region_create", "region_delete"]
+    
+    config = Config(broker={"type": "mt5", "symbols": []}, notifications={}, pattern={})
+    orchestrator = TradingOrchestrator(config)
+    for command in commands:
+        orchestrator._apply_region_command(command["type"], command["symbol"], json.loads(command["data"]))
+    assert orchestrator.region_manager.get_regions("EUR/USD") == []
+    region = orchestrator.region_manager.get_regions("GBP/USD")[0]
+    assert region.id == ids[1] and region.upper_bound == 1.30
+
+def test_region_endpoints_require_the_passphrase():
+    """Test that region create/delete are rejected with 401 without the passphrase header"""
+    service, client = _client(passphrase="s3cret")
+    spec = {"symbol": "EUR/USD", "name": "Support", "upper_bound": 1.10, "lower_bound": 1.09}
+    with client:
+        assert client.post("/regions/bulk", json={"regions": [spec]}).status_code == 401
+        response = client.post("/regions/bulk", json={"regions": [spec]},
+                               headers={"X-Webhook-Passphrase": "wrong"})
+        assert response.status_code == 401
+        response = client.post("/regions/bulk", json={"regions": [spec]},
+                               headers={"X-Webhook-Passphrase": "s3cret"})
+        ids = response.json()["ids"]
+        
+        assert client.request("DELETE", "/regions/bulk", json={"ids": ids}).status_code == 401
+        assert len(client.get("/regions").json()) == 1
+        response = client.request("DELETE", "/regions/bulk", json={"ids": ids},
+                                  headers={"X-Webhook-Passphrase": "s3cret"})
+        assert response.json() == {"deleted": 1, "ids": ids}
+
+def test_events_from_stream_are_queryable_with_pagination():
+    """Test that streamed pattern events are indexed and paged by cursor"""
+    service, client = _client()
+    with client:
+        async def publish():
+            publisher = EventPublisher(service.backend)
+            for i in range(250):
+                publisher.publish_pattern("choch", "EUR/USD", {
+                    "direction": "bullish", "price": 1.1, "timestamp": f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00"
+                })
+            await publisher.flush()
+            for _ in range(100):
+                if len(service.pattern_index) == 250:
+                    return
+                await asyncio.sleep(0.01)
+        client.portal.call(publish)
+        
+        pages, cursor = [], None
+        while True:
+            params = {"symbol": "EUR/USD", "limit": 100}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/events", params=params).json()
+            pages.append(len(body["items"]))
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == [100, 100, 50]
+        
+        body = client.get("/events", params={
+            "symbol": "EUR/USD", "start": "2024-01-01T01:00:00", "end": "2024-01-01T01:09:00"
+        }).json()
+        assert len(body["items"]) == 10
+        assert body["items"][0]["type"] == "choch"
+        assert client.get("/events", params={"symbol": "EUR/USD", "cursor": "bad"}).status_code == 400
+
+def test_tradingview_batch_webhook():
+    """Test batched TradingView alerts with a shared passphrase"""
+    service, client = _client(passphrase="s3cret")
+    with client:
+        alerts = [
+            {"ticker": "OANDA:EURUSD", "close": 1.1012, "time": "2024-01-01T00:00:00Z", "passphrase": "s3cret"},
+            {"ticker": "GBPUSD", "price": 1.27, "message": "breakout", "passphrase": "s3cret"}
+        ]
+        assert client.post("/webhooks/tradingview", json={"alerts": alerts}).json() == {"accepted": 2}
+        assert client.post("/webhooks/tradingview", json=alerts[0]).json() == {"accepted": 1}
+        assert client.post("/webhooks/tradingview", json=[{"ticker": "EURUSD"}]).status_code == 401
+        
+        items = client.get("/webhooks/tradingview", params={"symbol": "EUR/USD"}).json()["items"]
+        assert len(items) == 2
+        assert items[0]["price"] == 1.1012
+        assert "passphrase" not in items[0]
+    assert normalize_symbol("usdjpy") == "USD/JPY"
+
+def test_index_query_is_fast_for_large_histories():
+    """Test that range queries stay cheap on a large per-symbol index"""
+    index = EventIndex()
+    for i in range(100000):
+        index.add("EUR/USD", 1_700_000_000 + i, {"i": i})
+    
+    start = time.perf_counter()
+    for i in range(1000):
+        items, _ = index.query("EUR/USD", start=1_700_000_000 + i * 50, limit=50)
+    elapsed = time.perf_counter() - start
+    
+    assert items[0]["i"] == 999 * 50
+    assert elapsed < 0.5
+
+@pytest.mark.asyncio
+async def test_replicas_share_regions_through_redis():
+    """Test that a region created by one replica can be listed and deleted by another"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    first = WebhookService(RedisStreamBackend(client=client), consumer_name="replica-a")
+    second = WebhookService(RedisStreamBackend(client=client), consumer_name="replica-b")
+    
+    ids = await first.create_regions([RegionSpec(symbol="EUR/USD", name="Support", upper_bound=1.09,
+                                                 lower_bound=1.10)])
+    region = (await second.list_regions("EUR/USD"))[0]
+    assert region["id"] == ids[0] and region["upper_bound"] == 1.10
+    assert await second.delete_regions(ids + ["missing"]) == ids
+    assert await first.delete_regions(ids) == []
+    assert await first.list_regions() == []
+    
+    await first.publisher.flush()
+    await second.publisher.flush()
+    commands = await client.xrange("choch:commands")
+    assert [fields[b"type"] for _, fields in commands] == [b"region_create", b"region_delete"]
+
+@pytest.mark.asyncio
+async def test_each_replica_indexes_every_event():
+    """Test that replicas use their own consumer group instead of splitting the stream"""
+    backend = InMemoryStreamBackend()
+    first = WebhookService(backend, consumer_name="replica-a")
+    second = WebhookService(backend, consumer_name="replica-b")
+    
+    publisher = EventPublisher(backend)
+    for i in range(20):
+        publisher.publish_pattern("choch", "EUR/USD", {"price": 1.1, "timestamp": f"2024-01-01T00:{i:02d}:00"})
+    await publisher.flush()
+    await first.start()
+    await second.start()
+    for _ in range(100):
+        if len(first.pattern_index) == len(second.pattern_index) == 20:
+            break
+        await asyncio.sleep(0.01)
+    await first.stop()
+    await second.stop()
+    
+    assert len(first.pattern_index) == len(second.pattern_index) == 20
+    assert first.consumer_group != second.consumer_group
+
+@pytest.mark.asyncio
+async def test_service_answers_over_1k_requests_per_second():
+    """Test mixed query and webhook throughput against the ASGI app without a tick loop"""
+    service = WebhookService(InMemoryStreamBackend())
+    for i in range(10000):
+        service.pattern_index.add("EUR/USD", f"2024-01-{1 + i // 1440:02d}T{i // 60 % 24:02d}:{i % 60:02d}:00", {"i": i})
+    app = create_app(service)
+    
+    def request(client, i):
+        if i % 4 == 3:
+            return client.post("/webhooks/tradingview", json={"ticker": "EURUSD", "close": 1.1})
+        return client.get("/events", params={"symbol": "EUR/USD", "limit": 10,
+                                             "start": f"2024-01-01T{i // 60 % 24:02d}:{i % 60:02d}:00"})
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        start = time.perf_counter()
+        responses = []
+        for chunk in range(0, 2000, 100):
+            responses += await asyncio.gather(*(request(client, i) for i in range(chunk, chunk + 100)))
+        elapsed = time.perf_counter() - start
+    
+    assert all(response.status_code == 200 for response in responses)
+    assert len(service.webhook_index) == 500
+    assert len(responses) / elapsed > 1000
@@ -0,0 +1,77 @@
+"""
+WebSocketFeed tests against the bundled local quote server
+"""
+import pytest
+import asyncio
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data_feed.websocket import WebSocketFeed
+from data_feed.ws_server import QuoteServer
+
+async def _wait_for(predicate, timeout=2.0):
+    """Poll until predicate is true or timeout"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+def test_decode_batched_frame_with_field_map():
+    """Test batch decoding with a custom field mapping, skipping malformed quotes"""
+    feed = WebSocketFeed(
+        url="ws://unused",
+        field_map={"symbol": "s", "bid": "b", "ask": "a", "timestamp": "t"},
+        batch_key="data"
+    )
+    payload = {"data": [
+        {"s": "EUR/USD", "b": "1.0800", "a": "1.0801", "t": "2024-01-01T00:00:00"},
+        {"s": "GBP/USD", "b": 1.25, "a": 1.2502, "t": "2024-01-01T00:00:00"},
+        {"s": "USD/JPY"},
+        {"s": "AUD/USD", "b": "n/a", "a": 0.66},
+        {"s": "NZD/USD", "b": [0.6], "a": 0.61},
+    ]}
+
+    ticks = feed._decode_quotes(payload)
+
+    assert [t["symbol"] for t in ticks] == ["EUR/USD", "GBP/USD"]
+    assert ticks[0]["bid"] == 1.08
+    assert ticks[1]["spread"] == pytest.approx(0.0002)
+
+@pytest.mark.asyncio
+async def test_feed_receives_batches_and_resubscribes():
+    """Test batched delivery and resubscription after a dropped connection"""
+    server = QuoteServer(batch_size=10)
+    await server.start(stream=False)
+
+    feed = WebSocketFeed(url=server.url, reconnect_base_delay=0.05)
+    received = []
+
+    async def on_tick(symbol, tick_data):
+        received.append(tick_data)
+
+    feed.on_tick = on_tick
+    await feed.connect()
+    await feed.subscribe("EUR/USD")
+
+    try:
+        assert await _wait_for(lambda: any(server.clients.values()))
+        quotes = [{"symbol": "EUR/USD", "bid": 1.08 + i * 1e-5, "ask": 1.0801 + i * 1e-5} for i in range(25)]
+        await server.publish([{"symbol": "EUR/USD", "bid": "bad", "ask": 1.0801}])
+        await server.publish(quotes)
+        assert await _wait_for(lambda: len(received) == 25)
+        assert feed.frames_received == 2
+        assert feed.reconnect_count == 0
+
+        await server.drop_clients()
+        assert await _wait_for(lambda: feed.reconnect_count == 1 and any(server.clients.values()))
+
+        await server.publish(quotes[:5])
+        assert await _wait_for(lambda: len(received) == 30)
+    finally:
+        await feed.disconnect()
+        await server.stop()